@@ -3,6 +3,7 @@ Main application entry point and core application classes
 """
 from tkinter import *
 from tkinter import ttk
+from tkinter import messagebox
 import tkinter.font as tkfont
 import locale
 import logging
@@ -24,6 +25,9 @@ from src.ui.frames.browse_clients_frame import BrowseClientsFrame
 from src.ui.frames.browse_suppliers_frame import BrowseSuppliersFrame
 from src.ui.frames.browse_offers_frame import BrowseOffersFrame
 from src.ui.frames.settings_frame import SettingsFrame
+from src.ui.frames.analytics_frame import AnalyticsFrame
+from src.ui.frames.diagnostics_frame import DiagnosticsFrame
+from src.ui.windows.quick_open_window import QuickOpenWindow
 from src.core.offer_generator_app import OfferGeneratorApp
 from src.core.wz_generator_app import WzGeneratorApp
 from src.utils.config import WINDOW_SIZE, APP_TITLE
@@ -31,10 +35,10 @@ from src.utils.config import get_offers_folder, get_wz_folder
 from src.data.database_service import get_database_path, is_database_available
 import src.data.database_service as _dbs
 from src.utils.settings import settings_manager
+from src.utils import tracing, metrics
 import shutil
 from datetime import datetime
 
-
 def main():
     """Main entry point with navigation"""
     app = OfferGeneratorMainApp()
@@ -95,13 +99,22 @@ class OfferGeneratorMainApp:
         except Exception:
             pass
         try:
-            from src.utils.version import get_version_string
+            from src.utils.version import get_version_string, get_build_info
             version_str = get_version_string()
             self.window.title(f"{APP_TITLE} - {version_str}")
+            build = get_build_info()
+            self._log.info("  Version %s (built %s, Python %s)", build['version'],
+                           build['build_time'] or 'dev', build['python'])
         except ImportError:
             self.window.title(APP_TITLE)
         self._log.info("  Tk window created & configured in %.3f s", time.perf_counter() - t)
 
+        # Optional status bar with the stage timings of the last generated document (see poll_trace_readout)
+        self.timings_var = StringVar(value="")
+        self.timings_bar = Label(self.window, textvariable=self.timings_var, anchor=W, font=("Arial", 9),
+                                 bg='#e8e8e8', fg='#333333', padx=10, pady=2)
+        self._shown_trace = None
+
         # Initialize navigation manager
         t = time.perf_counter()
         self.nav_manager = NavigationManager(self.window)
@@ -112,6 +125,11 @@ class OfferGeneratorMainApp:
         self.setup_frames()
         self._log.info("  Frames setup completed in %.3f s", time.perf_counter() - t)
 
+        # Quick-open palette over documents, clients and suppliers
+        self.quick_open = QuickOpenWindow(self.window, self.nav_manager)
+        self.window.bind('<Control-p>', self.open_quick_open)
+        self.window.bind('<Control-P>', self.open_quick_open)
+
         # Verify required folders & show main menu
         t = time.perf_counter()
         missing = self.check_required_folders()
@@ -139,10 +157,71 @@ class OfferGeneratorMainApp:
             self.perform_database_backup_on_start()
         except Exception as e:
             self._log.warning("Database backup on start failed: %s", e)
-            print(f"Database backup on start failed: {e}")
         self._log.info("  Database backup step in %.3f s", time.perf_counter() - t)
 
-        self._log.info("OfferGeneratorMainApp.__init__ completed in %.3f s", time.perf_counter() - t_init)
+        # Prepare the local read replica without blocking the UI
+        try:
+            from src.data import replica_service
+            replica_service.warm_up_async(get_database_path())
+        except Exception as e:
+            self._log.warning("Replica warm-up failed: %s", e)
+
+        # Index the templates' placeholders in the background
+        try:
+            from src.utils import template_index
+            template_index.warm_up_async()
+        except Exception as e:
+            self._log.warning("Template index warm-up failed: %s", e)
+
+        # Create/backfill the product catalog and load the autocomplete index
+        try:
+            from src.data import product_catalog_service
+            product_catalog_service.warm_up_async()
+        except Exception as e:
+            self._log.warning("Product catalog warm-up failed: %s", e)
+
+        # Create/backfill the client/month document summary
+        try:
+            from src.data import summary_service
+            summary_service.warm_up_async()
+        except Exception as e:
+            self._log.warning("Document summary warm-up failed: %s", e)
+
+        # Build the quick-open (Ctrl+P) index
+        try:
+            from src.data import quick_open_service
+            quick_open_service.warm_up_async()
+        except Exception as e:
+            self._log.warning("Quick-open index warm-up failed: %s", e)
+
+        # Record timings to the local metrics store
+        try:
+            metrics.start()
+        except Exception as e:
+            self._log.warning("Metrics start failed: %s", e)
+
+        # Let open frames reload when the database is switched from settings
+        _dbs.add_database_listener(self.on_database_changed)
+
+        # Replay writes journaled while the shared DB was unreachable
+        try:
+            from src.data import write_journal
+            write_journal.start_sync_worker()
+            self.window.after(2000, self.poll_offline_sync)
+        except Exception as e:
+            self._log.warning("Offline sync worker start failed: %s", e)
+
+        # Report background PDF exports
+        self._pdf_exported = []
+        self.window.after(1000, self.poll_pdf_exports)
+
+        # Stage timings readout (setting 'show_timings')
+        self.window.after(1000, self.poll_trace_readout)
+
+        startup_seconds = time.perf_counter() - t_init
+        metrics.observe('app.startup', startup_seconds)
+        metrics.incr('app.starts')
+        self._log.info("OfferGeneratorMainApp.__init__ completed in %.3f s", startup_seconds)
     
     def setup_frames(self):
         """Setup navigation frames"""
@@ -182,6 +261,12 @@ class OfferGeneratorMainApp:
         # Browse offers frame
         self.nav_manager.add_frame('browse_offers', BrowseOffersFrame)
         
+        # Quote analytics frame
+        self.nav_manager.add_frame('analytics', AnalyticsFrame)
+
+        # Performance diagnostics frame
+        self.nav_manager.add_frame('diagnostics', DiagnosticsFrame)
+
         # Settings frame
         self.nav_manager.add_frame('settings', SettingsFrame)
     
@@ -223,6 +308,113 @@ class OfferGeneratorMainApp:
         dest_path = os.path.join(backup_folder, dest_name)
         shutil.copy2(db_path, dest_path)
 
+    def on_database_changed(self, new_path):
+        """Ask every frame that holds database data to reload it after a database switch."""
+        t = time.perf_counter()
+        self._log.info("Database switched to %s", new_path)
+        for name, frame in list(self.nav_manager.frames.items()):
+            handler = getattr(frame, 'on_database_changed', None)
+            if handler is None:
+                continue
+            try:
+                handler()
+            except Exception as e:
+                self._log.warning("Frame %s failed to reload after database switch: %s", name, e)
+        self._log.info("  Frames reloaded in %.3f s", time.perf_counter() - t)
+
+    def open_quick_open(self, event=None):
+        """Show the quick-open palette (Ctrl+P)"""
+        self.quick_open.open()
+        return 'break'
+
+    def poll_pdf_exports(self):
+        """Report finished background PDF exports on the UI thread."""
+        try:
+            from src.services import pdf_export_service
+            failed = []
+            for result in pdf_export_service.drain_events():
+                if result.error:
+                    failed.append(f"{os.path.basename(result.docx_path)}: {result.error}")
+                    continue
+                self._log.info("PDF exported (%s): %s", result.engine, result.pdf_path)
+                if result.notify:
+                    self._pdf_exported.append(result.pdf_path)
+            if failed:
+                messagebox.showwarning(
+                    "Eksport PDF",
+                    "Nie udało się utworzyć pliku PDF dla:\n\n" + "\n".join(failed[:10])
+                )
+            # Bulk exports are summarised once the queue is empty
+            if self._pdf_exported and pdf_export_service.pending_count() == 0:
+                count = len(self._pdf_exported)
+                folder = os.path.dirname(self._pdf_exported[-1])
+                self._pdf_exported = []
+                messagebox.showinfo("Eksport PDF", f"Utworzono plików PDF: {count}\n\n{folder}")
+        except Exception as e:
+            self._log.warning("PDF export poll failed: %s", e)
+        finally:
+            try:
+                self.window.after(1000, self.poll_pdf_exports)
+            except Exception:
+                pass
+
+    def poll_trace_readout(self):
+        """Show the stage timings of the last traced document operation in the status bar."""
+        try:
+            if settings_manager.get_app_setting('show_timings'):
+                trace = tracing.last_trace()
+                if trace is not None and trace is not self._shown_trace:
+                    self._shown_trace = trace
+                    self.timings_var.set(trace.summary_text())
+                elif trace is None and not self.timings_var.get():
+                    self.timings_var.set("Brak wygenerowanych dokumentów w tej sesji")
+                if not self.timings_bar.winfo_manager():
+                    # Pack in front of the frames so a frame filling the window never covers it
+                    slaves = [w for w in self.window.pack_slaves() if w is not self.timings_bar]
+                    options = {'before': slaves[0]} if slaves else {}
+                    self.timings_bar.pack(side=BOTTOM, fill=X, **options)
+            elif self.timings_bar.winfo_manager():
+                self.timings_bar.pack_forget()
+        except Exception as e:
+            self._log.warning("Timings readout failed: %s", e)
+        finally:
+            try:
+                self.window.after(1000, self.poll_trace_readout)
+            except Exception:
+                pass
+
+    def poll_offline_sync(self):
+        """Report results of background offline-write sync on the UI thread."""
+        try:
+            from src.data import write_journal
+            for result in write_journal.drain_events():
+                synced = result.get('synced', 0)
+                conflicts = result.get('conflicts', [])
+                if synced:
+                    self._log.info("Offline sync: %d write(s) applied, %d remaining", synced, result.get('remaining', 0))
+                if conflicts:
+                    if messagebox.askyesno(
+                        "Konflikt synchronizacji",
+                        "Nie udało się przesłać do bazy części zmian zapisanych w trybie offline:\n\n"
+                        + "\n".join(conflicts)
+                        + "\n\nTe zapisy pozostały w lokalnym dzienniku. Można je ponowić lub odrzucić "
+                          "w oknie \"Konflikty synchronizacji\" (menu główne).\n\nOtworzyć je teraz?",
+                        icon='warning'
+                    ):
+                        self.nav_manager.frames['main_menu'].open_offline_conflicts()
+                elif synced:
+                    messagebox.showinfo(
+                        "Synchronizacja",
+                        f"Połączenie z bazą danych zostało przywrócone. Przesłano {synced} zapis(y/ów) wykonanych w trybie offline."
+                    )
+        except Exception as e:
+            self._log.warning("Offline sync poll failed: %s", e)
+        finally:
+            try:
+                self.window.after(2000, self.poll_offline_sync)
+            except Exception:
+                pass
+
     def check_required_folders(self) -> bool:
         """Startup check for folders; do not show prompts at startup.
         - If database is unavailable, skip all prompts and allow startup.
@@ -241,7 +433,7 @@ class OfferGeneratorMainApp:
             _ = _get_wz_root()
             return False
         except Exception as e:
-            print(f"Required folders check error: {e}")
+            self._log.error("Required folders check error: %s", e)
             return False
     
     def close_application(self):
@@ -1,8 +1,11 @@
 """
 Navigation manager for handling frame switching
 """
+import logging
 from tkinter import *
 
+_log = logging.getLogger(__name__)
+
 
 class NavigationManager:
     """Manages navigation between different screens/frames"""
@@ -26,106 +29,21 @@ class NavigationManager:
         
         # Show the requested frame
         if frame_name in self.frames:
-            # Always recreate Settings frame to discard any unsaved UI state
-            if frame_name == 'settings':
-                try:
-                    # Destroy old instance
-                    self.frames[frame_name].destroy()
-                except Exception:
-                    pass
-                # Recreate fresh instance
-                from src.ui.frames.settings_frame import SettingsFrame as _SettingsFrame
-                self.frames[frame_name] = _SettingsFrame(self.root, self)
-            # Handle special cases with parameters
+            # Handle special cases with parameters. Document frames keep their widgets:
+            # the app instance is built on the first visit and reset on the following ones.
+            # (Settings reloads its values from disk in show(), discarding unsaved edits.)
+            frame = self.frames[frame_name]
             if frame_name == 'offer_editor' and 'offer_path' in kwargs:
-                # Initialize editor with offer path using frame's method
-                self.frames[frame_name].offer_path = kwargs['offer_path']
-                # Clear existing instance to force recreation
-                self.frames[frame_name].offer_app_instance = None
-                # Clear existing content
-                if hasattr(self.frames[frame_name], 'content_container'):
-                    for widget in self.frames[frame_name].content_container.winfo_children():
-                        widget.destroy()
-                # Initialize with new offer path
-                self.frames[frame_name].initialize_offer_app(kwargs['offer_path'])
+                frame.offer_path = kwargs['offer_path']
+                frame.initialize_offer_app(kwargs['offer_path'])
             elif frame_name == 'wz_editor' and 'wz_path' in kwargs:
-                # Initialize WZ editor with WZ path using frame's method
-                self.frames[frame_name].wz_path = kwargs['wz_path']
-                # Clear existing instance to force recreation
-                self.frames[frame_name].wz_app_instance = None
-                # Clear existing content
-                if hasattr(self.frames[frame_name], 'content_container'):
-                    for widget in self.frames[frame_name].content_container.winfo_children():
-                        widget.destroy()
-                # Initialize with new WZ path
-                self.frames[frame_name].initialize_wz_app(kwargs['wz_path'])
-            elif frame_name == 'offer_generator' and 'template_context' in kwargs:
-                # Create new generator instance with template context
-                from src.core.offer_generator_app import OfferGeneratorApp
-                # Clear existing content
-                for widget in self.frames[frame_name].content_container.winfo_children():
-                    widget.destroy()
-                # Create new generator app with template context and source frame information
-                source_frame = kwargs.get('source_frame', None)
-                self.frames[frame_name].offer_app_instance = OfferGeneratorApp(
-                    self.frames[frame_name], 
-                    self, 
-                    template_context=kwargs['template_context'],
-                    source_frame=source_frame
-                )
-                # Update back button text
-                if hasattr(self.frames[frame_name], 'update_back_button_text'):
-                    self.frames[frame_name].update_back_button_text()
-                # Ensure header action button ("Generuj ofertę") is present/updated
-                if hasattr(self.frames[frame_name], 'setup_header_actions'):
-                    try:
-                        self.frames[frame_name].setup_header_actions()
-                    except Exception:
-                        pass
-            elif frame_name == 'offer_generator':
-                # Regular generator without template - ensure it's initialized
-                if not hasattr(self.frames[frame_name], 'offer_app_instance') or not self.frames[frame_name].offer_app_instance:
-                    self.frames[frame_name].initialize_offer_app()
-            elif frame_name == 'offer_creation':
-                # Always create fresh instance for offer creation to ensure clean state
-                # Clear existing content first
-                if hasattr(self.frames[frame_name], 'content_container'):
-                    for widget in self.frames[frame_name].content_container.winfo_children():
-                        widget.destroy()
-                # Always create new instance with template_context=None
-                self.frames[frame_name].initialize_offer_app()
-            elif frame_name == 'wz_generator' and 'template_context' in kwargs:
-                # Create new generator instance with template context
-                from src.core.wz_generator_app import WzGeneratorApp
-                # Clear existing content
-                for widget in self.frames[frame_name].content_container.winfo_children():
-                    widget.destroy()
-                # Create new generator app with template context and source frame information
-                source_frame = kwargs.get('source_frame', None)
-                self.frames[frame_name].wz_app_instance = WzGeneratorApp(
-                    self.frames[frame_name], 
-                    self, 
-                    template_context=kwargs['template_context'],
-                    source_frame=source_frame
-                )
-                # Update back button text
-                if hasattr(self.frames[frame_name], 'update_back_button_text'):
-                    self.frames[frame_name].update_back_button_text()
-            elif frame_name == 'wz_generator':
-                # Regular generator without template - ensure it's initialized
-                # Use wz_app_instance analogous to offer_app_instance for offers
-                if not hasattr(self.frames[frame_name], 'wz_app_instance') or not self.frames[frame_name].wz_app_instance:
-                    # Initialize WZ app inside creation frame
-                    if hasattr(self.frames[frame_name], 'initialize_wz_app'):
-                        self.frames[frame_name].initialize_wz_app()
-            elif frame_name == 'wz_creation':
-                # Always create fresh instance for WZ creation to ensure clean state
-                # Clear existing content first
-                if hasattr(self.frames[frame_name], 'content_container'):
-                    for widget in self.frames[frame_name].content_container.winfo_children():
-                        widget.destroy()
-                # Always create new instance
-                self.frames[frame_name].initialize_wz_app()
+                frame.wz_path = kwargs['wz_path']
+                frame.initialize_wz_app(kwargs['wz_path'])
+            elif frame_name in ('offer_generator', 'offer_creation'):
+                # Fresh form, or the template context loaded by "Wczytaj do kreatora"
+                frame.initialize_offer_app(kwargs.get('template_context'), kwargs.get('source_frame'))
+            elif frame_name in ('wz_generator', 'wz_creation'):
+                frame.initialize_wz_app(kwargs.get('template_context'), kwargs.get('source_frame'))
             elif frame_name == 'browse_wz':
                 # Refresh WZ list when showing browse frame
                 if hasattr(self.frames[frame_name], 'refresh_wz_list'):
@@ -134,15 +52,9 @@ class NavigationManager:
             self.frames[frame_name].show()
             self.current_frame = frame_name
         else:
-            print(f"Frame '{frame_name}' not found!")
+            _log.warning("Frame '%s' not found!", frame_name)
     
     def show_main_generator(self):
         """Show main generator without template"""
         if 'offer_generator' in self.frames:
-            # Clear existing content
-            for widget in self.frames['offer_generator'].content_container.winfo_children():
-                widget.destroy()
-            # Create new generator app without template
-            from src.core.offer_generator_app import OfferGeneratorApp
-            OfferGeneratorApp(self.frames['offer_generator'], self)
             self.show_frame('offer_generator')
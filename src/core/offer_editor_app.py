@@ -1,6 +1,7 @@
 """
 Offer editor application logic - modified version of OfferGeneratorApp for editing existing offers
 """
+import logging
 from tkinter import *
 import tkinter.messagebox
 import sys
@@ -16,6 +17,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from src.ui.components.ui_components import UIComponents
 from src.ui.windows.product_add_window import ProductAddWindow
 from src.ui.windows.product_edit_window import ProductEditWindow
+from src.ui.windows.product_import_window import ProductImportWindow
 from src.ui.windows.supplier_search_window import SupplierSearchWindow
 from src.ui.components.product_table import ProductTable
 from src.services.offer_editor_service import update_offer_document
@@ -23,6 +25,8 @@ from src.data.database_service import get_offer_context_from_db
 from src.utils.config import BACKGROUND_IMAGE
 from src.utils.os_utils import open_document
 
+_log = logging.getLogger(__name__)
+
 
 class OfferEditorApp:
     """Offer editor app - modified version for editing existing offers"""
@@ -43,6 +47,13 @@ class OfferEditorApp:
         # Load existing offer data
         self.load_offer_data()
     
+    def reset(self, offer_path):
+        """Reuse the existing widgets for editing another offer instead of rebuilding the app"""
+        self.offer_path = offer_path
+        self.ui.reset_form()
+        self.count = 0
+        self.load_offer_data()
+
     def setup_ui(self):
         """Setup all UI components within the parent frame"""
         # Set minimum height for content container to ensure scrolling works
@@ -55,7 +66,7 @@ class OfferEditorApp:
             label_BG.place(x=0, y=0)
             label_BG.image = bg  # Keep a reference
         except Exception as e:
-            print(f"Could not load background image: {e}")
+            _log.warning("Could not load background image: %s", e)
             # If background image fails, use a clean professional color
             self.window.configure(bg='#f5f5f5')
         
@@ -63,8 +74,11 @@ class OfferEditorApp:
         # Create product table with edit and delete callbacks
         self.product_table = ProductTable(self.window, self.parent_frame, self.edit_product, self.on_product_deleted)
         self.ui = UIComponents(self.window, self.product_table)
-        self.product_add = ProductAddWindow(self.window, self.insert_product)
-        self.product_edit = ProductEditWindow(self.window, self.update_product)
+        self.product_add = ProductAddWindow(self.window, self.insert_product,
+                                            client_nip_provider=self._current_client_nip)
+        self.product_edit = ProductEditWindow(self.window, self.update_product,
+                                              client_nip_provider=self._current_client_nip)
+        self.product_import = ProductImportWindow(self.window, self.import_products)
         
         # Create supplier search window (for editing existing offers)
         self.supplier_search = SupplierSearchWindow(self.window, self.ui.fill_supplier_data)
@@ -78,6 +92,11 @@ class OfferEditorApp:
         # Create buttons (modified for editor)
         self.create_buttons()
     
+    def _current_client_nip(self):
+        """NIP of the client entered in the form (for per-client product prices)"""
+        entry = self.ui.entries.get('client_nip')
+        return entry.get() if entry is not None else None
+
     def create_buttons(self):
         """Create all buttons for editor mode"""
         # Supplier search button (like in creator)
@@ -110,6 +129,14 @@ class OfferEditorApp:
                width=3, height=1,
                command=self.move_product_down,
                cursor='hand2').place(x=320, y=740)
+
+        # Bulk import from CSV file or clipboard
+        Button(self.window, text="IMPORTUJ", 
+               font=("Arial", 12, "bold"),
+               bg='#17a2b8', fg='black',
+               padx=15, pady=8,
+               command=self.product_import.open_import_window,
+               cursor='hand2').place(x=400, y=740)
         
     # Save button moved to header in OfferEditorFrame
     
@@ -144,7 +171,7 @@ class OfferEditorApp:
             # Load and preserve original offer number
             if 'offer_number' in context_data:
                 self.ui.offer_number = context_data['offer_number']
-                print(f"Preserved offer number: {self.ui.offer_number}")
+                _log.debug("Preserved offer number: %s", self.ui.offer_number)
             else:
                 # For older offers without offer_number, try to extract from filename
                 filename = os.path.basename(self.offer_path)
@@ -153,9 +180,9 @@ class OfferEditorApp:
                 match = re.match(r'(\d+_OF_\d+_[A-Z]+)', filename.replace('.docx', ''))
                 if match:
                     self.ui.offer_number = match.group(1)
-                    print(f"Extracted offer number from filename: {self.ui.offer_number}")
+                    _log.debug("Extracted offer number from filename: %s", self.ui.offer_number)
                 else:
-                    print("Warning: Could not determine offer number")
+                    _log.warning("Could not determine offer number")
             
             # Update offer number display field if it exists
             if self.ui.offer_number and 'offer_number_display' in self.ui.entries:
@@ -229,7 +256,7 @@ class OfferEditorApp:
             if 'language' in context_data and 'language' in self.ui.entries:
                 language_value = context_data.get('language', 'PL')
                 self.ui.entries['language'].set(language_value)
-                print(f"Loaded language: {language_value}")
+                _log.debug("Loaded language: %s", language_value)
 
             # Load company (supplier self) header data from context instead of settings (editor mode requirement)
             company_map = {
@@ -264,15 +291,15 @@ class OfferEditorApp:
                             # Convert to the format expected by the application
                             formatted_date = parsed_date.strftime("%d %m %Y")
                             self.ui.date_var.set(formatted_date)
-                            print(f"Date converted from '{date_value}' to '{formatted_date}'")
+                            _log.debug("Date converted from '%s' to '%s'", date_value, formatted_date)
                         except ValueError:
                             # If parsing fails, try with numeric format
                             try:
                                 parsed_date = datetime.strptime(date_value, "%d %m %Y")
                                 self.ui.date_var.set(date_value)
-                                print(f"Date kept as '{date_value}'")
+                                _log.debug("Date kept as '%s'", date_value)
                             except ValueError:
-                                print(f"Could not parse date '{date_value}', keeping as is")
+                                _log.warning("Could not parse date '%s', keeping as is", date_value)
                                 self.ui.date_var.set(date_value)
                     else:
                         # If date is not string, convert to string
@@ -280,7 +307,7 @@ class OfferEditorApp:
                             formatted_date = date_value.strftime("%d %m %Y")
                             self.ui.date_var.set(formatted_date)
                 except Exception as e:
-                    print(f"Error setting date: {e}")
+                    _log.error("Error setting date: %s", e)
             # After date set, lock year for editor (prevent changing year)
             try:
                 parsed = datetime.strptime(self.ui.date_var.get(), "%d %m %Y")
@@ -293,8 +320,7 @@ class OfferEditorApp:
                 products = context_data.get('products', [])
                 # Clear existing products - remove all items from tree
                 if self.product_table.tree:
-                    for item in self.product_table.tree.get_children():
-                        self.product_table.tree.delete(item)
+                    self.product_table.clear()
                 
                 # Add products from context
                 for product in products:
@@ -314,9 +340,9 @@ class OfferEditorApp:
                         
                         try:
                             self.product_table.input_record(product_tuple)
-                            print(f"Added product: {product_tuple}")
+                            _log.debug("Added product: %s", product_tuple)
                         except Exception as e:
-                            print(f"Error adding product {product}: {e}")
+                            _log.error("Error adding product %s: %s", product, e)
                 
                 # Recalculate totals
                 self.calc_total()
@@ -327,7 +353,7 @@ class OfferEditorApp:
         except Exception as e:
             tkinter.messagebox.showerror("Błąd ładowania danych", 
                 f"Wystąpił błąd podczas ładowania danych z kontekstu:\\n{e}")
-            print(f"Error loading context data: {e}")  # For debugging
+            _log.error("Error loading context data: %s", e)
     
     def update_scroll_region(self):
         """Update scroll region if parent frame has scrolling capability"""
@@ -335,7 +361,7 @@ class OfferEditorApp:
             if hasattr(self.parent_frame, 'update_scroll_region'):
                 self.parent_frame.update_scroll_region()
         except Exception as e:
-            print(f"Could not update scroll region: {e}")
+            _log.warning("Could not update scroll region: %s", e)
     
     def insert_product(self, product_data):
         """Insert a new product into the table"""
@@ -345,6 +371,13 @@ class OfferEditorApp:
             return True
         return False
     
+    def import_products(self, rows):
+        """Insert validated rows from a CSV/clipboard import in one batch"""
+        inserted = self.product_table.bulk_insert(rows)
+        if inserted:
+            self.calc_total()
+        return inserted
+    
     def on_product_deleted(self):
         """Called when product is deleted via inline delete button"""
         # Automatically recalculate total after deletion
@@ -396,7 +429,7 @@ class OfferEditorApp:
         try:
             # Get form data
             context_data = self.ui.get_context_data()
-            print(f"Context data collected: {list(context_data.keys())}")  # Debug
+            _log.debug("Context data collected: %s", list(context_data.keys()))
             
             # Confirm update
             result = tkinter.messagebox.askyesno(
@@ -407,7 +440,7 @@ class OfferEditorApp:
             )
             
             if result:
-                print(f"Updating offer: {self.offer_path}")  # Debug
+                _log.debug("Updating offer: %s", self.offer_path)
                 
                 # Update document using specialized service
                 success = update_offer_document(context_data, self.offer_path)
@@ -421,7 +454,7 @@ class OfferEditorApp:
                     try:
                         open_document(self.offer_path)
                     except Exception as _e:
-                        print(f"Auto-open failed: {_e}")
+                        _log.warning("Auto-open failed: %s", _e)
                     self.nav_manager.show_frame('browse_offers')
                 else:
                     tkinter.messagebox.showerror("Błąd", 
@@ -430,4 +463,4 @@ class OfferEditorApp:
         except Exception as e:
             tkinter.messagebox.showerror("Błąd", 
                 f"Wystąpił błąd podczas aktualizacji oferty:\\n{e}")
-            print(f"Error in update_offer: {e}")  # Debug
+            _log.error("Error in update_offer: %s", e)
@@ -1,6 +1,7 @@
 """
 Core offer generator application logic
 """
+import logging
 from tkinter import *
 import tkinter.messagebox
 import sys
@@ -14,11 +15,14 @@ from src.ui.windows.client_search_window import ClientSearchWindow
 from src.ui.windows.supplier_search_window import SupplierSearchWindow
 from src.ui.windows.product_add_window import ProductAddWindow
 from src.ui.windows.product_edit_window import ProductEditWindow
+from src.ui.windows.product_import_window import ProductImportWindow
 from src.ui.components.product_table import ProductTable
 from src.services.offer_generator_service import generate_offer_document
 from src.utils.config import BACKGROUND_IMAGE
 from src.utils.os_utils import open_document
 
+_log = logging.getLogger(__name__)
+
 
 class OfferGeneratorApp:
     """Original offer generator app, now embedded within a frame"""
@@ -45,7 +49,7 @@ class OfferGeneratorApp:
                 if hasattr(self.ui, 'load_default_supplier'):
                     self.ui.load_default_supplier()
             except Exception as e:
-                print(f"Could not auto-load default supplier: {e}")
+                _log.warning("Could not auto-load default supplier: %s", e)
         
         # Initialize calculation variables
         self.count = 0
@@ -56,6 +60,23 @@ class OfferGeneratorApp:
             # Reset modification flag after template load
             self.user_modifications_made = False
     
+    def reset(self, template_context=None, source_frame=None):
+        """Reuse the existing widgets for another new offer instead of rebuilding the app:
+        restore a fresh form, then load `template_context` ("Wczytaj do kreatora") if given"""
+        self.template_context = template_context
+        self.source_frame = source_frame
+        self.ui.reset_form()
+        self.count = 0
+        if self.template_context:
+            self.load_template_context()
+        else:
+            try:
+                self.ui.load_default_supplier()
+            except Exception as e:
+                _log.warning("Could not auto-load default supplier: %s", e)
+        self.user_modifications_made = False
+        self.update_scroll_region()
+
     def setup_ui(self):
         """Setup all UI components within the parent frame"""
         # Set minimum height for content container to ensure scrolling works
@@ -68,7 +89,7 @@ class OfferGeneratorApp:
             label_BG.place(x=0, y=0)
             label_BG.image = bg  # Keep a reference
         except Exception as e:
-            print(f"Could not load background image: {e}")
+            _log.warning("Could not load background image: %s", e)
             # If background image fails, use a clean professional color
             self.window.configure(bg='#f5f5f5')
         
@@ -82,8 +103,11 @@ class OfferGeneratorApp:
         
         self.client_search = ClientSearchWindow(self.window, self.ui.fill_client_data)
         self.supplier_search = SupplierSearchWindow(self.window, self.ui.fill_supplier_data)
-        self.product_add = ProductAddWindow(self.window, self.insert_product)
-        self.product_edit = ProductEditWindow(self.window, self.update_product)
+        self.product_add = ProductAddWindow(self.window, self.insert_product,
+                                            client_nip_provider=self._current_client_nip)
+        self.product_edit = ProductEditWindow(self.window, self.update_product,
+                                              client_nip_provider=self._current_client_nip)
+        self.product_import = ProductImportWindow(self.window, self.import_products)
         
         # Create UI sections
         self.ui.create_upper_section()
@@ -94,6 +118,11 @@ class OfferGeneratorApp:
         # Create buttons
         self.create_buttons()
     
+    def _current_client_nip(self):
+        """NIP of the client entered in the form (for per-client product prices)"""
+        entry = self.ui.entries.get('client_nip')
+        return entry.get() if entry is not None else None
+
     def create_buttons(self):
         """Create all buttons"""
         # Product management buttons
@@ -118,6 +147,14 @@ class OfferGeneratorApp:
                width=3, height=1,
                command=self.move_product_down,
                cursor='hand2').place(x=320, y=740)
+
+        # Bulk import from CSV file or clipboard
+        Button(self.window, text="IMPORTUJ", 
+               font=("Arial", 12, "bold"),
+               bg='#17a2b8', fg='black',
+               padx=15, pady=8,
+               command=self.product_import.open_import_window,
+               cursor='hand2').place(x=400, y=740)
                 
         # Client search button
         search_client_button = Button(self.window, text="Szukaj klienta", 
@@ -143,6 +180,14 @@ class OfferGeneratorApp:
             return True
         return False
     
+    def import_products(self, rows):
+        """Insert validated rows from a CSV/clipboard import in one batch"""
+        inserted = self.product_table.bulk_insert(rows)
+        if inserted:
+            self.user_modifications_made = True
+            self.calc_total()
+        return inserted
+    
     def on_product_deleted(self):
         """Called when product is deleted via inline delete button"""
         # Mark user modifications
@@ -248,7 +293,7 @@ class OfferGeneratorApp:
             import tkinter.messagebox
             tkinter.messagebox.showerror("Błąd", 
                 f"Nie udało się załadować danych z szablonu:{e}")
-            print(f"Error loading template data: {e}")  # Debug
+            _log.error("Error loading template data: %s", e)
     
         # Update scroll region after all data is loaded
         self.update_scroll_region()
@@ -259,7 +304,7 @@ class OfferGeneratorApp:
             if hasattr(self.parent_frame, 'update_scroll_region'):
                 self.parent_frame.update_scroll_region()
         except Exception as e:
-            print(f"Could not update scroll region: {e}")
+            _log.warning("Could not update scroll region: %s", e)
     
     def has_unsaved_changes(self):
         """Check if user has made any changes that would be lost"""
@@ -312,7 +357,7 @@ class OfferGeneratorApp:
             return False
             
         except Exception as e:
-            print(f"Error checking for unsaved changes: {e}")
+            _log.error("Error checking for unsaved changes: %s", e)
             return False  # If error, assume no changes to avoid blocking user
     
     def clear_client_supplier_data(self):
@@ -364,16 +409,14 @@ class OfferGeneratorApp:
                     self.ui.selected_supplier_alias = None
             
         except Exception as e:
-            print(f"Error clearing client/supplier data: {e}")
+            _log.error("Error clearing client/supplier data: %s", e)
 
     def clear_all_data(self):
         """Clear all data from the form"""
         try:
             # Clear product table
             if hasattr(self, 'product_table') and self.product_table and self.product_table.tree:
-                for item in self.product_table.tree.get_children():
-                    self.product_table.tree.delete(item)
-                self.product_table.count = 0
+                self.product_table.clear()
             
             # Clear UI fields
             if hasattr(self, 'ui') and self.ui and hasattr(self.ui, 'entries'):
@@ -413,10 +456,10 @@ class OfferGeneratorApp:
             if hasattr(self.ui, 'load_default_supplier'):
                 self.ui.load_default_supplier()
             
-            print("All data cleared from offer creator")
+            _log.debug("All data cleared from offer creator")
             
         except Exception as e:
-            print(f"Error clearing data: {e}")
+            _log.error("Error clearing data: %s", e)
     
     def generate_offer(self):
         """Generate the offer document"""
@@ -440,7 +483,7 @@ class OfferGeneratorApp:
             try:
                 open_document(result.get('file_path'))
             except Exception as _e:
-                print(f"Auto-open failed: {_e}")
+                _log.warning("Auto-open failed: %s", _e)
             
             # Navigate back to appropriate frame based on source
             if self.nav_manager:
@@ -1,6 +1,7 @@
 """
 WZ Editor App - Main application logic for editing existing WZ documents
 """
+import logging
 from tkinter import *
 from tkinter import ttk
 import tkinter.messagebox
@@ -16,6 +17,7 @@ from src.ui.components.wz_ui_components import WzUIComponents
 from src.ui.components.wz_product_table import WzProductTable
 from src.ui.windows.wz_product_add_window import WzProductAddWindow
 from src.ui.windows.wz_product_edit_window import WzProductEditWindow
+from src.ui.windows.product_import_window import ProductImportWindow
 from src.ui.windows.client_search_window import ClientSearchWindow
 from src.ui.windows.supplier_search_window import SupplierSearchWindow
 from src.data.database_service import get_wz_context_from_db
@@ -25,6 +27,8 @@ from src.data.database_service import get_wz_context_from_db
 from src.utils.config import WZ_BACKGROUND_IMAGE
 from src.utils.os_utils import open_document
 
+_log = logging.getLogger(__name__)
+
 
 class WzEditorApp:
     """WZ editor app - modified version for editing existing WZ documents"""
@@ -45,6 +49,13 @@ class WzEditorApp:
         # Load existing WZ data
         self.load_wz_data()
     
+    def reset(self, wz_path):
+        """Reuse the existing widgets for editing another WZ instead of rebuilding the app"""
+        self.wz_path = wz_path
+        self.ui.reset_form()
+        self.count = 0
+        self.load_wz_data()
+
     def setup_ui(self):
         """Setup all UI components within the parent frame"""
         # Set minimum height for content container to ensure scrolling works
@@ -56,7 +67,7 @@ class WzEditorApp:
             try:
                 bg = PhotoImage(file=WZ_BACKGROUND_IMAGE)
             except Exception as te:
-                print(f"Primary PhotoImage load failed for WZ editor background: {te}. Trying Pillow fallback.")
+                _log.warning("Primary PhotoImage load failed for WZ editor background: %s. Trying Pillow fallback.", te)
                 try:
                     from PIL import Image, ImageTk
                     pil_img = Image.open(WZ_BACKGROUND_IMAGE)
@@ -67,7 +78,7 @@ class WzEditorApp:
             label_BG.place(x=0, y=0)
             label_BG.image = bg
         except Exception as e:
-            print(f"Could not load WZ editor background image: {e}")
+            _log.warning("Could not load WZ editor background image: %s", e)
             self.window.configure(bg='#f5f5f5')
         
         # Initialize UI components
@@ -76,6 +87,7 @@ class WzEditorApp:
         self.ui = WzUIComponents(self.window, self.product_table, show_generate_button=False)  # Hide generate button in editor
         self.product_add = WzProductAddWindow(self.window, self.insert_product)
         self.product_edit = WzProductEditWindow(self.window, self.update_product)
+        self.product_import = ProductImportWindow(self.window, self.import_products, with_prices=False)
         
         # Initialize search windows
         self.client_search = ClientSearchWindow(self.window, self.ui.fill_client_data)
@@ -104,6 +116,14 @@ class WzEditorApp:
         if hasattr(self.ui, 'move_down_btn'):
             self.ui.move_down_btn.config(command=self.move_product_down)
 
+        # Bulk import from CSV file or clipboard
+        Button(self.window, text="IMPORTUJ", 
+               font=("Arial", 12, "bold"),
+               bg='#17a2b8', fg='black',
+               padx=15, pady=8,
+               command=self.product_import.open_import_window,
+               cursor='hand2').place(x=400, y=730)
+
         # Create supplier search button only (client search removed per requirements)
         supplier_search_btn = Button(self.window, text="Szukaj dostawcy", font=("Arial", 10),
                                      command=self.supplier_search.open_supplier_search)
@@ -144,7 +164,7 @@ class WzEditorApp:
             # Load and preserve original WZ number
             if 'wz_number' in context_data:
                 self.ui.wz_number = context_data['wz_number']
-                print(f"Preserved WZ number: {self.ui.wz_number}")
+                _log.debug("Preserved WZ number: %s", self.ui.wz_number)
             else:
                 # For older WZ without wz_number, try to extract from filename
                 filename = os.path.basename(self.wz_path)
@@ -153,9 +173,9 @@ class WzEditorApp:
                 match = re.match(r'(\d+_WZ_\d+_[A-Z]+)', filename.replace('.docx', ''))
                 if match:
                     self.ui.wz_number = match.group(1)
-                    print(f"Extracted WZ number from filename: {self.ui.wz_number}")
+                    _log.debug("Extracted WZ number from filename: %s", self.ui.wz_number)
                 else:
-                    print("Warning: Could not determine WZ number")
+                    _log.warning("Could not determine WZ number")
             
             # Update WZ number display field if it exists
             if self.ui.wz_number and 'wz_number_display' in self.ui.entries:
@@ -226,7 +246,7 @@ class WzEditorApp:
             if 'language' in context_data and 'language' in self.ui.entries:
                 language_value = context_data.get('language', 'PL')
                 self.ui.entries['language'].set(language_value)
-                print(f"Loaded language: {language_value}")
+                _log.debug("Loaded language: %s", language_value)
 
             # Load company header fields from context (editor mode) overriding settings
             company_keys = ['address_1', 'address_2', 'nip', 'regon', 'email', 'phone_number', 'bank_name', 'account_number']
@@ -247,15 +267,15 @@ class WzEditorApp:
                             # Convert to the format expected by the application
                             formatted_date = parsed_date.strftime("%d %m %Y")
                             self.ui.date_var.set(formatted_date)
-                            print(f"Date converted from '{date_value}' to '{formatted_date}'")
+                            _log.debug("Date converted from '%s' to '%s'", date_value, formatted_date)
                         except ValueError:
                             # If parsing fails, try with numeric format
                             try:
                                 parsed_date = datetime.strptime(date_value, "%d %m %Y")
                                 self.ui.date_var.set(date_value)
-                                print(f"Date kept as '{date_value}'")
+                                _log.debug("Date kept as '%s'", date_value)
                             except ValueError:
-                                print(f"Could not parse date '{date_value}', keeping as is")
+                                _log.warning("Could not parse date '%s', keeping as is", date_value)
                                 self.ui.date_var.set(date_value)
                     else:
                         # If date is not string, convert to string
@@ -263,7 +283,7 @@ class WzEditorApp:
                             formatted_date = date_value.strftime("%d %m %Y")
                             self.ui.date_var.set(formatted_date)
                 except Exception as e:
-                    print(f"Error setting date: {e}")
+                    _log.error("Error setting date: %s", e)
             # Lock year after setting date
             try:
                 parsed = datetime.strptime(self.ui.date_var.get(), "%d %m %Y")
@@ -296,9 +316,9 @@ class WzEditorApp:
                         
                         try:
                             self.product_table.input_record(product_tuple)
-                            print(f"Added product: {product_tuple}")
+                            _log.debug("Added product: %s", product_tuple)
                         except Exception as e:
-                            print(f"Error adding product {product}: {e}")
+                            _log.error("Error adding product %s: %s", product, e)
                 
             # Update scroll region after all data is loaded
             self.update_scroll_region()
@@ -306,7 +326,7 @@ class WzEditorApp:
         except Exception as e:
             tkinter.messagebox.showerror("Błąd ładowania danych", 
                 f"Wystąpił błąd podczas ładowania danych z kontekstu:\n{e}")
-            print(f"Error loading context data: {e}")  # For debugging
+            _log.error("Error loading context data: %s", e)
     
     def update_scroll_region(self):
         """Update scroll region if parent frame has scrolling capability"""
@@ -314,7 +334,7 @@ class WzEditorApp:
             if hasattr(self.parent_frame, 'update_scroll_region'):
                 self.parent_frame.update_scroll_region()
         except Exception as e:
-            print(f"Could not update scroll region: {e}")
+            _log.warning("Could not update scroll region: %s", e)
     
     def insert_product(self, product_data):
         """Insert a new product into the table"""
@@ -335,6 +355,10 @@ class WzEditorApp:
             return True
         return False
     
+    def import_products(self, rows):
+        """Insert validated rows from a CSV/clipboard import in one batch"""
+        return self.product_table.bulk_insert(rows)
+    
     def on_product_deleted(self):
         """Called when product is deleted via inline delete button"""
         # No calculations needed for WZ (no pricing)
@@ -360,7 +384,7 @@ class WzEditorApp:
             else:
                 tkinter.messagebox.showwarning("Uwaga", "Nie można pobrać danych produktu!")
         except Exception as e:
-            print(f"Error in edit_product: {e}")
+            _log.error("Error in edit_product: %s", e)
             tkinter.messagebox.showerror("Błąd", f"Wystąpił błąd podczas edytowania produktu: {e}")
     
     def update_product(self, item_id, product_data):
@@ -373,7 +397,7 @@ class WzEditorApp:
         try:
             # Get form data
             context_data = self.ui.get_context_data()
-            print(f"Context data collected: {list(context_data.keys())}")  # Debug
+            _log.debug("Context data collected: %s", list(context_data.keys()))
             
             # Confirm update
             result = tkinter.messagebox.askyesno(
@@ -384,7 +408,7 @@ class WzEditorApp:
             )
             
             if result:
-                print(f"Updating WZ: {self.wz_path}")  # Debug
+                _log.debug("Updating WZ: %s", self.wz_path)
                 
                 # Update document using specialized service
                 success = update_wz_document(context_data, self.wz_path)
@@ -398,7 +422,7 @@ class WzEditorApp:
                     try:
                         open_document(self.wz_path)
                     except Exception as _e:
-                        print(f"Auto-open failed: {_e}")
+                        _log.warning("Auto-open failed: %s", _e)
                     self.nav_manager.show_frame('browse_wz')
                 else:
                     tkinter.messagebox.showerror("Błąd", 
@@ -407,4 +431,4 @@ class WzEditorApp:
         except Exception as e:
             tkinter.messagebox.showerror("Błąd", 
                 f"Wystąpił błąd podczas aktualizacji WZ:\n{e}")
-            print(f"Error in update_wz: {e}")  # Debug
+            _log.error("Error in update_wz: %s", e)
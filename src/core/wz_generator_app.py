@@ -1,6 +1,7 @@
 """
 Core WZ generator application logic
 """
+import logging
 from tkinter import *
 import tkinter.messagebox
 import sys
@@ -14,11 +15,16 @@ from src.ui.windows.client_search_window import ClientSearchWindow
 from src.ui.windows.supplier_search_window import SupplierSearchWindow
 from src.ui.windows.wz_product_add_window import WzProductAddWindow
 from src.ui.windows.wz_product_edit_window import WzProductEditWindow
+from src.ui.windows.product_import_window import ProductImportWindow
 from src.ui.components.wz_product_table import WzProductTable
 from src.services.wz_generator_service import generate_wz_document
-from src.data.database_service import get_next_wz_number, save_wz_to_db, normalize_wz_db_path
+from src.utils.document_context import WzContext
+from src.data.database_service import get_next_wz_number, save_wz_to_db, normalize_wz_db_path, OFFLINE_QUEUED_MESSAGE
 from src.utils.config import WZ_BACKGROUND_IMAGE
 from src.utils.os_utils import open_document
+from src.utils import tracing
+
+_log = logging.getLogger(__name__)
 
 
 class WzGeneratorApp:
@@ -53,6 +59,19 @@ class WzGeneratorApp:
             # Reset modification flag after template load
             self.user_modifications_made = False
     
+    def reset(self, template_context=None, source_frame=None):
+        """Reuse the existing widgets for another new WZ instead of rebuilding the app:
+        restore a fresh form, then load `template_context` ("Wczytaj do kreatora") if given"""
+        self.template_context = template_context
+        self.source_frame = source_frame
+        self.ui.reset_form()
+        self.count = 0
+        if self.template_context:
+            self.load_template_context()
+        else:
+            self.load_default_supplier()
+        self.user_modifications_made = False
+
     def setup_ui(self):
         """Setup all UI components within the parent frame"""
         # Set minimum height for content container to ensure scrolling works
@@ -64,7 +83,7 @@ class WzGeneratorApp:
             try:
                 bg = PhotoImage(file=WZ_BACKGROUND_IMAGE)
             except Exception as te:
-                print(f"Primary PhotoImage load failed for WZ background: {te}. Trying Pillow fallback.")
+                _log.warning("Primary PhotoImage load failed for WZ background: %s. Trying Pillow fallback.", te)
                 try:
                     from PIL import Image, ImageTk  # Pillow fallback
                     pil_img = Image.open(WZ_BACKGROUND_IMAGE)
@@ -75,7 +94,7 @@ class WzGeneratorApp:
             label_BG.place(x=0, y=0)
             label_BG.image = bg
         except Exception as e:
-            print(f"Could not load WZ background image: {e}")
+            _log.warning("Could not load WZ background image: %s", e)
             self.window.configure(bg='#f5f5f5')
         
         # Initialize UI components (WZ version)
@@ -90,6 +109,7 @@ class WzGeneratorApp:
         self.supplier_search = SupplierSearchWindow(self.window, self.ui.fill_supplier_data)
         self.product_add = WzProductAddWindow(self.window, self.insert_product)
         self.product_edit = WzProductEditWindow(self.window, self.update_product)
+        self.product_import = ProductImportWindow(self.window, self.import_products, with_prices=False)
 
 
         # Create UI sections
@@ -124,6 +144,14 @@ class WzGeneratorApp:
          command=self.move_product_down,
          cursor='hand2').place(x=320, y=740)
 
+     # Bulk import from CSV file or clipboard
+     Button(self.window, text="IMPORTUJ", 
+            font=("Arial", 12, "bold"),
+            bg='#17a2b8', fg='black',
+            padx=15, pady=8,
+            command=self.product_import.open_import_window,
+            cursor='hand2').place(x=400, y=740)
+
      # Client search button
      search_client_button = Button(self.window, text="Szukaj klienta",
                        font=("Arial", 10),
@@ -220,12 +248,19 @@ class WzGeneratorApp:
                 # Store alias substitute (company name) for potential usage
                 self.ui.selected_supplier_alias = company_name
         except Exception as e:
-            print(f"Could not load default supplier for WZ: {e}")
+            _log.warning("Could not load default supplier for WZ: %s", e)
     
     def insert_product(self, product_data):
         """Insert product data into table"""
         self.product_table.insert_product(product_data)
     
+    def import_products(self, rows):
+        """Insert validated rows from a CSV/clipboard import in one batch"""
+        inserted = self.product_table.bulk_insert(rows)
+        if inserted:
+            self.user_modifications_made = True
+        return inserted
+    
     def update_product(self, item_id, product_data):
         """Update product in table"""
         self.product_table.update_product(item_id, product_data)
@@ -270,31 +305,20 @@ class WzGeneratorApp:
             if year_val is None:
                 year_val = str(_dt.now().year)
 
-            # Next sequential number per year and full WZ number
-            wz_order_number = get_next_wz_number(int(year_val))
-            client_alias = self.ui.selected_client_alias or 'KLIENT'
-            wz_number = f"WZ_{wz_order_number}_{year_val}_{client_alias}"
-            context_data['wz_number'] = wz_number
-
-            # Generate document to disk
-            output_path = generate_wz_document(context_data)
+            output_path, saved, save_message = self._create_wz(context_data, year_val)
             if not output_path:
                 tkinter.messagebox.showerror("Błąd", "Nie udało się wygenerować pliku WZ.")
                 return
 
-            # Store relative path in DB
-            rel_wz = normalize_wz_db_path(output_path)
-            save_wz_to_db(wz_order_number, rel_wz, context_data)
-
-            tkinter.messagebox.showinfo(
-                "Sukces",
-                f"WZ zostało wygenerowane i zapisane do: {output_path}"
-            )
+            info = f"WZ zostało wygenerowane i zapisane do: {output_path}"
+            if not saved or save_message == OFFLINE_QUEUED_MESSAGE:
+                info += f"\n\n{save_message}"
+            tkinter.messagebox.showinfo("Sukces", info)
             # Auto-open in Word/default app
             try:
                 open_document(output_path)
             except Exception as _e:
-                print(f"Auto-open failed: {_e}")
+                _log.warning("Auto-open failed: %s", _e)
             if self.source_frame == 'browse_wz':
                 self.nav_manager.show_frame('browse_wz')
             else:
@@ -302,8 +326,33 @@ class WzGeneratorApp:
 
         except Exception as e:
             tkinter.messagebox.showerror("Błąd", f"Wystąpił błąd podczas generowania WZ:\n{e}")
-            print(f"Error generating WZ: {e}")
+            _log.error("Error generating WZ: %s", e)
     
+    @tracing.traced('wz.generate')
+    def _create_wz(self, context_data, year_val):
+        """Number, render and store a new WZ; returns (output path or None, saved, save message)"""
+        # Next sequential number per year and full WZ number
+        with tracing.span('number'):
+            wz_order_number = get_next_wz_number(int(year_val))
+        if wz_order_number is None:
+            # The database is unreachable and the reason was already shown
+            return None, False, None
+        client_alias = self.ui.selected_client_alias or 'KLIENT'
+        wz_number = f"WZ_{wz_order_number}_{year_val}_{client_alias}"
+        context_data['wz_number'] = wz_number
+
+        # Generate document to disk
+        context = WzContext.from_dict(context_data)
+        output_path = generate_wz_document(context)
+        if not output_path:
+            return None, False, None
+
+        # Store relative path in DB
+        rel_wz = normalize_wz_db_path(output_path)
+        with tracing.span('db'):
+            saved, save_message = save_wz_to_db(wz_order_number, rel_wz, context.to_storage())
+        return output_path, saved, save_message
+
     def validate_form(self):
         """Validate form data before generating WZ"""
         # Check if client is selected
@@ -0,0 +1,375 @@
+"""
+Year archive (cold storage) for closed years of offers and WZ documents.
+
+Archiving a year moves:
+  - the documents of <Offers root>/<year> and <WZ root>/<year> into
+    <root>/Archiwum/<year>.zip,
+  - the Offers and Wuzetkas rows of that year into a separate SQLite file
+    <database folder>/Archiwum/<database name>_<year>.db,
+so the active folders and the main database only hold the recent years.
+
+Archived documents stay browsable: the browse frames list them straight from
+the zip's central directory, and a document is extracted to a local cache
+(<data dir>/archive_cache/<kind>/<year>/<file>) only when it is opened,
+previewed or exported. Stored contexts of archived documents are read from the
+per-year database.
+"""
+import datetime
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import zipfile
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.config import get_data_dir, get_offers_folder, get_wz_folder
+from src.data import summary_service
+
+_log = logging.getLogger(__name__)
+
+ARCHIVE_DIRNAME = 'Archiwum'
+CACHE_DIRNAME = 'archive_cache'
+KIND_OFFER = 'offer'
+KIND_WZ = 'wz'
+
+# kind -> (table, path column, context column, year column, order column)
+_TABLES = {
+    KIND_OFFER: ('Offers', 'OfferFilePath', 'OfferContext', 'OfferYearNumber', 'OfferOrderNumber'),
+    KIND_WZ: ('Wuzetkas', 'WzFilePath', 'WzContext', 'WzYearNumber', 'WzOrderNumber'),
+}
+
+_lock = threading.Lock()
+_listing_cache = {}  # zip path -> ((mtime_ns, size), [document dicts])
+
+
+# ------------------------------
+# Locations
+# ------------------------------
+
+def _root(kind):
+    return get_offers_folder() if kind == KIND_OFFER else get_wz_folder()
+
+
+def archive_zip_path(kind, year) -> str:
+    return os.path.join(_root(kind), ARCHIVE_DIRNAME, f"{year}.zip")
+
+
+def archive_db_path(db_path, year) -> str:
+    name = os.path.splitext(os.path.basename(db_path))[0]
+    return os.path.join(os.path.dirname(db_path), ARCHIVE_DIRNAME, f"{name}_{year}.db")
+
+
+def _cache_path(kind, year, filename) -> str:
+    return os.path.join(get_data_dir(), CACHE_DIRNAME, kind, str(year), filename)
+
+
+def parse_cached_path(path):
+    """(kind, year, filename) when `path` points into the archive cache, else None."""
+    if not path:
+        return None
+    cache_root = os.path.join(get_data_dir(), CACHE_DIRNAME)
+    try:
+        rel = os.path.relpath(os.path.abspath(path), cache_root)
+    except ValueError:
+        return None
+    parts = rel.split(os.sep)
+    if len(parts) != 3 or parts[0] not in _TABLES or not parts[1].isdigit():
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+def is_archived_path(path) -> bool:
+    return parse_cached_path(path) is not None
+
+
+# ------------------------------
+# Reading archived years
+# ------------------------------
+
+def list_archived_years(kind):
+    """Years with an archive zip for `kind`, newest first (as strings)."""
+    folder = os.path.join(_root(kind) or '', ARCHIVE_DIRNAME)
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return []
+    years = [n[:-4] for n in names if n.lower().endswith('.zip') and n[:-4].isdigit() and len(n) == 8]
+    return sorted(years, reverse=True)
+
+
+def list_archived_documents(kind, year):
+    """Documents in the year's archive as dicts (filename, filepath, mtime), read from the
+    zip's central directory only. `filepath` is the local cache path of the document."""
+    zip_path = archive_zip_path(kind, year)
+    try:
+        st = os.stat(zip_path)
+    except OSError:
+        return []
+    key = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        cached = _listing_cache.get(zip_path)
+        if cached and cached[0] == key:
+            return list(cached[1])
+    documents = []
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith('.docx'):
+                    continue
+                filename = os.path.basename(info.filename)
+                mtime = datetime.datetime(*info.date_time).timestamp()
+                documents.append({'filename': filename, 'filepath': _cache_path(kind, year, filename),
+                                  'mtime': mtime, 'year': str(year)})
+    except (OSError, zipfile.BadZipFile) as e:
+        _log.warning("Cannot read archive %s: %s", zip_path, e)
+        return []
+    with _lock:
+        _listing_cache[zip_path] = (key, documents)
+    return list(documents)
+
+
+def ensure_local(path):
+    """Extract an archived document to the local cache on first use. Other paths are returned as is."""
+    parsed = parse_cached_path(path)
+    if parsed is None or os.path.isfile(path):
+        return path
+    kind, year, filename = parsed
+    with zipfile.ZipFile(archive_zip_path(kind, year)) as archive:
+        member = next((n for n in archive.namelist() if os.path.basename(n) == filename), None)
+        if member is None:
+            raise FileNotFoundError(f"{filename} nie występuje w archiwum {year}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.part'
+        with archive.open(member) as src, open(tmp, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, path)
+    return path
+
+
+def _connect_archive_db(db_path, year):
+    path = archive_db_path(db_path, year)
+    if not os.path.isfile(path):
+        return None
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def get_archived_context(db_path, path):
+    """Stored context JSON (string) of an archived document, or None."""
+    parsed = parse_cached_path(path)
+    if parsed is None:
+        return None
+    kind, year, filename = parsed
+    table, path_col, ctx_col, _year_col, _order_col = _TABLES[kind]
+    try:
+        conn = _connect_archive_db(db_path, year)
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(f"SELECT {ctx_col} FROM {table} WHERE {path_col} = ?",
+                               (f"{year}/{filename}",)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+    except sqlite3.Error:
+        return None
+
+
+def max_archived_order_number(db_path, kind, year) -> int:
+    """Highest order number stored in the year's archive (0 when the year is not archived)."""
+    table, _path_col, _ctx_col, year_col, order_col = _TABLES[kind]
+    try:
+        conn = _connect_archive_db(db_path, year)
+        if conn is None:
+            return 0
+        try:
+            row = conn.execute(f"SELECT MAX({order_col}) FROM {table} WHERE {year_col} = ?", (year,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] or 0
+    except sqlite3.Error:
+        return 0
+
+
+# ------------------------------
+# Archiving
+# ------------------------------
+
+def get_archivable_years(db_path):
+    """{year: (offers, wz)} for closed years that still have rows in the main database."""
+    current_year = datetime.datetime.now().year
+    years = {}
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        for index, kind in enumerate((KIND_OFFER, KIND_WZ)):
+            table, path_col = _TABLES[kind][:2]
+            try:
+                rows = conn.execute(f"SELECT substr({path_col}, 1, 4), COUNT(*) FROM {table} "
+                                    f"WHERE {path_col} GLOB '[12][0-9][0-9][0-9]/*' GROUP BY 1").fetchall()
+            except sqlite3.Error:
+                continue
+            for year, count in rows:
+                if int(year) < current_year:
+                    counts = years.setdefault(int(year), [0, 0])
+                    counts[index] = count
+    finally:
+        conn.close()
+    return {year: tuple(counts) for year, counts in sorted(years.items())}
+
+
+def _build_zip(kind, year, work_dir):
+    """Zip the year folder into work_dir (keeping documents already archived).
+    Returns (local zip path or None, [archived source files])."""
+    folder = os.path.join(_root(kind), str(year))
+    files = []
+    if os.path.isdir(folder):
+        files = sorted(os.path.join(folder, n) for n in os.listdir(folder)
+                       if os.path.isfile(os.path.join(folder, n)) and not n.startswith('~$'))
+    if not files:
+        return None, []
+    local_zip = os.path.join(work_dir, f"{kind}_{year}.zip")
+    existing = archive_zip_path(kind, year)
+    if os.path.isfile(existing):
+        shutil.copyfile(existing, local_zip)
+    with zipfile.ZipFile(local_zip, 'a', zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        present = set(archive.namelist())
+        archived = []
+        for path in files:
+            name = os.path.basename(path)
+            if name in present:
+                _log.warning("%s is already archived, leaving the file in place", path)
+                continue
+            archive.write(path, name)
+            archived.append(path)
+    return local_zip, archived
+
+
+def _move_rows(db_path, year):
+    """Move the year's Offers and Wuzetkas rows into the per-year database in one transaction.
+    Returns {kind: moved row count}."""
+    target = archive_db_path(db_path, year)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        schema = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'").fetchall())
+        archive_conn = sqlite3.connect(target)
+        try:
+            existing = {r[0] for r in archive_conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for table, _path_col, _c, _y, _o in _TABLES.values():
+                if table in schema and table not in existing:
+                    archive_conn.execute(schema[table])
+            archive_conn.commit()
+        finally:
+            archive_conn.close()
+
+        moved = {}
+        conn.execute("ATTACH DATABASE ? AS archive", (target,))
+        try:
+            with conn:
+                for kind, (table, path_col, _c, _y, _o) in _TABLES.items():
+                    if table not in schema:
+                        continue
+                    pattern = f"{year}/%"
+                    summary_service.remove_documents(conn.cursor(), kind, f"{path_col} LIKE ?", (pattern,))
+                    conn.execute(f"INSERT OR REPLACE INTO archive.{table} "
+                                 f"SELECT * FROM main.{table} WHERE {path_col} LIKE ?", (pattern,))
+                    moved[kind] = conn.execute(f"DELETE FROM main.{table} WHERE {path_col} LIKE ?",
+                                               (pattern,)).rowcount
+        finally:
+            conn.execute("DETACH DATABASE archive")
+        try:
+            conn.execute("VACUUM")
+        except sqlite3.Error as e:  # needs exclusive access: another workstation is reading
+            _log.warning("VACUUM after archiving %s skipped: %s", year, e)
+        return moved
+    finally:
+        conn.close()
+
+
+def _publish(local_path, target_path):
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    partial = target_path + '.part'
+    shutil.copyfile(local_path, partial)
+    os.replace(partial, target_path)
+
+
+def archive_year(year, progress_cb=None):
+    """Move a closed year into the archive. Returns (success, message)."""
+    from src.data import database_service
+
+    def report(message):
+        if progress_cb:
+            progress_cb(message)
+
+    year = int(year)
+    if year >= datetime.datetime.now().year:
+        return False, "Można archiwizować tylko zakończone lata."
+    db_path = database_service.get_database_path()
+    if not database_service.check_database_file(db_path):
+        return False, "Baza danych jest niedostępna."
+
+    work_dir = tempfile.mkdtemp(prefix='archive_')
+    try:
+        zips = {}
+        for kind in (KIND_OFFER, KIND_WZ):
+            report(f"Pakowanie dokumentów ({'oferty' if kind == KIND_OFFER else 'WZ'})...")
+            zips[kind] = _build_zip(kind, year, work_dir)
+
+        # Publish the archives before the rows leave the main database, so the rows never
+        # point at an archive that does not exist; undone if moving the rows fails
+        published = []
+        try:
+            for kind, (local_zip, _files) in zips.items():
+                if not local_zip:
+                    continue
+                target = archive_zip_path(kind, year)
+                previous = None
+                if os.path.isfile(target):
+                    previous = os.path.join(work_dir, f"{kind}_{year}.previous.zip")
+                    shutil.copyfile(target, previous)
+                report(f"Zapisywanie archiwum {target}...")
+                _publish(local_zip, target)
+                published.append((target, previous))
+
+            report("Przenoszenie wpisów bazy danych...")
+            moved = _move_rows(db_path, year)
+        except (OSError, sqlite3.Error):
+            for target, previous in published:
+                try:
+                    if previous:
+                        _publish(previous, target)
+                    else:
+                        os.remove(target)
+                except OSError as e:
+                    _log.warning("Could not roll back archive %s: %s", target, e)
+            raise
+        database_service._mirror_write()
+
+        for kind, (local_zip, files) in zips.items():
+            if not local_zip:
+                continue
+            for path in files:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    _log.warning("Could not remove archived file %s: %s", path, e)
+            try:
+                os.rmdir(os.path.join(_root(kind), str(year)))
+            except OSError:
+                pass  # not empty (files left in place)
+        with _lock:
+            _listing_cache.clear()
+        offers_files = len(zips[KIND_OFFER][1])
+        wz_files = len(zips[KIND_WZ][1])
+        return True, (f"Zarchiwizowano rok {year}.\n"
+                      f"Oferty: {offers_files} plików, {moved.get(KIND_OFFER, 0)} wpisów w bazie\n"
+                      f"WZ: {wz_files} plików, {moved.get(KIND_WZ, 0)} wpisów w bazie")
+    except (OSError, sqlite3.Error, zipfile.BadZipFile) as e:
+        _log.warning("Archiving year %s failed: %s", year, e)
+        return False, f"Archiwizacja roku {year} nie powiodła się: {e}"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
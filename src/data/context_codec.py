@@ -0,0 +1,266 @@
+"""
+Storage codec for the OfferContext/WzContext columns.
+
+Contexts used to be stored as plain JSON text. Every offer repeats the same
+company block (address, NIP, REGON, bank account, e-mail), the product table
+headers and the default offer terms, and every document repeats the same key
+names. New contexts are stored as a BLOB:
+
+    b'OGC' + version byte + zlib stream compressed with a preset dictionary
+
+The preset dictionary is a frozen sample context with the key names, table
+headers and structure of a document (neutral placeholders, no company data),
+so the repeated parts shrink to a few back-references per row. Each blob is self
+contained (no lookup table), which keeps archive databases, replicas and
+backups readable on their own.
+
+Older app versions read JSON text only, so writes go through encode_for(),
+which keeps storing JSON text until the database's schema version (PRAGMA
+user_version) reaches BLOB_SCHEMA_VERSION, i.e. until an administrator marked
+it as used only by app versions that read BLOBs. The compact_database() action
+sets that version and converts the rows still holding JSON text; nothing else
+rewrites them.
+
+Never edit an existing dictionary: old blobs need it to decode. Add a new
+version instead and make it the one used by encode().
+"""
+import json
+import logging
+import os
+import sqlite3
+import sys
+import zlib
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+_log = logging.getLogger(__name__)
+
+MAGIC = b'OGC'
+VERSION = 1
+COMPACT_BATCH = 200
+# PRAGMA user_version from which every app version using the database reads codec BLOBs
+BLOB_SCHEMA_VERSION = 1
+
+# Frozen sample context (version 1): the key names and the shape of a document
+# context with neutral placeholder values, no company or client data. Least
+# common parts first: zlib reaches the end of the dictionary with the shortest
+# distances.
+_SAMPLE_V1 = {
+    'wz_number': 'WZ_1_2025',
+    'supplier_alias': '',
+    'offer_number': 'K_1_2025_',
+    'termin_realizacji': " dni roboczych",
+    'termin_platnosci': " dni od wystawienia faktury",
+    'warunki_dostawy': "",
+    'waznosc_oferty': " dni",
+    'gwarancja': "",
+    'cena': "",
+    'uwagi': "",
+    'products_total_netto': 0.0,
+    'total_netto': '0,00',
+    'total_vat': '0,00',
+    'total_brutto': '0,00',
+    'product_headers': ['Lp', 'Nazwa', 'j.m.', 'ilość', 'Cena jednostkowa netto [PLN]', 'Wartość Netto [PLN]'],
+    'products': [['1', '', 'szt.', '1', '0,00', '0,00'], ['2', '', 'kpl.', '1', '0,00', '0,00']],
+    'client_name': '',
+    'client_address_1': 'ul. ',
+    'client_address_2': '00-000 ',
+    'client_nip': '',
+    'client_alias': '',
+    'supplier_name': '',
+    'supplier_address_1': 'ul. ',
+    'supplier_address_2': '00-000 ',
+    'supplier_nip': '',
+    'date': '2025-01-01T00:00:00',
+    'language': 'PL',
+    'town': '',
+    'address_1': 'ul. ',
+    'address_2': '00-000 ',
+    'nip': '',
+    'regon': '',
+    'email': '',
+    'phone_number': '+48 ',
+    'bank_name': '',
+    'account_number': '',
+}
+
+_DICTIONARIES = {
+    1: json.dumps(_SAMPLE_V1, ensure_ascii=False).encode('utf-8'),
+}
+
+# Database files known to be at BLOB_SCHEMA_VERSION (see blobs_allowed)
+_blob_databases = set()
+
+_TABLES = (
+    ('Offers', 'OfferContext'),
+    ('Wuzetkas', 'WzContext'),
+)
+
+
+def _to_json(context) -> str:
+    if isinstance(context, str):
+        return context
+    return json.dumps(context, default=str, ensure_ascii=False)
+
+
+def encode(context):
+    """Stored form of a context (dict, or its JSON text). None for an empty context."""
+    if context is None or context == '':
+        return None
+    if is_encoded(context):
+        return bytes(context)
+    compressor = zlib.compressobj(9, zdict=_DICTIONARIES[VERSION])
+    data = compressor.compress(_to_json(context).encode('utf-8')) + compressor.flush()
+    return MAGIC + bytes([VERSION]) + data
+
+
+def blobs_allowed(conn) -> bool:
+    """True when the database behind `conn` (a connection or cursor) is at
+    BLOB_SCHEMA_VERSION. The schema version is never lowered, so a positive answer
+    is cached per database file; until then it is read on each write."""
+    file = conn.execute("PRAGMA database_list").fetchone()[2]
+    if file and file in _blob_databases:
+        return True
+    if get_schema_version(conn) < BLOB_SCHEMA_VERSION:
+        return False
+    if file:
+        _blob_databases.add(file)
+    return True
+
+
+def encode_for(conn, context):
+    """Stored form of a context for the database behind `conn`: a codec BLOB when the
+    database allows them (blobs_allowed), JSON text otherwise. None for an empty context."""
+    if context is None or context == '':
+        return None
+    if blobs_allowed(conn):
+        return encode(context)
+    if is_encoded(context):
+        context = decode(context)
+    return _to_json(context)
+
+
+def is_encoded(raw) -> bool:
+    return isinstance(raw, (bytes, bytearray, memoryview)) and bytes(raw[:3]) == MAGIC
+
+
+def decode(raw):
+    """Context dict of a stored value: a codec BLOB, legacy JSON text or an already decoded
+    dict. None for an empty value; ValueError when the value cannot be read."""
+    if raw is None or isinstance(raw, dict):
+        return raw
+    if isinstance(raw, str):
+        return json.loads(raw) if raw else None
+    raw = bytes(raw)
+    if not raw:
+        return None
+    if raw[:3] != MAGIC:
+        return json.loads(raw.decode('utf-8'))
+    dictionary = _DICTIONARIES.get(raw[3]) if len(raw) > 3 else None
+    if dictionary is None:
+        raise ValueError(f"Nieznana wersja zapisu kontekstu: {raw[3] if len(raw) > 3 else '?'}")
+    try:
+        decompressor = zlib.decompressobj(zdict=dictionary)
+        text = decompressor.decompress(raw[4:]) + decompressor.flush()
+    except zlib.error as e:
+        raise ValueError(f"Uszkodzony zapis kontekstu: {e}") from e
+    return json.loads(text.decode('utf-8'))
+
+
+def decode_or_none(raw):
+    """decode() for bulk readers: unreadable values become None instead of raising."""
+    try:
+        return decode(raw)
+    except ValueError:
+        return None
+
+
+# ------------------------------
+# Converting legacy rows
+# ------------------------------
+
+def compact_stored_contexts(conn, batch=COMPACT_BATCH):
+    """Re-encode the contexts still stored as JSON text, one short transaction per batch
+    so other clients are not locked out. Returns (converted rows, bytes saved)."""
+    converted = saved = 0
+    for table, column in _TABLES:
+        last_rowid = 0
+        while True:
+            try:
+                rows = conn.execute(
+                    f"SELECT rowid, {column} FROM {table} WHERE rowid > ? AND typeof({column}) = 'text' "
+                    f"ORDER BY rowid LIMIT ?", (last_rowid, batch)).fetchall()
+            except sqlite3.Error as e:
+                _log.warning("Context compaction skipped %s: %s", table, e)
+                break
+            if not rows:
+                break
+            last_rowid = rows[-1][0]
+            updates = []
+            for rowid, text in rows:
+                try:
+                    json.loads(text)
+                except ValueError:
+                    continue  # leave unreadable rows untouched for the consistency check
+                blob = encode(text)
+                updates.append((blob, rowid))
+                saved += len(text.encode('utf-8')) - len(blob)
+            with conn:
+                conn.executemany(f"UPDATE {table} SET {column} = ? WHERE rowid = ?", updates)
+            converted += len(updates)
+    return converted, saved
+
+
+def get_schema_version(conn) -> int:
+    """Schema version stored in the database (PRAGMA user_version)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def needs_schema_upgrade(path) -> bool:
+    """True when the database is not yet marked as requiring an app version that reads
+    codec BLOBs, i.e. compact_database() must be confirmed with upgrade=True."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=10)
+    try:
+        return get_schema_version(conn) < BLOB_SCHEMA_VERSION
+    finally:
+        conn.close()
+
+
+def compact_database(path, upgrade=False):
+    """Administrator action: convert the legacy JSON contexts of the database at `path` and
+    VACUUM it so it actually shrinks (the converted rows leave half-empty pages behind).
+
+    The conversion cannot be undone and app versions older than the codec cannot read
+    the result, so it only runs on a database whose schema version is at least
+    BLOB_SCHEMA_VERSION; upgrade=True raises it first (after the administrator confirmed
+    that every workstation runs a current version). Returns (success, Polish message).
+    """
+    from src.data import database_service as dbs
+
+    if not dbs.check_database_file(path):
+        return False, "Baza danych jest niedostępna."
+    try:
+        conn = sqlite3.connect(path, timeout=10)
+        try:
+            if get_schema_version(conn) < BLOB_SCHEMA_VERSION:
+                if not upgrade:
+                    return False, ("Baza danych nie jest oznaczona jako wymagająca aktualnej wersji aplikacji. "
+                                   "Kompaktowanie wymaga potwierdzenia.")
+                conn.execute(f"PRAGMA user_version = {BLOB_SCHEMA_VERSION}")
+            converted, saved = compact_stored_contexts(conn)
+            _log.info("Compacted %d stored contexts (%d bytes less)", converted, saved)
+            try:
+                conn.execute("VACUUM")
+                vacuum_note = ""
+            except sqlite3.Error as e:  # e.g. another workstation holds a lock
+                _log.warning("VACUUM after context compaction failed: %s", e)
+                vacuum_note = ("\nPlik bazy nie został zmniejszony (baza jest używana na innym stanowisku); "
+                               "ponów kompaktowanie, gdy pozostałe stanowiska będą zamknięte.")
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return False, f"Nie udało się skompaktować bazy danych: {e}"
+    dbs._mirror_write()
+    return True, (f"Skompaktowano zapisane konteksty: {converted} "
+                  f"({saved / 1024:.0f} KB mniej).{vacuum_note}")
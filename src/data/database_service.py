@@ -1,6 +1,7 @@
 """
 Database service for managing data operations
 """
+import logging
 import sqlite3
 import json
 import tkinter.messagebox
@@ -13,8 +14,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.utils.config import DEFAULT_APP_SETTINGS, get_offers_folder, get_wz_folder
 from src.utils.settings import SettingsManager
+from src.data import replica_service, write_journal, archive_service, product_catalog_service, summary_service
+from src.data import quick_open_service
+from src.data import context_codec
+from src.utils.document_context import OfferContext, WzContext
+from src.utils import metrics
 import re
 
+_log = logging.getLogger(__name__)
+
 def _should_show_db_error_popup() -> bool:
     """Return True if DB error popups should be shown now.
     We suppress them during early startup before the main menu is ready.
@@ -35,39 +43,33 @@ def get_database_path():
         settings_manager = SettingsManager()
         db_path = settings_manager.get_database_path()
 
-        print(f"DEBUG: Raw database path from settings: {db_path}")
-
         # If path is relative, make it absolute from the executable location
         if db_path and not os.path.isabs(db_path):
             if getattr(sys, 'frozen', False):
                 # Running as PyInstaller executable - use executable directory
                 base_dir = os.path.dirname(sys.executable)
-                print(f"DEBUG: PyInstaller mode - base directory: {base_dir}")
             else:
                 # Running in development - use project root
                 base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-                print(f"DEBUG: Development mode - base directory: {base_dir}")
             db_path = os.path.abspath(os.path.join(base_dir, db_path))
 
         default_path = DEFAULT_APP_SETTINGS.get('database_path', '')
         final_path = db_path if db_path else default_path
-        print(f"DEBUG: Final database path: {final_path}")
-        print(f"DEBUG: Database file exists: {os.path.exists(final_path)}")
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("Database path: %s (exists: %s)", final_path, os.path.exists(final_path))
 
         return final_path
     except Exception as e:
-        print(f"Warning: Could not get database path from settings: {e}")
+        _log.warning("Could not get database path from settings: %s", e)
         default_path = DEFAULT_APP_SETTINGS.get('database_path', '')
-        print(f"DEBUG: Falling back to DEFAULT_APP_SETTINGS['database_path']: {default_path}")
+        _log.debug("Falling back to DEFAULT_APP_SETTINGS['database_path']: %s", default_path)
         return default_path
 
 
-def is_database_available() -> bool:
-    """Check if the configured database exists and is readable without creating it.
-    Paths table is no longer required; we accept DBs that have any core tables.
-    """
+def check_database_file(path) -> bool:
+    """Return True if `path` is an existing SQLite file with any of the app's tables.
+    Opens it read-only, so a wrong path never creates an empty database."""
     try:
-        path = get_database_path()
         if not path or not os.path.exists(path):
             return False
         # Try read-only connection; will fail if file missing or not a valid SQLite DB
@@ -83,6 +85,320 @@ def is_database_available() -> bool:
         return False
 
 
+def is_database_available() -> bool:
+    """Check if the configured database exists and is readable without creating it.
+    Paths table is no longer required; we accept DBs that have any core tables.
+    """
+    return check_database_file(get_database_path())
+
+
+# ------------------------------
+# Switching the database at runtime
+# ------------------------------
+
+_database_listeners = []
+
+
+def add_database_listener(callback):
+    """Register callback(new_path) called after the application switched to another database."""
+    if callback not in _database_listeners:
+        _database_listeners.append(callback)
+
+
+def remove_database_listener(callback):
+    if callback in _database_listeners:
+        _database_listeners.remove(callback)
+
+
+def rebind_database():
+    """Switch to the database path currently stored in settings without restarting.
+
+    Drops the long-lived connections and the local replica bound to the previous
+    file, then lets listeners (open frames) reload their data from the new one.
+    Returns (success, message).
+    """
+    new_path = get_database_path()
+    if not check_database_file(new_path):
+        return False, f"Wybrany plik nie jest poprawną bazą danych aplikacji:\n{new_path}"
+    replica_service.close_replica()
+    replica_service.warm_up_async(new_path)
+    # Entries journaled for this database (if any) can go out right away
+    write_journal.request_sync()
+    for callback in list(_database_listeners):
+        try:
+            callback(new_path)
+        except Exception as e:
+            _log.warning("Database change listener failed: %s", e)
+    return True, f"Przełączono na bazę danych:\n{new_path}"
+
+
+def _connect_for_read():
+    """Open a connection for read-only queries.
+    In read-replica mode this is the local copy of the database; otherwise the shared DB.
+    Returns None when no database is reachable (callers treat it as unavailable).
+    """
+    if replica_service.is_replica_enabled():
+        conn = replica_service.connect_replica(get_database_path())
+        if conn is not None:
+            return conn
+    # Do not create DB file implicitly when path is invalid
+    if not is_database_available():
+        return None
+    return sqlite3.connect(get_database_path())
+
+
+def run_migration(step, label) -> bool:
+    """Run a one-time schema step(cursor) -> bool (True when it changed the database) on the
+    shared database, in its own exclusive transaction and never inside a document save.
+    Workstations starting together queue on the lock, so only the first one backfills.
+    Returns the step's result; False when the database is unavailable or the step failed."""
+    path = get_database_path()
+    if not check_database_file(path):
+        return False
+    try:
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                changed = bool(step(conn.cursor()))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        _log.warning("Creating %s failed: %s", label, e)
+        return False
+    if changed:
+        _log.info("Created %s in %s", label, path)
+        _mirror_write()
+    return changed
+
+
+def _replica_snapshot():
+    """Token for _mirror_write(), taken after apply() ran and before conn.commit(),
+    i.e. while this write holds the shared database's write lock."""
+    return replica_service.write_snapshot(get_database_path())
+
+
+def _mirror_write(apply=None, snapshot=None):
+    """Propagate a committed write to the local replica (no-op when replica mode is off).
+    apply(cursor) repeats the write there; without it the replica is refreshed in the background."""
+    replica_service.mirror_after_write(get_database_path(), apply, snapshot)
+
+
+# ------------------------------
+# Offline writes (journal replayed when the shared DB is back)
+# ------------------------------
+
+OFFLINE_QUEUED_MESSAGE = (
+    "Brak połączenia z bazą danych. Zmiana została zapisana lokalnie "
+    "i zostanie przesłana do bazy automatycznie po przywróceniu połączenia."
+)
+
+
+def can_work_offline() -> bool:
+    """True when a local replica of the configured DB exists, so the user can keep
+    working (reads from the replica, writes to the journal) while the share is down."""
+    try:
+        path = get_database_path()
+        return bool(path) and replica_service.is_replica_enabled() and replica_service.has_replica_for(path)
+    except Exception:
+        return False
+
+
+def _queue_offline_write(kind, payload) -> bool:
+    """Journal a write for later replay and apply it to the local replica right away.
+    Returns True when the write was stored durably."""
+    path = get_database_path()
+    if not path or not write_journal.enqueue(kind, payload, path):
+        return False
+    replica_service.apply_to_replica(path, lambda cursor: _replay_write(cursor, kind, payload))
+    return True
+
+
+OFFLINE_NUMBERING_UNAVAILABLE_MESSAGE = (
+    "Brak połączenia z bazą danych i brak lokalnej kopii bazy. Nie można ustalić kolejnego numeru "
+    "dokumentu bez ryzyka powtórzenia numeru nadanego na innym stanowisku.\n\n"
+    "Przywróć połączenie z bazą lub włącz w ustawieniach lokalną kopię bazy danych."
+)
+
+
+def _offline_next_order_number(kind, table, year_column, order_column, year):
+    """Next order number while the shared DB is unreachable, or None when it cannot be
+    determined safely (without a local replica the numbers used by others are unknown)."""
+    if not can_work_offline():
+        return None
+    pending_max = write_journal.max_pending_order_number(kind, year, get_database_path())
+    return max(_offline_max_order_number(table, year_column, order_column, year), pending_max) + 1
+
+
+def retry_offline_conflict(entry_id):
+    """Queue a conflicting offline write again, e.g. after the cause was corrected by hand."""
+    write_journal.retry_entry(entry_id)
+
+
+def discard_offline_conflict(entry_id):
+    """Drop a conflicting offline write. The replica is refreshed, so the local copy of
+    the write (applied when it was journaled) disappears from the lists as well."""
+    write_journal.discard_entry(entry_id)
+    _mirror_write()
+
+
+def _offline_max_order_number(table, year_column, order_column, year) -> int:
+    """Highest order number for `year` as known by the local replica (0 if unknown)."""
+    path = get_database_path()
+    if not replica_service.has_replica_for(path):
+        return 0
+    conn = replica_service.connect_replica(path)
+    if conn is None:
+        return 0
+    try:
+        row = conn.execute(f"SELECT MAX({order_column}) FROM {table} WHERE {year_column} = ?", (year,)).fetchone()
+        return row[0] or 0
+    except sqlite3.Error:
+        return 0
+    finally:
+        conn.close()
+
+
+def _replay_write(cursor, kind, payload):
+    """Apply one journaled write with `cursor`. Returns a conflict description, or None when
+    the write was applied (or had already been applied by an earlier, interrupted sync)."""
+    if kind in (write_journal.OFFER_INSERT, write_journal.WZ_INSERT):
+        if kind == write_journal.OFFER_INSERT:
+            table, year_col, order_col, path_col, ctx_col, label = (
+                'Offers', 'OfferYearNumber', 'OfferOrderNumber', 'OfferFilePath', 'OfferContext', 'Oferta')
+        else:
+            table, year_col, order_col, path_col, ctx_col, label = (
+                'Wuzetkas', 'WzYearNumber', 'WzOrderNumber', 'WzFilePath', 'WzContext', 'WZ')
+        year, order, rel_path = payload['year'], payload['order_number'], payload['path']
+        cursor.execute(f"SELECT {path_col} FROM {table} WHERE {year_col} = ? AND {order_col} = ?", (year, order))
+        row = cursor.fetchone()
+        if row:
+            if row[0] == rel_path:
+                return None
+            return f"{label} nr {order}/{year} ({rel_path}): numer jest już zajęty w bazie przez {row[0]}"
+        cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {path_col} = ?", (rel_path,))
+        if cursor.fetchone()[0] > 0:
+            return f"{label} {rel_path}: plik o tej ścieżce jest już zapisany w bazie"
+        cursor.execute(
+            f"INSERT INTO {table} ({year_col}, {order_col}, {path_col}, {ctx_col}) VALUES (?, ?, ?, ?)",
+            (year, order, rel_path, context_codec.encode_for(cursor, payload.get('context'))),
+        )
+        doc_kind = 'offer' if kind == write_journal.OFFER_INSERT else 'wz'
+        summary_service.add_document(cursor, doc_kind, payload.get('context'), rel_path)
+        product_catalog_service.record_document_products(cursor, doc_kind, payload.get('context'), rel_path)
+        return None
+
+    if kind in (write_journal.OFFER_CONTEXT_UPDATE, write_journal.WZ_CONTEXT_UPDATE):
+        if kind == write_journal.OFFER_CONTEXT_UPDATE:
+            doc_kind, path_col = 'offer', 'OfferFilePath'
+            sql = "UPDATE Offers SET OfferContext = ? WHERE OfferFilePath = ?"
+        else:
+            doc_kind, path_col = 'wz', 'WzFilePath'
+            sql = "UPDATE Wuzetkas SET WzContext = ? WHERE WzFilePath = ?"
+        summary_service.remove_documents(cursor, doc_kind, f"{path_col} = ?", (payload['path'],))
+        product_catalog_service.forget_document_products(cursor, doc_kind, payload['path'])
+        cursor.execute(sql, (context_codec.encode_for(cursor, payload.get('context')), payload['path']))
+        if cursor.rowcount == 0:
+            return f"Nie znaleziono w bazie dokumentu {payload['path']} do aktualizacji"
+        summary_service.add_document(cursor, doc_kind, payload.get('context'), payload['path'])
+        product_catalog_service.record_document_products(cursor, doc_kind, payload.get('context'), payload['path'])
+        return None
+
+    if kind == write_journal.CLIENT_ADD:
+        values = (payload['company_name'], payload['address_p1'], payload['address_p2'], payload['alias'])
+        cursor.execute("SELECT CompanyName, AddressP1, AddressP2, Alias FROM Clients WHERE Nip = ?", (payload['nip'],))
+        row = cursor.fetchone()
+        if row:
+            if tuple(row) == values:
+                return None
+            return f"Klient z NIP {payload['nip']} został w międzyczasie dodany z innymi danymi"
+        cursor.execute(
+            "INSERT INTO Clients (Nip, CompanyName, AddressP1, AddressP2, Alias) VALUES (?, ?, ?, ?, ?)",
+            (payload['nip'],) + values,
+        )
+        return None
+
+    if kind == write_journal.CLIENT_UPDATE:
+        cursor.execute("SELECT COUNT(*) FROM Clients WHERE Alias = ? AND Nip != ?", (payload['alias'], payload['nip']))
+        if cursor.fetchone()[0] > 0:
+            return f"Alias {payload['alias']} jest już używany przez innego klienta"
+        cursor.execute(
+            "UPDATE Clients SET CompanyName = ?, AddressP1 = ?, AddressP2 = ?, Alias = ? WHERE Nip = ?",
+            (payload['company_name'], payload['address_p1'], payload['address_p2'], payload['alias'], payload['nip']),
+        )
+        if cursor.rowcount == 0:
+            return f"Klient z NIP {payload['nip']} nie istnieje w bazie"
+        return None
+
+    if kind == write_journal.CLIENT_EXTENDED_UPDATE:
+        cursor.execute(
+            """
+            UPDATE Clients
+            SET TerminRealizacji = ?, TerminPlatnosci = ?, WarunkiDostawy = ?,
+                WaznoscOferty = ?, Gwarancja = ?, Cena = ?
+            WHERE Nip = ?
+            """,
+            (payload.get('termin_realizacji'), payload.get('termin_platnosci'), payload.get('warunki_dostawy'),
+             payload.get('waznosc_oferty'), payload.get('gwarancja'), payload.get('cena'), payload['nip']),
+        )
+        if cursor.rowcount == 0:
+            return f"Klient z NIP {payload['nip']} nie istnieje w bazie"
+        return None
+
+    return f"Nieznany typ zapisu: {kind}"
+
+
+def sync_pending_writes():
+    """Replay journaled offline writes against the shared DB, oldest first.
+    Returns dict with 'synced' (count), 'conflicts' (messages) and 'remaining' (count).
+    Stops at the first connection error so the order of writes is preserved.
+    """
+    result = {'synced': 0, 'conflicts': [], 'remaining': 0}
+    path = get_database_path()
+    if not path or not write_journal.count_pending(path):
+        return result
+    if not is_database_available():
+        result['remaining'] = write_journal.count_pending(path)
+        return result
+    try:
+        conn = sqlite3.connect(path, timeout=10)
+    except sqlite3.Error as e:
+        _log.warning("Offline sync: cannot open database: %s", e)
+        result['remaining'] = write_journal.count_pending(path)
+        return result
+    try:
+        for entry_id, kind, payload in write_journal.get_pending(path):
+            cursor = conn.cursor()
+            try:
+                conflict = _replay_write(cursor, kind, payload)
+            except sqlite3.OperationalError as e:
+                conn.rollback()
+                write_journal.mark_attempt_failed(entry_id, str(e))
+                break
+            except (sqlite3.Error, KeyError) as e:
+                conn.rollback()
+                conflict = f"Błąd zapisu ({kind}): {e}"
+            if conflict:
+                conn.rollback()
+                write_journal.mark_conflict(entry_id, conflict)
+                result['conflicts'].append(conflict)
+                continue
+            conn.commit()
+            write_journal.mark_done(entry_id)
+            result['synced'] += 1
+    finally:
+        conn.close()
+    if result['synced']:
+        _mirror_write()
+        quick_open_service.invalidate()
+    result['remaining'] = write_journal.count_pending(path)
+    return result
+
+
 # ------------------------------
 # Paths helpers (Offers root via DB Paths table)
 # ------------------------------
@@ -160,17 +476,16 @@ def build_full_offer_path(rel_path: str) -> str:
 # Removed: set_offers_root_in_db (use Settings in UI layer)
 
 
+@metrics.timed('db.get_clients_from_db')
 def get_clients_from_db(include_extended: bool = False):
     """Fetch all clients from the database.
     When include_extended=True, also return additional nullable text columns:
     TerminRealizacji, TerminPlatnosci, WarunkiDostawy, WaznoscOferty, Gwarancja, Cena
     """
     try:
-        # Do not create DB file implicitly when path is invalid
-        if not is_database_available():
+        conn = _connect_for_read()
+        if conn is None:
             return []
-        db_path = get_database_path()
-        conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         if include_extended:
             cursor.execute(
@@ -197,13 +512,13 @@ def get_clients_from_db(include_extended: bool = False):
         return []
 
 
+@metrics.timed('db.get_suppliers_from_db')
 def get_suppliers_from_db():
     """Get all suppliers from the database"""
     try:
-        # Do not create DB file implicitly when path is invalid
-        if not is_database_available():
+        conn = _connect_for_read()
+        if conn is None:
             return []
-        conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         cursor.execute("SELECT Nip, CompanyName, AddressP1, AddressP2, COALESCE(IsDefault, 0) FROM Suppliers ORDER BY CompanyName")
         suppliers = cursor.fetchall()
@@ -234,13 +549,21 @@ def get_next_offer_number():
             tkinter.messagebox.showerror("Database Error", f"Error accessing database: {e}")
         return 1
 
+@metrics.timed('db.get_next_offer_number_for_year')
 def get_next_offer_number_for_year(year: int):
     """Get next offer sequential number for a given year (requires OfferYearNumber column).
     Legacy fallback removed intentionally – database must be migrated.
+    Returns None when the database is unreachable and there is no local replica.
     """
     try:
         if not is_database_available():
-            raise RuntimeError("Database unavailable")
+            number = _offline_next_order_number(write_journal.OFFER_INSERT, 'Offers', 'OfferYearNumber',
+                                                'OfferOrderNumber', year)
+            if number is None:
+                tkinter.messagebox.showerror("Brak dostępu do bazy danych", OFFLINE_NUMBERING_UNAVAILABLE_MESSAGE)
+            return number
+        # Numbers reserved by offline offers that are not synced yet
+        pending_max = write_journal.max_pending_order_number(write_journal.OFFER_INSERT, year, get_database_path())
         conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         cursor.execute("PRAGMA table_info(Offers)")
@@ -251,21 +574,19 @@ def get_next_offer_number_for_year(year: int):
         cursor.execute("SELECT MAX(OfferOrderNumber) FROM Offers WHERE OfferYearNumber = ?", (year,))
         result = cursor.fetchone()[0]
         conn.close()
-        return 1 if result is None else result + 1
+        # Numbers of an archived year continue after the archived ones
+        archived_max = archive_service.max_archived_order_number(get_database_path(), archive_service.KIND_OFFER, year)
+        return max(result or 0, pending_max, archived_max) + 1
     except Exception as e:
         tkinter.messagebox.showerror("Database Error", f"Offer yearly numbering error: {e}")
         return 1
 
 
+@metrics.timed('db.save_offer_to_db')
 def save_offer_to_db(offer_order_number, offer_file_path, offer_context=None):
     """Save offer (assumes OfferYearNumber column already exists and composite UNIQUE set)."""
     try:
-        # Prevent creating DB when path invalid
         path = get_database_path()
-        if not path or not os.path.exists(path):
-            raise sqlite3.Error("Database file not found")
-        conn = sqlite3.connect(get_database_path())
-        cursor = conn.cursor()
 
         # Determine offer year from context or path
         offer_year = None
@@ -287,29 +608,36 @@ def save_offer_to_db(offer_order_number, offer_file_path, offer_context=None):
 
         context_json = None
         if offer_context:
-            try:
-                _ctx = dict(offer_context)
-                for k in ('client_name','supplier_name'):
-                    if k in _ctx and isinstance(_ctx[k], str):
-                        if '<w:r>' in _ctx[k] or '<w:t' in _ctx[k]:
-                            import re as _re
-                            t = _ctx[k]
-                            t = _re.sub(r'<w:[^>]+>', '', t)
-                            t = t.replace('</w:t>', '').replace('</w:r>', '')
-                            _ctx[k] = t
-                offer_context = _ctx
-            except Exception:
-                pass
+            offer_context = OfferContext.coerce(offer_context).to_storage()
             context_json = json.dumps(offer_context, default=str, ensure_ascii=False)
 
         # Store relative path in DB
         rel_path = normalize_offer_db_path(offer_file_path)
-        cursor.execute(
-            "INSERT INTO Offers (OfferYearNumber, OfferOrderNumber, OfferFilePath, OfferContext) VALUES (?, ?, ?, ?)",
-            (offer_year, offer_order_number, rel_path, context_json),
-        )
+
+        # Prevent creating DB when path invalid; journal the insert while the share is down
+        if not path or not os.path.exists(path):
+            payload = {'year': offer_year, 'order_number': offer_order_number,
+                       'path': rel_path, 'context': context_json}
+            if _queue_offline_write(write_journal.OFFER_INSERT, payload):
+                tkinter.messagebox.showwarning("Tryb offline", OFFLINE_QUEUED_MESSAGE)
+                return True
+            raise sqlite3.Error("Database file not found")
+
+        def apply(cursor):
+            cursor.execute(
+                "INSERT INTO Offers (OfferYearNumber, OfferOrderNumber, OfferFilePath, OfferContext) VALUES (?, ?, ?, ?)",
+                (offer_year, offer_order_number, rel_path, context_codec.encode_for(cursor, context_json)),
+            )
+            summary_service.add_document(cursor, 'offer', offer_context, rel_path)
+            product_catalog_service.record_document_products(cursor, 'offer', offer_context, rel_path)
+
+        conn = sqlite3.connect(path)
+        apply(conn.cursor())
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.record_document('offer', rel_path, offer_context)
         return True
     except sqlite3.IntegrityError as ie:
         tkinter.messagebox.showerror("Database Error", f"(OfferYearNumber, OfferOrderNumber) uniqueness violation: {ie}")
@@ -319,49 +647,66 @@ def save_offer_to_db(offer_order_number, offer_file_path, offer_context=None):
         return False
 
 
+def _form_context(record_type, context):
+    """Stored context as the form loads it (names sanitized); None stays None."""
+    return record_type.from_dict(context).to_form() if context is not None else None
+
+
+@metrics.timed('db.get_offer_context_from_db')
 def get_offer_context_from_db(offer_file_path):
     """Get offer context from database by file path (accepts full or relative)."""
     try:
-        if not is_database_available():
+        if archive_service.is_archived_path(offer_file_path):
+            archived = archive_service.get_archived_context(get_database_path(), offer_file_path)
+            return _form_context(OfferContext, context_codec.decode(archived))
+        conn = _connect_for_read()
+        if conn is None:
             return None
-        conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         rel_path = normalize_offer_db_path(offer_file_path)
         cursor.execute("SELECT OfferContext FROM Offers WHERE OfferFilePath = ?", (rel_path,))
         result = cursor.fetchone()
         conn.close()
         
-        if result and result[0]:
-            # Parse JSON context
-            return json.loads(result[0])
-        return None
+        return _form_context(OfferContext, context_codec.decode(result[0])) if result else None
     except sqlite3.Error as e:
         if _should_show_db_error_popup():
             tkinter.messagebox.showerror("Database Error", f"Error retrieving offer context: {e}")
         return None
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         tkinter.messagebox.showerror("Data Error", f"Error parsing offer context: {e}")
         return None
 
 
+@metrics.timed('db.update_offer_context_in_db')
 def update_offer_context_in_db(offer_file_path, offer_context):
     """Update offer context in database (accepts full or relative path)."""
     try:
-        if not is_database_available():
-            return False
-        conn = sqlite3.connect(get_database_path())
-        cursor = conn.cursor()
-        
-        # Convert context to JSON
+        offer_context = OfferContext.coerce(offer_context).to_storage()
         context_json = json.dumps(offer_context, default=str, ensure_ascii=False)
-        
         rel_path = normalize_offer_db_path(offer_file_path)
-        cursor.execute(
-            "UPDATE Offers SET OfferContext = ? WHERE OfferFilePath = ?",
-            (context_json, rel_path),
-        )
+
+        if not is_database_available():
+            return _queue_offline_write(write_journal.OFFER_CONTEXT_UPDATE,
+                                        {'path': rel_path, 'context': context_json})
+
+        def apply(cursor):
+            summary_service.remove_documents(cursor, 'offer', "OfferFilePath = ?", (rel_path,))
+            product_catalog_service.forget_document_products(cursor, 'offer', rel_path)
+            cursor.execute(
+                "UPDATE Offers SET OfferContext = ? WHERE OfferFilePath = ?",
+                (context_codec.encode_for(cursor, context_json), rel_path),
+            )
+            summary_service.add_document(cursor, 'offer', offer_context, rel_path)
+            product_catalog_service.record_document_products(cursor, 'offer', offer_context, rel_path)
+
+        conn = sqlite3.connect(get_database_path())
+        apply(conn.cursor())
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.record_document('offer', rel_path, offer_context)
         return True
     except sqlite3.Error as e:
         if _should_show_db_error_popup():
@@ -369,45 +714,86 @@ def update_offer_context_in_db(offer_file_path, offer_context):
         return False
 
 
+@metrics.timed('db.get_wz_context_from_db')
 def get_wz_context_from_db(wz_file_path):
     """Get WZ context from database by file path (accepts full or relative)."""
     try:
-        if not is_database_available():
+        if archive_service.is_archived_path(wz_file_path):
+            archived = archive_service.get_archived_context(get_database_path(), wz_file_path)
+            return _form_context(WzContext, context_codec.decode(archived))
+        conn = _connect_for_read()
+        if conn is None:
             return None
-        conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         rel_path = normalize_wz_db_path(wz_file_path)
         cursor.execute("SELECT WzContext FROM Wuzetkas WHERE WzFilePath = ?", (rel_path,))
         result = cursor.fetchone()
         conn.close()
         
-        if result and result[0]:
-            # Parse JSON context
-            return json.loads(result[0])
-        return None
+        return _form_context(WzContext, context_codec.decode(result[0])) if result else None
     except sqlite3.Error as e:
         tkinter.messagebox.showerror("Database Error", f"Error retrieving WZ context: {e}")
         return None
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         tkinter.messagebox.showerror("Data Error", f"Error parsing WZ context: {e}")
         return None
 
 
+def get_stored_context(kind, file_path):
+    """Return the stored context of an offer ('offer') or WZ ('wz') document, or None.
+    Never shows dialogs, so it is safe to call from background threads."""
+    if archive_service.is_archived_path(file_path):
+        try:
+            archived = archive_service.get_archived_context(get_database_path(), file_path)
+            return context_codec.decode(archived)
+        except ValueError:
+            return None
+    if kind == 'offer':
+        sql = "SELECT OfferContext FROM Offers WHERE OfferFilePath = ?"
+        rel_path = normalize_offer_db_path(file_path)
+    else:
+        sql = "SELECT WzContext FROM Wuzetkas WHERE WzFilePath = ?"
+        rel_path = normalize_wz_db_path(file_path)
+    try:
+        conn = _connect_for_read()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(sql, (rel_path,)).fetchone()
+        finally:
+            conn.close()
+        return context_codec.decode(row[0]) if row else None
+    except (sqlite3.Error, ValueError):
+        return None
+
+
+@metrics.timed('db.update_wz_context_in_db')
 def update_wz_context_in_db(wz_file_path, wz_context):
     """Update WZ context in database (accepts full or relative path)."""
     try:
-        if not is_database_available():
-            return False
-        conn = sqlite3.connect(get_database_path())
-        cursor = conn.cursor()
-        
-        # Convert context to JSON
+        wz_context = WzContext.coerce(wz_context).to_storage()
         context_json = json.dumps(wz_context, default=str, ensure_ascii=False)
         rel_path = normalize_wz_db_path(wz_file_path)
-        cursor.execute("UPDATE Wuzetkas SET WzContext = ? WHERE WzFilePath = ?", 
-                      (context_json, rel_path))
+
+        if not is_database_available():
+            return _queue_offline_write(write_journal.WZ_CONTEXT_UPDATE,
+                                        {'path': rel_path, 'context': context_json})
+
+        def apply(cursor):
+            summary_service.remove_documents(cursor, 'wz', "WzFilePath = ?", (rel_path,))
+            product_catalog_service.forget_document_products(cursor, 'wz', rel_path)
+            cursor.execute("UPDATE Wuzetkas SET WzContext = ? WHERE WzFilePath = ?", 
+                          (context_codec.encode_for(cursor, context_json), rel_path))
+            summary_service.add_document(cursor, 'wz', wz_context, rel_path)
+            product_catalog_service.record_document_products(cursor, 'wz', wz_context, rel_path)
+
+        conn = sqlite3.connect(get_database_path())
+        apply(conn.cursor())
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.record_document('wz', rel_path, wz_context)
         return True
     except sqlite3.Error as e:
         tkinter.messagebox.showerror("Database Error", f"Error updating WZ context: {e}")
@@ -451,6 +837,16 @@ def add_client_to_db(nip, company_name, address_p1, address_p2, alias):
     try:
         path = get_database_path()
         if not path or not os.path.exists(path):
+            # Offline: only format checks are possible, uniqueness is verified during sync
+            if not nip.isdigit() or len(nip) != 10:
+                return False, "NIP musi składać się z dokładnie 10 cyfr"
+            alias_valid, alias_message = validate_alias(alias)
+            if not alias_valid:
+                return False, alias_message
+            payload = {'nip': nip, 'company_name': company_name, 'address_p1': address_p1,
+                       'address_p2': address_p2, 'alias': alias}
+            if _queue_offline_write(write_journal.CLIENT_ADD, payload):
+                return True, OFFLINE_QUEUED_MESSAGE
             return False, "Baza danych jest niedostępna lub nie istnieje."
         # Validate NIP
         nip_valid, nip_message = validate_nip(nip)
@@ -463,14 +859,19 @@ def add_client_to_db(nip, company_name, address_p1, address_p2, alias):
             return False, alias_message
         
         # Insert client
+        def apply(cursor):
+            cursor.execute("""
+                INSERT INTO Clients (Nip, CompanyName, AddressP1, AddressP2, Alias) 
+                VALUES (?, ?, ?, ?, ?)
+            """, (nip, company_name, address_p1, address_p2, alias))
+
         conn = sqlite3.connect(get_database_path())
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO Clients (Nip, CompanyName, AddressP1, AddressP2, Alias) 
-            VALUES (?, ?, ?, ?, ?)
-        """, (nip, company_name, address_p1, address_p2, alias))
+        apply(conn.cursor())
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.record_party('client', nip, company_name, address_p2, alias)
         
         return True, "Klient został pomyślnie dodany do bazy"
     except sqlite3.Error as e:
@@ -513,14 +914,19 @@ def add_supplier_to_db(nip, company_name, address_p1, address_p2):
             return False, nip_message
         
         # Insert supplier
+        def apply(cursor):
+            cursor.execute("""
+                INSERT INTO Suppliers (Nip, CompanyName, AddressP1, AddressP2) 
+                VALUES (?, ?, ?, ?)
+            """, (nip, company_name, address_p1, address_p2))
+
         conn = sqlite3.connect(get_database_path())
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO Suppliers (Nip, CompanyName, AddressP1, AddressP2) 
-            VALUES (?, ?, ?, ?)
-        """, (nip, company_name, address_p1, address_p2))
+        apply(conn.cursor())
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.record_party('supplier', nip, company_name, address_p2)
         
         return True, "Dostawca został pomyślnie dodany do bazy"
     except sqlite3.Error as e:
@@ -530,9 +936,9 @@ def add_supplier_to_db(nip, company_name, address_p1, address_p2):
 def get_client_by_nip(nip):
     """Get client data by NIP"""
     try:
-        if not is_database_available():
+        conn = _connect_for_read()
+        if conn is None:
             return None
-        conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         cursor.execute("SELECT Nip, CompanyName, AddressP1, AddressP2, Alias FROM Clients WHERE Nip = ?", (nip,))
         client = cursor.fetchone()
@@ -548,6 +954,13 @@ def update_client_in_db(nip, company_name, address_p1, address_p2, alias):
     try:
         path = get_database_path()
         if not path or not os.path.exists(path):
+            alias_valid, alias_message = validate_alias(alias)
+            if not alias_valid:
+                return False, alias_message
+            payload = {'nip': nip, 'company_name': company_name, 'address_p1': address_p1,
+                       'address_p2': address_p2, 'alias': alias}
+            if _queue_offline_write(write_journal.CLIENT_UPDATE, payload):
+                return True, OFFLINE_QUEUED_MESSAGE
             return False, "Baza danych jest niedostępna lub nie istnieje."
         # Validate alias (but allow current alias to remain the same)
         conn = sqlite3.connect(get_database_path())
@@ -568,13 +981,19 @@ def update_client_in_db(nip, company_name, address_p1, address_p2, alias):
             return False, alias_message
         
         # Update client
-        cursor.execute("""
-            UPDATE Clients 
-            SET CompanyName = ?, AddressP1 = ?, AddressP2 = ?, Alias = ?
-            WHERE Nip = ?
-        """, (company_name, address_p1, address_p2, alias, nip))
+        def apply(cursor):
+            cursor.execute("""
+                UPDATE Clients 
+                SET CompanyName = ?, AddressP1 = ?, AddressP2 = ?, Alias = ?
+                WHERE Nip = ?
+            """, (company_name, address_p1, address_p2, alias, nip))
+
+        apply(cursor)
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.record_party('client', nip, company_name, address_p2, alias)
         
         return True, "Dane klienta zostały zaktualizowane"
     except sqlite3.Error as e:
@@ -609,14 +1028,19 @@ def delete_client_from_db(nip):
             return False, f"Nie można usunąć klienta - istnieją {offer_count} ofert(y) dla tego klienta"
         
         # Delete client
-        cursor.execute("DELETE FROM Clients WHERE Nip = ?", (nip,))
-        
+        def apply(cursor):
+            cursor.execute("DELETE FROM Clients WHERE Nip = ?", (nip,))
+
+        apply(cursor)
         if cursor.rowcount == 0:
             conn.close()
             return False, "Klient nie został znaleziony"
         
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.forget('client', nip)
         
         return True, "Klient został usunięty z bazy"
     except sqlite3.Error as e:
@@ -632,32 +1056,48 @@ def set_client_extended_fields(nip, termin_realizacji=None, termin_platnosci=Non
     try:
         path = get_database_path()
         if not path or not os.path.exists(path):
+            payload = {
+                'nip': nip,
+                'termin_realizacji': termin_realizacji if termin_realizacji != '' else None,
+                'termin_platnosci': termin_platnosci if termin_platnosci != '' else None,
+                'warunki_dostawy': warunki_dostawy if warunki_dostawy != '' else None,
+                'waznosc_oferty': waznosc_oferty if waznosc_oferty != '' else None,
+                'gwarancja': gwarancja if gwarancja != '' else None,
+                'cena': cena if cena != '' else None,
+            }
+            if _queue_offline_write(write_journal.CLIENT_EXTENDED_UPDATE, payload):
+                return True, OFFLINE_QUEUED_MESSAGE
             return False, "Baza danych jest niedostępna lub nie istnieje."
+
+        def apply(cursor):
+            cursor.execute(
+                """
+                UPDATE Clients
+                SET TerminRealizacji = ?,
+                    TerminPlatnosci = ?,
+                    WarunkiDostawy = ?,
+                    WaznoscOferty = ?,
+                    Gwarancja = ?,
+                    Cena = ?
+                WHERE Nip = ?
+                """,
+                (
+                    termin_realizacji if termin_realizacji != '' else None,
+                    termin_platnosci if termin_platnosci != '' else None,
+                    warunki_dostawy if warunki_dostawy != '' else None,
+                    waznosc_oferty if waznosc_oferty != '' else None,
+                    gwarancja if gwarancja != '' else None,
+                    cena if cena != '' else None,
+                    nip,
+                ),
+            )
+
         conn = sqlite3.connect(get_database_path())
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            UPDATE Clients
-            SET TerminRealizacji = ?,
-                TerminPlatnosci = ?,
-                WarunkiDostawy = ?,
-                WaznoscOferty = ?,
-                Gwarancja = ?,
-                Cena = ?
-            WHERE Nip = ?
-            """,
-            (
-                termin_realizacji if termin_realizacji != '' else None,
-                termin_platnosci if termin_platnosci != '' else None,
-                warunki_dostawy if warunki_dostawy != '' else None,
-                waznosc_oferty if waznosc_oferty != '' else None,
-                gwarancja if gwarancja != '' else None,
-                cena if cena != '' else None,
-                nip,
-            ),
-        )
+        apply(conn.cursor())
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
         return True, "Zapisano dodatkowe pola klienta"
     except sqlite3.Error as e:
         return False, f"Błąd zapisu dodatkowych pól klienta: {e}"
@@ -666,9 +1106,9 @@ def set_client_extended_fields(nip, termin_realizacji=None, termin_platnosci=Non
 def get_supplier_by_nip(nip):
     """Get supplier data by NIP"""
     try:
-        if not is_database_available():
+        conn = _connect_for_read()
+        if conn is None:
             return None
-        conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         cursor.execute("SELECT Nip, CompanyName, AddressP1, AddressP2, COALESCE(IsDefault, 0) FROM Suppliers WHERE Nip = ?", (nip,))
         supplier = cursor.fetchone()
@@ -689,18 +1129,23 @@ def update_supplier_in_db(nip, company_name, address_p1, address_p2):
         cursor = conn.cursor()
         
         # Update supplier
-        cursor.execute("""
-            UPDATE Suppliers 
-            SET CompanyName = ?, AddressP1 = ?, AddressP2 = ?
-            WHERE Nip = ?
-        """, (company_name, address_p1, address_p2, nip))
-        
+        def apply(cursor):
+            cursor.execute("""
+                UPDATE Suppliers 
+                SET CompanyName = ?, AddressP1 = ?, AddressP2 = ?
+                WHERE Nip = ?
+            """, (company_name, address_p1, address_p2, nip))
+
+        apply(cursor)
         if cursor.rowcount == 0:
             conn.close()
             return False, "Dostawca nie został znaleziony"
         
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.record_party('supplier', nip, company_name, address_p2)
         
         return True, "Dane dostawcy zostały zaktualizowane"
     except sqlite3.Error as e:
@@ -727,14 +1172,19 @@ def delete_supplier_from_db(nip):
         # For now, we'll allow deletion (suppliers don't appear in offer file names)
         
         # Delete supplier
-        cursor.execute("DELETE FROM Suppliers WHERE Nip = ?", (nip,))
-        
+        def apply(cursor):
+            cursor.execute("DELETE FROM Suppliers WHERE Nip = ?", (nip,))
+
+        apply(cursor)
         if cursor.rowcount == 0:
             conn.close()
             return False, "Dostawca nie został znaleziony"
         
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.forget('supplier', nip)
         
         return True, "Dostawca został usunięty z bazy"
     except sqlite3.Error as e:
@@ -750,18 +1200,21 @@ def set_default_supplier(nip):
         conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         
-        # First, remove default status from all suppliers
-        cursor.execute("UPDATE Suppliers SET IsDefault = 0")
-        
-        # Then set the specified supplier as default
-        cursor.execute("UPDATE Suppliers SET IsDefault = 1 WHERE Nip = ?", (nip,))
-        
+        def apply(cursor):
+            # First, remove default status from all suppliers
+            cursor.execute("UPDATE Suppliers SET IsDefault = 0")
+            # Then set the specified supplier as default
+            cursor.execute("UPDATE Suppliers SET IsDefault = 1 WHERE Nip = ?", (nip,))
+
+        apply(cursor)
         if cursor.rowcount == 0:
             conn.close()
             return False, "Dostawca nie został znaleziony"
         
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
         
         return True, "Dostawca został ustawiony jako domyślny"
     except sqlite3.Error as e:
@@ -771,9 +1224,9 @@ def set_default_supplier(nip):
 def get_default_supplier():
     """Get the current default supplier"""
     try:
-        if not is_database_available():
+        conn = _connect_for_read()
+        if conn is None:
             return None
-        conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         cursor.execute("SELECT Nip, CompanyName, AddressP1, AddressP2, IsDefault FROM Suppliers WHERE IsDefault = 1")
         supplier = cursor.fetchone()
@@ -795,14 +1248,21 @@ def delete_offer_from_db(offer_file_path):
         
         # Delete offer by file path
         rel_path = normalize_offer_db_path(offer_file_path)
-        cursor.execute("DELETE FROM Offers WHERE OfferFilePath = ?", (rel_path,))
-        
+
+        def apply(cursor):
+            summary_service.remove_documents(cursor, 'offer', "OfferFilePath = ?", (rel_path,))
+            cursor.execute("DELETE FROM Offers WHERE OfferFilePath = ?", (rel_path,))
+
+        apply(cursor)
         if cursor.rowcount == 0:
             conn.close()
             return False, "Oferta nie została znaleziona w bazie danych"
         
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.forget('offer', rel_path)
         
         return True, "Oferta została usunięta z bazy danych"
     except sqlite3.Error as e:
@@ -812,9 +1272,9 @@ def delete_offer_from_db(offer_file_path):
 def find_offer_by_filename(filename):
     """Find offer in database by filename (matches end of relative path)."""
     try:
-        if not is_database_available():
+        conn = _connect_for_read()
+        if conn is None:
             return None
-        conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         
         # Search for offer by filename (using LIKE to match the end of the path)
@@ -830,12 +1290,13 @@ def find_offer_by_filename(filename):
         return None
 
 
+@metrics.timed('db.get_all_offer_file_paths')
 def get_all_offer_file_paths():
     """Get all offer file paths from database (relative paths)."""
     try:
-        if not is_database_available():
+        conn = _connect_for_read()
+        if conn is None:
             return []
-        conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         
         # Get all offer file paths from database
@@ -846,7 +1307,7 @@ def get_all_offer_file_paths():
         # Return list of file paths
         return [result[0] for result in results] if results else []
     except sqlite3.Error as e:
-        print(f"Database error in get_all_offer_file_paths: {e}")
+        _log.error("Database error in get_all_offer_file_paths: %s", e)
         return []
 
 
@@ -855,11 +1316,19 @@ def get_all_offer_file_paths():
 
 # WZ (Wuzetka) related functions
 
+@metrics.timed('db.get_next_wz_number')
 def get_next_wz_number(year: int):
-    """Get next WZ sequential number for a given year (requires WzYearNumber column)."""
+    """Get next WZ sequential number for a given year (requires WzYearNumber column).
+    Returns None when the database is unreachable and there is no local replica."""
     try:
         if not is_database_available():
-            return 1
+            number = _offline_next_order_number(write_journal.WZ_INSERT, 'Wuzetkas', 'WzYearNumber',
+                                                'WzOrderNumber', year)
+            if number is None:
+                tkinter.messagebox.showerror("Brak dostępu do bazy danych", OFFLINE_NUMBERING_UNAVAILABLE_MESSAGE)
+            return number
+        # Numbers reserved by offline WZ that are not synced yet
+        pending_max = write_journal.max_pending_order_number(write_journal.WZ_INSERT, year, get_database_path())
         conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         cursor.execute("PRAGMA table_info(Wuzetkas)")
@@ -870,22 +1339,19 @@ def get_next_wz_number(year: int):
         cursor.execute("SELECT MAX(WzOrderNumber) FROM Wuzetkas WHERE WzYearNumber = ?", (year,))
         result = cursor.fetchone()[0]
         conn.close()
-        return 1 if result is None else result + 1
+        # Numbers of an archived year continue after the archived ones
+        archived_max = archive_service.max_archived_order_number(get_database_path(), archive_service.KIND_WZ, year)
+        return max(result or 0, pending_max, archived_max) + 1
     except Exception as e:
         tkinter.messagebox.showerror("Database Error", f"WZ yearly numbering error: {e}")
         return 1
 
 
+@metrics.timed('db.save_wz_to_db')
 def save_wz_to_db(wz_order_number, wz_file_path, wz_context=None):
     """Save WZ (assumes WzYearNumber column exists after migration)."""
     try:
         path = get_database_path()
-        if not path or not os.path.exists(path):
-            return False, "Baza danych jest niedostępna lub nie istnieje."
-        conn = sqlite3.connect(get_database_path())
-        cursor = conn.cursor()
-        cursor.execute("PRAGMA table_info(Wuzetkas)")
-        cols = [r[1] for r in cursor.fetchall()]
 
         # Determine year
         wz_year = None
@@ -912,20 +1378,7 @@ def save_wz_to_db(wz_order_number, wz_file_path, wz_context=None):
 
         context_json = None
         if wz_context:
-            try:
-                # Make a shallow copy to avoid mutating caller
-                _ctx = dict(wz_context)
-                for k in ('client_name','supplier_name'):
-                    if k in _ctx and isinstance(_ctx[k], str):
-                        if '<w:r>' in _ctx[k] or '<w:t' in _ctx[k]:
-                            import re as _re
-                            t = _ctx[k]
-                            t = _re.sub(r'<w:[^>]+>', '', t)
-                            t = t.replace('</w:t>', '').replace('</w:r>', '')
-                            _ctx[k] = t
-                wz_context = _ctx
-            except Exception:
-                pass
+            wz_context = WzContext.coerce(wz_context).to_storage()
             context_json = json.dumps(wz_context, ensure_ascii=False)
 
         # Normalize path to relative before saving
@@ -942,25 +1395,46 @@ def save_wz_to_db(wz_order_number, wz_file_path, wz_context=None):
         except Exception:
             rel_wz_path = f"{wz_year}/{os.path.basename(str(rel_wz_path))}"
 
-        if 'WzYearNumber' in cols:
-            cursor.execute("INSERT INTO Wuzetkas (WzYearNumber, WzOrderNumber, WzFilePath, WzContext) VALUES (?, ?, ?, ?)",
-                           (wz_year, wz_order_number, rel_wz_path, context_json))
-        else:
-            cursor.execute("INSERT INTO Wuzetkas (WzOrderNumber, WzFilePath, WzContext) VALUES (?, ?, ?)",
-                           (wz_order_number, rel_wz_path, context_json))
+        # Journal the insert while the share is down
+        if not path or not os.path.exists(path):
+            payload = {'year': wz_year, 'order_number': wz_order_number,
+                       'path': rel_wz_path, 'context': context_json}
+            if _queue_offline_write(write_journal.WZ_INSERT, payload):
+                return True, OFFLINE_QUEUED_MESSAGE
+            return False, "Baza danych jest niedostępna lub nie istnieje."
+
+        def apply(cursor):
+            cursor.execute("PRAGMA table_info(Wuzetkas)")
+            cols = [r[1] for r in cursor.fetchall()]
+
+            if 'WzYearNumber' in cols:
+                cursor.execute("INSERT INTO Wuzetkas (WzYearNumber, WzOrderNumber, WzFilePath, WzContext) VALUES (?, ?, ?, ?)",
+                               (wz_year, wz_order_number, rel_wz_path, context_codec.encode_for(cursor, context_json)))
+            else:
+                cursor.execute("INSERT INTO Wuzetkas (WzOrderNumber, WzFilePath, WzContext) VALUES (?, ?, ?)",
+                               (wz_order_number, rel_wz_path, context_codec.encode_for(cursor, context_json)))
+            summary_service.add_document(cursor, 'wz', context_json, rel_wz_path)
+            product_catalog_service.record_document_products(cursor, 'wz', context_json, rel_wz_path)
+
+        conn = sqlite3.connect(path)
+        apply(conn.cursor())
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.record_document('wz', rel_wz_path, wz_context)
         return True, "WZ zostało zapisane do bazy danych"
     except sqlite3.Error as e:
         return False, f"Błąd podczas zapisywania WZ do bazy: {e}"
 
 
+@metrics.timed('db.get_all_wz')
 def get_all_wz():
     """Get all WZ from database"""
     try:
-        if not is_database_available():
+        conn = _connect_for_read()
+        if conn is None:
             return []
-        conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         
         # Get WZ with extracted client info from context
@@ -983,7 +1457,7 @@ def get_all_wz():
             
             if context_json:
                 try:
-                    context = json.loads(context_json)
+                    context = context_codec.decode(context_json)
                     client_name = context.get('client_name', 'N/A')
                     date = context.get('date', 'N/A')
                 except:
@@ -1018,14 +1492,20 @@ def delete_wz(wz_id):
         cursor = conn.cursor()
         
         # Delete WZ by ID
-        cursor.execute("DELETE FROM Wuzetkas WHERE WzOrderNumber = ?", (wz_id,))
-        
+        def apply(cursor):
+            summary_service.remove_documents(cursor, 'wz', "WzOrderNumber = ?", (wz_id,))
+            cursor.execute("DELETE FROM Wuzetkas WHERE WzOrderNumber = ?", (wz_id,))
+
+        apply(cursor)
         if cursor.rowcount == 0:
             conn.close()
             return False, "WZ nie zostało znalezione w bazie danych"
         
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.invalidate()
         
         return True, "WZ zostało usunięte z bazy danych"
     except sqlite3.Error as e:
@@ -1041,12 +1521,20 @@ def delete_wz_by_file_path(wz_file_path: str):
         conn = sqlite3.connect(get_database_path())
         cursor = conn.cursor()
         rel = normalize_wz_db_path(wz_file_path)
-        cursor.execute("DELETE FROM Wuzetkas WHERE WzFilePath = ?", (rel,))
+
+        def apply(cursor):
+            summary_service.remove_documents(cursor, 'wz', "WzFilePath = ?", (rel,))
+            cursor.execute("DELETE FROM Wuzetkas WHERE WzFilePath = ?", (rel,))
+
+        apply(cursor)
         if cursor.rowcount == 0:
             conn.close()
             return False, "WZ nie zostało znalezione w bazie (po ścieżce)"
+        snapshot = _replica_snapshot()
         conn.commit()
         conn.close()
+        _mirror_write(apply, snapshot)
+        quick_open_service.forget('wz', rel)
         return True, "WZ zostało usunięte z bazy danych"
     except sqlite3.Error as e:
         return False, f"Błąd podczas usuwania WZ (po ścieżce): {e}"
@@ -1055,7 +1543,9 @@ def delete_wz_by_file_path(wz_file_path: str):
 def get_all_wz_file_paths():
     """Get all WZ file paths from database"""
     try:
-        conn = sqlite3.connect(get_database_path())
+        conn = _connect_for_read()
+        if conn is None:
+            return []
         cursor = conn.cursor()
         
         # Get all WZ file paths from database
@@ -1066,7 +1556,7 @@ def get_all_wz_file_paths():
         # Return list of file paths
         return [result[0] for result in results] if results else []
     except sqlite3.Error as e:
-        print(f"Database error in get_all_wz_file_paths: {e}")
+        _log.error("Database error in get_all_wz_file_paths: %s", e)
         return []
 
 
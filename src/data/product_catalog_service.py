@@ -0,0 +1,386 @@
+"""
+Product catalog built from the offers and WZ documents.
+
+Products holds one row per product name (unique index on the normalized name:
+case-folded, whitespace collapsed) with the last unit and net unit price used,
+and ProductClientPrices the last price quoted to each client (by NIP). Both
+tables are created and backfilled from the stored OfferContext and WzContext by
+a one-time migration step at startup, outside any document save. Document dates are stored as ISO 'YYYY-MM-DD' (LastUsed, PriceDate)
+and a document only replaces the unit and prices of a newer one when its own
+date is not older, so the latest price wins even when an old offer is edited.
+Every saved or edited document updates the tables in the same transaction as
+its own row; an edit first takes back the use counts of the stored version, so
+re-saving a document does not count its products twice.
+
+The add/edit product windows search an in-memory prefix index (sorted keys for
+the whole name and for each word of it, searched with bisect), loaded in the
+background from the local read connection and refreshed after local writes.
+"""
+import bisect
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.data import context_codec
+from src.utils import money
+from src.utils.date_utils import to_iso_date
+
+_log = logging.getLogger(__name__)
+
+MAX_SUGGESTIONS = 8
+INDEX_MAX_AGE_SECONDS = 300
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS Products (
+        ProductId INTEGER PRIMARY KEY AUTOINCREMENT,
+        Name TEXT NOT NULL,
+        NormalizedName TEXT NOT NULL,
+        Unit TEXT,
+        LastPrice TEXT,
+        UseCount INTEGER NOT NULL DEFAULT 0,
+        LastUsed TEXT
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_products_normalized_name ON Products(NormalizedName)",
+    """
+    CREATE TABLE IF NOT EXISTS ProductClientPrices (
+        ProductId INTEGER NOT NULL,
+        ClientNip TEXT NOT NULL,
+        Price TEXT NOT NULL,
+        PriceDate TEXT,
+        DocumentPath TEXT,
+        PRIMARY KEY (ProductId, ClientNip)
+    )
+    """,
+)
+
+_WHITESPACE = re.compile(r'\s+')
+
+_lock = threading.Lock()
+_state = {'path': None, 'index': None, 'loaded_at': 0.0, 'loading': False}
+
+
+def normalize_name(name) -> str:
+    """Catalog key of a product name: case-folded, literal '\\n' markers and whitespace collapsed."""
+    text = str(name or '').replace('\\n', ' ').replace('\u00A0', ' ')
+    return _WHITESPACE.sub(' ', text).strip().casefold()
+
+
+def _client_key(nip) -> str:
+    return re.sub(r'\D', '', str(nip or ''))
+
+
+# ------------------------------
+# Writing
+# ------------------------------
+
+def _catalog_exists(cursor) -> bool:
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'Products'")
+    return cursor.fetchone()[0] > 0
+
+
+def _product_rows(kind, context):
+    """(name, unit, price or None) of each product line in a document context."""
+    rows = []
+    for product in context.get('products') or []:
+        if kind == 'offer':
+            if not isinstance(product, (list, tuple)) or len(product) < 5:
+                continue
+            name, unit, price = product[1], product[2], product[4]
+            try:
+                price = money.to_plain_string(money.parse_amount(price))
+            except ValueError:
+                price = None
+        else:
+            if isinstance(product, dict):
+                name, unit = product.get('name'), product.get('unit')
+            elif isinstance(product, (list, tuple)) and len(product) >= 3:
+                name, unit = product[1], product[2]
+            else:
+                continue
+            price = None
+        if normalize_name(name):
+            rows.append((str(name), str(unit or '').strip(), price))
+    return rows
+
+
+# A document without a readable date counts as the newest one
+_PRODUCT_IS_NEWER = "COALESCE(excluded.LastUsed, '9999-12-31') >= COALESCE(LastUsed, '')"
+_PRICE_IS_NEWER = "COALESCE(excluded.PriceDate, '9999-12-31') >= COALESCE(PriceDate, '')"
+
+
+def _record(cursor, kind, context, rel_path):
+    used = to_iso_date(context.get('date'))
+    client = _client_key(context.get('client_nip'))
+    for name, unit, price in _product_rows(kind, context):
+        key = normalize_name(name)
+        cursor.execute(
+            f"""
+            INSERT INTO Products (Name, NormalizedName, Unit, LastPrice, UseCount, LastUsed)
+            VALUES (?, ?, ?, ?, 1, ?)
+            ON CONFLICT(NormalizedName) DO UPDATE SET
+                Name = CASE WHEN {_PRODUCT_IS_NEWER} THEN excluded.Name ELSE Name END,
+                Unit = CASE WHEN {_PRODUCT_IS_NEWER} THEN COALESCE(NULLIF(excluded.Unit, ''), Unit) ELSE Unit END,
+                LastPrice = CASE WHEN {_PRODUCT_IS_NEWER} THEN COALESCE(excluded.LastPrice, LastPrice)
+                            ELSE LastPrice END,
+                UseCount = UseCount + 1,
+                LastUsed = CASE WHEN {_PRODUCT_IS_NEWER} THEN COALESCE(excluded.LastUsed, LastUsed) ELSE LastUsed END
+            """,
+            (name, key, unit, price, used),
+        )
+        if price is not None and client:
+            cursor.execute(
+                f"""
+                INSERT INTO ProductClientPrices (ProductId, ClientNip, Price, PriceDate, DocumentPath)
+                SELECT ProductId, ?, ?, ?, ? FROM Products WHERE NormalizedName = ?
+                ON CONFLICT(ProductId, ClientNip) DO UPDATE SET
+                    Price = excluded.Price,
+                    PriceDate = COALESCE(excluded.PriceDate, PriceDate),
+                    DocumentPath = excluded.DocumentPath
+                WHERE {_PRICE_IS_NEWER}
+                """,
+                (client, price, used, rel_path, key),
+            )
+
+
+def _backfill(cursor, source=None):
+    """Fill the new catalog from all stored contexts (read through `source`, default
+    `cursor`) in insertion order, so later documents win."""
+    source = source or cursor
+    queries = (
+        ('wz', "SELECT WzFilePath, WzContext FROM Wuzetkas ORDER BY rowid"),
+        ('offer', "SELECT OfferFilePath, OfferContext FROM Offers ORDER BY rowid"),
+    )
+    count = 0
+    for kind, sql in queries:
+        try:
+            rows = source.execute(sql).fetchall()
+        except sqlite3.Error as e:
+            _log.warning("Product catalog backfill skipped %s: %s", kind, e)
+            continue
+        for rel_path, raw in rows:
+            context = context_codec.decode_or_none(raw)
+            if isinstance(context, dict):
+                _record(cursor, kind, context, rel_path)
+                count += 1
+    _log.info("Product catalog backfilled from %d documents", count)
+
+
+def ensure_catalog(cursor) -> bool:
+    """Create (and backfill) the catalog tables when missing: the one-time migration step run
+    by warm_up_async through database_service.run_migration. Returns True when created."""
+    if _catalog_exists(cursor):
+        return False
+    for statement in _SCHEMA:
+        cursor.execute(statement)
+    _backfill(cursor)
+    return True
+
+
+def _in_savepoint(cursor, func, *args):
+    """Run func(cursor, *args) so that a failure part-way leaves none of its statements
+    in the caller's transaction."""
+    if not cursor.connection.in_transaction:
+        # An outermost SAVEPOINT would commit on RELEASE: open the caller's transaction first
+        cursor.execute("BEGIN")
+    cursor.execute("SAVEPOINT catalog")
+    try:
+        func(cursor, *args)
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK TO catalog")
+        cursor.execute("RELEASE catalog")
+        raise
+    cursor.execute("RELEASE catalog")
+
+
+def record_document_products(cursor, kind, context, rel_path):
+    """Update the catalog with the products of a saved offer ('offer') or WZ ('wz').
+
+    Runs inside the caller's transaction and is skipped until the migration step created
+    the catalog; catalog problems are logged, leave no partial update and never fail the
+    document write itself.
+    """
+    context = context_codec.decode_or_none(context)
+    if not isinstance(context, dict):
+        return
+    try:
+        if not _catalog_exists(cursor):
+            return
+        _in_savepoint(cursor, _record, kind, context, rel_path)
+    except sqlite3.Error as e:
+        _log.warning("Product catalog update failed for %s: %s", rel_path, e)
+        return
+    invalidate()
+
+
+_DOCUMENT_TABLES = {
+    'offer': ('Offers', 'OfferFilePath', 'OfferContext'),
+    'wz': ('Wuzetkas', 'WzFilePath', 'WzContext'),
+}
+
+
+def _unrecord(cursor, kind, rel_path):
+    table, path_col, ctx_col = _DOCUMENT_TABLES[kind]
+    row = cursor.execute(f"SELECT {ctx_col} FROM {table} WHERE {path_col} = ?", (rel_path,)).fetchone()
+    context = context_codec.decode_or_none(row[0]) if row else None
+    if not isinstance(context, dict):
+        return
+    for name, _unit, _price in _product_rows(kind, context):
+        cursor.execute("UPDATE Products SET UseCount = MAX(UseCount - 1, 0) WHERE NormalizedName = ?",
+                       (normalize_name(name),))
+
+
+def forget_document_products(cursor, kind, rel_path):
+    """Take back the use counts of the stored version of a document; call before its context
+    is updated (and record_document_products() after), so re-saving a document does not
+    count its products again."""
+    try:
+        if _catalog_exists(cursor):
+            _in_savepoint(cursor, _unrecord, kind, rel_path)
+    except sqlite3.Error as e:
+        _log.warning("Product catalog update failed for %s: %s", rel_path, e)
+
+
+# ------------------------------
+# Prefix index for autocomplete
+# ------------------------------
+
+class ProductIndex:
+    """Sorted (key, product id) pairs for the whole normalized name and for each of its words."""
+
+    def __init__(self, products, client_prices):
+        self.products = products              # id -> dict(name, unit, price, uses)
+        self.client_prices = client_prices    # (id, client nip) -> price
+        keys = []
+        for product_id, product in products.items():
+            words = normalize_name(product['name']).split(' ')
+            for i in range(len(words)):
+                keys.append((' '.join(words[i:]), product_id))
+        keys.sort()
+        self._keys = keys
+
+    def search(self, text, client_nip=None, limit=MAX_SUGGESTIONS):
+        """Products whose name (or one of its words) starts with `text`, most used first.
+        Each result carries 'price' for the client when one was quoted to them."""
+        prefix = normalize_name(text)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self._keys, (prefix,))
+        found = {}
+        for key, product_id in self._keys[start:]:
+            if not key.startswith(prefix):
+                break
+            found[product_id] = key == normalize_name(self.products[product_id]['name'])
+        # Whole-name matches first, then by use count
+        ranked = sorted(found, key=lambda pid: (not found[pid], -self.products[pid]['uses'],
+                                                self.products[pid]['name']))
+        client = _client_key(client_nip)
+        results = []
+        for product_id in ranked[:limit]:
+            product = dict(self.products[product_id])
+            client_price = self.client_prices.get((product_id, client)) if client else None
+            product['client_price'] = client_price is not None
+            if client_price is not None:
+                product['price'] = client_price
+            results.append(product)
+        return results
+
+
+def _read_index(conn):
+    cursor = conn.cursor()
+    if not _catalog_exists(cursor):
+        # Catalog not created in this database yet (e.g. a read-only replica): build it in memory
+        memory = sqlite3.connect(':memory:').cursor()
+        for statement in _SCHEMA:
+            memory.execute(statement)
+        _backfill(memory, source=cursor)
+        cursor = memory
+    products = {
+        product_id: {'name': name, 'unit': unit or '', 'price': price, 'uses': uses or 0}
+        for product_id, name, unit, price, uses in cursor.execute(
+            "SELECT ProductId, Name, Unit, LastPrice, UseCount FROM Products").fetchall()
+    }
+    client_prices = {
+        (product_id, client): price
+        for product_id, client, price in cursor.execute(
+            "SELECT ProductId, ClientNip, Price FROM ProductClientPrices").fetchall()
+    }
+    return ProductIndex(products, client_prices)
+
+
+def _load(db_path):
+    from src.data import database_service as dbs
+
+    try:
+        conn = dbs._connect_for_read()
+        if conn is None:
+            return
+        try:
+            index = _read_index(conn)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        _log.warning("Loading product catalog failed: %s", e)
+        index = None
+    with _lock:
+        _state['loading'] = False
+        if index is not None and _state['path'] == db_path:
+            _state.update(index=index, loaded_at=time.monotonic())
+
+
+def invalidate():
+    """Mark the in-memory index stale so the next search reloads it."""
+    with _lock:
+        _state['loaded_at'] = 0.0
+
+
+def preload_async():
+    """Load (or refresh) the index in the background if it is missing or stale."""
+    from src.data import database_service as dbs
+
+    db_path = dbs.get_database_path()
+    with _lock:
+        if _state['path'] != db_path:
+            _state.update(path=db_path, index=None, loaded_at=0.0)
+        fresh = time.monotonic() - _state['loaded_at'] < INDEX_MAX_AGE_SECONDS
+        if (_state['index'] is not None and fresh) or _state['loading']:
+            return
+        _state['loading'] = True
+    threading.Thread(target=_load, args=(db_path,), daemon=True, name='product-catalog').start()
+
+
+def search(text, client_nip=None, limit=MAX_SUGGESTIONS):
+    """Autocomplete suggestions for a typed product name ([] until the index is loaded)."""
+    with _lock:
+        index = _state['index']
+        stale = time.monotonic() - _state['loaded_at'] >= INDEX_MAX_AGE_SECONDS
+    if index is None or stale:
+        preload_async()
+    return index.search(text, client_nip, limit) if index is not None else []
+
+
+def _on_database_switched(_new_path):
+    with _lock:
+        _state.update(path=None, index=None, loaded_at=0.0)
+    warm_up_async()
+
+
+def warm_up_async():
+    """Create and backfill the catalog in the shared database if needed, then load the index."""
+    from src.data import database_service as dbs
+
+    def _run():
+        dbs.run_migration(ensure_catalog, "product catalog")
+        invalidate()
+        preload_async()
+
+    dbs.add_database_listener(_on_database_switched)
+    threading.Thread(target=_run, daemon=True, name='product-catalog-setup').start()
@@ -0,0 +1,333 @@
+"""
+In-memory index for the quick-open palette (Ctrl+P).
+
+Covers the offers and WZ documents of the main database (archived years are
+browsed from their own lists) and all clients and suppliers. Every entry is
+indexed by the words of its file name, number, client name, NIP, alias and
+date, so a query like "kowal 2025" matches by word prefixes.
+
+The index is built in a background thread at start (and after a database
+switch), refreshed when older than INDEX_MAX_AGE_SECONDS because other
+workstations write to the shared database, and updated in place by the
+database_service writes of this workstation, so a document saved a moment ago
+is found immediately.
+"""
+import bisect
+import heapq
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.data import context_codec
+
+_log = logging.getLogger(__name__)
+
+KIND_OFFER = 'offer'
+KIND_WZ = 'wz'
+KIND_CLIENT = 'client'
+KIND_SUPPLIER = 'supplier'
+
+KIND_LABELS = {
+    KIND_OFFER: "Oferta",
+    KIND_WZ: "WZ",
+    KIND_CLIENT: "Klient",
+    KIND_SUPPLIER: "Dostawca",
+}
+# Order of the kinds among equally good matches
+_KIND_ORDER = {KIND_CLIENT: 0, KIND_SUPPLIER: 1, KIND_OFFER: 2, KIND_WZ: 3}
+
+MAX_RESULTS = 30
+INDEX_MAX_AGE_SECONDS = 300
+
+_WORD = re.compile(r'[^\W_]+')
+
+
+@dataclass
+class Entry:
+    kind: str
+    key: str        # relative file path for documents, NIP for clients and suppliers
+    title: str
+    detail: str
+    seq: int = 0    # documents: higher is newer
+
+
+def normalize(text) -> str:
+    """Search form of a text: case-folded, literal '\\n' markers dropped."""
+    return str(text or '').replace('\\n', ' ').casefold()
+
+
+def words(*texts) -> set:
+    """Distinct search words of the given texts (split on anything but letters and digits)."""
+    found = set()
+    for text in texts:
+        found.update(_WORD.findall(normalize(text)))
+    return found
+
+
+def _clean(text) -> str:
+    return ' '.join(str(text or '').replace('\\n', ' ').split())
+
+
+def document_entry(kind, rel_path, context, seq=0) -> Entry:
+    """Entry of an offer or WZ stored under `rel_path` with its (decoded) context."""
+    context = context if isinstance(context, dict) else {}
+    title = os.path.splitext(os.path.basename(str(rel_path).replace('\\', '/')))[0]
+    client = _clean(context.get('client_name'))
+    date = _clean(context.get('date'))
+    detail = ' · '.join(part for part in (client, date) if part)
+    return Entry(kind, rel_path, title, detail, seq)
+
+
+def _document_words(entry, context):
+    context = context if isinstance(context, dict) else {}
+    return words(entry.title, context.get('offer_number'), context.get('wz_number'), context.get('client_name'),
+                 context.get('client_alias'), context.get('client_nip'), context.get('date'))
+
+
+def party_entry(kind, nip, company_name, alias='') -> Entry:
+    """Entry of a client or supplier."""
+    detail = f"NIP {nip}" + (f" · {alias}" if alias else '')
+    return Entry(kind, str(nip), _clean(company_name) or str(nip), detail)
+
+
+def _order_key(entry):
+    return normalize(entry.title), _KIND_ORDER[entry.kind], -entry.seq
+
+
+class QuickOpenIndex:
+    """Entries by (kind, key) and sorted (word, (kind, key)) pairs for prefix lookups."""
+
+    def __init__(self):
+        self.entries = {}
+        self._words = []
+        self._entry_words = {}
+        self._order = {}        # (kind, key) -> (folded title, kind order, -seq) for ranking
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def put(self, entry, entry_words):
+        """Add or replace an entry; documents without seq become the newest."""
+        ident = (entry.kind, entry.key)
+        self.remove(entry.kind, entry.key)
+        if entry.kind in (KIND_OFFER, KIND_WZ) and not entry.seq:
+            self._next_seq += 1
+            entry.seq = self._next_seq
+        self._next_seq = max(self._next_seq, entry.seq)
+        self.entries[ident] = entry
+        self._entry_words[ident] = entry_words
+        self._order[ident] = _order_key(entry)
+        for word in entry_words:
+            bisect.insort(self._words, (word, ident))
+
+    def load(self, items):
+        """Fill an empty index from (entry, words) pairs at once."""
+        pairs = []
+        for entry, entry_words in items:
+            ident = (entry.kind, entry.key)
+            self.entries[ident] = entry
+            self._entry_words[ident] = entry_words
+            self._order[ident] = _order_key(entry)
+            self._next_seq = max(self._next_seq, entry.seq)
+            pairs.extend((word, ident) for word in entry_words)
+        pairs.sort()
+        self._words = pairs
+
+    def remove(self, kind, key):
+        ident = (kind, key)
+        if self.entries.pop(ident, None) is None:
+            return
+        del self._order[ident]
+        for word in self._entry_words.pop(ident, ()):
+            i = bisect.bisect_left(self._words, (word, ident))
+            if i < len(self._words) and self._words[i] == (word, ident):
+                del self._words[i]
+
+    def _matching(self, prefix):
+        start = bisect.bisect_left(self._words, (prefix,))
+        end = bisect.bisect_left(self._words, (prefix + '\U0010FFFF',), start)
+        return {ident for _word, ident in self._words[start:end]}
+
+    def search(self, text, limit=MAX_RESULTS):
+        """Entries having a word starting with each word of `text`; title matches first, then newest."""
+        query = sorted(words(text), key=len, reverse=True)
+        if not query:
+            return []
+        # The longest word is usually the most selective one
+        found = self._matching(query[0])
+        for prefix in query[1:]:
+            if not found:
+                break
+            found &= self._matching(prefix)
+        lead = normalize(text).strip()
+        order = self._order
+
+        def rank(ident):
+            title, kind_order, newest = order[ident]
+            return not title.startswith(lead), kind_order, newest, title
+
+        return [self.entries[ident] for ident in heapq.nsmallest(limit, found, key=rank)]
+
+
+# ------------------------------
+# Loading
+# ------------------------------
+
+_lock = threading.Lock()
+_state = {'path': None, 'index': None, 'loaded_at': 0.0, 'loading': False}
+
+
+def _decode(blob):
+    try:
+        return context_codec.decode(blob) or {}
+    except Exception:  # damaged legacy context: the file name is still indexed
+        return {}
+
+
+def _read_index(conn) -> QuickOpenIndex:
+    cursor = conn.cursor()
+    items = []
+    seq = 0
+    for kind, table, path_column, context_column in ((KIND_OFFER, 'Offers', 'OfferFilePath', 'OfferContext'),
+                                                      (KIND_WZ, 'Wuzetkas', 'WzFilePath', 'WzContext')):
+        for rel_path, blob in cursor.execute(
+                f"SELECT {path_column}, {context_column} FROM {table} ORDER BY rowid").fetchall():
+            if not rel_path:
+                continue
+            seq += 1
+            context = _decode(blob)
+            entry = document_entry(kind, rel_path, context, seq)
+            items.append((entry, _document_words(entry, context)))
+    for nip, name, address_p2, alias in cursor.execute(
+            "SELECT Nip, CompanyName, AddressP2, Alias FROM Clients").fetchall():
+        items.append((party_entry(KIND_CLIENT, nip, name, alias or ''), words(name, nip, alias, address_p2)))
+    for nip, name, address_p2 in cursor.execute("SELECT Nip, CompanyName, AddressP2 FROM Suppliers").fetchall():
+        items.append((party_entry(KIND_SUPPLIER, nip, name), words(name, nip, address_p2)))
+    index = QuickOpenIndex()
+    index.load(items)
+    return index
+
+
+def _load(db_path):
+    from src.data import database_service as dbs
+
+    t = time.perf_counter()
+    try:
+        conn = dbs._connect_for_read()
+        if conn is None:
+            index = None
+        else:
+            try:
+                index = _read_index(conn)
+            finally:
+                conn.close()
+    except sqlite3.Error as e:
+        _log.warning("Loading quick-open index failed: %s", e)
+        index = None
+    with _lock:
+        _state['loading'] = False
+        if index is not None and _state['path'] == db_path:
+            _state.update(index=index, loaded_at=time.monotonic())
+    if index is not None:
+        _log.info("Quick-open index: %d entries in %.3f s", len(index), time.perf_counter() - t)
+
+
+def invalidate():
+    """Mark the in-memory index stale so the next search reloads it."""
+    with _lock:
+        _state['loaded_at'] = 0.0
+
+
+def preload_async():
+    """Load (or refresh) the index in the background if it is missing or stale."""
+    from src.data import database_service as dbs
+
+    db_path = dbs.get_database_path()
+    with _lock:
+        if _state['path'] != db_path:
+            _state.update(path=db_path, index=None, loaded_at=0.0)
+        fresh = time.monotonic() - _state['loaded_at'] < INDEX_MAX_AGE_SECONDS
+        if (_state['index'] is not None and fresh) or _state['loading']:
+            return
+        _state['loading'] = True
+    threading.Thread(target=_load, args=(db_path,), daemon=True, name='quick-open').start()
+
+
+def is_loaded() -> bool:
+    with _lock:
+        return _state['index'] is not None
+
+
+def search(text, limit=MAX_RESULTS):
+    """Palette results for the typed text ([] until the index is loaded)."""
+    with _lock:
+        index = _state['index']
+        stale = time.monotonic() - _state['loaded_at'] >= INDEX_MAX_AGE_SECONDS
+        results = index.search(text, limit) if index is not None else []
+    if index is None or stale:
+        preload_async()
+    return results
+
+
+def _on_database_switched(_new_path):
+    with _lock:
+        _state.update(path=None, index=None, loaded_at=0.0)
+    preload_async()
+
+
+def warm_up_async():
+    """Build the index in the background and rebuild it whenever the database is switched."""
+    from src.data import database_service as dbs
+
+    dbs.add_database_listener(_on_database_switched)
+    preload_async()
+
+
+# ------------------------------
+# Incremental updates (called by database_service after a commit)
+# ------------------------------
+
+def _update(change):
+    with _lock:
+        index = _state['index']
+        if index is None:
+            return   # the next load reads the change from the database
+        try:
+            change(index)
+        except Exception as e:  # never let the palette break a save
+            _log.warning("Updating quick-open index failed: %s", e)
+            _state['loaded_at'] = 0.0
+
+
+def record_document(kind, rel_path, context):
+    """An offer/WZ was saved or its context updated (context: dict or JSON text)."""
+    if not rel_path:
+        return
+    if not isinstance(context, dict):
+        context = _decode(context) if context else {}
+
+    def change(index):
+        old = index.entries.get((kind, rel_path))
+        entry = document_entry(kind, rel_path, context, old.seq if old else 0)
+        index.put(entry, _document_words(entry, context))
+    _update(change)
+
+
+def record_party(kind, nip, company_name, address_p2='', alias=''):
+    """A client or supplier was added or updated."""
+    _update(lambda index: index.put(party_entry(kind, nip, company_name, alias or ''),
+                                    words(company_name, nip, alias, address_p2)))
+
+
+def forget(kind, key):
+    """A document (relative path) or client/supplier (NIP) was deleted."""
+    _update(lambda index: index.remove(kind, str(key)))
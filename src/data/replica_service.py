@@ -0,0 +1,375 @@
+"""
+Local read replica of the shared database.
+
+When enabled (app setting 'db_replica_enabled'), a copy of the network database
+is kept in the local data directory and all read-only queries are served from it.
+Writes still go to the shared database; afterwards the same write is applied to
+the replica so the next read sees the change without copying the shared file
+again. When the replica matched the shared file right before the write
+(write_snapshot), it also adopts the file's new mtime/size and data_version, so
+our own write is not mistaken for a foreign change; otherwise it stays stale and
+a full refresh happens in a background thread.
+
+Freshness is tracked with the source file's mtime/size plus SQLite's
+PRAGMA data_version observed through a long-lived read-only probe connection.
+Checks are throttled and run in a background thread once a replica exists, so
+list views never wait for the network share.
+"""
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.config import get_data_dir
+
+_log = logging.getLogger(__name__)
+
+REPLICA_FILENAME = 'database_replica.db'
+REPLICA_META_FILENAME = 'database_replica.json'
+# Minimum delay between two freshness checks against the network share
+CHECK_INTERVAL_SECONDS = 3.0
+# How long readers wait while the replica is being refreshed
+READ_TIMEOUT_SECONDS = 10.0
+
+_lock = threading.RLock()
+_state = {
+    'source': None,          # source path the replica currently mirrors
+    'fingerprint': None,     # (mtime_ns, size) of the source at last copy
+    'data_version': None,    # PRAGMA data_version seen by the probe at last copy
+    'probe': None,           # long-lived read-only connection to the source
+    'checked_at': 0.0,       # monotonic time of the last freshness check
+    'refreshing': False,     # a background refresh is running
+    'enabled': None,         # cached 'db_replica_enabled' setting (None = not read yet)
+}
+
+
+def is_replica_enabled() -> bool:
+    """Return True when read-replica mode is switched on in app settings.
+    The setting is read once and then cached (see set_replica_enabled)."""
+    enabled = _state['enabled']
+    if enabled is None:
+        try:
+            from src.utils.settings import SettingsManager
+            enabled = bool(SettingsManager().get_app_setting('db_replica_enabled'))
+        except Exception:
+            enabled = False
+        _state['enabled'] = enabled
+    return enabled
+
+
+def set_replica_enabled(enabled: bool):
+    """Update the cached setting after the settings were saved."""
+    _state['enabled'] = bool(enabled)
+
+
+def get_replica_path() -> str:
+    """Path of the local replica file."""
+    return os.path.join(get_data_dir(), REPLICA_FILENAME)
+
+
+def _get_meta_path() -> str:
+    return os.path.join(get_data_dir(), REPLICA_META_FILENAME)
+
+
+def _source_fingerprint(source_path):
+    """Return (mtime_ns, size) of the source DB or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(source_path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def _load_meta():
+    try:
+        with open(_get_meta_path(), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        fp = meta.get('fingerprint')
+        return meta.get('source'), (tuple(fp) if fp else None)
+    except Exception:
+        return None, None
+
+
+def _save_meta(source_path, fingerprint):
+    try:
+        with open(_get_meta_path(), 'w', encoding='utf-8') as f:
+            json.dump({'source': source_path, 'fingerprint': list(fingerprint) if fingerprint else None}, f)
+    except Exception as e:
+        _log.warning("Could not write replica metadata: %s", e)
+
+
+def _close_probe():
+    probe = _state.get('probe')
+    _state['probe'] = None
+    if probe is not None:
+        try:
+            probe.close()
+        except Exception:
+            pass
+
+
+def _read_data_version(source_path):
+    """Read PRAGMA data_version via the probe connection (opened lazily)."""
+    try:
+        if _state['probe'] is None:
+            _state['probe'] = sqlite3.connect(
+                f"file:{source_path}?mode=ro", uri=True, check_same_thread=False
+            )
+        return _state['probe'].execute("PRAGMA data_version").fetchone()[0]
+    except sqlite3.Error:
+        _close_probe()
+        return None
+
+
+def _bind_source(source_path):
+    """Point the replica state at source_path, reusing a persisted copy if it still matches."""
+    if _state['source'] == source_path:
+        return
+    _close_probe()
+    _state['source'] = source_path
+    _state['data_version'] = None
+    _state['checked_at'] = 0.0
+    meta_source, meta_fp = _load_meta()
+    if meta_source == source_path and os.path.exists(get_replica_path()):
+        _state['fingerprint'] = meta_fp
+    else:
+        _state['fingerprint'] = None
+
+
+def _is_stale(source_path) -> bool:
+    fingerprint = _source_fingerprint(source_path)
+    if fingerprint is None:
+        # Share unreachable: keep serving what we have
+        return False
+    if fingerprint != _state['fingerprint']:
+        return True
+    data_version = _read_data_version(source_path)
+    if data_version is not None and _state['data_version'] is not None:
+        return data_version != _state['data_version']
+    # First probe reading after (re)binding: remember it as the baseline
+    _state['data_version'] = data_version
+    return False
+
+
+def _copy_source(source_path) -> bool:
+    """Copy the source DB into the replica file using the SQLite backup API."""
+    fingerprint = _source_fingerprint(source_path)
+    if fingerprint is None:
+        return False
+    data_version = _read_data_version(source_path)
+    t = time.perf_counter()
+    staging_path = get_replica_path() + '.tmp'
+    src = staging = dst = None
+    try:
+        # Slow part (network read) goes to a private staging file first, so readers
+        # of the replica are only blocked for the fast local copy below.
+        src = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True, timeout=READ_TIMEOUT_SECONDS)
+        staging = sqlite3.connect(staging_path)
+        src.backup(staging)
+        dst = sqlite3.connect(get_replica_path(), timeout=READ_TIMEOUT_SECONDS)
+        staging.backup(dst)
+    except sqlite3.Error as e:
+        _log.warning("Replica refresh from %s failed: %s", source_path, e)
+        return False
+    finally:
+        for c in (src, staging, dst):
+            if c is not None:
+                try:
+                    c.close()
+                except Exception:
+                    pass
+        try:
+            os.remove(staging_path)
+        except OSError:
+            pass
+    _state['fingerprint'] = fingerprint
+    _state['data_version'] = data_version
+    _save_meta(source_path, fingerprint)
+    _log.info("Replica refreshed from %s in %.3f s", source_path, time.perf_counter() - t)
+    return True
+
+
+def refresh_replica(source_path, force: bool = False) -> bool:
+    """Synchronously bring the replica up to date with source_path.
+    Returns True when the replica is usable afterwards.
+    """
+    with _lock:
+        _bind_source(source_path)
+        _state['checked_at'] = time.monotonic()
+        if force or _state['fingerprint'] is None or _is_stale(source_path):
+            _copy_source(source_path)
+        return _state['fingerprint'] is not None and os.path.exists(get_replica_path())
+
+
+def _background_refresh(source_path):
+    try:
+        refresh_replica(source_path)
+    except Exception as e:
+        _log.warning("Background replica refresh failed: %s", e)
+    finally:
+        with _lock:
+            _state['refreshing'] = False
+
+
+def _schedule_refresh(source_path, throttle: bool = True):
+    """Start a background freshness check unless one is already running
+    (throttled to one per CHECK_INTERVAL_SECONDS unless throttle is False)."""
+    with _lock:
+        if _state['refreshing']:
+            return
+        if throttle and time.monotonic() - _state['checked_at'] < CHECK_INTERVAL_SECONDS:
+            return
+        _state['refreshing'] = True
+    threading.Thread(target=_background_refresh, args=(source_path,), daemon=True).start()
+
+
+def connect_replica(source_path):
+    """Return a read-only connection to the local replica of source_path, or None.
+    The first call copies the database synchronously; later calls return the
+    existing copy immediately and check for changes in the background.
+    """
+    if not source_path:
+        return None
+    # Fast path without the lock: a background refresh may be holding it
+    ready = (_state['source'] == source_path and _state['fingerprint'] is not None
+             and os.path.exists(get_replica_path()))
+    if not ready:
+        with _lock:
+            _bind_source(source_path)
+            ready = _state['fingerprint'] is not None and os.path.exists(get_replica_path())
+    if not ready:
+        if not os.path.exists(source_path) or not refresh_replica(source_path, force=True):
+            return None
+    else:
+        _schedule_refresh(source_path)
+    try:
+        return sqlite3.connect(f"file:{get_replica_path()}?mode=ro", uri=True, timeout=READ_TIMEOUT_SECONDS)
+    except sqlite3.Error as e:
+        _log.warning("Cannot open replica: %s", e)
+        return None
+
+
+def has_replica_for(source_path) -> bool:
+    """True when a local copy of source_path exists (usable while the share is down)."""
+    if not source_path:
+        return False
+    with _lock:
+        _bind_source(source_path)
+        return _state['fingerprint'] is not None and os.path.exists(get_replica_path())
+
+
+def open_replica_writable(source_path):
+    """Writable connection to the replica, used to apply writes locally so reads
+    reflect them right away. None if no replica."""
+    if not has_replica_for(source_path):
+        return None
+    try:
+        return sqlite3.connect(get_replica_path(), timeout=READ_TIMEOUT_SECONDS)
+    except sqlite3.Error as e:
+        _log.warning("Cannot open replica for writing: %s", e)
+        return None
+
+
+def apply_to_replica(source_path, apply) -> bool:
+    """Run apply(cursor) against the replica of source_path and commit.
+    Returns True when the replica now contains the write."""
+    conn = open_replica_writable(source_path)
+    if conn is None:
+        return False
+    try:
+        apply(conn.cursor())
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        _log.warning("Applying write to replica failed: %s", e)
+        return False
+    finally:
+        conn.close()
+
+
+def write_snapshot(source_path):
+    """Call while a write transaction on source_path holds its lock, before the commit.
+    Returns a token for mirror_after_write() when the replica matched the shared
+    database up to this write, else None (replica off, behind, or being refreshed)."""
+    if not source_path or not is_replica_enabled():
+        return None
+    # Never wait for a background copy here: the caller holds the shared write lock
+    if not _lock.acquire(blocking=False):
+        return None
+    try:
+        if _state['source'] != source_path or _state['fingerprint'] is None:
+            return None
+        if _source_fingerprint(source_path) != _state['fingerprint']:
+            return None
+        data_version = _read_data_version(source_path)
+        if data_version is None or _state['data_version'] not in (None, data_version):
+            return None
+        return (_state['fingerprint'], data_version)
+    finally:
+        _lock.release()
+
+
+def _adopt_source_state(source_path, snapshot):
+    """After our own write was applied to the replica, take the shared database's new
+    mtime/size and data_version as the replica's, so the write does not look like a
+    foreign change that needs a full copy."""
+    if not _lock.acquire(blocking=False):
+        return
+    try:
+        if _state['source'] != source_path or (_state['fingerprint'], _state['data_version']) not in (
+                snapshot, (snapshot[0], None)):
+            return
+        fingerprint = _source_fingerprint(source_path)
+        data_version = _read_data_version(source_path)
+        if fingerprint is None or data_version is None:
+            return
+        _state['fingerprint'] = fingerprint
+        _state['data_version'] = data_version
+        _save_meta(source_path, fingerprint)
+    finally:
+        _lock.release()
+
+
+def mirror_after_write(source_path, apply=None, snapshot=None):
+    """Repeat a write just committed to the shared database on the replica with
+    apply(cursor), so the change is visible to reads without copying the shared file
+    on the UI thread. With the write_snapshot() token taken before the commit, the
+    replica then counts as up to date with the shared file. Without `apply` (or when
+    it fails) the replica is refreshed in the background instead."""
+    if not source_path or not is_replica_enabled():
+        return
+    try:
+        if apply is not None and apply_to_replica(source_path, apply):
+            if snapshot is not None:
+                _adopt_source_state(source_path, snapshot)
+            return
+    except Exception as e:
+        _log.warning("Mirroring write to replica failed: %s", e)
+    _schedule_refresh(source_path, throttle=False)
+
+
+def warm_up_async(source_path):
+    """Prepare the replica in the background (used at startup)."""
+    if not source_path or not is_replica_enabled():
+        return
+    with _lock:
+        if _state['refreshing']:
+            return
+        _state['refreshing'] = True
+    threading.Thread(target=_background_refresh, args=(source_path,), daemon=True).start()
+
+
+def close_replica():
+    """Release the probe connection and forget the bound source."""
+    with _lock:
+        _close_probe()
+        _state['source'] = None
+        _state['fingerprint'] = None
+        _state['data_version'] = None
+        _state['checked_at'] = 0.0
@@ -0,0 +1,301 @@
+"""
+Materialized per-client, per-month document summary.
+
+DocumentSummary holds, for each client (NIP, or the name when there is no NIP)
+and year/month of the document date, the number of offers and WZ documents and
+the net value of the offers. It covers the documents in the main database
+(archived years leave it together with their rows).
+
+Each document's share is kept in DocumentSummaryItems (client, period and
+net value in whole grosze). Every write to Offers/Wuzetkas replaces the
+document's item and recomputes the affected (client, month) rows from the
+items with the same cursor, i.e. in the same transaction as the write itself,
+so totals are exact integer sums and never drift. The tables are created and
+filled by a one-time migration step at startup (warm_up_async); until then the
+writes skip them. rebuild_summaries() recomputes everything from scratch and
+reports how many entries differed from the incremental state.
+"""
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.data import context_codec
+from src.utils import money
+from src.utils.date_utils import parse_year_month
+
+_log = logging.getLogger(__name__)
+
+KIND_OFFER = 'offer'
+KIND_WZ = 'wz'
+
+# kind -> (table, path column, context column)
+_TABLES = {
+    KIND_OFFER: ('Offers', 'OfferFilePath', 'OfferContext'),
+    KIND_WZ: ('Wuzetkas', 'WzFilePath', 'WzContext'),
+}
+
+_ITEMS = 'DocumentSummaryItems'
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS DocumentSummaryItems (
+        Kind TEXT NOT NULL,
+        FilePath TEXT NOT NULL,
+        ClientKey TEXT NOT NULL,
+        Year INTEGER NOT NULL,
+        Month INTEGER NOT NULL,
+        ClientLabel TEXT,
+        NettoGrosze INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (Kind, FilePath)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_summary_items_period ON DocumentSummaryItems(ClientKey, Year, Month)",
+    """
+    CREATE TABLE IF NOT EXISTS DocumentSummary (
+        ClientKey TEXT NOT NULL,
+        Year INTEGER NOT NULL,
+        Month INTEGER NOT NULL,
+        ClientLabel TEXT,
+        OfferCount INTEGER NOT NULL DEFAULT 0,
+        WzCount INTEGER NOT NULL DEFAULT 0,
+        NettoGrosze INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (ClientKey, Year, Month)
+    )
+    """,
+)
+
+# Summary rows recomputed from the items; the label is the one of the latest written document
+_AGGREGATE = """
+    INSERT INTO DocumentSummary (ClientKey, Year, Month, ClientLabel, OfferCount, WzCount, NettoGrosze)
+    SELECT ClientKey, Year, Month,
+           (SELECT last.ClientLabel FROM DocumentSummaryItems AS last
+            WHERE last.ClientKey = i.ClientKey AND last.Year = i.Year AND last.Month = i.Month
+            ORDER BY last.rowid DESC LIMIT 1),
+           SUM(Kind = 'offer'), SUM(Kind = 'wz'), SUM(NettoGrosze)
+    FROM DocumentSummaryItems AS i
+    WHERE {where}
+    GROUP BY ClientKey, Year, Month
+"""
+
+
+def client_key(nip, name):
+    """(grouping key, display label) of a document's client: NIP digits, or the name."""
+    name = ' '.join(str(name or '').replace('\\n', ' ').split())
+    digits = re.sub(r'\D', '', str(nip or ''))
+    if digits:
+        return digits, f"{name} (NIP {nip})" if name else f"NIP {nip}"
+    return name.casefold(), name or "(bez nazwy)"
+
+
+def _offer_netto(context) -> int:
+    """Net value of an offer in whole grosze."""
+    for key in ('total_netto', 'products_total_netto'):
+        if context.get(key) not in (None, ''):
+            try:
+                return int(money.round_money(context[key]) * 100)
+            except ValueError:
+                pass
+    total = money.ZERO
+    for line in context.get('products') or []:
+        if isinstance(line, list) and len(line) >= 6:
+            try:
+                total += money.parse_amount(line[5])
+            except ValueError:
+                pass
+    return int(money.round_money(total) * 100)
+
+
+def _item(kind, context, rel_path):
+    """(key, year, month, label, netto grosze) of one document, or None."""
+    context = context_codec.decode_or_none(context)
+    if not isinstance(context, dict):
+        context = {}
+    period = parse_year_month(context.get('date'))
+    if period is None:
+        m = re.match(r'^((?:19|20)\d{2})/', str(rel_path or ''))
+        if not m:
+            return None
+        period = (int(m.group(1)), 0)  # month unknown
+    key, label = client_key(context.get('client_nip'), context.get('client_name'))
+    return key, period[0], period[1], label, _offer_netto(context) if kind == KIND_OFFER else 0
+
+
+def _tables_exist(cursor) -> bool:
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (_ITEMS,))
+    return cursor.fetchone()[0] > 0
+
+
+def _recompute(cursor, periods):
+    """Rebuild the DocumentSummary rows of the given (key, year, month) periods from the items."""
+    for key, year, month in set(periods):
+        cursor.execute("DELETE FROM DocumentSummary WHERE ClientKey = ? AND Year = ? AND Month = ?",
+                       (key, year, month))
+        cursor.execute(_AGGREGATE.format(where="ClientKey = ? AND Year = ? AND Month = ?"), (key, year, month))
+
+
+def _compute_items(cursor):
+    """[(kind, path, key, year, month, label, netto grosze)] of all documents."""
+    items = []
+    for kind, (table, path_col, ctx_col) in _TABLES.items():
+        try:
+            rows = cursor.execute(f"SELECT {path_col}, {ctx_col} FROM {table} ORDER BY rowid").fetchall()
+        except sqlite3.Error as e:
+            _log.warning("Summary: reading %s failed: %s", table, e)
+            continue
+        for rel_path, raw in rows:
+            entry = _item(kind, raw, rel_path)
+            if entry is not None:
+                items.append((kind, rel_path) + entry)
+    return items
+
+
+def _fill(cursor, items):
+    cursor.execute(f"DELETE FROM {_ITEMS}")
+    cursor.executemany(
+        f"INSERT OR REPLACE INTO {_ITEMS} (Kind, FilePath, ClientKey, Year, Month, ClientLabel, NettoGrosze) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        items,
+    )
+    cursor.execute("DELETE FROM DocumentSummary")
+    cursor.execute(_AGGREGATE.format(where="1"))
+
+
+def ensure_summary(cursor) -> bool:
+    """Create and fill the summary tables when they are missing (one-time migration step, run
+    through database_service.run_migration). A DocumentSummary of the earlier layout, with
+    float NettoSum totals, is replaced. Returns True when created."""
+    if _tables_exist(cursor):
+        return False
+    cursor.execute("DROP TABLE IF EXISTS DocumentSummary")
+    for statement in _SCHEMA:
+        cursor.execute(statement)
+    _fill(cursor, _compute_items(cursor))
+    return True
+
+
+def _on_database_switched(_new_path):
+    warm_up_async()
+
+
+def warm_up_async():
+    """Create the summary tables in the shared database (in the background) if needed."""
+    from src.data import database_service as dbs
+
+    dbs.add_database_listener(_on_database_switched)
+    threading.Thread(target=dbs.run_migration, args=(ensure_summary, "document summary"),
+                     daemon=True, name='summary-setup').start()
+
+
+def add_document(cursor, kind, context, rel_path):
+    """Record a just inserted/updated document and recompute its client/month row (same
+    transaction as the write). Skipped until the migration step created the tables."""
+    try:
+        if not _tables_exist(cursor):
+            return
+        periods = cursor.execute(
+            f"SELECT ClientKey, Year, Month FROM {_ITEMS} WHERE Kind = ? AND FilePath = ?", (kind, rel_path)
+        ).fetchall()
+        entry = _item(kind, context, rel_path)
+        cursor.execute(f"DELETE FROM {_ITEMS} WHERE Kind = ? AND FilePath = ?", (kind, rel_path))
+        if entry is not None:
+            cursor.execute(
+                f"INSERT INTO {_ITEMS} (Kind, FilePath, ClientKey, Year, Month, ClientLabel, NettoGrosze) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, rel_path) + entry,
+            )
+            periods.append(entry[:3])
+        _recompute(cursor, periods)
+    except sqlite3.Error as e:
+        _log.warning("Summary update failed for %s: %s", rel_path, e)
+
+
+def rename_document(cursor, kind, old_path, new_path):
+    """Follow a document whose stored path was rewritten (same transaction as the update)."""
+    try:
+        if _tables_exist(cursor):
+            cursor.execute(f"UPDATE {_ITEMS} SET FilePath = ? WHERE Kind = ? AND FilePath = ?",
+                           (new_path, kind, old_path))
+    except sqlite3.Error as e:
+        _log.warning("Summary update failed for %s: %s", old_path, e)
+
+
+def remove_documents(cursor, kind, where, params=()):
+    """Drop the documents matching `where` from the summary and recompute their client/month
+    rows; call before deleting or updating them, with the cursor of the same transaction."""
+    table, path_col, _ctx_col = _TABLES[kind]
+    try:
+        if not _tables_exist(cursor):
+            return
+        selection = f"Kind = ? AND FilePath IN (SELECT {path_col} FROM {table} WHERE {where})"
+        periods = cursor.execute(f"SELECT ClientKey, Year, Month FROM {_ITEMS} WHERE {selection}",
+                                 (kind, *params)).fetchall()
+        cursor.execute(f"DELETE FROM {_ITEMS} WHERE {selection}", (kind, *params))
+        _recompute(cursor, periods)
+    except sqlite3.Error as e:
+        _log.warning("Summary update failed for %s: %s", table, e)
+
+
+def rebuild_summaries():
+    """Recompute the summary from scratch. Returns (success, Polish message with the
+    number of entries that differed from the incrementally maintained state)."""
+    from src.data import database_service as dbs
+
+    path = dbs.get_database_path()
+    if not dbs.check_database_file(path):
+        return False, "Baza danych jest niedostępna."
+    if dbs.run_migration(ensure_summary, "document summary"):
+        return True, "Podsumowania utworzone od nowa."
+    try:
+        conn = sqlite3.connect(path, timeout=10)
+        try:
+            with conn:
+                cursor = conn.cursor()
+                current = {
+                    (key, year, month): (offers, wz, netto)
+                    for key, year, month, offers, wz, netto in cursor.execute(
+                        "SELECT ClientKey, Year, Month, OfferCount, WzCount, NettoGrosze FROM DocumentSummary")
+                }
+                items = _compute_items(cursor)
+                fresh = {}
+                for kind, _path, key, year, month, _label, netto in items:
+                    offers, wz, total = fresh.get((key, year, month), (0, 0, 0))
+                    fresh[(key, year, month)] = (offers + (kind == KIND_OFFER), wz + (kind == KIND_WZ), total + netto)
+                differences = sum(1 for k in current.keys() | fresh.keys() if current.get(k) != fresh.get(k))
+                _fill(cursor, items)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return False, f"Nie udało się przeliczyć podsumowań: {e}"
+    dbs._mirror_write()
+    if differences:
+        return True, f"Podsumowania przeliczone. Poprawiono wpisów: {differences}."
+    return True, "Podsumowania przeliczone. Wszystkie wpisy były zgodne."
+
+
+def get_summary(year_from, year_to):
+    """Summary rows (label, year, month, offers, wz, netto as Decimal) for the given years, read
+    through the regular read connection. Empty when the tables do not exist yet."""
+    from src.data import database_service as dbs
+
+    conn = dbs._connect_for_read()
+    if conn is None:
+        return []
+    try:
+        rows = conn.execute(
+            "SELECT ClientLabel, Year, Month, OfferCount, WzCount, NettoGrosze FROM DocumentSummary "
+            "WHERE Year BETWEEN ? AND ? AND (OfferCount > 0 OR WzCount > 0) "
+            "ORDER BY Year, Month, NettoGrosze DESC",
+            (year_from, year_to),
+        ).fetchall()
+    except sqlite3.Error:
+        return []
+    finally:
+        conn.close()
+    return [(label, year, month, offers, wz, money.parse_amount(netto or 0).scaleb(-2))
+            for label, year, month, offers, wz, netto in rows]
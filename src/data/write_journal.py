@@ -0,0 +1,235 @@
+"""
+Durable local journal of database writes made while the shared database is unreachable.
+
+Entries are kept in a small SQLite file in the local data directory and replayed
+in insertion order by a background sync worker once the shared database is back
+(see database_service.sync_pending_writes). Entries that cannot be applied, e.g.
+because another user already took the same order number, stay in the journal
+with status 'conflict' until the user retries or discards them
+(ui/windows/offline_conflicts_window.py).
+"""
+import datetime
+import json
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import threading
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.config import get_data_dir
+
+_log = logging.getLogger(__name__)
+
+JOURNAL_FILENAME = 'pending_writes.db'
+# Seconds between sync attempts while there is something to replay
+SYNC_INTERVAL_SECONDS = 15.0
+
+STATUS_PENDING = 'pending'
+STATUS_CONFLICT = 'conflict'
+
+# Journal entry kinds
+OFFER_INSERT = 'offer_insert'
+WZ_INSERT = 'wz_insert'
+OFFER_CONTEXT_UPDATE = 'offer_context_update'
+WZ_CONTEXT_UPDATE = 'wz_context_update'
+CLIENT_ADD = 'client_add'
+CLIENT_UPDATE = 'client_update'
+CLIENT_EXTENDED_UPDATE = 'client_extended_update'
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_events = queue.Queue()
+_worker = None
+
+
+def get_journal_path() -> str:
+    """Path of the local journal database."""
+    return os.path.join(get_data_dir(), JOURNAL_FILENAME)
+
+
+def _connect():
+    conn = sqlite3.connect(get_journal_path(), timeout=10)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS PendingWrites (
+            Id INTEGER PRIMARY KEY AUTOINCREMENT,
+            Kind TEXT NOT NULL,
+            Payload TEXT NOT NULL,
+            TargetDb TEXT NOT NULL,
+            CreatedAt TEXT NOT NULL,
+            Status TEXT NOT NULL DEFAULT 'pending',
+            Attempts INTEGER NOT NULL DEFAULT 0,
+            LastError TEXT
+        )
+        """
+    )
+    return conn
+
+
+def enqueue(kind: str, payload: dict, target_db: str) -> bool:
+    """Append a write to the journal. Returns True when it was stored durably."""
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute(
+                "INSERT INTO PendingWrites (Kind, Payload, TargetDb, CreatedAt) VALUES (?, ?, ?, ?)",
+                (kind, json.dumps(payload, ensure_ascii=False, default=str), target_db,
+                 datetime.datetime.now().isoformat(timespec='seconds')),
+            )
+            conn.commit()
+            conn.close()
+        _log.info("Queued offline write %s for %s", kind, target_db)
+        _wake.set()
+        return True
+    except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+        _log.error("Could not queue offline write %s: %s", kind, e)
+        return False
+
+
+def _fetch(sql, params=()):
+    if not os.path.exists(get_journal_path()):
+        return []
+    try:
+        with _lock:
+            conn = _connect()
+            rows = conn.execute(sql, params).fetchall()
+            conn.close()
+        return rows
+    except sqlite3.Error as e:
+        _log.warning("Journal read failed: %s", e)
+        return []
+
+
+def get_pending(target_db: str):
+    """Return pending entries for target_db as (id, kind, payload) in replay order."""
+    rows = _fetch(
+        "SELECT Id, Kind, Payload FROM PendingWrites WHERE TargetDb = ? AND Status = ? ORDER BY Id",
+        (target_db, STATUS_PENDING),
+    )
+    return [(r[0], r[1], json.loads(r[2])) for r in rows]
+
+
+def count_pending(target_db: str = None) -> int:
+    """Number of entries still waiting to be replayed."""
+    if target_db is None:
+        rows = _fetch("SELECT COUNT(*) FROM PendingWrites WHERE Status = ?", (STATUS_PENDING,))
+    else:
+        rows = _fetch("SELECT COUNT(*) FROM PendingWrites WHERE TargetDb = ? AND Status = ?",
+                      (target_db, STATUS_PENDING))
+    return rows[0][0] if rows else 0
+
+
+def get_conflicts(target_db: str = None):
+    """Return unresolved conflicts as (id, kind, payload, created_at, last_error)."""
+    if target_db is None:
+        rows = _fetch("SELECT Id, Kind, Payload, CreatedAt, LastError FROM PendingWrites WHERE Status = ? ORDER BY Id",
+                      (STATUS_CONFLICT,))
+    else:
+        rows = _fetch("SELECT Id, Kind, Payload, CreatedAt, LastError FROM PendingWrites "
+                      "WHERE TargetDb = ? AND Status = ? ORDER BY Id", (target_db, STATUS_CONFLICT))
+    return [(r[0], r[1], json.loads(r[2]), r[3], r[4]) for r in rows]
+
+
+def get_pending_payloads(kind: str, target_db: str):
+    """Payloads of pending entries of one kind (used to show offline work in lists)."""
+    return [payload for _id, k, payload in get_pending(target_db) if k == kind]
+
+
+def max_pending_order_number(kind: str, year: int, target_db: str) -> int:
+    """Highest order number reserved by pending inserts of `kind` in `year` (0 if none)."""
+    best = 0
+    for payload in get_pending_payloads(kind, target_db):
+        try:
+            if int(payload.get('year')) == int(year):
+                best = max(best, int(payload.get('order_number') or 0))
+        except (TypeError, ValueError):
+            continue
+    return best
+
+
+def _update(sql, params):
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute(sql, params)
+            conn.commit()
+            conn.close()
+    except sqlite3.Error as e:
+        _log.error("Journal update failed: %s", e)
+
+
+def mark_done(entry_id: int):
+    """Remove an entry after it has been applied to the shared database."""
+    _update("DELETE FROM PendingWrites WHERE Id = ?", (entry_id,))
+
+
+def mark_conflict(entry_id: int, message: str):
+    """Park an entry that cannot be applied automatically."""
+    _update("UPDATE PendingWrites SET Status = ?, LastError = ?, Attempts = Attempts + 1 WHERE Id = ?",
+            (STATUS_CONFLICT, message, entry_id))
+
+
+def mark_attempt_failed(entry_id: int, message: str):
+    """Record a transient failure; the entry stays pending."""
+    _update("UPDATE PendingWrites SET LastError = ?, Attempts = Attempts + 1 WHERE Id = ?",
+            (message, entry_id))
+
+
+def discard_entry(entry_id: int):
+    """Drop a conflicting entry after the user resolved it manually."""
+    mark_done(entry_id)
+
+
+def retry_entry(entry_id: int):
+    """Put a conflicting entry back in the queue (e.g. after the cause was fixed in the database)."""
+    _update("UPDATE PendingWrites SET Status = ? WHERE Id = ? AND Status = ?",
+            (STATUS_PENDING, entry_id, STATUS_CONFLICT))
+    _wake.set()
+
+
+# ------------------------------
+# Background sync
+# ------------------------------
+
+def _sync_loop(interval):
+    while True:
+        _wake.wait(interval)
+        _wake.clear()
+        try:
+            if count_pending() == 0:
+                continue
+            from src.data.database_service import sync_pending_writes
+            result = sync_pending_writes()
+            if result.get('synced') or result.get('conflicts'):
+                _events.put(result)
+        except Exception as e:
+            _log.warning("Offline write sync failed: %s", e)
+
+
+def start_sync_worker(interval: float = SYNC_INTERVAL_SECONDS):
+    """Start the daemon thread that replays the journal (idempotent)."""
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    _worker = threading.Thread(target=_sync_loop, args=(interval,), daemon=True, name='write-journal-sync')
+    _worker.start()
+    _wake.set()
+
+
+def request_sync():
+    """Ask the worker to try syncing now instead of waiting for the next interval."""
+    _wake.set()
+
+
+def drain_events():
+    """Return sync results produced since the last call (for the UI thread)."""
+    items = []
+    while True:
+        try:
+            items.append(_events.get_nowait())
+        except queue.Empty:
+            return items
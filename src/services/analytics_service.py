@@ -0,0 +1,265 @@
+"""
+Quote analytics: offer line items aggregated per client, month and product.
+
+The offer contexts of the years in the range are read in one SQL pass per
+database (the main one and the archive databases of archived years) and
+decoded with context_codec. Month and client are resolved once per offer; the
+month comes from date_utils.parse_year_month, since offers saved from the form
+store their date as text ('13 listopada 2025').
+The line items are stored column by column in `array` buffers: int64 group
+codes and float64 quantities and values. Group sums are then single bincount
+calls when NumPy is installed, or one tight loop per column without it.
+"""
+import logging
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+from array import array
+from dataclasses import dataclass, field
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.data import archive_service, context_codec
+from src.data.summary_service import client_key
+from src.utils.date_utils import parse_year_month
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python aggregation is used instead
+    np = None
+
+_log = logging.getLogger(__name__)
+
+_MONTH = re.compile(r'^\d{4}-\d{2}$')
+
+_CONTEXTS_SQL = "SELECT rowid, OfferContext FROM Offers WHERE OfferYearNumber BETWEEN ? AND ?"
+
+
+@dataclass
+class LineItems:
+    """Offer line items as parallel columns; group columns hold indexes into the label lists."""
+    month: array = field(default_factory=lambda: array('q'))
+    client: array = field(default_factory=lambda: array('q'))
+    product: array = field(default_factory=lambda: array('q'))
+    offer: array = field(default_factory=lambda: array('q'))
+    quantity: array = field(default_factory=lambda: array('d'))
+    value: array = field(default_factory=lambda: array('d'))
+    months: list = field(default_factory=list)
+    clients: list = field(default_factory=list)
+    products: list = field(default_factory=list)
+    offer_count: int = 0
+
+    def __len__(self):
+        return len(self.value)
+
+
+@dataclass
+class SummaryRow:
+    label: str
+    offers: int
+    items: int
+    quantity: float
+    value: float
+
+
+@dataclass
+class AnalyticsReport:
+    date_from: str
+    date_to: str
+    items: int = 0
+    offers: int = 0
+    total_value: float = 0.0
+    by_client: list = field(default_factory=list)
+    by_month: list = field(default_factory=list)
+    by_product: list = field(default_factory=list)
+    load_seconds: float = 0.0
+    aggregate_seconds: float = 0.0
+
+
+# ------------------------------
+# Loading
+# ------------------------------
+
+def _amount(value):
+    """Float of a stored amount ('1 234,50', '2', 3.5); None when it cannot be read."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(' ', '').replace('\u00A0', '').replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def _month_of(date, cache):
+    """'YYYY-MM' of a stored offer date (None when unreadable); `cache` maps raw dates."""
+    key = str(date or '')
+    if key not in cache:
+        period = parse_year_month(date)
+        cache[key] = f"{period[0]:04d}-{period[1]:02d}" if period else None
+    return cache[key]
+
+
+def _append_rows(items, rows, source, month_from, month_to, codes):
+    """Decode the contexts and append their line items. Month, client and offer codes
+    are resolved once per document, only the product code per line."""
+    month_codes, client_codes, product_codes, offer_codes = codes
+    month_col, client_col, product_col, offer_col = items.month, items.client, items.product, items.offer
+    quantity_col, value_col = items.quantity, items.value
+    month_cache = {}
+    for rowid, raw in rows:
+        context = context_codec.decode_or_none(raw)
+        if not isinstance(context, dict):
+            continue
+        month = _month_of(context.get('date'), month_cache)
+        products = context.get('products')
+        if not (month and month_from <= month <= month_to and isinstance(products, list)):
+            continue
+
+        month_code = month_codes.get(month)
+        if month_code is None:
+            month_code = month_codes[month] = len(items.months)
+            items.months.append(month)
+        key, label = client_key(context.get('client_nip'), context.get('client_name'))
+        client_code = client_codes.get(key)
+        if client_code is None:
+            client_code = client_codes[key] = len(items.clients)
+            items.clients.append(label)
+        offer_code = offer_codes.setdefault((source, rowid), len(offer_codes))
+
+        for line in products:
+            if not isinstance(line, list) or len(line) < 5:
+                continue
+            name = ' '.join(str(line[1] or '').replace('\\n', ' ').split())
+            key = name.casefold()
+            product_code = product_codes.get(key)
+            if product_code is None:
+                product_code = product_codes[key] = len(items.products)
+                items.products.append(name)
+            quantity = _amount(line[3]) or 0.0
+            value = _amount(line[5]) if len(line) > 5 else None
+            if value is None:
+                value = quantity * (_amount(line[4]) or 0.0)
+            month_col.append(month_code)
+            client_col.append(client_code)
+            product_col.append(product_code)
+            offer_col.append(offer_code)
+            quantity_col.append(quantity)
+            value_col.append(value)
+
+
+def load_line_items(conn, month_from, month_to, archive_dbs=()):
+    """Line items of offers dated within [month_from, month_to] ('YYYY-MM')."""
+    items = LineItems()
+    codes = ({}, {}, {}, {})
+    years = (int(month_from[:4]), int(month_to[:4]))
+    for source, db in enumerate([conn] + list(archive_dbs)):
+        try:
+            rows = db.execute(_CONTEXTS_SQL, years).fetchall()
+        except sqlite3.Error as e:
+            _log.warning("Reading offers for analytics failed: %s", e)
+            continue
+        _append_rows(items, rows, source, month_from, month_to, codes)
+    items.offer_count = len(codes[3])
+    return items
+
+
+# ------------------------------
+# Aggregation
+# ------------------------------
+
+def _group_sum(codes, weights, size):
+    if np is not None and size:
+        return np.bincount(np.frombuffer(codes, dtype=np.int64), weights=np.frombuffer(weights, dtype=np.float64),
+                           minlength=size).tolist()
+    sums = [0.0] * size
+    for code, weight in zip(codes, weights):
+        sums[code] += weight
+    return sums
+
+
+def _group_count(codes, size):
+    if np is not None and size:
+        return np.bincount(np.frombuffer(codes, dtype=np.int64), minlength=size).tolist()
+    counts = [0] * size
+    for code in codes:
+        counts[code] += 1
+    return counts
+
+
+def _group_distinct(codes, values, size):
+    """Number of distinct `values` per group code."""
+    if np is not None and size:
+        groups = np.frombuffer(codes, dtype=np.int64)
+        members = np.frombuffer(values, dtype=np.int64)
+        width = int(members.max()) + 1
+        return np.bincount(np.unique(groups * width + members) // width, minlength=size).tolist()
+    counts = [0] * size
+    for code, _value in set(zip(codes, values)):
+        counts[code] += 1
+    return counts
+
+
+def _summarize(items, codes, labels, sort_by_label=False):
+    size = len(labels)
+    values = _group_sum(codes, items.value, size)
+    quantities = _group_sum(codes, items.quantity, size)
+    counts = _group_count(codes, size)
+    offers = _group_distinct(codes, items.offer, size)
+    rows = [SummaryRow(labels[i], offers[i], counts[i], quantities[i], values[i]) for i in range(size)]
+    if sort_by_label:
+        rows.sort(key=lambda r: r.label)
+    else:
+        rows.sort(key=lambda r: (-r.value, r.label))
+    return rows
+
+
+def aggregate(items, month_from='', month_to=''):
+    """Per-client, per-month and per-product sums of the loaded line items."""
+    report = AnalyticsReport(date_from=month_from, date_to=month_to)
+    report.items = len(items)
+    report.offers = items.offer_count
+    report.total_value = math.fsum(items.value)
+    report.by_client = _summarize(items, items.client, items.clients)
+    report.by_month = _summarize(items, items.month, items.months, sort_by_label=True)
+    report.by_product = _summarize(items, items.product, items.products)
+    return report
+
+
+def compute_report(month_from, month_to):
+    """Load and aggregate the offers between two months ('YYYY-MM', inclusive)."""
+    from src.data import database_service as dbs
+
+    if not (_MONTH.match(month_from or '') and _MONTH.match(month_to or '')):
+        raise ValueError("Podaj miesiące w formacie RRRR-MM")
+    if month_from > month_to:
+        month_from, month_to = month_to, month_from
+
+    t = time.perf_counter()
+    conn = dbs._connect_for_read()
+    if conn is None:
+        raise sqlite3.OperationalError("Baza danych jest niedostępna")
+    archives = []
+    try:
+        db_path = dbs.get_database_path()
+        for year in range(int(month_from[:4]), int(month_to[:4]) + 1):
+            path = archive_service.archive_db_path(db_path, year)
+            if os.path.exists(path):
+                archives.append(sqlite3.connect(f"file:{path}?mode=ro", uri=True))
+        items = load_line_items(conn, month_from, month_to, archives)
+    finally:
+        conn.close()
+        for archive in archives:
+            archive.close()
+    load_seconds = time.perf_counter() - t
+
+    t = time.perf_counter()
+    report = aggregate(items, month_from, month_to)
+    report.load_seconds = load_seconds
+    report.aggregate_seconds = time.perf_counter() - t
+    _log.info("Analytics %s..%s: %d items in %.3f s + %.3f s", month_from, month_to, report.items,
+              report.load_seconds, report.aggregate_seconds)
+    return report
@@ -0,0 +1,241 @@
+"""
+Consistency check between the Offers/Wuzetkas tables and the document folders.
+
+The offers and WZ roots are listed with os.scandir, one directory per task on a
+small thread pool (network shares answer directory listings slowly but in
+parallel). Each table is read with a single query, and the rows and files are
+compared in one pass over the collected sets. The check reports:
+  - rows whose document file does not exist,
+  - .docx files on disk that no row points to,
+  - paths not stored as 'YYYY/filename.docx' or with a year that differs from
+    the row's year column,
+  - order numbers used more than once within a year.
+
+Optional repair only rewrites paths that can be resolved unambiguously: a bad
+or stale path is replaced by 'YYYY/filename.docx' when exactly one file with
+that name exists in the row's year folder and no other row points to it. Rows and files are
+never deleted.
+"""
+import logging
+import os
+import re
+import sqlite3
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.config import get_offers_folder, get_wz_folder
+from src.data import quick_open_service, summary_service
+
+_log = logging.getLogger(__name__)
+
+SCAN_WORKERS = 8
+ARCHIVE_DIRNAME = 'Archiwum'
+
+_VALID_PATH = re.compile(r'^((?:19|20)\d{2})/[^/]+\.docx$')
+
+# kind -> (label, table, year column, order column, path column)
+_KINDS = {
+    'offer': ('Oferty', 'Offers', 'OfferYearNumber', 'OfferOrderNumber', 'OfferFilePath'),
+    'wz': ('WZ', 'Wuzetkas', 'WzYearNumber', 'WzOrderNumber', 'WzFilePath'),
+}
+
+
+@dataclass
+class KindReport:
+    """Findings for one document kind."""
+    label: str
+    rows: int = 0
+    files: int = 0
+    missing_files: list = field(default_factory=list)     # DB paths without a file
+    orphan_files: list = field(default_factory=list)      # files without a DB row
+    bad_paths: list = field(default_factory=list)         # (DB path, reason)
+    duplicate_numbers: list = field(default_factory=list) # (year, number, [paths])
+    repaired: list = field(default_factory=list)          # (old path, new path)
+
+    @property
+    def problem_count(self) -> int:
+        return (len(self.missing_files) + len(self.orphan_files) + len(self.bad_paths)
+                + len(self.duplicate_numbers))
+
+
+@dataclass
+class ConsistencyReport:
+    kinds: dict = field(default_factory=dict)   # kind -> KindReport
+    errors: list = field(default_factory=list)
+
+    @property
+    def problem_count(self) -> int:
+        return sum(k.problem_count for k in self.kinds.values())
+
+    def to_text(self) -> str:
+        lines = ["Raport spójności bazy i dokumentów", "=" * 60]
+        for report in self.kinds.values():
+            lines.append("")
+            lines.append(f"[{report.label}] wpisy w bazie: {report.rows}, pliki na dysku: {report.files}")
+            sections = (
+                ("Wpisy bez pliku", report.missing_files),
+                ("Pliki bez wpisu w bazie", report.orphan_files),
+                ("Nieprawidłowe ścieżki", [f"{p} ({reason})" for p, reason in report.bad_paths]),
+                ("Powtórzone numery", [f"{year}/{number}: {', '.join(paths)}"
+                                       for year, number, paths in report.duplicate_numbers]),
+                ("Naprawione ścieżki", [f"{old} -> {new}" for old, new in report.repaired]),
+            )
+            for title, items in sections:
+                lines.append(f"{title}: {len(items)}")
+                lines.extend(f" - {item}" for item in items)
+        if self.errors:
+            lines.append("")
+            lines.append("Błędy:")
+            lines.extend(f" - {e}" for e in self.errors)
+        lines.append("")
+        lines.append("Koniec raportu.")
+        return '\n'.join(lines)
+
+
+# ------------------------------
+# Scanning
+# ------------------------------
+
+def _list_dir(path):
+    """(files, subdirectories) names of one directory."""
+    files, dirs = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                dirs.append(entry.name)
+            elif entry.name.lower().endswith('.docx') and not entry.name.startswith('~$'):
+                files.append(entry.name)
+    return files, dirs
+
+
+def scan_documents(root, executor):
+    """Relative paths ('YYYY/name' or 'name' for legacy root files) of all .docx under root.
+    Year folders are listed in parallel on `executor`, which must not be the pool running
+    this call; the archive folder is skipped."""
+    files, dirs = _list_dir(root)
+    found = set(files)
+    years = [d for d in dirs if d != ARCHIVE_DIRNAME]
+    for year, (year_files, _subdirs) in zip(years, executor.map(_list_dir, [os.path.join(root, y) for y in years])):
+        found.update(f"{year}/{name}" for name in year_files)
+    return found
+
+
+def _read_rows(conn, kind):
+    _label, table, year_col, order_col, path_col = _KINDS[kind]
+    cols = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+    year_expr = year_col if year_col in cols else 'NULL'
+    return conn.execute(f"SELECT rowid, {year_expr}, {order_col}, {path_col} FROM {table}").fetchall()
+
+
+def _check_kind(kind, rows, files):
+    report = KindReport(label=_KINDS[kind][0], rows=len(rows), files=len(files))
+    by_name = defaultdict(list)
+    for rel in files:
+        by_name[os.path.basename(rel)].append(rel)
+
+    db_paths = set()
+    numbers = defaultdict(list)
+    repairs = {}
+    for rowid, year, number, raw_path in rows:
+        path = (raw_path or '').replace('\\', '/').strip('/')
+        db_paths.add(path)
+        if year is not None and number is not None:
+            numbers[(year, number)].append(path)
+        match = _VALID_PATH.match(path)
+        if not match:
+            report.bad_paths.append((raw_path, "oczekiwano RRRR/nazwa.docx"))
+        elif year is not None and int(match.group(1)) != int(year):
+            report.bad_paths.append((raw_path, f"rok w ścieżce różny od roku wpisu ({year})"))
+        if path not in files:
+            report.missing_files.append(raw_path)
+        if (not match or path not in files) and raw_path:
+            candidates = [c for c in by_name.get(os.path.basename(path), [])
+                          if year is None or c.startswith(f"{year}/")]
+            if len(candidates) == 1 and candidates[0] != path:
+                repairs[rowid] = (raw_path, candidates[0])
+
+    report.orphan_files = sorted(files - db_paths)
+    report.duplicate_numbers = [(year, number, paths) for (year, number), paths in sorted(numbers.items())
+                                if len(paths) > 1]
+    # A candidate claimed by another row (or by two repairs) is not safe to assign
+    targets = defaultdict(int)
+    for _old, new in repairs.values():
+        targets[new] += 1
+    safe = {rowid: pair for rowid, pair in repairs.items() if pair[1] not in db_paths and targets[pair[1]] == 1}
+    return report, safe
+
+
+def _apply_repairs(conn, kind, repairs, report):
+    _label, table, _year_col, _order_col, path_col = _KINDS[kind]
+    with conn:
+        for rowid, (old, new) in repairs.items():
+            conn.execute(f"UPDATE {table} SET {path_col} = ? WHERE rowid = ?", (new, rowid))
+            # The summary items are keyed by path: move them along in the same transaction
+            summary_service.rename_document(conn.cursor(), kind, old, new)
+            report.repaired.append((old, new))
+    # Repaired rows are no longer missing, and their files no longer orphaned
+    fixed_old = {old for old, _new in report.repaired}
+    fixed_new = {new for _old, new in report.repaired}
+    report.missing_files = [p for p in report.missing_files if p not in fixed_old]
+    report.bad_paths = [(p, reason) for p, reason in report.bad_paths if p not in fixed_old]
+    report.orphan_files = [p for p in report.orphan_files if p not in fixed_new]
+
+
+def run_check(repair=False, progress_cb=None) -> ConsistencyReport:
+    """Compare the database with the offers and WZ folders; optionally repair resolvable paths."""
+    from src.data import database_service
+
+    def report_progress(message):
+        if progress_cb:
+            progress_cb(message)
+
+    result = ConsistencyReport()
+    db_path = database_service.get_database_path()
+    if not database_service.check_database_file(db_path):
+        result.errors.append("Baza danych jest niedostępna.")
+        return result
+
+    roots = {'offer': get_offers_folder(), 'wz': get_wz_folder()}
+    # One task per root, each waiting for its year folder listings on a separate pool:
+    # tasks never wait for other tasks of their own pool
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as year_pool, \
+            ThreadPoolExecutor(max_workers=len(roots)) as executor:
+        report_progress("Skanowanie folderów...")
+        scans = {kind: executor.submit(scan_documents, root, year_pool)
+                 for kind, root in roots.items() if root and os.path.isdir(root)}
+        conn = sqlite3.connect(db_path)
+        try:
+            report_progress("Odczyt bazy danych...")
+            rows = {}
+            for kind in _KINDS:
+                try:
+                    rows[kind] = _read_rows(conn, kind)
+                except sqlite3.Error as e:
+                    result.errors.append(f"{_KINDS[kind][0]}: {e}")
+            for kind in _KINDS:
+                if kind not in rows:
+                    continue
+                if kind not in scans:
+                    result.errors.append(f"{_KINDS[kind][0]}: folder {roots[kind]!r} jest niedostępny")
+                    continue
+                try:
+                    files = scans[kind].result()
+                except OSError as e:
+                    result.errors.append(f"{_KINDS[kind][0]}: {e}")
+                    continue
+                report, repairs = _check_kind(kind, rows[kind], files)
+                if repair and repairs:
+                    report_progress(f"Naprawa ścieżek ({report.label})...")
+                    _apply_repairs(conn, kind, repairs, report)
+                result.kinds[kind] = report
+        finally:
+            conn.close()
+    if repair and any(r.repaired for r in result.kinds.values()):
+        database_service._mirror_write()
+        quick_open_service.invalidate()
+    return result
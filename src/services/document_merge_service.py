@@ -0,0 +1,105 @@
+"""
+Merging a selection of offers or WZ documents into one file for printing and archiving.
+
+Documents are appended one at a time: each source .docx is opened, appended
+to the combined document with docxcompose and released before the next one is
+read, so only the combined output and a single source are ever in memory. The
+generated .docx files are used as they are; nothing is re-rendered from the
+database.
+
+PDF output is produced from the combined .docx with LibreOffice when it is
+installed. Without LibreOffice (or docxcompose) the built-in renderer writes
+the PDF page by page, appending each source document to the file and
+discarding its pages.
+
+The result is assembled in a local temp folder and then copied to the chosen
+location in one sequential write.
+"""
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.services import pdf_export_service
+
+_log = logging.getLogger(__name__)
+
+FORMAT_DOCX = 'docx'
+FORMAT_PDF = 'pdf'
+
+
+def is_docx_merge_available() -> bool:
+    """True when docxcompose (optional dependency) is installed."""
+    try:
+        import docxcompose  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _progress(progress_cb, done, total):
+    if progress_cb:
+        progress_cb(done, total)
+
+
+def _compose_docx(paths, output_path, progress_cb=None):
+    """Append the documents one by one into output_path (page break between them)."""
+    from docx import Document
+    from docxcompose.composer import Composer
+
+    composer = Composer(Document(paths[0]))
+    _progress(progress_cb, 1, len(paths))
+    for index, path in enumerate(paths[1:], 2):
+        source = Document(path)
+        composer.doc.add_page_break()
+        composer.append(source)
+        del source
+        _progress(progress_cb, index, len(paths))
+    composer.save(output_path)
+
+
+def _render_pdf_builtin(paths, output_path, progress_cb=None):
+    """Write the built-in rendering of every document into one PDF, one document at a time."""
+    for index, path in enumerate(paths, 1):
+        pdf_export_service._render_builtin(path, output_path, append=index > 1)
+        _progress(progress_cb, index, len(paths))
+
+
+def merge_documents(paths, output_path, progress_cb=None):
+    """
+    Merge documents into output_path (.docx or .pdf, by extension).
+    progress_cb(done, total) is called from the calling thread after each document.
+    Returns (success, message).
+    """
+    paths = [p for p in paths if p and os.path.isfile(p)]
+    if not paths:
+        return False, "Brak dokumentów do połączenia."
+    output_format = FORMAT_PDF if output_path.lower().endswith('.pdf') else FORMAT_DOCX
+    if output_format == FORMAT_DOCX and not is_docx_merge_available():
+        return False, "Łączenie do pliku Word wymaga pakietu docxcompose."
+
+    work_dir = tempfile.mkdtemp(prefix='merge_')
+    try:
+        local_output = os.path.join(work_dir, f"merged.{output_format}")
+        if output_format == FORMAT_DOCX:
+            _compose_docx(paths, local_output, progress_cb)
+        elif pdf_export_service.find_soffice() and is_docx_merge_available():
+            combined = os.path.join(work_dir, 'merged.docx')
+            _compose_docx(paths, combined, progress_cb)
+            pdf_export_service.convert_file(combined, local_output)
+        else:
+            _render_pdf_builtin(paths, local_output, progress_cb)
+
+        partial = output_path + '.part'
+        shutil.copyfile(local_output, partial)
+        os.replace(partial, output_path)
+        return True, f"Połączono dokumenty: {len(paths)}\nZapisano: {output_path}"
+    except Exception as e:
+        _log.warning("Merging %d documents into %s failed: %s", len(paths), output_path, e)
+        return False, f"Nie udało się połączyć dokumentów: {e}"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,283 @@
+"""
+Lightweight text previews of generated offers and WZ documents for the browse frames.
+
+A preview is built from the context stored in the database (OfferContext/WzContext)
+or, when a document has no stored context, from the text of the docx itself.
+Rendering runs in a single background worker; finished previews are cached on
+disk in the local data directory, keyed by a hash of the file path, size and
+modification time (pruned by age and count when the worker starts), and kept in
+a small in-memory LRU for the current session. Each result queue (browse frame)
+keeps only its newest pending request.
+The UI thread calls request_preview() with its own queue and polls it with after().
+Archived documents are extracted from their year zip by the worker when requested.
+"""
+import collections
+import hashlib
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import zipfile
+from xml.etree import ElementTree
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.config import get_data_dir
+
+_log = logging.getLogger(__name__)
+
+PREVIEW_CACHE_DIRNAME = 'previews'
+# Bump when the preview layout changes so old cache files are not reused
+PREVIEW_FORMAT_VERSION = 1
+MEMORY_CACHE_SIZE = 300
+MAX_PREVIEW_PRODUCTS = 15
+MAX_DOCX_LINES = 60
+# Disk cache limits, applied when the worker starts
+PREVIEW_CACHE_MAX_FILES = 5000
+PREVIEW_CACHE_MAX_AGE_DAYS = 90
+
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+_lock = threading.Condition()
+_pending = collections.OrderedDict()      # result queue -> (path, kind), newest user request per queue
+_prefetch = collections.OrderedDict()     # path -> kind, background warm-up
+_memory = collections.OrderedDict()       # path -> (fingerprint, text)
+_worker = None
+
+
+def _cache_dir() -> str:
+    path = os.path.join(get_data_dir(), PREVIEW_CACHE_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _prune_cache():
+    """Drop cached previews older than PREVIEW_CACHE_MAX_AGE_DAYS and all but the newest
+    PREVIEW_CACHE_MAX_FILES (every file version gets its own cache file)."""
+    try:
+        with os.scandir(_cache_dir()) as entries:
+            files = [(entry.stat().st_mtime, entry.path) for entry in entries if entry.is_file()]
+    except OSError as e:
+        _log.warning("Could not list the preview cache: %s", e)
+        return
+    files.sort(reverse=True)
+    cutoff = time.time() - PREVIEW_CACHE_MAX_AGE_DAYS * 86400
+    removed = 0
+    for index, (mtime, path) in enumerate(files):
+        if index >= PREVIEW_CACHE_MAX_FILES or mtime < cutoff:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+    if removed:
+        _log.info("Preview cache: removed %d old files", removed)
+
+
+def _fingerprint(file_path):
+    """Cache key of the current file version, or None when the file is not reachable."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    raw = f"{PREVIEW_FORMAT_VERSION}|{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+# ------------------------------
+# Rendering
+# ------------------------------
+
+def _first_line(value) -> str:
+    return str(value or '').strip().split('\n')[0].strip()
+
+
+def _product_fields(product):
+    """(name, unit, qty, unit_price, total) from a stored product row (list or dict)."""
+    if isinstance(product, dict):
+        return (product.get('pname') or product.get('name') or product.get('product_name', ''),
+                product.get('unit', ''), product.get('qty') or product.get('quantity', ''),
+                product.get('unit_price', ''), product.get('total', ''))
+    row = list(product) + [''] * 6
+    return row[1], row[2], row[3], row[4], row[5]
+
+
+def render_context_preview(kind: str, context: dict) -> str:
+    """Plain-text summary of a stored document context."""
+    lines = []
+    if kind == 'offer':
+        lines.append(f"Oferta: {context.get('offer_number') or '-'}")
+    else:
+        lines.append(f"WZ: {context.get('wz_number') or '-'}")
+    if context.get('date'):
+        lines.append(f"Data: {context.get('date')}")
+    client = _first_line(context.get('client_name'))
+    if client:
+        nip = context.get('client_nip')
+        lines.append(f"Klient: {client}" + (f" (NIP {nip})" if nip else ''))
+    supplier = _first_line(context.get('supplier_name'))
+    if supplier:
+        lines.append(f"Dostawca: {supplier}")
+
+    products = context.get('products') or []
+    lines.append('')
+    lines.append(f"Pozycje ({len(products)}):")
+    for index, product in enumerate(products[:MAX_PREVIEW_PRODUCTS], 1):
+        name, unit, qty, unit_price, total = _product_fields(product)
+        line = f"{index}. {_first_line(name)} – {qty} {unit}".rstrip()
+        if kind == 'offer' and total:
+            line += f" × {unit_price} = {total}"
+        lines.append(line)
+    if len(products) > MAX_PREVIEW_PRODUCTS:
+        lines.append(f"... i {len(products) - MAX_PREVIEW_PRODUCTS} więcej")
+
+    if kind == 'offer' and context.get('total_netto'):
+        lines.append('')
+        lines.append(f"Razem netto: {context.get('total_netto')} PLN")
+        if context.get('total_brutto'):
+            lines.append(f"Razem brutto: {context.get('total_brutto')} PLN")
+    if context.get('uwagi'):
+        lines.append('')
+        lines.append(f"Uwagi: {_first_line(context.get('uwagi'))}")
+    return '\n'.join(lines)
+
+
+def render_docx_preview(file_path: str) -> str:
+    """Plain text of the first paragraphs of a docx, read straight from document.xml."""
+    lines = []
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open('word/document.xml') as xml:
+            for _event, element in ElementTree.iterparse(xml):
+                if element.tag != f'{_W_NS}p':
+                    continue
+                text = ''.join(t.text or '' for t in element.iter(f'{_W_NS}t')).strip()
+                element.clear()
+                if text:
+                    lines.append(text)
+                    if len(lines) >= MAX_DOCX_LINES:
+                        break
+    return '\n'.join(lines)
+
+
+def _render(kind, file_path) -> str:
+    from src.data.database_service import get_stored_context
+    context = get_stored_context(kind, file_path)
+    if context:
+        return render_context_preview(kind, context)
+    try:
+        return render_docx_preview(file_path)
+    except (OSError, KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        return f"Brak podglądu: {e}"
+
+
+def _load_or_render(kind, file_path):
+    """Return (fingerprint, text) using the disk cache when possible."""
+    fingerprint = _fingerprint(file_path)
+    if fingerprint is None:
+        return None, "Plik jest niedostępny."
+    cache_file = os.path.join(_cache_dir(), f"{fingerprint}.txt")
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return fingerprint, f.read()
+    except OSError:
+        pass
+    text = _render(kind, file_path)
+    try:
+        tmp = cache_file + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        _log.warning("Could not cache preview for %s: %s", file_path, e)
+    return fingerprint, text
+
+
+# ------------------------------
+# Worker
+# ------------------------------
+
+def _remember(file_path, fingerprint, text):
+    with _lock:
+        _memory[file_path] = (fingerprint, text)
+        _memory.move_to_end(file_path)
+        while len(_memory) > MEMORY_CACHE_SIZE:
+            _memory.popitem(last=False)
+
+
+def _next_job():
+    with _lock:
+        while not _pending and not _prefetch:
+            _lock.wait()
+        if _pending:
+            # One request per frame (the newest: the user arrows through the list), frames in turn
+            results, (file_path, kind) = _pending.popitem(last=False)
+            return file_path, kind, results
+        file_path, kind = _prefetch.popitem(last=False)
+        return file_path, kind, None
+
+
+def _worker_loop():
+    from src.data import archive_service
+
+    _prune_cache()
+    while True:
+        file_path, kind, results = _next_job()
+        try:
+            if archive_service.parse_cached_path(file_path) is not None and not os.path.isfile(file_path):
+                if results is None:
+                    continue  # do not pull whole archives over the network just to warm up
+                # Archived document selected: extract it here, off the Tk thread
+                archive_service.ensure_local(file_path)
+            with _lock:
+                known = _memory.get(file_path)
+            fingerprint = _fingerprint(file_path)
+            if known is not None and fingerprint is not None and known[0] == fingerprint:
+                text = known[1]
+            else:
+                fingerprint, text = _load_or_render(kind, file_path)
+                if fingerprint is not None:
+                    _remember(file_path, fingerprint, text)
+            if results is not None:
+                results.put((file_path, text))
+        except Exception as e:
+            _log.warning("Preview of %s failed: %s", file_path, e)
+            if results is not None:
+                results.put((file_path, f"Brak podglądu: {e}"))
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    _worker = threading.Thread(target=_worker_loop, daemon=True, name='document-preview')
+    _worker.start()
+
+
+def get_cached_preview(file_path):
+    """Preview text from this session's memory cache (may be slightly stale), or None."""
+    with _lock:
+        known = _memory.get(file_path)
+    return known[1] if known else None
+
+
+def request_preview(kind: str, file_path: str, results: queue.Queue):
+    """Ask for the preview of one document; (file_path, text) is put on `results`."""
+    _ensure_worker()
+    with _lock:
+        _pending.pop(results, None)
+        _pending[results] = (file_path, kind)
+        _lock.notify()
+
+
+def prefetch(kind: str, file_paths):
+    """Warm the caches for documents the user is likely to look at next."""
+    _ensure_worker()
+    with _lock:
+        _prefetch.clear()
+        for path in file_paths:
+            _prefetch[path] = kind
+        _lock.notify()
+
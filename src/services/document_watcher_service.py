@@ -0,0 +1,194 @@
+"""
+Polling watcher keeping the browse frames in sync with the shared folders and database.
+
+Change notifications from SMB shares are unreliable, so a single background
+thread polls instead: every POLL_INTERVAL_SECONDS it lists the folder shown by
+each watching frame (one directory listing, sizes and mtimes from the listing)
+and checks the database's PRAGMA data_version through a long-lived read-only
+connection to the shared file. The registered document paths are re-read, through
+that same connection, only when data_version changed.
+
+A document is visible when its file exists and it is registered in the
+database, mirroring how the browse frames build their lists. Differences to the
+previous poll are queued per watcher as (change, full path, mtime) tuples;
+frames drain them from an after() loop and update only the affected rows.
+REFRESH asks for a full reload (year folders appeared or disappeared).
+"""
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+_log = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 2.0
+
+KIND_OFFER = 'offer'
+KIND_WZ = 'wz'
+
+ADDED = 'added'
+REMOVED = 'removed'
+MODIFIED = 'modified'
+REFRESH = 'refresh'
+
+_lock = threading.Condition()
+_watches = {}       # owner -> _Watch
+_worker = None
+_db_state = {'path': None, 'probe': None, 'version': None, 'registered': {}}
+
+
+class _Watch:
+    def __init__(self, kind, root, year):
+        self.kind = kind
+        self.root = root
+        self.year = year                # None = root view (legacy files + year folders)
+        self.snapshot = None            # path -> (mtime_ns, size) of visible documents
+        self.year_dirs = None
+        self.events = deque()
+
+
+# ------------------------------
+# Polling
+# ------------------------------
+
+def _registered_paths(kind):
+    """Relative paths registered in the database for `kind` (re-read when data_version changes)."""
+    from src.data import database_service as dbs
+
+    db_path = dbs.get_database_path()
+    state = _db_state
+    if state['path'] != db_path:
+        if state['probe'] is not None:
+            state['probe'].close()
+        state.update(path=db_path, probe=None, version=None, registered={})
+    try:
+        if state['probe'] is None:
+            if not dbs.check_database_file(db_path):
+                return None
+            state['probe'] = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        version = state['probe'].execute("PRAGMA data_version").fetchone()[0]
+    except sqlite3.Error:
+        if state['probe'] is not None:
+            state['probe'].close()
+        state.update(probe=None, version=None)
+        return state['registered'].get(kind)
+    if version != state['version']:
+        state['version'] = version
+        state['registered'] = {}
+    if kind not in state['registered']:
+        # Read through the probe itself: in replica mode the regular read connection may
+        # still be behind the data_version just observed on the shared database
+        if kind == KIND_OFFER:
+            sql, normalize = "SELECT OfferFilePath FROM Offers", dbs.normalize_offer_db_path
+        else:
+            sql, normalize = "SELECT WzFilePath FROM Wuzetkas", dbs.normalize_wz_db_path
+        try:
+            rows = state['probe'].execute(sql).fetchall()
+        except sqlite3.Error as e:
+            _log.warning("Reading registered %s paths failed: %s", kind, e)
+            return None
+        state['registered'][kind] = {normalize(p) for (p,) in rows if p}
+    return state['registered'][kind]
+
+
+def _scan(watch, registered):
+    """Return ({path: (mtime_ns, size)} of visible documents, set of year folder names)."""
+    folder = os.path.join(watch.root, watch.year) if watch.year else watch.root
+    documents, year_dirs = {}, set()
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if watch.year is None and entry.name.isdigit() and len(entry.name) == 4:
+                        year_dirs.add(entry.name)
+                    continue
+                if not entry.name.endswith('.docx') or entry.name.startswith('~$'):
+                    continue
+                rel = f"{watch.year}/{entry.name}" if watch.year else entry.name
+                if rel in registered:
+                    st = entry.stat()
+                    documents[entry.path] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        pass  # folder missing (e.g. archived year) or share unreachable: nothing visible
+    return documents, year_dirs
+
+
+def _poll_watch(watch):
+    registered = _registered_paths(watch.kind)
+    if registered is None:
+        return  # database unreachable, keep the last state
+    documents, year_dirs = _scan(watch, registered)
+    if watch.snapshot is not None:
+        events = []
+        for path, stamp in documents.items():
+            previous = watch.snapshot.get(path)
+            if previous is None:
+                events.append((ADDED, path, stamp[0] / 1e9))
+            elif previous != stamp:
+                events.append((MODIFIED, path, stamp[0] / 1e9))
+        events.extend((REMOVED, path, None) for path in watch.snapshot.keys() - documents.keys())
+        if year_dirs != watch.year_dirs:
+            events = [(REFRESH, None, None)]
+        if events:
+            with _lock:
+                watch.events.extend(events)
+    watch.snapshot = documents
+    watch.year_dirs = year_dirs
+
+
+def _worker_loop():
+    while True:
+        with _lock:
+            while not _watches:
+                _lock.wait()
+            watches = list(_watches.values())
+        for watch in watches:
+            try:
+                _poll_watch(watch)
+            except Exception as e:
+                _log.warning("Watching %s failed: %s", watch.root, e)
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    _worker = threading.Thread(target=_worker_loop, daemon=True, name='document-watcher')
+    _worker.start()
+
+
+# ------------------------------
+# API for the browse frames
+# ------------------------------
+
+def watch(owner, kind, root, year=None):
+    """Start (or retarget) watching the view of `owner`: the root folder or one year folder."""
+    if not root:
+        return
+    _ensure_worker()
+    with _lock:
+        _watches[owner] = _Watch(kind, root, str(year) if year else None)
+        _lock.notify()
+
+
+def unwatch(owner):
+    with _lock:
+        _watches.pop(owner, None)
+
+
+def drain(owner):
+    """Return the changes queued for `owner` since the last call."""
+    with _lock:
+        watch_state = _watches.get(owner)
+        if watch_state is None or not watch_state.events:
+            return []
+        events = list(watch_state.events)
+        watch_state.events.clear()
+    return events
@@ -1,10 +1,10 @@
 """
 Service for editing offers
 """
+import logging
 from docxtpl import DocxTemplate
 from jinja2 import Environment
 import tkinter.messagebox
-import datetime
 import os
 import sys
 import shutil
@@ -13,13 +13,23 @@ import shutil
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.utils.config import TEMPLATE_PATH
-from src.services.offer_generator_service import convert_date, select_template
+from src.services.offer_generator_service import (
+    offer_template_path, ensure_offer_totals, OPTIONAL_OFFER_PLACEHOLDERS,
+)
+from src.utils import template_index
+from src.utils import tracing
+from src.utils.document_context import OfferContext
 from src.data.database_service import update_offer_context_in_db
+from src.services import pdf_export_service
+from src.utils.docx_writer import save_rendered_document
+
+_log = logging.getLogger(__name__)
 
 
 # Template selection is centralized in offer_generator_service.select_template
 
 
+@tracing.traced('offer.update')
 def update_offer_document(context_data, offer_file_path):
     """Update an existing offer document and database context"""
     try:
@@ -27,108 +37,53 @@ def update_offer_document(context_data, offer_file_path):
         if not offer_file_path or not os.path.exists(offer_file_path):
             raise ValueError("Offer file not found")
 
-        # Wyodrębnij dane klienta i dostawcy z context_data
-        client_data = {
-            'name': context_data.get('client_name', ''),
-            'address1': context_data.get('client_address_1', ''),  # Uwaga: z podkreślnikiem
-        }
-
-        supplier_data = {
-            'name': context_data.get('supplier_name', ''),
-            'address1': context_data.get('supplier_address_1', ''),  # Uwaga: z podkreślnikiem
-        }
-
-        # Pobierz produkty z context_data
-        products = context_data.get('products', [])
+        context = ensure_offer_totals(OfferContext.coerce(context_data))
 
         # Wybierz odpowiedni szablon na podstawie długości nazw i pola gwarancji
-        language = context_data.get('language', 'PL')  # Get language from context, default PL
-        template_filename = select_template(
-            supplier_data.get('name', ''),
-            supplier_data.get('address1', ''),
-            client_data.get('name', ''),
-            client_data.get('address1', ''),
-            context_data.get('gwarancja', ''),
-            language
-        )
-
-        template_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            'templates',
-            template_filename,
-        )
+        with tracing.span('template'):
+            template_path = offer_template_path(context)
 
         # Create backup of original file
         backup_path = offer_file_path + ".backup"
-        shutil.copy2(offer_file_path, backup_path)
+        with tracing.span('backup'):
+            shutil.copy2(offer_file_path, backup_path)
 
         # Load template
-        doc = DocxTemplate(template_path)
-
-        # Przygotuj pełne dane kontekstowe dla szablonu
-        template_context = context_data.copy()
-        # Sanitize potential RichText / Word XML remnants before storage
-        def _sanitize_plain(val):
-            try:
-                if val is None:
-                    return ''
-                if val.__class__.__name__ == 'RichText':
-                    val = str(val)
-                text = str(val)
-                if '<w:r>' in text or '<w:t' in text:
-                    import re as _re
-                    text = _re.sub(r'<w:[^>]+>', '', text)
-                    text = text.replace('</w:t>', '').replace('</w:r>', '')
-                return text
-            except Exception:
-                return str(val)
-        template_context['client_name'] = _sanitize_plain(template_context.get('client_name',''))
-        template_context['supplier_name'] = _sanitize_plain(template_context.get('supplier_name',''))
-        template_context.update({
-            'client_name': client_data.get('name', ''),
-            'client_address1': client_data.get('address1', ''),
-            'supplier_name': supplier_data.get('name', ''),
-            'supplier_address1': supplier_data.get('address1', ''),
-            'products': products,
-        })
-
-        # Get language from context (default to PL)
-        language = context_data.get('language', 'PL')
-        
-        # Convert date for display if needed with language-specific formatting
-        if 'date' in template_context:
-            template_context['date'] = convert_date(template_context['date'], language)
-
-        # Convert client_name '\n' markers to real line breaks using RichText for Word rendering
-        try:
-            from docxtpl import RichText
-            name_val = template_context.get('client_name', '')
-            if isinstance(name_val, str) and '\\n' in name_val:
-                rt = RichText()
-                rt.add(name_val.replace('\\n', '\n'))
-                template_context['client_name'] = rt
-        except Exception:
-            # Fallback: leave as plain text if RichText unavailable
-            pass
+        with tracing.span('load'):
+            doc = DocxTemplate(template_path)
+
+        # Check the context against the template's placeholders before rendering
+        with tracing.span('template'):
+            render_context, missing = template_index.prepare_render_context(
+                template_path, context.to_template(), optional=OPTIONAL_OFFER_PLACEHOLDERS
+            )
+        if missing:
+            raise ValueError(f"Brak danych dla pól szablonu: {', '.join(missing)}")
 
         # Render template with Jinja2 autoescape enabled
-        jinja_env = Environment(autoescape=True)
-        doc.render(template_context, jinja_env=jinja_env)
+        with tracing.span('render'):
+            jinja_env = Environment(autoescape=True)
+            doc.render(render_context, jinja_env=jinja_env)
 
         # Save to the same location (overwrite)
-        doc.save(offer_file_path)
+        with tracing.span('save'):
+            save_rendered_document(doc, offer_file_path, template_path)
+        with tracing.span('pdf'):
+            pdf_export_service.export_after_save(offer_file_path)
 
         # Update context in database
-        update_offer_context_in_db(offer_file_path, template_context)
+        with tracing.span('db'):
+            update_offer_context_in_db(offer_file_path, context.to_storage())
 
         # Remove backup if successful
         if os.path.exists(backup_path):
             os.remove(backup_path)
 
-        print(f"Offer updated successfully: {offer_file_path}")
+        _log.info("Offer updated successfully: %s", offer_file_path)
         return True
 
     except Exception as e:
+        tracing.mark_failed(e)
         # Restore backup if update failed
         if 'backup_path' in locals() and os.path.exists(backup_path):
             shutil.copy2(backup_path, offer_file_path)
@@ -137,5 +92,5 @@ def update_offer_document(context_data, offer_file_path):
         tkinter.messagebox.showerror(
             "Błąd", f"Nie udało się zaktualizować oferty:\n{e}"
         )
-        print(f"Error updating offer: {e}")  # Debug info
+        _log.error("Error updating offer: %s", e)
         return False
@@ -6,6 +6,7 @@ and whether the warranty (gwarancja) field is provided. Maps to four templates:
  - Long names  + with gwarancja -> offer_template_long_names.docx
  - Long names  + empty gwarancja -> offer_template_long_names_no_gwarancja.docx
 """
+import logging
 import os
 from docx import Document
 from datetime import datetime
@@ -44,7 +45,7 @@ def select_template(supplier_name: str, supplier_address1: str, client_name: str
         base_template = base_template.replace(".docx", "_english.docx")
     
     return base_template
-from docxtpl import DocxTemplate, RichText
+from docxtpl import DocxTemplate
 from jinja2 import Environment
 import tkinter.messagebox
 import datetime
@@ -55,12 +56,26 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.utils.config import TEMPLATE_PATH, get_offers_folder
+from src.utils import money
+from src.services import pdf_export_service
+from src.utils.docx_writer import save_rendered_document
+from src.utils import template_index
+from src.utils import tracing
+from src.utils.document_context import OfferContext
 from src.data.database_service import (
     get_next_offer_number_for_year,
     save_offer_to_db,
     normalize_offer_db_path,
 )
 
+_log = logging.getLogger(__name__)
+
+# Offer terms the form may leave out; they render as empty text
+OPTIONAL_OFFER_PLACEHOLDERS = (
+    'uwagi', 'gwarancja', 'cena', 'termin_realizacji', 'termin_platnosci',
+    'warunki_dostawy', 'waznosc_oferty',
+)
+
 
 def convert_date(date: datetime.datetime, language: str = "PL") -> str:
     """Convert datetime to formatted string based on language.
@@ -81,6 +96,9 @@ def generate_offer_number(date: datetime.datetime, client_alias: str) -> tuple:
     try:
         year = date.year
         seq_number = get_next_offer_number_for_year(year)
+        if seq_number is None:
+            # The database is unreachable and the reason was already shown
+            return None, None, None
         offer_number = f"{seq_number}/OF/{year}_{client_alias}"
         # For filesystem, avoid slashes in base name
         filename = f"{seq_number}_OF_{year}_{client_alias}.docx"
@@ -118,119 +136,101 @@ def extract_client_alias_from_context(context_data):
     return alias if alias else "CLIENT"
 
 
-def generate_offer_document(context_data):
-    """Generate offer document using the provided context data"""
+def ensure_offer_totals(context):
+    """Fill document totals (netto, VAT, brutto) of an OfferContext when it does not carry
+    them yet, e.g. contexts saved by older versions. Line totals are recomputed from
+    quantity and unit price with the money engine; contexts from the UI already hold
+    exact totals."""
+    if context.total_netto and context.total_brutto is not None:
+        return context
+    rows = [p for p in (context.products or []) if isinstance(p, list) and len(p) >= 5]
     try:
-        # Sanitize context data copy for document generation and ensure plain-text stored later
-        def _sanitize_name(value):
-            try:
-                if value is None:
-                    return ''
-                if value.__class__.__name__ == 'RichText':
-                    value = str(value)
-                text = str(value)
-                if '<w:r>' in text or '<w:t' in text:
-                    import re as _re
-                    text = _re.sub(r'<w:[^>]+>', '', text)
-                    text = text.replace('</w:t>', '').replace('</w:r>', '')
-                return text
-            except Exception:
-                return str(value)
+        pairs = [(money.parse_quantity(p[3]), money.parse_amount(p[4])) for p in rows]
+    except ValueError:
+        return context  # leave unparsable legacy data untouched
+    line_totals, totals = money.compute_lines(pairs)
+    for row, (_qty, price), total in zip(rows, pairs, line_totals):
+        row[4] = money.format_amount(price)
+        if len(row) >= 6:
+            row[5] = money.format_amount(total)
+        else:
+            row.append(money.format_amount(total))
+    context.products_total_netto = float(totals.netto)
+    context.total_netto = money.format_amount(totals.netto)
+    context.total_vat = money.format_amount(totals.vat)
+    context.total_brutto = money.format_amount(totals.brutto)
+    return context
+
+
+def offer_template_path(context) -> str:
+    """Template for an OfferContext (see select_template)."""
+    template_filename = select_template(
+        context.supplier_name or '', context.supplier_address_1 or '', context.client_name or '',
+        context.client_address_1 or '', context.gwarancja or '', context.language_code
+    )
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'templates', template_filename)
 
-        raw_client_name = _sanitize_name(context_data.get('client_name', ''))
-        raw_supplier_name = _sanitize_name(context_data.get('supplier_name', ''))
 
-        # Extract necessary data
-        date_obj = context_data.get('date')
-        if isinstance(date_obj, str):
-            # If date is already converted to string, we need to parse it back
-            # This shouldn't happen with current flow, but safety check
+@tracing.traced('offer.generate')
+def generate_offer_document(context_data):
+    """Generate offer document using the provided context data (form dict or OfferContext)"""
+    try:
+        context = OfferContext.coerce(context_data)
+
+        # A date already converted to text should not reach this point; number it as today
+        date_obj = context.date
+        if not isinstance(date_obj, (datetime.date, datetime.datetime)):
             date_obj = datetime.datetime.now()
         
-        client_alias = extract_client_alias_from_context(context_data)
+        client_alias = extract_client_alias_from_context(context)
         
         # Generate offer number and file path
-        offer_number, file_path, order_number = generate_offer_number(
-            date_obj, client_alias)
+        with tracing.span('number'):
+            offer_number, file_path, order_number = generate_offer_number(
+                date_obj, client_alias)
         
         if not offer_number or not file_path:
+            tracing.mark_failed("offer number")
             return False
         
-        # Get language from context (default to PL)
-        language = context_data.get('language', 'PL')
-        
         # Update context with the generated offer number
-        context_data['offer_number'] = offer_number
-        
-        # Convert date to string for template with language-specific formatting
-        context_data['date'] = convert_date(date_obj, language)
-        
-        # Debug: Print products to see if they're being passed as list of lists
-        products = context_data.get('products', [])
-        product_headers = context_data.get('product_headers', [])
-        
-        print(f"Products to be included in offer: {len(products)} items")
-        print(f"Product format: {'List of lists' if products and isinstance(products[0], list) else 'Other format'}")
-        
-        if product_headers:
-            print(f"Product table headers: {product_headers}")
-        
-        for i, product in enumerate(products):
-            if isinstance(product, list):
-                print(f"Product row {i+1}: {product}")
+        context.offer_number = offer_number
+        context.date = date_obj
+        ensure_offer_totals(context)
+
+        if _log.isEnabledFor(logging.DEBUG):
+            products = context.products or []
+            _log.debug("Products to be included in offer: %d items", len(products))
+            if context.product_headers:
+                _log.debug("Product table headers: %s", context.product_headers)
+            for i, product in enumerate(products):
                 # Each row contains: [pid, pname, unit, qty, unit_price, total]
-                if len(product) >= 6:
-                    print(f"  - Lp: {product[0]}")
-                    print(f"  - Nazwa: {product[1]}")
-                    print(f"  - Jednostka: {product[2]}")
-                    print(f"  - Ilość: {product[3]}")
-                    print(f"  - Cena jedn.: {product[4]}")
-                    print(f"  - Suma: {product[5]}")
-            else:
-                print(f"Product {i+1}: {product}")
-        
-        # Products are now in format expected by Word template
-        # Each product is a list: [pid, pname, unit, qty, unit_price, total]
-        # This can be directly used in Word template as table rows
-        # Headers are available in context['product_headers']
+                _log.debug("Product row %d: %s", i + 1, product)
         
         # Wybierz odpowiedni szablon na podstawie długości nazw i pola gwarancji
-        supplier_name = context_data.get('supplier_name', '')
-        supplier_address1 = context_data.get('supplier_address_1', '')
-        client_name = context_data.get('client_name', '')
-        client_address1 = context_data.get('client_address_1', '')
-        gwarancja = context_data.get('gwarancja', '')
-        language = context_data.get('language', 'PL')  # Get language from context, default PL
-
-        template_filename = select_template(
-            supplier_name, supplier_address1, client_name, client_address1, gwarancja, language
-        )
-
-        # Utwórz ścieżkę do wybranego szablonu
-        template_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'templates', template_filename)
+        with tracing.span('template'):
+            template_path = offer_template_path(context)
 
-        # Convert client_name and supplier_name '\n' markers to real line breaks using RichText
-        def _to_richtext_with_newlines(value):
-            if value is None:
-                return ""
-            text = str(value)
-            if '\\n' not in text:
-                return text
-            rt = RichText()
-            rt.add(text.replace('\\n', '\n'))
-            return rt
-
-        context_data['client_name'] = _to_richtext_with_newlines(raw_client_name)
-        context_data['supplier_name'] = _to_richtext_with_newlines(raw_supplier_name)
+            # Check the context against the template's placeholders before rendering
+            render_context, missing = template_index.prepare_render_context(
+                template_path, context.to_template(), optional=OPTIONAL_OFFER_PLACEHOLDERS
+            )
+        if missing:
+            tracing.mark_failed(f"missing template values: {missing}")
+            tkinter.messagebox.showerror("Błąd", f"Brak danych dla pól szablonu: {', '.join(missing)}")
+            return {'success': False, 'error': f'Missing template values: {missing}'}
 
         # Generate document with Jinja2 autoescape to preserve XML entities like '&'
-        doc = DocxTemplate(template_path)
-        jinja_env = Environment(autoescape=True)
-        doc.render(context_data, jinja_env=jinja_env)
+        with tracing.span('load'):
+            doc = DocxTemplate(template_path)
+        with tracing.span('render'):
+            jinja_env = Environment(autoescape=True)
+            doc.render(render_context, jinja_env=jinja_env)
         
         # Ensure base offers root exists (do NOT auto-create root to enforce startup validation)
         offers_root = get_offers_folder()
         if not os.path.isdir(offers_root):
+            tracing.mark_failed("offers root folder missing")
             tkinter.messagebox.showerror(
                 "Błąd",
                 "Folder ofert nie istnieje. Ustaw poprawny folder w zakładce Ustawienia przed generowaniem oferty."
@@ -239,29 +239,31 @@ def generate_offer_document(context_data):
 
         # Ensure year subdirectory exists (safe to create under existing root)
         year_dir = os.path.dirname(file_path)
-        if not os.path.isdir(year_dir):
-            try:
-                os.makedirs(year_dir, exist_ok=True)
-            except OSError as e:
-                tkinter.messagebox.showerror("Błąd", f"Nie udało się utworzyć folderu roku: {e}")
-                return {'success': False, 'error': f'Cannot create year folder: {e}'}
+        with tracing.span('folder'):
+            year_dir_error = None
+            if not os.path.isdir(year_dir):
+                try:
+                    os.makedirs(year_dir, exist_ok=True)
+                except OSError as e:
+                    year_dir_error = e
+        if year_dir_error is not None:
+            tracing.mark_failed(year_dir_error)
+            tkinter.messagebox.showerror("Błąd", f"Nie udało się utworzyć folderu roku: {year_dir_error}")
+            return {'success': False, 'error': f'Cannot create year folder: {year_dir_error}'}
         
         # Save to offers folder
-        doc.save(file_path)
+        with tracing.span('save'):
+            save_rendered_document(doc, file_path, template_path)
+        with tracing.span('pdf'):
+            pdf_export_service.export_after_save(file_path)
         
         # Save to database only if we auto-generated the number
         if order_number is not None:
-            # Make a copy of context data for storage (exclude template-specific conversions)
-            storage_context = context_data.copy()
-            # Replace RichText back with plain text (with literal \n markers kept) for DB storage
-            storage_context['client_name'] = raw_client_name
-            storage_context['supplier_name'] = raw_supplier_name
-            # Convert date back to timestamp for storage
-            if isinstance(date_obj, datetime.datetime):
-                storage_context['date'] = date_obj.isoformat()
-            
             rel_db_path = normalize_offer_db_path(file_path)
-            if not save_offer_to_db(order_number, rel_db_path, storage_context):
+            with tracing.span('db'):
+                saved = save_offer_to_db(order_number, rel_db_path, context.to_storage())
+            if not saved:
+                tracing.mark_failed("database save")
                 tkinter.messagebox.showwarning("Warning", "Offer generated but failed to save to database")
         
         # Return success status and details instead of showing message here
@@ -272,5 +274,6 @@ def generate_offer_document(context_data):
         }
         
     except Exception as e:
+        tracing.mark_failed(e)
         tkinter.messagebox.showerror("Error", f"Failed to generate offer: {e}")
         return {'success': False, 'error': str(e)}
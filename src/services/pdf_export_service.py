@@ -0,0 +1,340 @@
+"""
+Background export of generated offers and WZ documents to PDF.
+
+Documents are queued and converted by a small pool of worker threads
+(MAX_CONCURRENT_CONVERSIONS). Each worker drains up to BATCH_SIZE queued files
+and converts them with a single headless LibreOffice run using its own
+persistent profile, so LibreOffice start-up and first-run profile creation are
+paid once per batch instead of once per file, and workers never share a
+profile. PDFs are written to a local staging folder and then copied next to the
+.docx in one sequential write.
+
+Without LibreOffice a simple built-in renderer (python-docx text laid out with
+Pillow) produces a readable PDF of the document text.
+
+The UI thread drains finished exports with drain_events() from an after() loop.
+convert_file() converts a single document synchronously in the caller's thread.
+"""
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.config import get_data_dir
+
+_log = logging.getLogger(__name__)
+
+PDF_EXPORT_SETTING = 'pdf_export_enabled'
+MAX_CONCURRENT_CONVERSIONS = 2
+BATCH_SIZE = 20
+CONVERT_TIMEOUT_SECONDS = 600
+CONVERTER_DIRNAME = 'pdf_converter'
+
+ENGINE_LIBREOFFICE = 'libreoffice'
+ENGINE_BUILTIN = 'builtin'
+
+_WINDOWS_SOFFICE_PATHS = (
+    r"C:\Program Files\LibreOffice\program\soffice.exe",
+    r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+)
+
+
+@dataclass
+class ExportResult:
+    """Outcome of one document conversion."""
+    docx_path: str
+    pdf_path: Optional[str]
+    engine: Optional[str] = None
+    error: Optional[str] = None
+    notify: bool = False      # requested explicitly by the user (bulk export)
+
+
+_jobs = queue.Queue()
+_events = queue.Queue()
+_lock = threading.Lock()
+_workers = []
+_in_progress = 0
+_soffice_path = None
+_soffice_checked = False
+
+
+def is_auto_export_enabled() -> bool:
+    """True when every generated document should also be exported to PDF."""
+    try:
+        from src.utils.settings import SettingsManager
+        return bool(SettingsManager().get_app_setting(PDF_EXPORT_SETTING))
+    except Exception:
+        return False
+
+
+def find_soffice():
+    """Path of the LibreOffice executable, or None (looked up once)."""
+    global _soffice_path, _soffice_checked
+    if not _soffice_checked:
+        candidates = [shutil.which('soffice'), shutil.which('libreoffice')]
+        if sys.platform.startswith('win'):
+            candidates.extend(_WINDOWS_SOFFICE_PATHS)
+        _soffice_path = next((c for c in candidates if c and os.path.isfile(c)), None)
+        _soffice_checked = True
+        _log.info("PDF converter: %s", _soffice_path or 'built-in renderer (LibreOffice not found)')
+    return _soffice_path
+
+
+def pdf_path_for(docx_path: str) -> str:
+    return os.path.splitext(docx_path)[0] + '.pdf'
+
+
+# ------------------------------
+# Conversion engines
+# ------------------------------
+
+def _worker_dir(worker_index, name: str) -> str:
+    path = os.path.join(get_data_dir(), CONVERTER_DIRNAME, f"{name}_{worker_index}")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _convert_with_libreoffice(soffice, docx_paths, outdir, profile_dir):
+    """Convert a batch in one LibreOffice run. Returns {docx_path: staged_pdf or None}."""
+    for name in os.listdir(outdir):
+        try:
+            os.remove(os.path.join(outdir, name))
+        except OSError:
+            pass
+    cmd = [soffice, f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+           '--headless', '--norestore', '--nologo', '--nodefault',
+           '--convert-to', 'pdf', '--outdir', outdir, *docx_paths]
+    creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+    subprocess.run(cmd, capture_output=True, timeout=CONVERT_TIMEOUT_SECONDS,
+                   creationflags=creationflags, check=False)
+    staged = {}
+    for path in docx_paths:
+        candidate = os.path.join(outdir, os.path.splitext(os.path.basename(path))[0] + '.pdf')
+        staged[path] = candidate if os.path.isfile(candidate) else None
+    return staged
+
+
+def _docx_text_lines(docx_path):
+    """Paragraph and table text of a docx in document order."""
+    from docx import Document
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    document = Document(docx_path)
+    lines = []
+    for block in document.element.body.iterchildren():
+        tag = block.tag.rsplit('}', 1)[-1]
+        if tag == 'p':
+            lines.append(Paragraph(block, document).text)
+        elif tag == 'tbl':
+            for row in Table(block, document).rows:
+                cells = []
+                for cell in row.cells:
+                    text = cell.text.replace('\n', ' ').strip()
+                    # Merged cells repeat the same text; print it once
+                    if not cells or cells[-1] != text:
+                        cells.append(text)
+                lines.append(' | '.join(cells))
+            lines.append('')
+    return lines
+
+
+def _load_font(size):
+    from PIL import ImageFont
+    for name in ('arial.ttf', 'DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+                 'LiberationSans-Regular.ttf'):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def _builtin_pages(docx_path):
+    """Yield the document text laid out on A4 page images (150 dpi)."""
+    from PIL import Image, ImageDraw
+
+    width, height, margin = 1240, 1754, 110
+    font = _load_font(22)
+    line_height = 32
+    max_width = width - 2 * margin
+
+    def wrap(draw, text):
+        if not text:
+            return ['']
+        out, current = [], ''
+        for word in text.split(' '):
+            candidate = f"{current} {word}" if current else word
+            if draw.textlength(candidate, font=font) <= max_width:
+                current = candidate
+            else:
+                if current:
+                    out.append(current)
+                current = word
+        out.append(current)
+        return out
+
+    measure = ImageDraw.Draw(Image.new('L', (1, 1)))
+    page = None
+    draw = None
+    y = height
+    for text in _docx_text_lines(docx_path):
+        for line in wrap(measure, text):
+            if draw is None or y + line_height > height - margin:
+                if page is not None:
+                    yield page
+                page = Image.new('RGB', (width, height), 'white')
+                draw = ImageDraw.Draw(page)
+                y = margin
+            draw.text((margin, y), line, fill='black', font=font)
+            y += line_height
+    yield page if page is not None else Image.new('RGB', (width, height), 'white')
+
+
+def _render_builtin(docx_path, pdf_path, append=False):
+    """Save the built-in rendering of a docx as a PDF (or append it to one written by this renderer)."""
+    pages = list(_builtin_pages(docx_path))
+    pages[0].save(pdf_path, 'PDF', resolution=150, save_all=True, append_images=pages[1:], append=append)
+
+
+def _publish(staged_pdf, docx_path):
+    """Copy a staged PDF next to its docx in one sequential write, then drop the staged file."""
+    target = pdf_path_for(docx_path)
+    tmp_target = target + '.tmp'
+    shutil.copyfile(staged_pdf, tmp_target)
+    os.replace(tmp_target, target)
+    try:
+        os.remove(staged_pdf)
+    except OSError:
+        pass
+    return target
+
+
+def convert_file(docx_path: str, pdf_path: str) -> str:
+    """Convert one document in the calling thread. Returns the engine used."""
+    outdir = _worker_dir('direct', 'out')
+    soffice = find_soffice()
+    if soffice:
+        try:
+            staged = _convert_with_libreoffice(soffice, [docx_path], outdir, _worker_dir('direct', 'profile'))
+            if staged.get(docx_path):
+                shutil.move(staged[docx_path], pdf_path)
+                return ENGINE_LIBREOFFICE
+        except (OSError, subprocess.SubprocessError) as e:
+            _log.warning("LibreOffice conversion failed, using built-in renderer: %s", e)
+    _render_builtin(docx_path, pdf_path)
+    return ENGINE_BUILTIN
+
+
+# ------------------------------
+# Worker pool
+# ------------------------------
+
+def _take_batch():
+    """Block for one job, then take more without waiting (unique file names per batch)."""
+    batch = [_jobs.get()]
+    names = {os.path.basename(batch[0][0]).lower()}
+    while len(batch) < BATCH_SIZE:
+        try:
+            job = _jobs.get_nowait()
+        except queue.Empty:
+            break
+        name = os.path.basename(job[0]).lower()
+        if name in names:
+            # Same output name would collide in the staging folder; keep it for the next batch
+            _jobs.put(job)
+            break
+        names.add(name)
+        batch.append(job)
+    return batch
+
+
+def _worker_loop(worker_index):
+    global _in_progress
+    outdir = _worker_dir(worker_index, 'out')
+    profile_dir = _worker_dir(worker_index, 'profile')
+    while True:
+        batch = _take_batch()
+        with _lock:
+            _in_progress += len(batch)
+        try:
+            soffice = find_soffice()
+            staged = {}
+            if soffice:
+                try:
+                    staged = _convert_with_libreoffice(soffice, [p for p, _n in batch], outdir, profile_dir)
+                except (OSError, subprocess.SubprocessError) as e:
+                    _log.warning("LibreOffice conversion failed, using built-in renderer: %s", e)
+            for docx_path, notify in batch:
+                try:
+                    if staged.get(docx_path):
+                        engine = ENGINE_LIBREOFFICE
+                        pdf = _publish(staged[docx_path], docx_path)
+                    else:
+                        engine = ENGINE_BUILTIN
+                        local_pdf = os.path.join(outdir, os.path.splitext(os.path.basename(docx_path))[0] + '.pdf')
+                        _render_builtin(docx_path, local_pdf)
+                        pdf = _publish(local_pdf, docx_path)
+                    _events.put(ExportResult(docx_path, pdf, engine=engine, notify=notify))
+                except Exception as e:
+                    _log.warning("PDF export of %s failed: %s", docx_path, e)
+                    _events.put(ExportResult(docx_path, None, error=str(e), notify=notify))
+        finally:
+            with _lock:
+                _in_progress -= len(batch)
+
+
+def _ensure_workers():
+    with _lock:
+        alive = [w for w in _workers if w.is_alive()]
+        _workers[:] = alive
+        for index in range(len(alive), MAX_CONCURRENT_CONVERSIONS):
+            worker = threading.Thread(target=_worker_loop, args=(index,), daemon=True,
+                                      name=f'pdf-export-{index}')
+            worker.start()
+            _workers.append(worker)
+
+
+def submit(docx_paths, notify: bool = False) -> int:
+    """Queue documents for PDF export. Returns the number of queued files."""
+    paths = [p for p in docx_paths if p and p.lower().endswith('.docx')]
+    if not paths:
+        return 0
+    _ensure_workers()
+    for path in paths:
+        _jobs.put((path, notify))
+    return len(paths)
+
+
+def export_after_save(docx_path: str):
+    """Export stage of document generation: queue the PDF when auto-export is enabled."""
+    if docx_path and is_auto_export_enabled():
+        submit([docx_path])
+
+
+def pending_count() -> int:
+    """Documents queued or being converted."""
+    with _lock:
+        return _jobs.qsize() + _in_progress
+
+
+def drain_events():
+    """Return ExportResult objects finished since the last call (for the UI thread)."""
+    items = []
+    while True:
+        try:
+            items.append(_events.get_nowait())
+        except queue.Empty:
+            return items
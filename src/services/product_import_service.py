@@ -0,0 +1,181 @@
+"""
+Bulk import of product rows from CSV files or clipboard text.
+
+Accepts what users typically have at hand: a CSV saved from Excel (semicolon
+separated, cp1250 or UTF-8 with BOM), a comma separated file, or cells copied
+straight from a spreadsheet (tab separated). Input is read line by line through
+csv.reader, so large files are never loaded as a whole, and every row is
+validated in the same pass. Invalid rows are collected with their line numbers
+instead of stopping the import.
+"""
+import csv
+import io
+import re
+import sys
+import os
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils import money
+
+# Header names recognised for each field (compared lower-case, without dots/spaces and
+# bracketed units such as '[PLN]'); price columns also match by prefix, so the app's own
+# 'Cena jednostkowa netto [PLN]' is recognised
+_HEADER_ALIASES = {
+    'name': ('nazwa', 'nazwaproduktu', 'produkt', 'towar', 'name', 'product'),
+    'unit': ('jm', 'jednostka', 'jednostkamiary', 'unit'),
+    'quantity': ('ilosc', 'ilość', 'ile', 'qty', 'quantity'),
+    'unit_price': ('cena', 'cenajednostkowa', 'cenanetto', 'cenajedn', 'price', 'unitprice'),
+    'position': ('lp', 'nr', 'pozycja', 'no'),
+}
+_HEADER_PREFIXES = {
+    'unit_price': ('cena', 'price', 'unitprice'),
+}
+_BRACKETED = re.compile(r'\[[^\]]*\]|\([^)]*\)')
+_DELIMITERS = ('\t', ';', ',')
+# Encodings tried for files, in order (Excel in Polish Windows saves CSV as cp1250)
+_FILE_ENCODINGS = ('utf-8-sig', 'cp1250')
+# Upper bound for error messages kept in the result
+MAX_REPORTED_ERRORS = 50
+
+
+@dataclass
+class ImportResult:
+    """Outcome of parsing one import source."""
+    rows: List[tuple] = field(default_factory=list)     # validated (name, unit, qty[, unit_price])
+    errors: List[str] = field(default_factory=list)     # first MAX_REPORTED_ERRORS problems
+    error_count: int = 0
+    skipped_header: bool = False
+
+    def add_error(self, line_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Wiersz {line_number}: {message}")
+
+
+def _normalize_header(cell: str) -> str:
+    cell = _BRACKETED.sub('', cell)
+    return cell.strip().lower().replace('.', '').replace(' ', '').replace('_', '')
+
+
+def _detect_delimiter(first_line: str) -> str:
+    """Pick the delimiter occurring most often in the first line (tab wins ties, as in pastes)."""
+    counts = [(first_line.count(d), -i, d) for i, d in enumerate(_DELIMITERS)]
+    best = max(counts)
+    return best[2] if best[0] > 0 else ';'
+
+
+def _header_mapping(cells) -> Optional[dict]:
+    """Map field name -> column index if `cells` looks like a header row, else None."""
+    mapping = {}
+    for index, cell in enumerate(cells):
+        key = _normalize_header(cell)
+        for field_name, aliases in _HEADER_ALIASES.items():
+            matches = key in aliases or any(key.startswith(p) for p in _HEADER_PREFIXES.get(field_name, ()))
+            if matches and field_name not in mapping:
+                mapping[field_name] = index
+                break
+    if 'name' in mapping and 'quantity' in mapping:
+        return mapping
+    return None
+
+
+def _positional_mapping(cells, with_prices: bool) -> dict:
+    """Column layout for files without a header: [Lp,] name, unit, qty[, price]."""
+    expected = 4 if with_prices else 3
+    offset = 0
+    if len(cells) > expected and cells[0].strip().isdigit():
+        offset = 1  # leading position number, as in an exported document table
+    mapping = {'name': offset, 'unit': offset + 1, 'quantity': offset + 2}
+    if with_prices:
+        mapping['unit_price'] = offset + 3
+    return mapping
+
+
+def parse_product_lines(lines: Iterable[str], with_prices: bool = True) -> ImportResult:
+    """Parse and validate product rows from an iterable of text lines in a single pass."""
+    result = ImportResult()
+    iterator = iter(lines)
+    first_line = None
+    for first_line in iterator:
+        if first_line.strip():
+            break
+    else:
+        return result
+
+    delimiter = _detect_delimiter(first_line)
+
+    def chained():
+        yield first_line
+        yield from iterator
+
+    mapping = None
+    for line_number, cells in enumerate(csv.reader(chained(), delimiter=delimiter), 1):
+        if not cells or not any(c.strip() for c in cells):
+            continue
+        if mapping is None:
+            mapping = _header_mapping(cells)
+            if mapping is not None:
+                if with_prices and 'unit_price' not in mapping:
+                    result.add_error(line_number, "brak kolumny z ceną")
+                    return result
+                result.skipped_header = True
+                continue
+            mapping = _positional_mapping(cells, with_prices)
+
+        def cell(field_name):
+            index = mapping.get(field_name)
+            if index is None or index >= len(cells):
+                return ''
+            return cells[index].strip()
+
+        name = cell('name').replace('\r\n', '\n')
+        unit = cell('unit')
+        if not name:
+            result.add_error(line_number, "brak nazwy produktu")
+            continue
+        if not unit:
+            result.add_error(line_number, "brak jednostki miary")
+            continue
+        try:
+            quantity = money.parse_quantity(cell('quantity'))
+        except ValueError:
+            result.add_error(line_number, f"nieprawidłowa ilość '{cell('quantity')}'")
+            continue
+        if quantity <= 0:
+            result.add_error(line_number, "ilość musi być większa od zera")
+            continue
+        if not with_prices:
+            result.rows.append((name, unit, quantity))
+            continue
+        try:
+            unit_price = money.parse_amount(cell('unit_price'))
+        except ValueError:
+            result.add_error(line_number, f"nieprawidłowa cena '{cell('unit_price')}'")
+            continue
+        if unit_price < 0:
+            result.add_error(line_number, "cena nie może być ujemna")
+            continue
+        result.rows.append((name, unit, quantity, unit_price))
+    return result
+
+
+def parse_product_text(text: str, with_prices: bool = True) -> ImportResult:
+    """Parse rows pasted from the clipboard."""
+    return parse_product_lines(io.StringIO(text, newline=''), with_prices)
+
+
+def parse_product_file(path: str, with_prices: bool = True) -> ImportResult:
+    """Parse rows from a CSV file, streaming it line by line.
+    Raises OSError when the file cannot be read in any supported encoding."""
+    last_error = None
+    for encoding in _FILE_ENCODINGS:
+        try:
+            with open(path, 'r', encoding=encoding, newline='') as f:
+                return parse_product_lines(f, with_prices)
+        except UnicodeDecodeError as e:
+            last_error = e
+    raise OSError(f"Nieobsługiwane kodowanie pliku: {last_error}")
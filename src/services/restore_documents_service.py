@@ -3,25 +3,31 @@
 Usage workflow (orchestrated by UI window):
 - Provide path to .db (SQLite) file (read-only)
 - Provide output root folder (created if missing)
-- For each record in Offers table having (OfferFilePath, OfferContext JSON) generate a .docx
-- For each record in Wuzetkas table having (WzFilePath, WzContext JSON) generate a .docx
+- For each record in Offers table having (OfferFilePath, OfferContext) generate a .docx
+- For each record in Wuzetkas table having (WzFilePath, WzContext) generate a .docx
 - Offers: select the proper template using existing select_template logic
 - WZ: use existing wz template selection (simple fixed template?)
 
 The database schema is expected to contain columns:
  Offers(OfferFilePath TEXT, OfferContext TEXT)
  Wuzetkas(WzFilePath TEXT, WzContext TEXT)
+Contexts are JSON text in older databases and context_codec BLOBs in newer ones.
 
 We do NOT write back to the DB. Pure export.
 """
 from __future__ import annotations
-import os, json, sqlite3, datetime
+import os, sqlite3
 from typing import Optional, Callable
 import tkinter.messagebox
 
 # Reuse existing logic
-from src.services.offer_generator_service import select_template, convert_date
-from docxtpl import DocxTemplate, RichText
+from src.services.offer_generator_service import offer_template_path, ensure_offer_totals
+from docxtpl import DocxTemplate
+from src.utils.docx_writer import save_rendered_document
+from src.utils import template_index
+from src.utils import tracing
+from src.data import context_codec
+from src.utils.document_context import OfferContext, WzContext
 from jinja2 import Environment
 
 TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'templates')
@@ -55,18 +61,10 @@ class RestoreReport:
                 + ("\nBłędy WZ:\n" + "\n".join(self.wz_errors) if self.wz_errors else "")
                )
 
-def _rich(value: str | None):
-    if not value:
-        return ""
-    if '\\n' not in value:
-        return value
-    rt = RichText()
-    rt.add(value.replace('\\n', '\n'))
-    return rt
-
 def _ensure_parent(path: str):
     os.makedirs(os.path.dirname(path), exist_ok=True)
 
+@tracing.traced('restore')
 def restore_from_database(db_path: str, output_root: str, progress_cb: Optional[Callable[[str], None]] = None) -> RestoreReport:
     rep = RestoreReport()
     if progress_cb is None:
@@ -81,60 +79,42 @@ def restore_from_database(db_path: str, output_root: str, progress_cb: Optional[
 
     # Offers
     try:
-        cur.execute("SELECT OfferFilePath, OfferContext FROM Offers")
-        rows = cur.fetchall()
+        with tracing.span('db'):
+            cur.execute("SELECT OfferFilePath, OfferContext FROM Offers")
+            rows = cur.fetchall()
         rep.offers_total = len(rows)
         for rel_path, ctx_json in rows:
             if not rel_path:
                 rep.offers_errors.append("Pusty OfferFilePath")
                 continue
             try:
-                context = json.loads(ctx_json) if ctx_json else {}
-            except Exception as e:  # malformed JSON
+                with tracing.span('decode'):
+                    context = context_codec.decode(ctx_json) or {}
+            except Exception as e:  # malformed JSON or damaged blob
                 rep.offers_errors.append(f"{rel_path}: JSON error {e}")
                 continue
             try:
-                # Rebuild template selection context
-                supplier_name = context.get('supplier_name', '')
-                supplier_address1 = context.get('supplier_address_1', '')
-                client_name = context.get('client_name', '')
-                client_address1 = context.get('client_address_1', '')
-                gwarancja = context.get('gwarancja', '')
-                language = context.get('language', 'PL')  # Default to PL if not in context
-                template_name = select_template(supplier_name, supplier_address1, client_name, client_address1, gwarancja, language)
-                template_path = os.path.join(TEMPLATES_DIR, template_name)
+                record = ensure_offer_totals(OfferContext.from_dict(context))
+                with tracing.span('template'):
+                    template_path = offer_template_path(record)
                 if not os.path.isfile(template_path):
-                    raise FileNotFoundError(f"Brak szablonu: {template_name}")
-
-                # Convert date in context
-                date_raw = context.get('date')
-                if isinstance(date_raw, str):
-                    # Try ISO parse else fallback now
-                    try:
-                        date_dt = datetime.datetime.fromisoformat(date_raw)
-                    except Exception:
-                        date_dt = datetime.datetime.now()
-                elif isinstance(date_raw, (datetime.date, datetime.datetime)):
-                    date_dt = datetime.datetime.combine(date_raw, datetime.time()) if isinstance(date_raw, datetime.date) and not isinstance(date_raw, datetime.datetime) else date_raw
-                else:
-                    date_dt = datetime.datetime.now()
-                
-                # Get language from context (default to PL) and convert date with language-specific formatting
-                language = context.get('language', 'PL')
-                context['date'] = convert_date(date_dt, language)
-
-                # Replace newline markers
-                context['client_name'] = _rich(context.get('client_name'))
-                context['supplier_name'] = _rich(context.get('supplier_name'))
+                    raise FileNotFoundError(f"Brak szablonu: {os.path.basename(template_path)}")
 
                 # Build absolute target path (Offers folder prefix)
                 target_path = os.path.join(output_root, 'Oferty', rel_path)
-                _ensure_parent(target_path)
-
-                doc = DocxTemplate(template_path)
-                jinja_env = Environment(autoescape=True)
-                doc.render(context, jinja_env=jinja_env)
-                doc.save(target_path)
+                with tracing.span('folder'):
+                    _ensure_parent(target_path)
+
+                # Stored contexts predate some placeholders: those stay empty, as they did originally
+                with tracing.span('template'):
+                    render_context, _missing = template_index.prepare_render_context(template_path, record.to_template())
+                with tracing.span('load'):
+                    doc = DocxTemplate(template_path)
+                with tracing.span('render'):
+                    jinja_env = Environment(autoescape=True)
+                    doc.render(render_context, jinja_env=jinja_env)
+                with tracing.span('save'):
+                    save_rendered_document(doc, target_path, template_path)
                 rep.offers_ok += 1
                 progress_cb(f"Oferta: {rel_path}")
             except Exception as e:
@@ -144,8 +124,9 @@ def restore_from_database(db_path: str, output_root: str, progress_cb: Optional[
 
     # WZ
     try:
-        cur.execute("SELECT WzFilePath, WzContext FROM Wuzetkas")
-        rows = cur.fetchall()
+        with tracing.span('db'):
+            cur.execute("SELECT WzFilePath, WzContext FROM Wuzetkas")
+            rows = cur.fetchall()
         rep.wz_total = len(rows)
         
         for rel_path, ctx_json in rows:
@@ -153,16 +134,16 @@ def restore_from_database(db_path: str, output_root: str, progress_cb: Optional[
                 rep.wz_errors.append("Pusty WzFilePath")
                 continue
             try:
-                context = json.loads(ctx_json) if ctx_json else {}
+                with tracing.span('decode'):
+                    context = context_codec.decode(ctx_json) or {}
             except Exception as e:
                 rep.wz_errors.append(f"{rel_path}: JSON error {e}")
                 continue
             try:
-                # Get language from context, default to PL
-                language = context.get('language', 'PL')
-                
+                record = WzContext.from_dict(context)
+
                 # Select appropriate WZ template based on language
-                if language and language.upper() == "EN":
+                if record.language_code == "EN":
                     wz_template_name = 'wz_template_english.docx'
                 else:
                     wz_template_name = 'wz_template.docx'
@@ -170,57 +151,21 @@ def restore_from_database(db_path: str, output_root: str, progress_cb: Optional[
                 wz_template_path = os.path.join(TEMPLATES_DIR, wz_template_name)
                 if not os.path.isfile(wz_template_path):
                     raise FileNotFoundError(f"Brak szablonu WZ: {wz_template_name}")
-                
-                # Convert date to Polish long form (e.g. '4 sierpnia 2025') similar to offers
-                date_raw = context.get('date')
-                try:
-                    # If already in Polish long form (month name), leave as is
-                    if isinstance(date_raw, str) and any(m in date_raw.lower() for m in [
-                        'stycznia','lutego','marca','kwietnia','maja','czerwca','lipca','sierpnia','września','października','listopada','grudnia'
-                    ]):
-                        pass
-                    else:
-                        date_dt = None
-                        if isinstance(date_raw, str):
-                            # Try multiple patterns
-                            patterns = [
-                                '%Y-%m-%d', '%d-%m-%Y', '%d.%m.%Y', '%d/%m/%Y', '%d %m %Y'
-                            ]
-                            for p in patterns:
-                                try:
-                                    date_dt = datetime.datetime.strptime(date_raw, p)
-                                    break
-                                except Exception:
-                                    continue
-                            if date_dt is None:
-                                # last resort ISO attempt
-                                try:
-                                    date_dt = datetime.datetime.fromisoformat(date_raw)
-                                except Exception:
-                                    date_dt = datetime.datetime.now()
-                        elif isinstance(date_raw, (datetime.date, datetime.datetime)):
-                            date_dt = date_raw if isinstance(date_raw, datetime.datetime) else datetime.datetime.combine(date_raw, datetime.time())
-                        else:
-                            date_dt = datetime.datetime.now()
-                        
-                        # Get language from context (default to PL) and convert date with language-specific formatting
-                        language = context.get('language', 'PL')
-                        context['date'] = convert_date(date_dt, language)
-                except Exception:
-                    # On any failure just force now() formatted with language from context
-                    language = context.get('language', 'PL')
-                    context['date'] = convert_date(datetime.datetime.now(), language)
-                # Newline conversions
-                context['client_name'] = _rich(context.get('client_name'))
-                context['supplier_name'] = _rich(context.get('supplier_name'))
 
                 # Build absolute target path (WZki folder prefix)
                 target_path = os.path.join(output_root, 'WZki', rel_path)
-                _ensure_parent(target_path)
-                doc = DocxTemplate(wz_template_path)
-                jinja_env = Environment(autoescape=True)
-                doc.render(context, jinja_env=jinja_env)
-                doc.save(target_path)
+                with tracing.span('folder'):
+                    _ensure_parent(target_path)
+                # Stored contexts predate some placeholders: those stay empty, as they did originally
+                with tracing.span('template'):
+                    render_context, _missing = template_index.prepare_render_context(wz_template_path, record.to_template())
+                with tracing.span('load'):
+                    doc = DocxTemplate(wz_template_path)
+                with tracing.span('render'):
+                    jinja_env = Environment(autoescape=True)
+                    doc.render(render_context, jinja_env=jinja_env)
+                with tracing.span('save'):
+                    save_rendered_document(doc, target_path, wz_template_path)
                 rep.wz_ok += 1
                 progress_cb(f"WZ: {rel_path}")
             except Exception as e:
@@ -229,4 +174,7 @@ def restore_from_database(db_path: str, output_root: str, progress_cb: Optional[
         rep.wz_errors.append(f"DB error (Wuzetkas): {e}")
 
     conn.close()
+    errors = len(rep.offers_errors) + len(rep.wz_errors)
+    if errors:
+        tracing.mark_failed(f"{errors} documents not restored")
     return rep
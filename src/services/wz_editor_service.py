@@ -1,6 +1,7 @@
 """
 WZ editor service for updating existing WZ documents
 """
+import logging
 import os
 import json
 from datetime import datetime
@@ -10,79 +11,60 @@ import tkinter.messagebox
 
 from src.utils.config import get_wz_folder
 from src.data.database_service import DatabaseService, update_wz_context_in_db
+from src.utils.document_context import WzContext
+from src.utils import tracing
 
+_log = logging.getLogger(__name__)
 
+
+@tracing.traced('wz.update')
 def update_wz_document(context_data, wz_path):
     """
     Update existing WZ document with new data
     
     Args:
-        context_data (dict): Form data from UI
+        context_data (dict | WzContext): Form data from UI
         wz_path (str): Path to existing WZ document to update
         
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        print(f"Starting WZ update process for: {wz_path}")
+        _log.debug("Starting WZ update process for: %s", wz_path)
         
         # Validate input
         if not wz_path or not os.path.exists(wz_path):
-            print(f"WZ file does not exist: {wz_path}")
+            _log.warning("WZ file does not exist: %s", wz_path)
             return False
         
         if not context_data:
-            print("No context data provided")
+            _log.warning("No context data provided")
             return False
         
-        # Get WZ number (should be preserved from original)
-        wz_number = context_data.get('wz_number', 'WZ_UNKNOWN')
-        print(f"Updating WZ number: {wz_number}")
-        
-        # Sanitize plain versions first (avoid storing Word tags) then convert to RichText only for rendering
-        def _sanitize_plain(val):
-            try:
-                if val is None:
-                    return ''
-                if val.__class__.__name__ == 'RichText':
-                    val = str(val)
-                txt = str(val)
-                if '<w:r>' in txt or '<w:t' in txt:
-                    import re as _re
-                    txt = _re.sub(r'<w:[^>]+>', '', txt)
-                    txt = txt.replace('</w:t>', '').replace('</w:r>', '')
-                return txt
-            except Exception:
-                return str(val)
-        plain_client = _sanitize_plain(context_data.get('client_name',''))
-        context_data['client_name'] = plain_client
-        try:
-            from docxtpl import RichText
-            if '\\n' in plain_client:
-                rt = RichText()
-                rt.add(plain_client.replace('\\n','\n'))
-                context_data['client_name'] = rt
-        except Exception:
-            pass
+        context = WzContext.coerce(context_data)
+        _log.debug("Updating WZ number: %s", context.wz_number or 'WZ_UNKNOWN')
 
         # Update WZ document using template
-        success = generate_wz_document_from_template(context_data, wz_path)
+        success = generate_wz_document_from_template(context, wz_path)
         
         if success:
             # Update context in database
-            db_success = update_wz_context_in_db(wz_path, context_data)
+            with tracing.span('db'):
+                db_success = update_wz_context_in_db(wz_path, context.to_storage())
             if not db_success:
-                print("Warning: WZ document updated but database context update failed")
+                _log.warning("WZ document updated but database context update failed")
                 # Don't fail the entire operation for database issues
             
-            print(f"Successfully updated WZ: {wz_path}")
+            _log.info("Successfully updated WZ: %s", wz_path)
             return True
         else:
-            print(f"Failed to update WZ document: {wz_path}")
+            tracing.mark_failed("document update")
+            _log.warning("Failed to update WZ document: %s", wz_path)
             return False
         
     except Exception as e:
-        print(f"Error in update_wz_document: {e}")
+        tracing.mark_failed(e)
+        _log.error("Error in update_wz_document: %s", e)
         return False
 
 
@@ -91,7 +73,7 @@ def generate_wz_document_from_template(context_data, output_path):
     Generate WZ document from template and save to specified path
     
     Args:
-        context_data (dict): Context data with form values
+        context_data (dict | WzContext): Context data with form values
         output_path (str): Path where to save the updated document
         
     Returns:
@@ -104,5 +86,5 @@ def generate_wz_document_from_template(context_data, output_path):
         return generate_wz_document(context_data, output_path)
         
     except Exception as e:
-        print(f"Error generating WZ document from template: {e}")
+        _log.error("Error generating WZ document from template: %s", e)
         return False
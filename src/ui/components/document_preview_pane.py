@@ -0,0 +1,72 @@
+"""
+Preview pane showing a text summary of the document selected in a browse list
+"""
+from tkinter import *
+import queue
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from src.services import document_preview_service
+
+
+class DocumentPreviewPane:
+    """Read-only text pane filled by the background preview worker"""
+
+    POLL_MS = 50
+
+    def __init__(self, parent, kind):
+        self.kind = kind  # 'offer' or 'wz'
+        self.current_path = None
+        self._poll_job = None
+        self._results = queue.Queue()
+
+        self.frame = Frame(parent, bg='white')
+        Label(self.frame, text='Podgląd', font=('Arial', 11, 'bold'), bg='white', fg='#333').pack(anchor=W)
+        self.text = Text(self.frame, width=48, wrap=WORD, font=('Arial', 10), bg='#fafafa',
+                         relief=FLAT, state=DISABLED, cursor='arrow')
+        self.text.pack(fill=BOTH, expand=True, pady=(5, 0))
+
+    def _set_text(self, text):
+        self.text.config(state=NORMAL)
+        self.text.delete('1.0', END)
+        self.text.insert('1.0', text)
+        self.text.config(state=DISABLED)
+
+    def show_for(self, file_path):
+        """Show the preview of file_path (None clears the pane)"""
+        self.current_path = file_path
+        if not file_path:
+            self._set_text('')
+            return
+        cached = document_preview_service.get_cached_preview(file_path)
+        self._set_text(cached if cached is not None else 'Wczytywanie podglądu...')
+        # Always confirm in the background: the file may have changed since it was cached
+        document_preview_service.request_preview(self.kind, file_path, self._results)
+        self._schedule_poll()
+
+    def prefetch(self, file_paths):
+        """Prepare previews of the listed documents in the background"""
+        if file_paths:
+            document_preview_service.prefetch(self.kind, list(file_paths))
+
+    def _schedule_poll(self):
+        if self._poll_job is None:
+            self._poll_job = self.frame.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        done = False
+        while True:
+            try:
+                file_path, text = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # Results for rows the user already moved past are dropped
+            if file_path == self.current_path:
+                self._set_text(text)
+                done = True
+        if not done and self.current_path:
+            self._schedule_poll()
@@ -0,0 +1,166 @@
+"""
+As-you-type product suggestions for the product add/edit windows
+"""
+from tkinter import *
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from src.data import product_catalog_service
+from src.utils import money
+
+
+class ProductAutocomplete:
+    """Suggestion list under the product name field, filled from the product catalog.
+
+    Down/Up move through the list, Enter or a click picks a product and passes it
+    to `on_pick` (dict with name, unit, price, client_price), Escape closes it.
+    """
+
+    DELAY_MS = 120
+    MIN_CHARS = 2
+    _NAVIGATION_KEYS = {'Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab', 'Shift_L', 'Shift_R',
+                        'Control_L', 'Control_R', 'Alt_L', 'Alt_R', 'Left', 'Right', 'Home', 'End'}
+
+    def __init__(self, name_widget, on_pick, client_nip_provider=None, with_price=True):
+        self.name_widget = name_widget
+        self.on_pick = on_pick
+        self.client_nip_provider = client_nip_provider
+        self.with_price = with_price
+        self.suggestions = []
+        self._job = None
+        self._listbox = None
+
+        product_catalog_service.preload_async()
+        name_widget.bind('<KeyRelease>', self._on_key, add='+')
+        name_widget.bind('<Down>', self._on_down)
+        name_widget.bind('<Up>', self._on_up)
+        name_widget.bind('<Return>', self._on_return)
+        name_widget.bind('<Escape>', self._on_escape)
+        name_widget.bind('<FocusOut>', lambda e: name_widget.after(150, self._hide_unless_focused), add='+')
+
+    def _typed_text(self):
+        if self.name_widget.winfo_class() == 'Text':
+            return self.name_widget.get('1.0', 'end-1c')
+        return self.name_widget.get()
+
+    def _on_key(self, event):
+        if event.keysym in self._NAVIGATION_KEYS:
+            return
+        if self._job is not None:
+            self.name_widget.after_cancel(self._job)
+        self._job = self.name_widget.after(self.DELAY_MS, self._update)
+
+    def _update(self):
+        self._job = None
+        text = self._typed_text()
+        if len(text.strip()) < self.MIN_CHARS:
+            self.hide()
+            return
+        client_nip = None
+        if self.client_nip_provider:
+            try:
+                client_nip = self.client_nip_provider()
+            except Exception:
+                client_nip = None
+        self.suggestions = product_catalog_service.search(text, client_nip)
+        if not self.suggestions:
+            self.hide()
+            return
+        self._show()
+
+    def _label(self, product):
+        name = product['name'].replace('\\n', ' ').replace('\n', ' ')
+        if len(name) > 60:
+            name = name[:57] + '...'
+        parts = [name, product.get('unit') or '']
+        if self.with_price and product.get('price'):
+            try:
+                price = money.format_amount(money.parse_amount(product['price']))
+            except ValueError:
+                price = product['price']
+            parts.append(f"{price} zł" + (" (ten klient)" if product.get('client_price') else ""))
+        return '   |   '.join(p for p in parts if p)
+
+    def _show(self):
+        top = self.name_widget.winfo_toplevel()
+        if self._listbox is None or not self._listbox.winfo_exists():
+            self._listbox = Listbox(top, font=("Arial", 10), activestyle='none', relief=SOLID, bd=1,
+                                    exportselection=False)
+            self._listbox.bind('<ButtonRelease-1>', lambda e: self._pick())
+            self._listbox.bind('<Return>', lambda e: self._pick())
+            self._listbox.bind('<Escape>', lambda e: self.hide())
+        self._listbox.delete(0, END)
+        for product in self.suggestions:
+            self._listbox.insert(END, self._label(product))
+        x = self.name_widget.winfo_rootx() - top.winfo_rootx()
+        y = self.name_widget.winfo_rooty() - top.winfo_rooty() + self.name_widget.winfo_height()
+        width = max(self.name_widget.winfo_width(), 420)
+        self._listbox.configure(height=len(self.suggestions))
+        self._listbox.place(x=x, y=y, width=width)
+        self._listbox.lift()
+        self._listbox.selection_clear(0, END)
+
+    def is_visible(self):
+        return self._listbox is not None and self._listbox.winfo_exists() and self._listbox.winfo_ismapped()
+
+    def hide(self):
+        if self._listbox is not None and self._listbox.winfo_exists():
+            self._listbox.place_forget()
+
+    def _hide_unless_focused(self):
+        try:
+            if self.name_widget.focus_get() is not self._listbox:
+                self.hide()
+        except (KeyError, TclError):
+            self.hide()
+
+    def _move(self, step):
+        if not self.is_visible():
+            return None
+        current = self._listbox.curselection()
+        index = (current[0] + step) if current else (0 if step > 0 else len(self.suggestions) - 1)
+        index = max(0, min(len(self.suggestions) - 1, index))
+        self._listbox.selection_clear(0, END)
+        self._listbox.selection_set(index)
+        self._listbox.see(index)
+        return 'break'
+
+    def _on_down(self, event):
+        return self._move(1)
+
+    def _on_up(self, event):
+        return self._move(-1)
+
+    def _on_return(self, event):
+        if self.is_visible() and self._listbox.curselection():
+            self._pick()
+            return 'break'
+        return None
+
+    def _on_escape(self, event):
+        if self.is_visible():
+            self.hide()
+            return 'break'
+        return None
+
+    def _pick(self):
+        selection = self._listbox.curselection() if self._listbox is not None else ()
+        if not selection:
+            return
+        product = self.suggestions[selection[0]]
+        self.hide()
+        self.on_pick(product)
+        self.name_widget.focus_set()
+
+
+def fill_text_widget(widget, value):
+    """Replace the content of an Entry or Text widget."""
+    if widget.winfo_class() == 'Text':
+        widget.delete('1.0', END)
+        widget.insert('1.0', value)
+    else:
+        widget.delete(0, END)
+        widget.insert(0, value)
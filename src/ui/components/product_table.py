@@ -1,9 +1,12 @@
 """
 Product table component for managing product list
 """
+import logging
 from tkinter import ttk
 from tkinter import *
 import tkinter.messagebox
+from dataclasses import dataclass, field
+from decimal import Decimal
 import sys
 import os
 
@@ -11,31 +14,41 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from src.utils.config import TABLE_COLUMNS, TABLE_COLUMN_HEADERS
+from src.utils import money
 
+_log = logging.getLogger(__name__)
 
-def _to_float(value) -> float:
-    """Parse value that may contain spaces as thousand separators and comma decimal."""
-    if isinstance(value, str):
-        # remove spaces (thousands) and convert comma to dot
-        cleaned = value.replace(' ', '').replace('\u00A0', '').replace(',', '.')
-        return float(cleaned)
-    return float(value)
 
 def format_currency(value):
     """Format number as '36 800,00' (space thousands, comma decimals)."""
     try:
-        n = _to_float(value)
-        # First format with US grouping, then swap separators
-        s = f"{n:,.2f}"
-        s = s.replace(',', ' ').replace('.', ',')
-        return s
+        return money.format_amount(value)
     except Exception:
         # Fallback to string
         return str(value)
 
 
+MAX_NAME_LINES = 7
+
+
+@dataclass
+class ProductRow:
+    """One line item of the offer table; source of truth for values shown in the Treeview."""
+    product_name: str
+    unit: str
+    quantity: int
+    unit_price: Decimal
+    total: Decimal = field(init=False)
+
+    def __post_init__(self):
+        self.total = money.line_total(self.quantity, self.unit_price)
+
+
 class ProductTable:
     """Handles product table functionality"""
+
+    # Delay before applying deferred view updates (row height) after a burst of edits
+    REFRESH_DELAY_MS = 30
     
     def __init__(self, parent_window, parent_frame=None, edit_callback=None, delete_callback=None):
         self.parent_window = parent_window
@@ -44,6 +57,11 @@ class ProductTable:
         self.delete_callback = delete_callback  # Callback for inline delete
         self.tree = None
         self.count = 0
+        # Row model keyed by Treeview iid plus running aggregates, updated per edit
+        self._rows = {}
+        self._total = money.ZERO
+        self._line_counts = [0] * (MAX_NAME_LINES + 1)  # rows per number of name lines
+        self._refresh_job = None
         # Dynamic row height management (Treeview supports one rowheight per widget)
         self._style = None
         self._style_name = 'Offers.Treeview'
@@ -111,27 +129,63 @@ class ProductTable:
                 return 1
             lines = product_name.count('\n') + 1
             # Cap to 7 lines as per UI input limit
-            return max(1, min(7, lines))
+            return max(1, min(MAX_NAME_LINES, lines))
         except Exception:
             return 1
 
+    # ---- row model bookkeeping (O(1) per edit) ----
+
+    def _add_to_model(self, iid, row: ProductRow):
+        self._rows[iid] = row
+        self._total += row.total
+        self._line_counts[self._compute_needed_lines(row.product_name)] += 1
+        self._schedule_view_refresh()
+
+    def _remove_from_model(self, iid):
+        row = self._rows.pop(str(iid), None)
+        if row is None:
+            return
+        self._total -= row.total
+        self._line_counts[self._compute_needed_lines(row.product_name)] -= 1
+        self._schedule_view_refresh()
+
+    def _schedule_view_refresh(self):
+        """Coalesce view updates triggered by many edits into one deferred pass."""
+        if self._refresh_job is not None:
+            return
+        try:
+            self._refresh_job = self.tree.after(self.REFRESH_DELAY_MS, self._flush_view_refresh)
+        except Exception:
+            self._flush_view_refresh()
+
+    def _flush_view_refresh(self):
+        self._refresh_job = None
+        self._refresh_rowheight()
+
     def _refresh_rowheight(self):
         """Set Treeview rowheight to fit the longest multi-line product name currently in the table."""
         try:
             if not self._style:
                 return
             max_lines = 1
-            for child in self.tree.get_children():
-                vals = self.tree.item(child).get('values') or []
-                if len(vals) >= 2:
-                    max_lines = max(max_lines, self._compute_needed_lines(str(vals[1])))
+            for lines in range(MAX_NAME_LINES, 0, -1):
+                if self._line_counts[lines] > 0:
+                    max_lines = lines
+                    break
+            wanted = int(self._line_px * max_lines)
+            if max_lines == self._max_lines and str(self._style.lookup(self._style_name, 'rowheight')) == str(wanted):
+                return  # avoid a needless Treeview reflow
             self._max_lines = max_lines
             self._style.configure(self._style_name, rowheight=int(self._line_px * self._max_lines))
         except Exception:
             pass
-    
-    def input_record(self, product_data):
-        """Insert a new product record with auto-generated position number"""
+
+    def _row_values(self, position_number, row: ProductRow):
+        return (position_number, row.product_name, row.unit, row.quantity,
+                format_currency(row.unit_price), format_currency(row.total), "Edytuj", "Usuń")
+
+    def _parse_product_data(self, product_data):
+        """Validate (name, unit, qty, price) input and build a ProductRow, or return None."""
         # Extract data without product_id since it will be auto-generated
         if len(product_data) == 5:
             # Old format with product_id - ignore the first element
@@ -139,198 +193,166 @@ class ProductTable:
         else:
             # New format without product_id
             product_name, unit, quantity, unit_price = product_data
-        
+
         if not all([product_name, unit, quantity, unit_price]):
             tkinter.messagebox.showinfo("WARNING", "Enter all the fields!")
-            return False
-        
+            return None
+
         try:
-            quantity = int(quantity)
-            unit_price = _to_float(unit_price)
-            total = quantity * unit_price
-            
-            # Auto-generate position number (1-based)
-            position_number = len(self.tree.get_children()) + 1
-            
-            print(f"Adding product: {position_number}, {product_name}, {unit}, {quantity}, {unit_price}, {total}")
-            
-            if self.tree:
-                # Format numbers with comma for display
-                unit_price_display = format_currency(unit_price)
-                total_display = format_currency(total)
-                
-                # Insert product name as-is (may include newlines); Treeview will display multi-line when rowheight allows
-                self.tree.insert('', index=END, iid=self.count,
-                               values=(position_number, product_name, unit, quantity, unit_price_display, total_display, "Edytuj", "Usuń"))
-                # Expand rowheight if needed for multi-line names
-                self._refresh_rowheight()
-                self.count += 1
-                return True
-            else:
-                print("Error: Table not initialized!")
-                
+            return ProductRow(str(product_name), str(unit),
+                              money.parse_quantity(quantity), money.parse_amount(unit_price))
         except ValueError:
             tkinter.messagebox.showinfo("WARNING", "Enter valid numeric values!")
-            return False
+            return None
     
+    def input_record(self, product_data):
+        """Insert a new product record with auto-generated position number"""
+        row = self._parse_product_data(product_data)
+        if row is None:
+            return False
+        if not self.tree:
+            _log.error("Table not initialized!")
+            return False
+
+        # Auto-generate position number (1-based)
+        position_number = len(self._rows) + 1
+        iid = str(self.count)
+        # Insert product name as-is (may include newlines); Treeview will display multi-line when rowheight allows
+        self.tree.insert('', index=END, iid=iid, values=self._row_values(position_number, row))
+        self._add_to_model(iid, row)
+        self.count += 1
+        return True
+
+    def bulk_insert(self, rows):
+        """Append many already validated (name, unit, quantity, unit_price) rows at once.
+
+        Unlike input_record, no per-row view refresh is scheduled: the running total is
+        updated once and the row height is recalculated a single time at the end.
+        Returns the number of inserted rows.
+        """
+        if not self.tree or not rows:
+            return 0
+        position_number = len(self._rows)
+        added = money.ZERO
+        insert = self.tree.insert
+        for name, unit, qty, price in rows:
+            row = ProductRow(str(name), str(unit), qty, price)
+            position_number += 1
+            iid = str(self.count)
+            self.count += 1
+            insert('', index=END, iid=iid, values=self._row_values(position_number, row))
+            self._rows[iid] = row
+            added += row.total
+            self._line_counts[self._compute_needed_lines(row.product_name)] += 1
+        self._total += added
+        self._refresh_rowheight()
+        return len(rows)
+
     def remove_record(self):
         """Remove selected product record"""
         if self.tree:
             for selected_item in self.tree.selection():
                 self.tree.delete(selected_item)
+                self._remove_from_model(selected_item)
             # Renumber all remaining items
             self.renumber_items()
-            # Recompute row height after deletion in case the longest row was removed
-            self._refresh_rowheight()
+
+    def clear(self):
+        """Remove all products and reset the running totals."""
+        if self.tree:
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)
+        self._rows.clear()
+        self._total = money.ZERO
+        self._line_counts = [0] * (MAX_NAME_LINES + 1)
+        self.count = 0
+        self._schedule_view_refresh()
     
     def renumber_items(self):
         """Renumber all items in the table to maintain sequential order"""
         if not self.tree:
             return
         
-        # Get all children (items) in the table
-        children = self.tree.get_children()
-        
-        # Update position numbers sequentially
-        for index, child in enumerate(children, 1):
-            current_values = list(self.tree.item(child)['values'])
-            # Update the position number (first column)
-            current_values[0] = index
-            # Update the item with new values
-            self.tree.item(child, values=current_values)
+        # Only the position column changes; set it directly instead of rewriting the whole row
+        for index, child in enumerate(self.tree.get_children(), 1):
+            self.tree.set(child, 'PID', index)
     
     def get_selected_product(self):
         """Get data of the selected product for editing"""
         if self.tree and self.tree.selection():
             selected_item = self.tree.selection()[0]
-            values = self.tree.item(selected_item)['values']
-            if values:
-                # Convert values back to original format (remove commas from prices)
-                # Skip the position number (first column) and DELETE column (last column)
-                position_number, product_name, unit, quantity, unit_price_display, total_display = values[:6]
-                
-                # Convert prices back to normalized dot format for editing
-                unit_price = unit_price_display.replace(' ', '').replace('\u00A0', '').replace(',', '.')
-                
+            row = self._rows.get(str(selected_item))
+            if row:
                 return {
                     'item_id': selected_item,
-                    'product_name': str(product_name),
-                    'unit': str(unit),
-                    'quantity': str(quantity),
-                    'unit_price': str(unit_price)
+                    'product_name': row.product_name,
+                    'unit': row.unit,
+                    'quantity': str(row.quantity),
+                    # Normalized dot format for editing
+                    'unit_price': money.to_plain_string(row.unit_price)
                 }
         return None
     
     def update_record(self, item_id, product_data):
         """Update existing product record while preserving position number"""
-        # Extract data without product_id since position number is auto-managed
-        if len(product_data) == 5:
-            # Old format with product_id - ignore the first element
-            _, product_name, unit, quantity, unit_price = product_data
-        else:
-            # New format without product_id
-            product_name, unit, quantity, unit_price = product_data
-        
-        if not all([product_name, unit, quantity, unit_price]):
-            tkinter.messagebox.showinfo("WARNING", "Enter all the fields!")
+        row = self._parse_product_data(product_data)
+        if row is None:
             return False
-        
-        try:
-            quantity = int(quantity)
-            unit_price = _to_float(unit_price)
-            total = quantity * unit_price
-            
-            if self.tree:
-                # Get current position number from the existing record
-                current_values = self.tree.item(item_id)['values']
-                position_number = current_values[0]  # Keep existing position number
-                
-                # Format numbers with comma for display
-                unit_price_display = format_currency(unit_price)
-                total_display = format_currency(total)
-                
-                # Update the record
-                self.tree.item(item_id, values=(position_number, product_name, unit, quantity, unit_price_display, total_display, "Edytuj", "Usuń"))
-                # Rowheight may need to change if product name lines changed
-                self._refresh_rowheight()
-                return True
-            else:
-                print("Error: Table not initialized!")
-                
-        except ValueError:
-            tkinter.messagebox.showinfo("WARNING", "Enter valid numeric values!")
+        if not self.tree:
+            _log.error("Table not initialized!")
             return False
+
+        item_id = str(item_id)
+        # Keep existing position number
+        position_number = self.tree.set(item_id, 'PID')
+        self.tree.item(item_id, values=self._row_values(position_number, row))
+        self._remove_from_model(item_id)
+        self._add_to_model(item_id, row)
+        return True
     
     def calculate_totals(self):
-        """Calculate totals from all products in the table"""
+        """Return the netto total of all products (Decimal, kept up to date on every edit)."""
+        return self._total
+
+    def get_rows(self):
+        """Return ProductRow objects in display order."""
         if not self.tree:
-            return 0.0
-        
-        total = 0.0
-        for i in range(20):  # Based on original logic
-            if self.tree.exists(i):
-                item = self.tree.item(str(i))
-                if item['values']:
-                    # Handle values that might have spaces and comma decimal
-                    total_value = _to_float(str(item['values'][5]))
-                    total += float(total_value)  # TOTAL column (now index 5)
-        
-        return total
+            return []
+        return [self._rows[str(child)] for child in self.tree.get_children() if str(child) in self._rows]
     
     def get_all_products(self):
         """Get all products from the table as a list of lists (rows)"""
+        if not self.tree:
+            _log.error("Table not initialized when getting products!")
+            return []
         products = []
-        if self.tree:
-            print(f"Getting products from table with {len(self.tree.get_children())} items")
-            for child in self.tree.get_children():
-                item = self.tree.item(child)
-                if item['values']:
-                    # Extract values: position, pname, unit, qty, unit_price, total (skip EDIT and DELETE columns)
-                    values = item['values'][:6]  # Take only first 6 values, skip EDIT and DELETE
-                    position, pname, unit, qty, unit_price, total = values
-                    
-                    # Create a row as list with formatted values (comma as decimal separator)
-                    row = [
-                        str(position),                      # Lp (pozycja) - auto-generated
-                        str(pname),                         # Nazwa produktu
-                        str(unit),                          # Jednostka miary
-                        str(qty),                           # Ilość
-                        format_currency(unit_price),        # Cena jednostkowa z przecinkiem
-                        format_currency(total)              # Suma z przecinkiem
-                    ]
-                    products.append(row)
-                    print(f"Retrieved product row: {row}")
-        else:
-            print("Error: Table not initialized when getting products!")
-        
-        print(f"Total product rows retrieved: {len(products)}")
+        for position, row in enumerate(self.get_rows(), 1):
+            # Create a row as list with formatted values (comma as decimal separator)
+            products.append([
+                str(position),                      # Lp (pozycja) - auto-generated
+                row.product_name,                   # Nazwa produktu
+                row.unit,                           # Jednostka miary
+                str(row.quantity),                  # Ilość
+                format_currency(row.unit_price),    # Cena jednostkowa z przecinkiem
+                format_currency(row.total)          # Suma z przecinkiem
+            ])
+        _log.debug("Total product rows retrieved: %s", len(products))
         return products
     
     def get_all_products_as_dicts(self):
         """Get all products from the table as a list of dictionaries (legacy method)"""
-        products = []
-        if self.tree:
-            print(f"Getting products from table with {len(self.tree.get_children())} items")
-            for child in self.tree.get_children():
-                item = self.tree.item(child)
-                if item['values']:
-                    # Extract values: (position, pname, unit, qty, unit_price, total, edit_icon, delete_icon)
-                    pid, pname, unit, qty, unit_price, total = item['values'][:6]  # Take only first 6 values
-                    product = {
-                        'pid': pid,
-                        'pname': pname,
-                        'unit': unit,
-                        'qty': qty,
-                        'unit_price': format_currency(unit_price),
-                        'total': format_currency(total)
-                    }
-                    products.append(product)
-                    print(f"Retrieved product: {product}")
-        else:
-            print("Error: Table not initialized when getting products!")
-        
-        print(f"Total products retrieved: {len(products)}")
-        return products
+        return [
+            {
+                'pid': int(pid),
+                'pname': pname,
+                'unit': unit,
+                'qty': qty,
+                'unit_price': unit_price,
+                'total': total
+            }
+            for pid, pname, unit, qty, unit_price, total in self.get_all_products()
+        ]
 
     def has_scrollbar_active(self):
         """Check if the table scrollbar is active (visible and needed)"""
@@ -517,18 +539,17 @@ class ProductTable:
                 
                 if column == edit_column_index:  # EDIT column
                     # Get product data
-                    values = self.tree.item(item)['values']
-                    if values and self.edit_callback:
-                        # Call edit callback with product data
-                        # values format: (position, name, unit, qty, price, total, edit_icon, delete_icon)
+                    row = self._rows.get(str(item))
+                    if row and self.edit_callback:
+                        # Call edit callback with product data taken from the row model
                         product_data = {
                             'item_id': item,
-                            'position': values[0],
-                            'product_name': values[1],  # Changed from 'name' to 'product_name'
-                            'unit': values[2],
-                            'quantity': values[3],
-                            'unit_price': values[4].replace(',', '.'),  # Convert back from display format
-                            'total': values[5].replace(',', '.')        # Convert back from display format
+                            'position': self.tree.set(item, 'PID'),
+                            'product_name': row.product_name,
+                            'unit': row.unit,
+                            'quantity': row.quantity,
+                            'unit_price': money.to_plain_string(row.unit_price),
+                            'total': money.to_plain_string(row.total)
                         }
                         self.edit_callback(product_data)
                         
@@ -541,6 +562,7 @@ class ProductTable:
                     if result:
                         # Delete the item
                         self.tree.delete(item)
+                        self._remove_from_model(item)
                         
                         # Renumber all remaining items
                         self.renumber_items()
@@ -1,6 +1,7 @@
 """
 Main UI components for the offer creation interface
 """
+import logging
 from tkinter import *
 from tkinter import ttk
 import tkinter.messagebox
@@ -13,6 +14,9 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from src.utils.settings import settings_manager
+from src.utils import money
+
+_log = logging.getLogger(__name__)
 
 
 def format_nip(nip_value):
@@ -94,7 +98,33 @@ class UIComponents:
                     else:
                         widget.delete(0, END)
                         widget.insert(0, value)
-    
+
+    def reset_form(self):
+        """Bring the existing widgets back to the state of a freshly created form
+        (company data and offer details from settings, everything else empty)"""
+        self.refresh_company_data()
+        if 'language' in self.entries:
+            self.entries['language'].set("PL")
+        for field in ('client_name', 'supplier_name', 'uwagi'):
+            if field in self.entries:
+                self.entries[field].delete('1.0', END)
+        for field in ('client_address_1', 'client_address_2', 'supplier_address_1', 'supplier_address_2',
+                      'client_nip', 'supplier_nip', 'offer_number_display'):
+            if field in self.entries:
+                widget = self.entries[field]
+                state = widget.cget('state')
+                widget.config(state='normal')
+                widget.delete(0, END)
+                widget.config(state=state)
+        self.date_var.set(datetime.now().strftime("%d %m %Y"))
+        self.clear_suma()
+        self.selected_client_alias = None
+        self.selected_supplier_alias = None
+        self.offer_number = None
+        self.locked_year = None
+        if self.product_table is not None and self.product_table.tree:
+            self.product_table.clear()
+
     def create_upper_section(self, show_offer_number=False):
         """Create the upper section of the form"""
         # Language selector (top right, before date)
@@ -254,8 +284,7 @@ class UIComponents:
     
     def update_suma(self, value):
         """Update the suma field value with comma as decimal separator"""
-        formatted_value = f"{float(value):.2f}".replace('.', ',')
-        self.suma_var.set(formatted_value)
+        self.suma_var.set(money.format_amount(value, grouping=False))
     
     def clear_suma(self):
         """Clear the suma field"""
@@ -319,7 +348,7 @@ class UIComponents:
                             widget.delete(0, END)
                             widget.insert(0, str(use_val or ''))
             except Exception as e:
-                print(f"Debug: could not fill extended client fields: {e}")
+                _log.debug("Could not fill extended client fields: %s", e)
     
     def fill_supplier_data(self, supplier_data):
         """Fill supplier entry fields with selected supplier data"""
@@ -367,7 +396,7 @@ class UIComponents:
                     parsed_date = datetime.strptime(date_str, "%d %B %Y").date()
                 except ValueError:
                     # If all parsing fails, use current date
-                    print(f"Warning: Could not parse date '{date_str}', using current date")
+                    _log.warning("Could not parse date '%s', using current date", date_str)
                     parsed_date = datetime.now().date()
         
         context = {
@@ -415,14 +444,14 @@ class UIComponents:
             context['products'] = self.product_table.get_all_products()
             # Calculate total sum of all products (netto) 
             products_total_netto = self.product_table.calculate_totals()
-            context['products_total_netto'] = products_total_netto
+            # Stored in the DB context as JSON; keep it a plain number
+            context['products_total_netto'] = float(products_total_netto)
             
-            # Format the netto total with space thousands and comma decimals
-            try:
-                from src.ui.components.product_table import format_currency
-                context['total_netto'] = format_currency(products_total_netto)
-            except Exception:
-                context['total_netto'] = f"{products_total_netto:.2f}".replace('.', ',')
+            # Format totals with space thousands and comma decimals (exact Decimal values)
+            totals = money.totals_from_netto(products_total_netto)
+            context['total_netto'] = money.format_amount(totals.netto)
+            context['total_vat'] = money.format_amount(totals.vat)
+            context['total_brutto'] = money.format_amount(totals.brutto)
             
             
         # Add product table headers for Word template
@@ -484,7 +513,7 @@ class UIComponents:
                                 # client_data format: (nip, company_name, address1, address2, alias)
                                 self.selected_client_alias = client_data[4]  # alias is at index 4
                         except Exception as e:
-                            print(f"Debug: Error looking up client in database: {e}")
+                            _log.debug("Error looking up client in database: %s", e)
             
             # Load supplier data
             supplier_fields = ['supplier_name', 'supplier_address_1', 'supplier_address_2', 'supplier_nip']
@@ -545,8 +574,7 @@ class UIComponents:
                 products = context_data.get('products', [])
                 # Clear existing products
                 if self.product_table.tree:
-                    for item in self.product_table.tree.get_children():
-                        self.product_table.tree.delete(item)
+                    self.product_table.clear()
                 
                 # Add products from context
                 for product in products:
@@ -566,7 +594,7 @@ class UIComponents:
                         try:
                             self.product_table.input_record(product_tuple)
                         except Exception as e:
-                            print(f"Error adding product {product}: {e}")
+                            _log.error("Error adding product %s: %s", product, e)
                 
                 # Recalculate totals
                 if hasattr(self.product_table, 'calculate_totals'):
@@ -576,7 +604,7 @@ class UIComponents:
             return True
             
         except Exception as e:
-            print(f"Error loading context for new offer: {e}")
+            _log.error("Error loading context for new offer: %s", e)
             return False
     
     def set_editor_mode(self):
@@ -694,7 +722,7 @@ class UIComponents:
             try:
                 # Method 1: Try selection_get() first
                 selected_date = cal.selection_get()
-                print(f"selection_get() returned: {selected_date}")  # Debug
+                _log.debug("selection_get() returned: %s", selected_date)
                 
                 if selected_date:
                     # Enforce locked year if set
@@ -712,7 +740,7 @@ class UIComponents:
                 
                 # Method 2: Try get_date() as fallback
                 date_str = cal.get_date()
-                print(f"get_date() returned: {date_str}")  # Debug
+                _log.debug("get_date() returned: %s", date_str)
                 
                 if date_str:
                     # Parse the date string and reformat
@@ -728,7 +756,7 @@ class UIComponents:
                                 parsed_date = _dt(self.locked_year, 1, 1)
                         formatted_date = parsed_date.strftime("%d %m %Y")
                         self.date_var.set(formatted_date)
-                        print(f"Date set to: {self.date_var.get()}")  # Debug
+                        _log.debug("Date set to: %s", self.date_var.get())
                         date_window.destroy()
                         return
                     except ValueError:
@@ -737,9 +765,9 @@ class UIComponents:
                             try:
                                 parsed_date = datetime.strptime(date_str, fmt)
                                 formatted_date = parsed_date.strftime("%d %m %Y")
-                                print(f"Parsed with format {fmt}: {formatted_date}")  # Debug
+                                _log.debug("Parsed with format %s: %s", fmt, formatted_date)
                                 self.date_var.set(formatted_date)
-                                print(f"Date set to: {self.date_var.get()}")  # Debug
+                                _log.debug("Date set to: %s", self.date_var.get())
                                 date_window.destroy()
                                 return
                             except ValueError:
@@ -753,7 +781,7 @@ class UIComponents:
                     
                     selected_date = datetime(current_year, current_month, current_day)
                     formatted_date = selected_date.strftime("%d %m %Y")
-                    print(f"Using calendar view date: {formatted_date}")  # Debug
+                    _log.debug("Using calendar view date: %s", formatted_date)
                     self.date_var.set(formatted_date)
                     date_window.destroy()
                     return
@@ -761,12 +789,12 @@ class UIComponents:
                     pass
                 
                 # If all methods fail, show error
-                print("All date retrieval methods failed")  # Debug
+                _log.warning("All date retrieval methods failed")
                 import tkinter.messagebox
                 tkinter.messagebox.showerror("Błąd", "Nie udało się pobrać wybranej daty. Spróbuj kliknąć przycisk OK.")
                         
             except Exception as e:
-                print(f"Error selecting date: {e}")
+                _log.error("Error selecting date: %s", e)
                 import tkinter.messagebox
                 tkinter.messagebox.showerror("Błąd", f"Błąd podczas wyboru daty: {e}")
         
@@ -808,5 +836,5 @@ class UIComponents:
                 self.fill_supplier_data(supplier_data)
                 
         except Exception as e:
-            print(f"Error loading default supplier: {e}")
+            _log.error("Error loading default supplier: %s", e)
             # If error occurs, supplier fields remain empty (which is the desired fallback)
@@ -10,6 +10,8 @@ import os
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
+from src.utils import money
+
 
 class WzProductTable:
     """Handles WZ product table functionality - simplified without pricing columns"""
@@ -102,7 +104,7 @@ class WzProductTable:
             return False
 
         try:
-            quantity = int(quantity)
+            quantity = money.parse_quantity(quantity)
             position_number = len(self.tree.get_children()) + 1
             if self.tree:
                 self.tree.insert('', index=END, iid=self.count,
@@ -114,6 +116,25 @@ class WzProductTable:
             tkinter.messagebox.showinfo("WARNING", "Enter valid numeric values!")
             return False
 
+    def bulk_insert(self, rows):
+        """Append many already validated (name, unit, quantity) rows at once.
+        Row height is computed once for the whole batch. Returns the number of inserted rows."""
+        if not self.tree or not rows:
+            return 0
+        position_number = len(self.tree.get_children())
+        max_lines = self._max_lines
+        insert = self.tree.insert
+        for name, unit, quantity in rows:
+            position_number += 1
+            insert('', index=END, iid=self.count,
+                   values=(position_number, name, unit, quantity, 'Edytuj', 'Usuń'))
+            self.count += 1
+            max_lines = max(max_lines, self._compute_needed_lines(name))
+        if max_lines != self._max_lines and self._style:
+            self._max_lines = max_lines
+            self._style.configure(self._style_name, rowheight=int(self._line_px * self._max_lines))
+        return len(rows)
+
     def insert_product(self, product_data):
         self.count += 1
         self.tree.insert('', 'end',
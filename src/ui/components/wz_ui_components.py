@@ -1,6 +1,7 @@
 """
 WZ UI Components - simplified version for WZ creation without pricing and some other elements
 """
+import logging
 from tkinter import *
 from tkinter import ttk
 import tkinter.messagebox
@@ -15,6 +16,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirna
 from src.data.database_service import get_suppliers_from_db, get_clients_from_db
 from src.utils.settings import settings_manager
 
+_log = logging.getLogger(__name__)
+
 
 class WzUIComponents:
     """Handles WZ UI creation and data management - simplified version"""
@@ -434,7 +437,40 @@ class WzUIComponents:
         # Clear aliases
         self.selected_client_alias = None
         self.selected_supplier_alias = None
-    
+
+    def reset_form(self):
+        """Bring the existing widgets back to the state of a freshly created form
+        (company data from settings, everything else empty)"""
+        self.suppliers_data = get_suppliers_from_db() or []
+        self.clients_data = get_clients_from_db() or []
+        self.text_data = settings_manager.get_all_company_data_settings()
+        for field in ('town', 'address_1', 'address_2', 'nip', 'regon', 'email', 'phone_number',
+                      'bank_name', 'account_number'):
+            if field in self.entries:
+                self.entries[field].delete(0, END)
+                self.entries[field].insert(0, self.text_data.get(field, ''))
+        if 'language' in self.entries:
+            self.entries['language'].set("PL")
+        for field in ('client_name', 'supplier_name'):
+            if field in self.entries:
+                self.entries[field].delete('1.0', END)
+        for field in ('client_address_1', 'client_address_2', 'supplier_address_1', 'supplier_address_2',
+                      'client_nip', 'supplier_nip', 'wz_number_display'):
+            if field in self.entries:
+                widget = self.entries[field]
+                state = widget.cget('state')
+                widget.config(state='normal')
+                widget.delete(0, END)
+                widget.config(state=state)
+        self.date_var.set(datetime.now().strftime('%d %m %Y'))
+        self.suma_var.set("0,00")
+        self.selected_client_alias = None
+        self.selected_supplier_alias = None
+        self.wz_number = None
+        self.locked_year = None
+        if self.product_table is not None:
+            self.product_table.clear_table()
+
     def set_editor_mode(self):
         """Set fields to read-only mode for WZ editing"""
         # Fields that should be read-only in editor mode
@@ -473,7 +509,7 @@ class WzUIComponents:
                     parsed_date = datetime.strptime(date_str, "%d %B %Y").date()
                 except ValueError:
                     # If all parsing fails, use current date
-                    print(f"Warning: Could not parse date '{date_str}', using current date")
+                    _log.warning("Could not parse date '%s', using current date", date_str)
                     parsed_date = datetime.now().date()
         
         # Helper to read name fields and normalize newlines to literal markers
@@ -554,7 +590,7 @@ class WzUIComponents:
                         if client_data and len(client_data) >= 5:
                             self.selected_client_alias = client_data[4]
                     except Exception as e:
-                        print(f"Debug: Error looking up client alias by NIP: {e}")
+                        _log.debug("Error looking up client alias by NIP: %s", e)
             
             # Load supplier data
             supplier_fields = ['supplier_name', 'supplier_address_1', 'supplier_address_2', 'supplier_nip']
@@ -609,7 +645,7 @@ class WzUIComponents:
                         try:
                             self.product_table.input_record(product_tuple)
                         except Exception as e:
-                            print(f"Error adding product {product}: {e}")
+                            _log.error("Error adding product %s: %s", product, e)
                 
                 # Recalculate totals
                 if hasattr(self.product_table, 'calculate_totals'):
@@ -620,5 +656,5 @@ class WzUIComponents:
             return True
             
         except Exception as e:
-            print(f"Error loading context for new offer: {e}")
+            _log.error("Error loading context for new offer: %s", e)
             return False
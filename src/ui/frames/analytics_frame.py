@@ -0,0 +1,194 @@
+"""
+Quote analytics frame: offer values per client, month and product
+"""
+from tkinter import *
+from tkinter import ttk
+import tkinter.messagebox
+import datetime
+import threading
+import queue
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from src.services import analytics_service
+from src.data import summary_service
+from src.utils import money
+
+
+class AnalyticsFrame(Frame):
+    """Dashboard with the offer aggregates for a range of months"""
+
+    POLL_MS = 80
+    TABS = (
+        ('by_client', "Klienci", "Klient"),
+        ('by_month', "Miesiące", "Miesiąc"),
+        ('by_product', "Produkty", "Produkt"),
+    )
+
+    def __init__(self, parent, nav_manager):
+        super().__init__(parent)
+        self.nav_manager = nav_manager
+        self._queue = queue.Queue()
+        self._thread = None
+        self.trees = {}
+        self.create_ui()
+
+    def create_ui(self):
+        """Create the dashboard UI"""
+        self.configure(bg='#f0f0f0')
+
+        header_frame = Frame(self, bg='#f0f0f0')
+        header_frame.pack(fill=X, padx=20, pady=20)
+        Label(header_frame, text="Raporty ofert", font=("Arial", 18, "bold"),
+              bg='#f0f0f0', fg='#333333').pack(side=LEFT)
+        Button(header_frame, text="Powrót do menu głównego", font=("Arial", 12), fg='black',
+               padx=15, pady=8, command=self.return_to_main_menu, cursor='hand2').pack(side=RIGHT)
+        self.rebuild_btn = Button(header_frame, text="Przelicz podsumowania", font=("Arial", 12), fg='black',
+                                  padx=15, pady=8, command=self.rebuild_summaries, cursor='hand2')
+        self.rebuild_btn.pack(side=RIGHT, padx=10)
+
+        # Date range
+        range_frame = Frame(self, bg='#f0f0f0')
+        range_frame.pack(fill=X, padx=20)
+        today = datetime.date.today()
+        Label(range_frame, text="Od (RRRR-MM):", font=("Arial", 12), bg='#f0f0f0').pack(side=LEFT)
+        self.month_from = Entry(range_frame, width=10, font=("Arial", 12))
+        self.month_from.insert(0, f"{today.year}-01")
+        self.month_from.pack(side=LEFT, padx=(5, 15))
+        Label(range_frame, text="Do (RRRR-MM):", font=("Arial", 12), bg='#f0f0f0').pack(side=LEFT)
+        self.month_to = Entry(range_frame, width=10, font=("Arial", 12))
+        self.month_to.insert(0, f"{today.year}-{today.month:02d}")
+        self.month_to.pack(side=LEFT, padx=(5, 15))
+        self.compute_btn = Button(range_frame, text="Oblicz", font=("Arial", 12, "bold"), fg='black',
+                                  padx=15, pady=4, command=self.compute, cursor='hand2')
+        self.compute_btn.pack(side=LEFT)
+        for entry in (self.month_from, self.month_to):
+            entry.bind('<Return>', lambda e: self.compute())
+
+        self.summary_var = StringVar(value="")
+        Label(self, textvariable=self.summary_var, font=("Arial", 12), bg='#f0f0f0', fg='#333333',
+              anchor=W).pack(fill=X, padx=20, pady=(12, 6))
+
+        # One tab per grouping
+        notebook = ttk.Notebook(self)
+        notebook.pack(fill=BOTH, expand=True, padx=20, pady=(0, 20))
+        columns = ('label', 'offers', 'items', 'quantity', 'value')
+        for key, tab_title, label_title in self.TABS:
+            tab = Frame(notebook, bg='#f0f0f0')
+            notebook.add(tab, text=tab_title)
+            tree = ttk.Treeview(tab, columns=columns, show='headings')
+            for column, title, width, anchor in (('label', label_title, 420, W), ('offers', "Oferty", 90, E),
+                                                 ('items', "Pozycje", 90, E), ('quantity', "Ilość", 110, E),
+                                                 ('value', "Wartość netto [PLN]", 170, E)):
+                tree.heading(column, text=title)
+                tree.column(column, width=width, anchor=anchor, stretch=(column == 'label'))
+            scrollbar = ttk.Scrollbar(tab, orient=VERTICAL, command=tree.yview)
+            tree.configure(yscrollcommand=scrollbar.set)
+            tree.pack(side=LEFT, fill=BOTH, expand=True)
+            scrollbar.pack(side=RIGHT, fill=Y)
+            self.trees[key] = tree
+
+        # Client/month summary maintained in the database (includes WZ counts)
+        tab = Frame(notebook, bg='#f0f0f0')
+        notebook.add(tab, text="Klienci wg miesięcy")
+        tree = ttk.Treeview(tab, columns=('label', 'month', 'offers', 'wz', 'value'), show='headings')
+        for column, title, width, anchor in (('label', "Klient", 420, W), ('month', "Miesiąc", 90, CENTER),
+                                             ('offers', "Oferty", 90, E), ('wz', "WZ", 90, E),
+                                             ('value', "Wartość ofert netto [PLN]", 190, E)):
+            tree.heading(column, text=title)
+            tree.column(column, width=width, anchor=anchor, stretch=(column == 'label'))
+        scrollbar = ttk.Scrollbar(tab, orient=VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=LEFT, fill=BOTH, expand=True)
+        scrollbar.pack(side=RIGHT, fill=Y)
+        self.summary_tree = tree
+
+    def compute(self):
+        """Compute the report for the entered range in the background"""
+        if self._thread and self._thread.is_alive():
+            return
+        month_from = self.month_from.get().strip()
+        month_to = self.month_to.get().strip()
+        self.compute_btn.config(state=DISABLED)
+        self.summary_var.set("Obliczanie...")
+        self._thread = threading.Thread(target=self._run, args=(month_from, month_to), daemon=True)
+        self._thread.start()
+        self.after(self.POLL_MS, self._poll)
+
+    def _run(self, month_from, month_to):
+        try:
+            report = analytics_service.compute_report(month_from, month_to)
+            summary = [row for row in summary_service.get_summary(int(report.date_from[:4]), int(report.date_to[:4]))
+                       if report.date_from <= f"{row[1]}-{row[2]:02d}" <= report.date_to or row[2] == 0]
+            self._queue.put(('done', (report, summary)))
+        except Exception as e:  # noqa: BLE001
+            self._queue.put(('error', str(e)))
+
+    def _run_rebuild(self):
+        try:
+            self._queue.put(('rebuilt', summary_service.rebuild_summaries()))
+        except Exception as e:  # noqa: BLE001
+            self._queue.put(('rebuilt', (False, f"Nie udało się przeliczyć podsumowań: {e}")))
+
+    def _poll(self):
+        try:
+            kind, result = self._queue.get_nowait()
+        except queue.Empty:
+            self.after(self.POLL_MS, self._poll)
+            return
+        self.compute_btn.config(state=NORMAL)
+        if kind == 'rebuilt':
+            self.rebuild_btn.config(state=NORMAL)
+            success, message = result
+            if success:
+                tkinter.messagebox.showinfo("Podsumowania", message)
+            else:
+                tkinter.messagebox.showerror("Błąd", message)
+            return
+        if kind == 'error':
+            self.summary_var.set("")
+            tkinter.messagebox.showerror("Błąd", f"Nie udało się obliczyć raportu:\n{result}")
+            return
+        self._show_report(*result)
+
+    def _show_report(self, report, summary):
+        self.summary_var.set(
+            f"{report.date_from} – {report.date_to}:  oferty: {report.offers},  pozycje: {report.items},  "
+            f"wartość netto: {money.format_amount(report.total_value)} PLN  "
+            f"(obliczono w {report.load_seconds + report.aggregate_seconds:.2f} s)"
+        )
+        for key, _tab_title, _label_title in self.TABS:
+            tree = self.trees[key]
+            tree.delete(*tree.get_children())
+            for row in getattr(report, key):
+                tree.insert('', END, values=(row.label, row.offers, row.items,
+                                             money.format_quantity(round(row.quantity, 3)),
+                                             money.format_amount(row.value)))
+        self.summary_tree.delete(*self.summary_tree.get_children())
+        for label, year, month, offers, wz, netto in summary:
+            period = f"{year}-{month:02d}" if month else f"{year}-??"
+            self.summary_tree.insert('', END, values=(label, period, offers, wz, money.format_amount(netto)))
+
+    def rebuild_summaries(self):
+        """Recompute the client/month summary from scratch (verification)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self.rebuild_btn.config(state=DISABLED)
+        self._thread = threading.Thread(target=self._run_rebuild, daemon=True)
+        self._thread.start()
+        self.after(self.POLL_MS, self._poll)
+
+    def return_to_main_menu(self):
+        """Return to main menu"""
+        self.nav_manager.show_frame('main_menu')
+
+    def hide(self):
+        """Hide this frame"""
+        self.pack_forget()
+
+    def show(self):
+        """Show this frame"""
+        self.pack(fill=BOTH, expand=True)
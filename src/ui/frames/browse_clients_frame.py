@@ -1,6 +1,7 @@
 """
 Clients management frame
 """
+import logging
 from tkinter import *
 from tkinter import ttk
 import tkinter.messagebox
@@ -16,6 +17,9 @@ from src.data.database_service import (
     set_client_extended_fields
 )
 from src.ui.windows.client_edit_window import ClientEditWindow
+from src.utils import metrics
+
+_log = logging.getLogger(__name__)
 
 
 class BrowseClientsFrame(Frame):
@@ -160,6 +164,7 @@ class BrowseClientsFrame(Frame):
         """Return to main menu"""
         self.nav_manager.show_frame('main_menu')
     
+    @metrics.timed('list.clients')
     def refresh_clients_list(self):
         """Refresh the clients list"""
         # Load clients from database
@@ -390,16 +395,20 @@ class BrowseClientsFrame(Frame):
     def show(self):
         """Show this frame"""
         self.pack(fill=BOTH, expand=True)
+
+    def on_database_changed(self):
+        """Reload the list after the application switched to another database"""
+        self.refresh_clients_list()
     
     def on_client_single_click(self, event):
         """Handle single-click on clients table to check for edit/delete column clicks"""
         # Get the region that was clicked
         region = self.clients_tree.identify_region(event.x, event.y)
-        print(f"Client clicked region: {region}")
+        _log.debug("Client clicked region: %s", region)
         if region == "cell":
             # Get the column that was clicked
             column = self.clients_tree.identify_column(event.x)
-            print(f"Client clicked column: {column}")
+            _log.debug("Client clicked column: %s", column)
             
             # Get the item that was clicked
             item = self.clients_tree.identify_row(event.y)
@@ -412,27 +421,7 @@ class BrowseClientsFrame(Frame):
                 # EDIT column is the 12th column (index #12)
                 if column == "#12":  
                     # Open edit modal for this client
-                    nip = values[0]
-                    src = next((c for c in self.clients_data if str(c['NIP']) == str(nip)), None)
-                    if not src:
-                        tkinter.messagebox.showerror("Błąd", "Nie udało się znaleźć danych klienta do edycji.")
-                        return
-                    client = {
-                        'nip': src['NIP'],
-                        'company_name': src['Nazwa firmy'],
-                        'address_p1': src['Adres 1'],
-                        'address_p2': src['Adres 2'],
-                        'alias': src['Alias'],
-                        'termin_realizacji': src.get('Termin realizacji', ''),
-                        'termin_platnosci': src.get('Termin płatności', ''),
-                        'warunki_dostawy': src.get('Warunki dostawy', ''),
-                        'waznosc_oferty': src.get('Ważność oferty', ''),
-                        'gwarancja': src.get('Gwarancja', ''),
-                        'cena': src.get('Cena', ''),
-                    }
-                    if self.client_window is None:
-                        self.client_window = ClientEditWindow(self.winfo_toplevel(), self._handle_client_save, validate_alias)
-                    self.client_window.open(mode='edit', client=client)
+                    self.open_client_editor(values[0])
                     
                 # DELETE column is the 13th column (index #13)
                 elif column == "#13":  
@@ -449,6 +438,33 @@ class BrowseClientsFrame(Frame):
                         else:
                             tkinter.messagebox.showerror("Błąd", message)
 
+    def open_client_editor(self, nip):
+        """Open the edit modal for the client with the given NIP"""
+        src = next((c for c in self.clients_data if str(c['NIP']) == str(nip)), None)
+        if not src:
+            # Added since the list was loaded (e.g. opened from the quick-open palette)
+            self.refresh_clients_list()
+            src = next((c for c in self.clients_data if str(c['NIP']) == str(nip)), None)
+        if not src:
+            tkinter.messagebox.showerror("Błąd", "Nie udało się znaleźć danych klienta do edycji.")
+            return
+        client = {
+            'nip': src['NIP'],
+            'company_name': src['Nazwa firmy'],
+            'address_p1': src['Adres 1'],
+            'address_p2': src['Adres 2'],
+            'alias': src['Alias'],
+            'termin_realizacji': src.get('Termin realizacji', ''),
+            'termin_platnosci': src.get('Termin płatności', ''),
+            'warunki_dostawy': src.get('Warunki dostawy', ''),
+            'waznosc_oferty': src.get('Ważność oferty', ''),
+            'gwarancja': src.get('Gwarancja', ''),
+            'cena': src.get('Cena', ''),
+        }
+        if self.client_window is None:
+            self.client_window = ClientEditWindow(self.winfo_toplevel(), self._handle_client_save, validate_alias)
+        self.client_window.open(mode='edit', client=client)
+
     # Replaced by modal window; method kept as no-op for backward references
     def open_edit_client_form(self, client_nip, client_values):
         pass
@@ -1,4 +1,5 @@
 """Browse offers frame (clean implementation with year-folder navigation)."""
+import logging
 from tkinter import *  # noqa: F401,F403
 from tkinter import ttk
 import tkinter.messagebox
@@ -16,6 +17,20 @@ from src.data.database_service import (
     get_all_offer_file_paths,
 )
 from src.utils.config import get_offers_folder
+from src.utils import metrics
+from src.ui.components.document_preview_pane import DocumentPreviewPane
+from src.services import pdf_export_service
+from src.data import archive_service
+from src.services import document_watcher_service as watcher
+from src.ui.windows.merge_export_window import MergeExportWindow
+
+_log = logging.getLogger(__name__)
+
+
+# Number of documents at the top of the list whose previews are prepared in advance
+PREFETCH_PREVIEWS = 40
+# How often queued folder/database changes are applied to the list
+WATCH_POLL_MS = 1000
 
 
 class BrowseOffersFrame(Frame):
@@ -25,6 +40,11 @@ class BrowseOffersFrame(Frame):
         super().__init__(parent)
         self.nav_manager = nav_manager
         self.offers_list: list[str] = []
+        self.archived_paths: dict[str, str] = {}  # filename -> cache path of archived offers in the open year
+        self.path_items: dict[str, str] = {}  # full path -> tree item id
+        self.item_mtime: dict[str, float] = {}  # tree item id -> file mtime (for sorted inserts)
+        self._watching = False
+        self._watch_job = None
         self.current_year_folder: str | None = None
         self.sort_by = 'date'
         self.sort_reverse = True
@@ -68,11 +88,15 @@ class BrowseOffersFrame(Frame):
      vs = ttk.Scrollbar(tree_wrap, orient=VERTICAL, command=self.tree.yview)
      hs = ttk.Scrollbar(tree_wrap, orient=HORIZONTAL, command=self.tree.xview)
      self.tree.configure(yscrollcommand=vs.set, xscrollcommand=hs.set)
+     # Preview pane on the right, packed first so the list keeps the remaining width
+     self.preview = DocumentPreviewPane(tree_wrap, 'offer')
+     self.preview.frame.pack(side=RIGHT, fill=Y, padx=(10, 0))
      self.tree.pack(side=LEFT, fill=BOTH, expand=True)
      vs.pack(side=RIGHT, fill=Y)
      hs.pack(side=BOTTOM, fill=X)
      self.tree.bind('<ButtonRelease-1>', self.on_single_click)
      self.tree.bind('<Double-1>', self.on_double_click)
+     self.tree.bind('<<TreeviewSelect>>', self.on_selection_changed)
 
      buttons = Frame(content, bg='#f0f0f0')
      buttons.pack(fill=X, pady=10)
@@ -80,6 +104,10 @@ class BrowseOffersFrame(Frame):
          command=self.load_offers, cursor='hand2').pack(side=LEFT, padx=(0, 10))
      Button(buttons, text='Otwórz folder', font=('Arial', 12), fg='black', padx=15, pady=8,
          command=self.open_offers_folder, cursor='hand2').pack(side=LEFT, padx=(0, 10))
+     Button(buttons, text='Eksportuj do PDF', font=('Arial', 12), fg='black', padx=15, pady=8,
+         command=self.export_to_pdf, cursor='hand2').pack(side=LEFT, padx=(0, 10))
+     Button(buttons, text='Połącz dokumenty', font=('Arial', 12), fg='black', padx=15, pady=8,
+         command=self.merge_documents, cursor='hand2').pack(side=LEFT, padx=(0, 10))
 
     # Sorting ----------------------------------------------------------
     def sort_by_column(self, column: str):
@@ -101,10 +129,14 @@ class BrowseOffersFrame(Frame):
             self.tree.heading('date', text=f'Data utworzenia{arrow}')
 
     # Data loading -----------------------------------------------------
+    @metrics.timed('list.offers')
     def load_offers(self):
         for iid in self.tree.get_children():
             self.tree.delete(iid)
         self.offers_list.clear()
+        self.archived_paths.clear()
+        self.path_items.clear()
+        self.item_mtime.clear()
 
         offers_root = get_offers_folder()
         if not os.path.isdir(offers_root):
@@ -112,13 +144,15 @@ class BrowseOffersFrame(Frame):
 
         if self.current_year_folder is None:
             try:
-                years = [d for d in os.listdir(offers_root)
-                         if os.path.isdir(os.path.join(offers_root, d)) and d.isdigit() and len(d) == 4]
-                years.sort(reverse=True)
+                years = {d for d in os.listdir(offers_root)
+                         if os.path.isdir(os.path.join(offers_root, d)) and d.isdigit() and len(d) == 4}
+                # Archived years are listed like regular year folders
+                years.update(archive_service.list_archived_years(archive_service.KIND_OFFER))
+                years = sorted(years, reverse=True)
                 for y in years:
                     self.tree.insert('', 'end', values=(f'📁 {y}', '', '', '', ''))
             except Exception as e:  # noqa: BLE001
-                print(f'Year folder listing error: {e}')
+                _log.error("Year folder listing error: %s", e)
 
         try:
             db_paths = get_all_offer_file_paths()  # now relative like 'YYYY/filename.docx'
@@ -141,20 +175,87 @@ class BrowseOffersFrame(Frame):
                 if name.endswith('.docx') and os.path.isfile(full):
                     st = os.stat(full)
                     file_infos.append({'filename': name, 'filepath': full, 'mtime': st.st_mtime})
+            if self.current_year_folder is not None:
+                # Documents of an archived year, read lazily from the year's archive
+                listed = {info['filename'] for info in file_infos}
+                for info in archive_service.list_archived_documents(archive_service.KIND_OFFER, self.current_year_folder):
+                    if info['filename'] not in listed:
+                        file_infos.append(info)
+                        self.archived_paths[info['filename']] = info['filepath']
             if self.sort_by == 'filename':
                 file_infos.sort(key=lambda x: x['filename'], reverse=self.sort_reverse)
             else:
                 file_infos.sort(key=lambda x: x['mtime'], reverse=self.sort_reverse)
             for info in file_infos:
                 date_str = datetime.fromtimestamp(info['mtime']).strftime('%Y-%m-%d %H:%M')
-                self.tree.insert('', 'end', values=(info['filename'], date_str, 'Edytuj', 'Wczytaj do kreatora', 'Usuń'))
+                iid = self.tree.insert('', 'end', values=(info['filename'], date_str, 'Edytuj', 'Wczytaj do kreatora', 'Usuń'))
                 self.offers_list.append(info['filepath'])
+                self.path_items[info['filepath']] = iid
+                self.item_mtime[iid] = info['mtime']
         except Exception as e:  # noqa: BLE001
             tkinter.messagebox.showerror('Błąd', f'Nie udało się załadować listy ofert: {e}')
-            print(f'Error loading offers: {e}')
+            _log.error("Error loading offers: %s", e)
+        self.preview.show_for(None)
+        self.preview.prefetch([p for p in self.offers_list[:PREFETCH_PREVIEWS] if not archive_service.is_archived_path(p)])
+        if self._watching:
+            watcher.watch(self, watcher.KIND_OFFER, offers_root, self.current_year_folder)
+
+    # Live updates -----------------------------------------------------
+    def _poll_watcher(self):
+        self._watch_job = None
+        if not self._watching:
+            return
+        changes = watcher.drain(self)
+        if changes:
+            self.apply_document_changes(changes)
+        self._watch_job = self.after(WATCH_POLL_MS, self._poll_watcher)
+
+    def apply_document_changes(self, changes):
+        """Apply watcher changes to the affected rows only."""
+        for change, path, mtime in changes:
+            if change == watcher.REFRESH:
+                self.load_offers()
+                return
+            iid = self.path_items.get(path)
+            if change == watcher.REMOVED:
+                if iid is not None:
+                    self.tree.delete(iid)
+                    del self.path_items[path]
+                    self.item_mtime.pop(iid, None)
+                    self.offers_list.remove(path)
+                continue
+            date_str = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+            if iid is not None:
+                self.tree.set(iid, 'date', date_str)
+                self.item_mtime[iid] = mtime
+                if self.sort_by == 'date':
+                    self.tree.move(iid, '', self._sorted_index(os.path.basename(path), mtime, exclude=iid))
+                if path == self.preview.current_path:
+                    self.preview.show_for(path)
+                continue
+            filename = os.path.basename(path)
+            iid = self.tree.insert('', self._sorted_index(filename, mtime),
+                                   values=(filename, date_str, 'Edytuj', 'Wczytaj do kreatora', 'Usuń'))
+            self.path_items[path] = iid
+            self.item_mtime[iid] = mtime
+            self.offers_list.append(path)
+
+    def _sorted_index(self, filename, mtime, exclude=None):
+        """Tree position of a document row under the current sort order."""
+        key = filename if self.sort_by == 'filename' else mtime
+        children = [iid for iid in self.tree.get_children() if iid != exclude]
+        for index, iid in enumerate(children):
+            if iid not in self.item_mtime:
+                continue  # year folder rows stay on top
+            other = self.tree.item(iid)['values'][0] if self.sort_by == 'filename' else self.item_mtime[iid]
+            if (key > other) if self.sort_reverse else (key < other):
+                return index
+        return 'end'
 
     # Helpers ----------------------------------------------------------
     def _build_offer_path(self, filename: str) -> str:
+        if filename in self.archived_paths:
+            return self.archived_paths[filename]
         base = get_offers_folder()
         if self.current_year_folder:
             return os.path.join(base, self.current_year_folder, filename)
@@ -176,6 +277,7 @@ class BrowseOffersFrame(Frame):
             tkinter.messagebox.showwarning('Uwaga', 'Najpierw zaznacz ofertę do otwarcia!')
             return
         try:
+            path = archive_service.ensure_local(path)
             if platform.system() == 'Darwin':
                 subprocess.call(['open', path])
             elif platform.system() == 'Windows':
@@ -190,6 +292,9 @@ class BrowseOffersFrame(Frame):
         if not path:
             tkinter.messagebox.showwarning('Uwaga', 'Najpierw zaznacz ofertę do edycji!')
             return
+        if archive_service.is_archived_path(path):
+            tkinter.messagebox.showinfo('Archiwum', 'Oferta pochodzi z zarchiwizowanego roku i jest tylko do odczytu.')
+            return
         self.nav_manager.show_frame('offer_editor', offer_path=path)
 
     def delete_selected_offer(self):
@@ -197,6 +302,9 @@ class BrowseOffersFrame(Frame):
         if not path:
             tkinter.messagebox.showwarning('Uwaga', 'Najpierw zaznacz ofertę do usunięcia!')
             return
+        if archive_service.is_archived_path(path):
+            tkinter.messagebox.showinfo('Archiwum', 'Oferta pochodzi z zarchiwizowanego roku i jest tylko do odczytu.')
+            return
         filename = os.path.basename(path)
         if not tkinter.messagebox.askyesno('Potwierdzenie usunięcia', f'Czy na pewno chcesz usunąć ofertę:\n{filename}\n\nTej operacji nie można cofnąć!'):
             return
@@ -213,6 +321,51 @@ class BrowseOffersFrame(Frame):
             else:
                 tkinter.messagebox.showerror('Błąd', f'Nie udało się usunąć pliku: {e}')
 
+    def _selected_or_listed_paths(self, title: str):
+        """Paths of the selected offers, or of all listed ones after confirmation (None to cancel)."""
+        paths = []
+        for iid in self.tree.selection():
+            filename = self.tree.item(iid)['values'][0]
+            if isinstance(filename, str) and filename.startswith('📁 '):
+                continue
+            paths.append(self._build_offer_path(filename))
+        if paths:
+            return self._local_paths(paths)
+        if not self.offers_list:
+            tkinter.messagebox.showwarning('Uwaga', 'Brak ofert w tym widoku.')
+            return None
+        if not tkinter.messagebox.askyesno(title, f'Nie zaznaczono ofert. Użyć wszystkich ofert z listy ({len(self.offers_list)})?'):
+            return None
+        return self._local_paths(self.offers_list)
+
+    def _local_paths(self, paths):
+        """Extract archived offers to the local cache; None when the archive cannot be read."""
+        try:
+            return [archive_service.ensure_local(p) for p in paths]
+        except Exception as e:  # noqa: BLE001
+            tkinter.messagebox.showerror('Błąd', f'Nie udało się odczytać oferty z archiwum: {e}')
+            return None
+
+    def export_to_pdf(self):
+        """Queue selected offers (or all listed ones) for background PDF export."""
+        paths = self._selected_or_listed_paths('Eksport PDF')
+        if not paths:
+            return
+        paths = [p for p in paths if not archive_service.is_archived_path(p)]
+        if not paths:
+            tkinter.messagebox.showinfo('Eksport PDF', 'Oferty z archiwum można połączyć do jednego pliku PDF przyciskiem "Połącz dokumenty".')
+            return
+        count = pdf_export_service.submit(paths, notify=True)
+        tkinter.messagebox.showinfo('Eksport PDF', f'Dodano do kolejki eksportu: {count}\nPliki PDF pojawią się obok dokumentów.')
+
+    def merge_documents(self):
+        """Merge selected offers (or all listed ones) into a single file."""
+        paths = self._selected_or_listed_paths('Połącz dokumenty')
+        if not paths:
+            return
+        default_name = f"Oferty_{self.current_year_folder or 'wszystkie'}"
+        MergeExportWindow(self, paths, default_name).open()
+
     def open_offers_folder(self):
         try:
             folder = get_offers_folder()
@@ -231,17 +384,25 @@ class BrowseOffersFrame(Frame):
             tkinter.messagebox.showwarning('Uwaga', 'Najpierw wybierz ofertę z listy!')
             return
         filename = self.tree.item(sel[0])['values'][0]
-        path = self._build_offer_path(filename)
+        self.load_offer_into_creator(self._build_offer_path(filename))
+
+    def load_offer_into_creator(self, path, source_frame='browse_offers'):
+        """Open the offer creator filled with the stored context of the offer at `path`"""
         from src.data.database_service import get_offer_context_from_db
         ctx = get_offer_context_from_db(path)
         if not ctx:
+            filename = os.path.basename(path)
             if tkinter.messagebox.askyesno('Brak kontekstu', f"Oferta '{filename}' nie ma zapisanego kontekstu.\n\nCzy przejść do kreatora z pustymi polami?"):
                 self.nav_manager.show_frame('offer_generator')
             return
         ctx.pop('offer_number', None)
-        self.nav_manager.show_frame('offer_generator', template_context=ctx, source_frame='browse_offers')
+        self.nav_manager.show_frame('offer_generator', template_context=ctx, source_frame=source_frame)
 
     # Event handlers ---------------------------------------------------
+    def on_selection_changed(self, event=None):
+        # Archived documents are extracted by the preview worker, not on the Tk thread
+        self.preview.show_for(self.get_selected_offer_path())
+
     def on_single_click(self, event):
         region = self.tree.identify_region(event.x, event.y)
         if region != 'cell':
@@ -296,10 +457,18 @@ class BrowseOffersFrame(Frame):
         self.nav_manager.show_frame('main_menu')
 
     def hide(self):
+        self._watching = False
+        watcher.unwatch(self)
+        if self._watch_job is not None:
+            self.after_cancel(self._watch_job)
+            self._watch_job = None
         self.pack_forget()
 
     def show(self):
         self.pack(fill=BOTH, expand=True)
+        self._watching = True
+        if self._watch_job is None:
+            self._watch_job = self.after(WATCH_POLL_MS, self._poll_watcher)
         self.current_year_folder = None
         if self.up_btn.winfo_ismapped():
             self.up_btn.forget()
@@ -15,6 +15,7 @@ from src.data.database_service import (
     update_supplier_in_db, delete_supplier_from_db, set_default_supplier
 )
 from src.ui.windows.supplier_edit_window import SupplierEditWindow
+from src.utils import metrics
 
 
 class BrowseSuppliersFrame(Frame):
@@ -161,6 +162,7 @@ class BrowseSuppliersFrame(Frame):
         """Return to main menu"""
         self.nav_manager.show_frame('main_menu')
     
+    @metrics.timed('list.suppliers')
     def refresh_suppliers_list(self):
         """Refresh the suppliers list"""
         # Load suppliers from database
@@ -340,6 +342,10 @@ class BrowseSuppliersFrame(Frame):
     def show(self):
         """Show this frame"""
         self.pack(fill=BOTH, expand=True)
+
+    def on_database_changed(self):
+        """Reload the list after the application switched to another database"""
+        self.refresh_suppliers_list()
     
     def on_supplier_single_click(self, event):
         """Handle single-click on suppliers table to check for edit/delete column clicks"""
@@ -1,4 +1,5 @@
 """Browse WZ frame with year-folder navigation (mirrors offers implementation)."""
+import logging
 from tkinter import *  # noqa: F401,F403
 from tkinter import ttk
 import tkinter.messagebox
@@ -13,6 +14,19 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirna
 
 from src.data.database_service import DatabaseService
 from src.utils.config import get_wz_folder
+from src.utils import metrics
+from src.ui.components.document_preview_pane import DocumentPreviewPane
+from src.services import pdf_export_service
+from src.data import archive_service
+from src.services import document_watcher_service as watcher
+from src.ui.windows.merge_export_window import MergeExportWindow
+
+_log = logging.getLogger(__name__)
+
+# Number of documents at the top of the list whose previews are prepared in advance
+PREFETCH_PREVIEWS = 40
+# How often queued folder/database changes are applied to the list
+WATCH_POLL_MS = 1000
 
 
 class BrowseWzFrame(Frame):
@@ -24,6 +38,9 @@ class BrowseWzFrame(Frame):
      self.db = DatabaseService()
      self.wz_list: list[str] = []  # list of full paths (files only)
      self.item_path: dict[str, str] = {}  # tree item id -> full path
+     self.item_mtime: dict[str, float] = {}  # tree item id -> file mtime (for sorted inserts)
+     self._watching = False
+     self._watch_job = None
      self.current_year_folder: str | None = None
      self.sort_by = 'date'
      self.sort_reverse = True
@@ -65,11 +82,15 @@ class BrowseWzFrame(Frame):
      vs = ttk.Scrollbar(tree_wrap, orient=VERTICAL, command=self.wz_tree.yview)
      hs = ttk.Scrollbar(tree_wrap, orient=HORIZONTAL, command=self.wz_tree.xview)
      self.wz_tree.configure(yscrollcommand=vs.set, xscrollcommand=hs.set)
+     # Preview pane on the right, packed first so the list keeps the remaining width
+     self.preview = DocumentPreviewPane(tree_wrap, 'wz')
+     self.preview.frame.pack(side=RIGHT, fill=Y, padx=(10, 0))
      self.wz_tree.pack(side=LEFT, fill=BOTH, expand=True)
      vs.pack(side=RIGHT, fill=Y)
      hs.pack(side=BOTTOM, fill=X)
      self.wz_tree.bind('<ButtonRelease-1>', self.on_single_click)
      self.wz_tree.bind('<Double-1>', self.on_double_click)
+     self.wz_tree.bind('<<TreeviewSelect>>', self.on_selection_changed)
 
      buttons = Frame(content, bg='#f0f0f0')
      buttons.pack(fill=X, pady=10)
@@ -77,6 +98,10 @@ class BrowseWzFrame(Frame):
          command=self.refresh_wz_list, cursor='hand2').pack(side=LEFT, padx=(0, 10))
      Button(buttons, text='Otwórz folder', font=('Arial', 12), fg='black', padx=15, pady=8,
          command=self.open_wz_folder, cursor='hand2').pack(side=LEFT, padx=(0, 10))
+     Button(buttons, text='Eksportuj do PDF', font=('Arial', 12), fg='black', padx=15, pady=8,
+         command=self.export_to_pdf, cursor='hand2').pack(side=LEFT, padx=(0, 10))
+     Button(buttons, text='Połącz dokumenty', font=('Arial', 12), fg='black', padx=15, pady=8,
+         command=self.merge_documents, cursor='hand2').pack(side=LEFT, padx=(0, 10))
     
     def sort_by_column(self, column):
         """Sort by clicking on column header"""
@@ -105,6 +130,7 @@ class BrowseWzFrame(Frame):
         else:  # sort by date
             self.wz_tree.heading('date', text=f'Data utworzenia{arrow}')
     
+    @metrics.timed('list.wz')
     def refresh_wz_list(self):
         """Refresh list; show year folders at root, filter by selected year."""
         try:
@@ -113,6 +139,7 @@ class BrowseWzFrame(Frame):
                 self.wz_tree.delete(item)
             self.wz_list.clear()
             self.item_path.clear()
+            self.item_mtime.clear()
 
             wz_root = get_wz_folder()
             if not os.path.isdir(wz_root):
@@ -135,9 +162,11 @@ class BrowseWzFrame(Frame):
                         except OSError:
                             pass
 
-            # Year folder rows (only at root view)
+            # Year folder rows (only at root view); archived years are listed like regular ones
             if self.current_year_folder is None:
-                years = sorted({fi['year'] for fi in file_infos if fi['year']}, reverse=True)
+                years = {fi['year'] for fi in file_infos if fi['year']}
+                years.update(archive_service.list_archived_years(archive_service.KIND_WZ))
+                years = sorted(years, reverse=True)
                 for y in years:
                     self.wz_tree.insert('', 'end', values=(f'📁 {y}', '', '', '', ''))
 
@@ -146,6 +175,10 @@ class BrowseWzFrame(Frame):
                 visible_files = [fi for fi in file_infos if fi['year'] is None]
             else:
                 visible_files = [fi for fi in file_infos if fi['year'] == self.current_year_folder]
+                # Documents of an archived year, read lazily from the year's archive
+                listed = {fi['filename'] for fi in visible_files}
+                visible_files.extend(fi for fi in archive_service.list_archived_documents(archive_service.KIND_WZ, self.current_year_folder)
+                                     if fi['filename'] not in listed)
 
             # Sort
             if self.sort_by == 'filename':
@@ -157,10 +190,70 @@ class BrowseWzFrame(Frame):
                 date_str = datetime.fromtimestamp(fi['mtime']).strftime('%Y-%m-%d %H:%M')
                 iid = self.wz_tree.insert('', 'end', values=(fi['filename'], date_str, 'Edytuj', 'Wczytaj do kreatora', 'Usuń'))
                 self.item_path[iid] = fi['filepath']
+                self.item_mtime[iid] = fi['mtime']
                 self.wz_list.append(fi['filepath'])
         except Exception as e:  # noqa: BLE001
             tkinter.messagebox.showerror('Błąd', f'Nie udało się załadować listy WZ: {e}')
-            print(f'Error loading WZ list: {e}')
+            _log.error("Error loading WZ list: %s", e)
+        self.preview.show_for(None)
+        self.preview.prefetch([p for p in self.wz_list[:PREFETCH_PREVIEWS] if not archive_service.is_archived_path(p)])
+        if self._watching:
+            watcher.watch(self, watcher.KIND_WZ, get_wz_folder(), self.current_year_folder)
+
+    # Live updates -----------------------------------------------------
+    def _poll_watcher(self):
+        self._watch_job = None
+        if not self._watching:
+            return
+        changes = watcher.drain(self)
+        if changes:
+            self.apply_document_changes(changes)
+        self._watch_job = self.after(WATCH_POLL_MS, self._poll_watcher)
+
+    def apply_document_changes(self, changes):
+        """Apply watcher changes to the affected rows only."""
+        path_items = {path: iid for iid, path in self.item_path.items()}
+        for change, path, mtime in changes:
+            if change == watcher.REFRESH:
+                self.refresh_wz_list()
+                return
+            iid = path_items.get(path)
+            if change == watcher.REMOVED:
+                if iid is not None:
+                    self.wz_tree.delete(iid)
+                    del path_items[path]
+                    del self.item_path[iid]
+                    self.item_mtime.pop(iid, None)
+                    self.wz_list.remove(path)
+                continue
+            date_str = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+            if iid is not None:
+                self.wz_tree.set(iid, 'date', date_str)
+                self.item_mtime[iid] = mtime
+                if self.sort_by == 'date':
+                    self.wz_tree.move(iid, '', self._sorted_index(os.path.basename(path), mtime, exclude=iid))
+                if path == self.preview.current_path:
+                    self.preview.show_for(path)
+                continue
+            filename = os.path.basename(path)
+            iid = self.wz_tree.insert('', self._sorted_index(filename, mtime),
+                                      values=(filename, date_str, 'Edytuj', 'Wczytaj do kreatora', 'Usuń'))
+            path_items[path] = iid
+            self.item_path[iid] = path
+            self.item_mtime[iid] = mtime
+            self.wz_list.append(path)
+
+    def _sorted_index(self, filename, mtime, exclude=None):
+        """Tree position of a document row under the current sort order."""
+        key = filename if self.sort_by == 'filename' else mtime
+        children = [iid for iid in self.wz_tree.get_children() if iid != exclude]
+        for index, iid in enumerate(children):
+            if iid not in self.item_mtime:
+                continue  # year folder rows stay on top
+            other = self.wz_tree.item(iid)['values'][0] if self.sort_by == 'filename' else self.item_mtime[iid]
+            if (key > other) if self.sort_reverse else (key < other):
+                return index
+        return 'end'
     
     def get_selected_wz_path(self):
         sel = self.wz_tree.selection()
@@ -175,6 +268,50 @@ class BrowseWzFrame(Frame):
             return None
         return self.item_path.get(iid)
     
+    def _selected_or_listed_paths(self, title: str):
+        """Paths of the selected WZ documents, or of all listed ones after confirmation (None to cancel)."""
+        paths = [self.item_path[iid] for iid in self.wz_tree.selection() if iid in self.item_path]
+        if paths:
+            return self._local_paths(paths)
+        if not self.wz_list:
+            tkinter.messagebox.showwarning('Uwaga', 'Brak dokumentów WZ w tym widoku.')
+            return None
+        if not tkinter.messagebox.askyesno(title, f'Nie zaznaczono dokumentów. Użyć wszystkich WZ z listy ({len(self.wz_list)})?'):
+            return None
+        return self._local_paths(self.wz_list)
+
+    def _local_paths(self, paths):
+        """Extract archived WZ documents to the local cache; None when the archive cannot be read."""
+        try:
+            return [archive_service.ensure_local(p) for p in paths]
+        except Exception as e:  # noqa: BLE001
+            tkinter.messagebox.showerror('Błąd', f'Nie udało się odczytać WZ z archiwum: {e}')
+            return None
+
+    def export_to_pdf(self):
+        """Queue selected WZ documents (or all listed ones) for background PDF export."""
+        paths = self._selected_or_listed_paths('Eksport PDF')
+        if not paths:
+            return
+        paths = [p for p in paths if not archive_service.is_archived_path(p)]
+        if not paths:
+            tkinter.messagebox.showinfo('Eksport PDF', 'Dokumenty z archiwum można połączyć do jednego pliku PDF przyciskiem "Połącz dokumenty".')
+            return
+        count = pdf_export_service.submit(paths, notify=True)
+        tkinter.messagebox.showinfo('Eksport PDF', f'Dodano do kolejki eksportu: {count}\nPliki PDF pojawią się obok dokumentów.')
+
+    def merge_documents(self):
+        """Merge selected WZ documents (or all listed ones) into a single file."""
+        paths = self._selected_or_listed_paths('Połącz dokumenty')
+        if not paths:
+            return
+        default_name = f"WZ_{self.current_year_folder or 'wszystkie'}"
+        MergeExportWindow(self, paths, default_name).open()
+
+    def on_selection_changed(self, event=None):
+        # Archived documents are extracted by the preview worker, not on the Tk thread
+        self.preview.show_for(self.get_selected_wz_path())
+
     def on_single_click(self, event):
         """Handle single-click on table to check for action column clicks"""
         # Get the region that was clicked
@@ -202,19 +339,16 @@ class BrowseWzFrame(Frame):
                 if not path:
                     return
 
+                if column in (edit_column_index, delete_column_index) and archive_service.is_archived_path(path):
+                    tkinter.messagebox.showinfo('Archiwum', 'WZ pochodzi z zarchiwizowanego roku i jest tylko do odczytu.')
+                    return
+
                 if column == edit_column_index:
                     self.wz_tree.selection_set(item)
                     self.nav_manager.show_frame('wz_editor', wz_path=path)
                 elif column == load_column_index:
                     self.wz_tree.selection_set(item)
-                    from src.data.database_service import get_wz_context_from_db
-                    context_data = get_wz_context_from_db(path)
-                    if not context_data:
-                        if tkinter.messagebox.askyesno('Brak kontekstu', f"WZ-ka '{filename}' nie ma zapisanego kontekstu.\n\nCzy przejść do kreatora WZ z pustymi polami?"):
-                            self.nav_manager.show_frame('wz_generator')
-                        return
-                    context_data.pop('wz_number', None)
-                    self.nav_manager.show_frame('wz_generator', template_context=context_data, source_frame='browse_wz')
+                    self.load_wz_into_creator(path)
                 elif column == delete_column_index:
                     if tkinter.messagebox.askyesno('Potwierdzenie usunięcia', f"Czy na pewno chcesz usunąć WZ: {filename}? Tej operacji nie można cofnąć!"):
                         self.delete_wz_by_path(path)
@@ -248,6 +382,18 @@ class BrowseWzFrame(Frame):
                     self.wz_tree.selection_set(item)
                     self.open_selected_wz()
     
+    def load_wz_into_creator(self, path, source_frame='browse_wz'):
+        """Open the WZ creator filled with the stored context of the WZ at `path`"""
+        from src.data.database_service import get_wz_context_from_db
+        context_data = get_wz_context_from_db(path)
+        if not context_data:
+            filename = os.path.basename(path)
+            if tkinter.messagebox.askyesno('Brak kontekstu', f"WZ-ka '{filename}' nie ma zapisanego kontekstu.\n\nCzy przejść do kreatora WZ z pustymi polami?"):
+                self.nav_manager.show_frame('wz_generator')
+            return
+        context_data.pop('wz_number', None)
+        self.nav_manager.show_frame('wz_generator', template_context=context_data, source_frame=source_frame)
+
     def delete_wz_by_path(self, wz_path: str):
         try:
             # Delete using unique file path to avoid removing same order numbers in other years
@@ -256,7 +402,7 @@ class BrowseWzFrame(Frame):
                 try:
                     os.remove(wz_path)
                 except OSError as fe:
-                    print(f"Ostrzeżenie: nie udało się usunąć pliku z dysku: {fe}")
+                    _log.warning("Could not delete the WZ file from disk: %s", fe)
             self.refresh_wz_list()
         except Exception as e:  # noqa: BLE001
             tkinter.messagebox.showerror('Błąd', f'Nie udało się usunąć WZ: {e}')
@@ -280,6 +426,11 @@ class BrowseWzFrame(Frame):
         if not wz_path:
             tkinter.messagebox.showwarning('Uwaga', 'Najpierw zaznacz WZ do otwarcia!')
             return
+        try:
+            wz_path = archive_service.ensure_local(wz_path)
+        except Exception as e:  # noqa: BLE001
+            tkinter.messagebox.showerror('Błąd', f'Nie udało się odczytać WZ z archiwum: {e}')
+            return
         if os.path.exists(wz_path):
             try:
                 if platform.system() == 'Darwin':
@@ -299,10 +450,18 @@ class BrowseWzFrame(Frame):
     
     def hide(self):
         """Hide this frame"""
+        self._watching = False
+        watcher.unwatch(self)
+        if self._watch_job is not None:
+            self.after_cancel(self._watch_job)
+            self._watch_job = None
         self.pack_forget()
     
     def show(self):
         self.pack(fill=BOTH, expand=True)
+        self._watching = True
+        if self._watch_job is None:
+            self._watch_job = self.after(WATCH_POLL_MS, self._poll_watcher)
         self.current_year_folder = None
         if self.up_btn.winfo_ismapped():
             self.up_btn.forget()
@@ -0,0 +1,175 @@
+"""
+Diagnostics frame: timing percentiles and counters of this workstation
+"""
+from tkinter import *
+from tkinter import ttk
+import tkinter.messagebox
+import threading
+import queue
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from src.utils import metrics, tracing
+
+
+METRIC_LABELS = {
+    'app.startup': "Uruchomienie aplikacji",
+    'app.starts': "Uruchomienia aplikacji",
+    'list.offers': "Lista ofert",
+    'list.wz': "Lista WZ",
+    'list.clients': "Lista klientów",
+    'list.suppliers': "Lista dostawców",
+}
+
+
+def metric_label(name: str) -> str:
+    """Polish description of a metric name ('trace.offer.generate.render' -> 'Generowanie oferty – wypełnianie')."""
+    if name in METRIC_LABELS:
+        return METRIC_LABELS[name]
+    if name.startswith('trace.'):
+        rest = name[len('trace.'):]
+        for trace_name, label in tracing.TRACE_LABELS.items():
+            if rest == trace_name:
+                return label
+            if rest.startswith(trace_name + '.'):
+                stage = rest[len(trace_name) + 1:]
+                if stage == 'errors':
+                    return f"{label} – błędy"
+                return f"{label} – {tracing.STAGE_LABELS.get(stage, stage)}"
+    if name.startswith('db.'):
+        return f"Baza: {name[len('db.'):]}"
+    return name
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:,.0f}".replace(',', '\u00A0')
+
+
+class DiagnosticsFrame(Frame):
+    """Recent timing percentiles (generation, database, lists, startup) and counters"""
+
+    POLL_MS = 80
+    PERIODS = (("Ostatnie 24 godziny", 1), ("Ostatnie 7 dni", 7), ("Ostatnie 30 dni", 30), ("Ostatnie 90 dni", 90))
+
+    def __init__(self, parent, nav_manager):
+        super().__init__(parent)
+        self.nav_manager = nav_manager
+        self._queue = queue.Queue()
+        self._thread = None
+        self.create_ui()
+
+    def create_ui(self):
+        """Create the diagnostics UI"""
+        self.configure(bg='#f0f0f0')
+
+        header_frame = Frame(self, bg='#f0f0f0')
+        header_frame.pack(fill=X, padx=20, pady=20)
+        Label(header_frame, text="Diagnostyka wydajności", font=("Arial", 18, "bold"),
+              bg='#f0f0f0', fg='#333333').pack(side=LEFT)
+        Button(header_frame, text="Powrót do menu głównego", font=("Arial", 12), fg='black',
+               padx=15, pady=8, command=self.return_to_main_menu, cursor='hand2').pack(side=RIGHT)
+        self.refresh_btn = Button(header_frame, text="Odśwież", font=("Arial", 12), fg='black',
+                                  padx=15, pady=8, command=self.refresh, cursor='hand2')
+        self.refresh_btn.pack(side=RIGHT, padx=10)
+
+        period_frame = Frame(self, bg='#f0f0f0')
+        period_frame.pack(fill=X, padx=20)
+        Label(period_frame, text="Okres:", font=("Arial", 12), bg='#f0f0f0').pack(side=LEFT)
+        self.period_var = StringVar(value=self.PERIODS[1][0])
+        period_box = ttk.Combobox(period_frame, textvariable=self.period_var, state='readonly', width=22,
+                                  values=[label for label, _days in self.PERIODS])
+        period_box.pack(side=LEFT, padx=(5, 15))
+        period_box.bind('<<ComboboxSelected>>', lambda e: self.refresh())
+
+        self.summary_var = StringVar(value="")
+        Label(self, textvariable=self.summary_var, font=("Arial", 11), bg='#f0f0f0', fg='#333333',
+              anchor=W).pack(fill=X, padx=20, pady=(12, 6))
+
+        Label(self, text="Czasy [ms]", font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333333',
+              anchor=W).pack(fill=X, padx=20)
+        timings = Frame(self, bg='#f0f0f0')
+        timings.pack(fill=BOTH, expand=True, padx=20, pady=(0, 10))
+        columns = ('label', 'count', 'p50', 'p90', 'p99', 'max')
+        self.timings_tree = ttk.Treeview(timings, columns=columns, show='headings')
+        for column, title, width, anchor in (('label', "Pomiar", 420, W), ('count', "Liczba", 90, E),
+                                             ('p50', "Mediana", 100, E), ('p90', "p90", 100, E),
+                                             ('p99', "p99", 100, E), ('max', "Maks.", 100, E)):
+            self.timings_tree.heading(column, text=title)
+            self.timings_tree.column(column, width=width, anchor=anchor, stretch=(column == 'label'))
+        scrollbar = ttk.Scrollbar(timings, orient=VERTICAL, command=self.timings_tree.yview)
+        self.timings_tree.configure(yscrollcommand=scrollbar.set)
+        self.timings_tree.pack(side=LEFT, fill=BOTH, expand=True)
+        scrollbar.pack(side=RIGHT, fill=Y)
+
+        Label(self, text="Liczniki", font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333333',
+              anchor=W).pack(fill=X, padx=20)
+        counters = Frame(self, bg='#f0f0f0')
+        counters.pack(fill=X, padx=20, pady=(0, 20))
+        self.counters_tree = ttk.Treeview(counters, columns=('label', 'value', 'updated'), show='headings', height=5)
+        for column, title, width, anchor in (('label', "Licznik", 420, W), ('value', "Wartość", 90, E),
+                                             ('updated', "Ostatnio", 160, CENTER)):
+            self.counters_tree.heading(column, text=title)
+            self.counters_tree.column(column, width=width, anchor=anchor, stretch=(column == 'label'))
+        self.counters_tree.pack(fill=X)
+
+    def _days(self) -> int:
+        for label, days in self.PERIODS:
+            if label == self.period_var.get():
+                return days
+        return 7
+
+    def refresh(self):
+        """Read the metrics store in the background"""
+        if self._thread and self._thread.is_alive():
+            return
+        self.refresh_btn.config(state=DISABLED)
+        self.summary_var.set("Wczytywanie...")
+        self._thread = threading.Thread(target=self._run, args=(self._days(),), daemon=True)
+        self._thread.start()
+        self.after(self.POLL_MS, self._poll)
+
+    def _run(self, days):
+        try:
+            self._queue.put(('done', (metrics.summarize(days), metrics.get_counters())))
+        except Exception as e:  # noqa: BLE001
+            self._queue.put(('error', str(e)))
+
+    def _poll(self):
+        try:
+            kind, result = self._queue.get_nowait()
+        except queue.Empty:
+            self.after(self.POLL_MS, self._poll)
+            return
+        self.refresh_btn.config(state=NORMAL)
+        if kind == 'error':
+            self.summary_var.set("")
+            tkinter.messagebox.showerror("Błąd", f"Nie udało się wczytać pomiarów:\n{result}")
+            return
+        self._show(*result)
+
+    def _show(self, summaries, counters):
+        self.timings_tree.delete(*self.timings_tree.get_children())
+        for s in summaries:
+            self.timings_tree.insert('', END, values=(metric_label(s.name), s.count, _ms(s.p50), _ms(s.p90),
+                                                      _ms(s.p99), _ms(s.max)))
+        self.counters_tree.delete(*self.counters_tree.get_children())
+        for name, value, updated in counters:
+            self.counters_tree.insert('', END, values=(metric_label(name), value, updated.strftime('%Y-%m-%d %H:%M')))
+        samples = sum(s.count for s in summaries)
+        self.summary_var.set(f"{self.period_var.get()}: pomiarów {samples}  (plik: {metrics.get_metrics_path()})")
+
+    def return_to_main_menu(self):
+        """Return to main menu"""
+        self.nav_manager.show_frame('main_menu')
+
+    def hide(self):
+        """Hide this frame"""
+        self.pack_forget()
+
+    def show(self):
+        """Show this frame"""
+        self.pack(fill=BOTH, expand=True)
+        self.refresh()
@@ -12,7 +12,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirna
 
 from src.utils.config import APP_VERSION
 from src.data.database_service import is_database_available
-from src.data.database_service import is_database_available
+from src.data.database_service import is_database_available, can_work_offline
 from src.utils.config import get_offers_folder, get_wz_folder
 
 
@@ -37,7 +37,16 @@ class MainMenuFrame(Frame):
             bg='#f0f0f0',
             fg='#333333',
         )
-        title_label.pack(pady=50)
+        title_label.pack(pady=(50, 10))
+
+        # Quick-open palette hint (bound on the main window, see main_app)
+        Label(
+            self,
+            text="Ctrl+P – szybkie otwieranie ofert, WZ, klientów i dostawców",
+            font=("Arial", 11),
+            bg='#f0f0f0',
+            fg='#666666',
+        ).pack(pady=(0, 30))
 
         # Main menu buttons frame
         buttons_frame = Frame(self, bg='#f0f0f0')
@@ -121,6 +130,19 @@ class MainMenuFrame(Frame):
         )
         browse_suppliers_btn.pack(pady=10)
 
+        # Quote analytics button
+        analytics_btn = Button(
+            buttons_frame,
+            text="Raporty ofert",
+            font=("Arial", 14),
+            fg='black',
+            padx=30,
+            pady=10,
+            command=self.open_analytics,
+            cursor='hand2',
+        )
+        analytics_btn.pack(pady=10)
+
         # Restore documents button
         restore_docs_btn = Button(
             buttons_frame,
@@ -134,6 +156,45 @@ class MainMenuFrame(Frame):
         )
         restore_docs_btn.pack(pady=10)
 
+        # Archive closed years button
+        archive_btn = Button(
+            buttons_frame,
+            text="Archiwizuj stare lata",
+            font=("Arial", 12),
+            fg='black',
+            padx=20,
+            pady=8,
+            command=self.open_archive_years,
+            cursor='hand2',
+        )
+        archive_btn.pack(pady=5)
+
+        # Consistency check button
+        consistency_btn = Button(
+            buttons_frame,
+            text="Sprawdź spójność danych",
+            font=("Arial", 12),
+            fg='black',
+            padx=20,
+            pady=8,
+            command=self.open_consistency_check,
+            cursor='hand2',
+        )
+        consistency_btn.pack(pady=5)
+
+        # Offline writes that could not be synced
+        conflicts_btn = Button(
+            buttons_frame,
+            text="Konflikty synchronizacji",
+            font=("Arial", 12),
+            fg='black',
+            padx=20,
+            pady=8,
+            command=self.open_offline_conflicts,
+            cursor='hand2',
+        )
+        conflicts_btn.pack(pady=5)
+
         # Download logs button
         download_logs_btn = Button(
             buttons_frame,
@@ -147,6 +208,19 @@ class MainMenuFrame(Frame):
         )
         download_logs_btn.pack(pady=5)
 
+        # Performance diagnostics button
+        diagnostics_btn = Button(
+            buttons_frame,
+            text="Diagnostyka wydajności",
+            font=("Arial", 12),
+            fg='black',
+            padx=20,
+            pady=8,
+            command=lambda: self.nav_manager.show_frame('diagnostics'),
+            cursor='hand2',
+        )
+        diagnostics_btn.pack(pady=5)
+
         # Settings button
         settings_btn = Button(
             buttons_frame,
@@ -260,8 +334,48 @@ class MainMenuFrame(Frame):
         except Exception as e:
             tkinter.messagebox.showerror("Błąd", f"Nie udało się otworzyć okna przywracania: {e}")
     
+    def open_analytics(self):
+        """Navigate to the quote analytics dashboard"""
+        if not self._require_database_ready():
+            return
+        self.nav_manager.show_frame('analytics')
+
+    def open_archive_years(self):
+        """Open the year archive window (lazy create)."""
+        if not self._require_database_ready():
+            return
+        try:
+            from src.ui.windows.archive_years_window import ArchiveYearsWindow
+            if not hasattr(self, '_archive_win'):
+                self._archive_win = ArchiveYearsWindow(self.nav_manager.root)
+            self._archive_win.open()
+        except Exception as e:
+            tkinter.messagebox.showerror("Błąd", f"Nie udało się otworzyć okna archiwizacji: {e}")
+
+    def open_consistency_check(self):
+        """Open the consistency check window (lazy create)."""
+        if not self._require_database_ready():
+            return
+        try:
+            from src.ui.windows.consistency_check_window import ConsistencyCheckWindow
+            if not hasattr(self, '_consistency_win'):
+                self._consistency_win = ConsistencyCheckWindow(self.nav_manager.root)
+            self._consistency_win.open()
+        except Exception as e:
+            tkinter.messagebox.showerror("Błąd", f"Nie udało się otworzyć okna sprawdzania: {e}")
+
+    def open_offline_conflicts(self):
+        """Open the list of offline writes that could not be synced (lazy create)."""
+        try:
+            from src.ui.windows.offline_conflicts_window import OfflineConflictsWindow
+            if not hasattr(self, '_conflicts_win'):
+                self._conflicts_win = OfflineConflictsWindow(self.nav_manager.root)
+            self._conflicts_win.open()
+        except Exception as e:
+            tkinter.messagebox.showerror("Błąd", f"Nie udało się otworzyć listy konfliktów: {e}")
+
     def download_logs(self):
-        """Zip the application logs folder and let the user choose where to save."""
+        """Zip the application logs folder and a metrics snapshot and let the user choose where to save."""
         from src.utils.app_logging import _get_logs_dir
         import zipfile
         from datetime import datetime as _dt
@@ -291,6 +405,12 @@ class MainMenuFrame(Frame):
                 for fname in log_files:
                     full_path = os.path.join(logs_dir, fname)
                     zf.write(full_path, fname)
+                # Performance metrics of this workstation for support
+                try:
+                    from src.utils import metrics
+                    zf.writestr('metryki.json', metrics.snapshot_json())
+                except Exception as e:  # noqa: BLE001 - the logs are still worth saving
+                    zf.writestr('metryki_blad.txt', f"Nie udało się zapisać metryk: {e}")
 
             tkinter.messagebox.showinfo(
                 "Logi zapisane",
@@ -318,6 +438,14 @@ class MainMenuFrame(Frame):
         try:
             if is_database_available():
                 return True
+            # Share down but a local replica exists: reads come from the copy, writes are journaled
+            if can_work_offline():
+                tkinter.messagebox.showwarning(
+                    "Tryb offline",
+                    "Brak połączenia z bazą danych. Pracujesz na lokalnej kopii bazy – zapisane zmiany "
+                    "zostaną przesłane do bazy automatycznie po przywróceniu połączenia."
+                )
+                return True
         except Exception:
             pass
         tkinter.messagebox.showerror(
@@ -168,12 +168,17 @@ class OfferCreationFrame(Frame):
         except Exception as e:
             pass  # Silently ignore scrolling errors
     
-    def initialize_offer_app(self):
-        """Initialize the offer application components"""
+    def initialize_offer_app(self, template_context=None, source_frame=None):
+        """Initialize the offer application components (built once, then reset for every new offer)"""
         try:
-            # Always create new instance to ensure clean state
-            # Pass template_context=None explicitly to ensure client/supplier data is cleared
-            self.offer_app_instance = self.offer_app_class(self, self.nav_manager, template_context=None)
+            if self.offer_app_instance:
+                # Reuse the existing widgets; reset restores a clean form (or loads the template)
+                self.offer_app_instance.reset(template_context, source_frame)
+                self.canvas.yview_moveto(0)
+            else:
+                self.offer_app_instance = self.offer_app_class(self, self.nav_manager,
+                                                               template_context=template_context,
+                                                               source_frame=source_frame)
             # Update scroll region after content is loaded
             self.after(100, self.update_scroll_region)
             
@@ -401,18 +406,10 @@ class OfferCreationFrame(Frame):
     def show(self):
         """Show this frame"""
         self.pack(fill=BOTH, expand=True)
-        # Initialize offer app when shown (only if not already initialized)
+        # Initialize offer app when shown (only if not already initialized;
+        # NavigationManager resets an existing one before showing the frame)
         if not self.offer_app_instance:
             self.initialize_offer_app()
-        else:
-            # Only clear data if this is NOT a template-based instance
-            # (template instances are created fresh by NavigationManager)
-            should_clear = True
-            if hasattr(self.offer_app_instance, 'template_context') and self.offer_app_instance.template_context:
-                should_clear = False  # Don't clear if we have template data
-                
-            if should_clear and hasattr(self.offer_app_instance, 'clear_all_data'):
-                self.offer_app_instance.clear_all_data()
         
         # Re-bind global mouse wheel events when showing
         self.bind_all("<MouseWheel>", self.on_mousewheel)
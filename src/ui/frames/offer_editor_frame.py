@@ -1,6 +1,7 @@
 """
 Offer editor frame for editing existing offers
 """
+import logging
 from tkinter import *
 import tkinter.messagebox
 import sys
@@ -9,6 +10,8 @@ import os
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
+_log = logging.getLogger(__name__)
+
 
 class OfferEditorFrame(Frame):
     """Frame for editing existing offers"""
@@ -277,7 +280,13 @@ class OfferEditorFrame(Frame):
     def initialize_offer_app(self, offer_path=None):
         """Initialize the offer application components for editing"""
         try:
-            if not self.offer_app_instance:
+            if self.offer_app_instance:
+                # Reuse the existing widgets for the next offer instead of rebuilding them
+                self.offer_app_instance.reset(offer_path or self.offer_path)
+                self.canvas.yview_moveto(0)
+                self.after(100, self.update_scroll_region)
+                self.start_mouse_position_checking()
+            else:
                 # Create a modified offer app for editing
                 from src.core.offer_editor_app import OfferEditorApp
                 self.offer_app_instance = OfferEditorApp(self, self.nav_manager, offer_path or self.offer_path)
@@ -295,7 +304,7 @@ class OfferEditorFrame(Frame):
                 self.start_mouse_position_checking()
         except Exception as e:
             tkinter.messagebox.showerror("Błąd", f"Nie udało się załadować interfejsu edycji oferty: {e}")
-            print(f"Detailed error: {e}")  # For debugging
+            _log.error("Detailed error: %s", e)
     
     def update_scroll_region(self):
         """Force update of scroll region"""
@@ -1,17 +1,21 @@
 """
 Settings frame for application configuration
 """
+import logging
 from tkinter import *
 from tkinter import ttk
 import tkinter.messagebox
 import sys
 import os
+import threading
 
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from src.utils.settings import settings_manager
 
+_log = logging.getLogger(__name__)
+
 
 class SettingsFrame(Frame):
     """Frame for managing application settings"""
@@ -415,6 +419,52 @@ class SettingsFrame(Frame):
       separator3 = Frame(inner_frame, height=1, bg='#dddddd')
       separator3.pack(fill=X, pady=20)
 
+      # Local read replica of the database
+      replica_frame = Frame(inner_frame, bg='#ffffff')
+      replica_frame.pack(fill=X, pady=5)
+
+      self.db_replica_var = BooleanVar(value=False)
+      Checkbutton(replica_frame, text="Przechowuj lokalną kopię bazy danych do odczytu",
+                  variable=self.db_replica_var, onvalue=True, offvalue=False,
+                  bg='#ffffff', font=("Arial", 11)).pack(anchor=W)
+      Label(replica_frame, text="Listy i podglądy są wczytywane z kopii na tym komputerze; zapisy trafiają do bazy sieciowej",
+            font=("Arial", 9), bg='#ffffff', fg='#666666').pack(anchor=W)
+
+      # Database maintenance (administrator action)
+      compact_frame = Frame(inner_frame, bg='#ffffff')
+      compact_frame.pack(fill=X, pady=5)
+      self.compact_btn = Button(compact_frame, text="Kompaktuj bazę danych...", font=("Arial", 10),
+                                padx=15, pady=5, command=self.compact_database, cursor='hand2')
+      self.compact_btn.pack(side=LEFT)
+      Label(compact_frame, text="Zapisuje starsze dokumenty w formacie skompresowanym i zmniejsza plik bazy",
+            font=("Arial", 9), bg='#ffffff', fg='#666666').pack(side=LEFT, padx=(10, 0))
+
+      # Automatic PDF export of generated documents
+      pdf_frame = Frame(inner_frame, bg='#ffffff')
+      pdf_frame.pack(fill=X, pady=5)
+
+      self.pdf_export_var = BooleanVar(value=False)
+      Checkbutton(pdf_frame, text="Twórz automatycznie plik PDF po wygenerowaniu dokumentu",
+                  variable=self.pdf_export_var, onvalue=True, offvalue=False,
+                  bg='#ffffff', font=("Arial", 11)).pack(anchor=W)
+      Label(pdf_frame, text="PDF jest zapisywany obok pliku .docx (LibreOffice, jeśli jest zainstalowany)",
+            font=("Arial", 9), bg='#ffffff', fg='#666666').pack(anchor=W)
+
+      # Stage timings of the last generated document
+      timings_frame = Frame(inner_frame, bg='#ffffff')
+      timings_frame.pack(fill=X, pady=5)
+
+      self.show_timings_var = BooleanVar(value=False)
+      Checkbutton(timings_frame, text="Pokazuj czasy generowania dokumentów na pasku stanu",
+                  variable=self.show_timings_var, onvalue=True, offvalue=False,
+                  bg='#ffffff', font=("Arial", 11)).pack(anchor=W)
+      Label(timings_frame, text="Czas numeracji, wypełniania szablonu, zapisu pliku i zapisu do bazy dla ostatniego dokumentu",
+            font=("Arial", 9), bg='#ffffff', fg='#666666').pack(anchor=W)
+
+      # Separator
+      separator4 = Frame(inner_frame, height=1, bg='#dddddd')
+      separator4.pack(fill=X, pady=20)
+
       # Database backup settings
       backup_frame = Frame(inner_frame, bg='#ffffff')
       backup_frame.pack(fill=X, pady=5)
@@ -610,6 +660,24 @@ class SettingsFrame(Frame):
             enabled = False
         self.db_backup_var.set(enabled)
         self._set_entry_value('db_backup_folder', app_settings.get('db_backup_folder', ''))
+
+        # Read replica setting
+        try:
+            self.db_replica_var.set(bool(app_settings.get('db_replica_enabled', False)))
+        except Exception:
+            self.db_replica_var.set(False)
+
+        # PDF export setting
+        try:
+            self.pdf_export_var.set(bool(app_settings.get('pdf_export_enabled', False)))
+        except Exception:
+            self.pdf_export_var.set(False)
+
+        # Status bar timings setting
+        try:
+            self.show_timings_var.set(bool(app_settings.get('show_timings', False)))
+        except Exception:
+            self.show_timings_var.set(False)
         
     
     def save_settings(self):
@@ -652,7 +720,7 @@ class SettingsFrame(Frame):
 
         # Collect app settings and check if critical settings changed
         # offers_folder and wz_folder are now also in app settings
-        app_fields = ['database_path', 'db_backup_enabled', 'db_backup_folder', 'offers_folder', 'wz_folder']
+        app_fields = ['database_path', 'db_backup_enabled', 'db_backup_folder', 'db_replica_enabled', 'pdf_export_enabled', 'show_timings', 'offers_folder', 'wz_folder']
         app_settings = {}
         offers_folder_changed = False
         wz_folder_changed = False
@@ -679,6 +747,15 @@ class SettingsFrame(Frame):
                 new_value = bool(self.db_backup_var.get())
                 app_settings['db_backup_enabled'] = new_value
                 continue
+            if field == 'db_replica_enabled':
+                app_settings['db_replica_enabled'] = bool(self.db_replica_var.get())
+                continue
+            if field == 'pdf_export_enabled':
+                app_settings['pdf_export_enabled'] = bool(self.pdf_export_var.get())
+                continue
+            if field == 'show_timings':
+                app_settings['show_timings'] = bool(self.show_timings_var.get())
+                continue
             if field in self.entries:
                 app_settings[field] = self.entries[field].get().strip()
             else:
@@ -704,20 +781,24 @@ class SettingsFrame(Frame):
         # Validate database path if it changed
         if database_path_changed:
             new_db_path = app_settings.get('database_path', '')
-            if new_db_path and not os.path.exists(new_db_path):
+            from src.data.database_service import check_database_file
+            if new_db_path and not check_database_file(new_db_path):
                 result = tkinter.messagebox.askyesno(
                     "Uwaga",
-                    f"Podana ścieżka do bazy danych nie istnieje:\n{new_db_path}\n\nCzy chcesz kontynuować? Aplikacja może nie działać poprawnie."
+                    f"Podana ścieżka nie wskazuje na poprawną bazę danych:\n{new_db_path}\n\nCzy chcesz kontynuować? Aplikacja może nie działać poprawnie."
                 )
                 if not result:
                     return  # Don't save if user cancels
 
         # Save to file
         if self.settings_manager.save_settings():
-            # Restart only when database path changed; folder changes don't require restart
+            from src.data import replica_service
+            replica_service.set_replica_enabled(app_settings.get('db_replica_enabled'))
+            # Database path change is applied in place (replica is rebound there too)
             if database_path_changed:
-                self.show_restart_prompt(database_path_changed)
+                self.switch_database()
             else:
+                self._apply_replica_setting(app_settings)
                 # Don't show success if user changed folders but they couldn't be saved
                 failed_folder_changes = (
                     (offers_folder_changed and not offers_folder_applied) or
@@ -730,49 +811,78 @@ class SettingsFrame(Frame):
         else:
             tkinter.messagebox.showerror("Błąd", "Nie udało się zapisać ustawień.")
     
-    def show_restart_prompt(self, database_changed=False):
-        """Show restart prompt when critical settings have changed"""
-        import tkinter.messagebox
-        
-        if database_changed:
-            message = ("Ścieżka do bazy danych została zmieniona.\n"
-                      "Aplikacja musi zostać uruchomiona ponownie żeby zmiany zaczęły obowiązywać.\n\n"
-                      "Kliknij OK aby kontynuować.")
-        else:
-            message = ("Ścieżka do folderu z ofertami i/lub WZkami została zmieniona.\n"
-                      "Aplikacja zostanie uruchomiona ponownie.\n\n"
-                      "Kliknij OK aby kontynuować.")
-        
-        result = tkinter.messagebox.showinfo("Restart wymagany", message, type='ok')
-        if result == 'ok':
-            self.restart_application()
-    
-    def restart_application(self):
-        """Restart the application"""
-        import sys
-        import os
-        import subprocess
-        
+    def _apply_replica_setting(self, app_settings):
+        """Start or drop the local database replica to match the saved setting."""
         try:
-            # Get the current script path
-            script_path = os.path.abspath(sys.argv[0])
-            
-            # Close current application
-            self.nav_manager.root.quit()
-            self.nav_manager.root.destroy()
-            
-            # Start new instance
-            if sys.platform.startswith('win'):
-                subprocess.Popen([sys.executable, script_path])
+            from src.data import replica_service
+            from src.data.database_service import get_database_path
+            if app_settings.get('db_replica_enabled'):
+                replica_service.warm_up_async(get_database_path())
             else:
-                subprocess.Popen([sys.executable, script_path])
-                
-            # Exit current process
-            sys.exit(0)
-            
+                replica_service.close_replica()
+        except Exception as e:
+            _log.error("Replica setting apply error: %s", e)
+
+    def compact_database(self):
+        """Convert the legacy JSON contexts of the shared database and VACUUM it (in the background)"""
+        from src.data import context_codec
+        from src.data.database_service import get_database_path, check_database_file
+        path = get_database_path()
+        if not check_database_file(path):
+            tkinter.messagebox.showerror("Błąd", "Baza danych jest niedostępna.")
+            return
+        try:
+            upgrade = context_codec.needs_schema_upgrade(path)
         except Exception as e:
-            tkinter.messagebox.showerror("Błąd", f"Nie udało się uruchomić aplikacji ponownie: {e}")
-            print(f"Restart error: {e}")
+            tkinter.messagebox.showerror("Błąd", f"Nie udało się odczytać wersji bazy danych:\n{e}")
+            return
+        if upgrade:
+            question = ("Po kompaktowaniu dokumenty zapisane w bazie będą czytelne tylko dla aktualnej wersji "
+                        "aplikacji. Zmiany nie można cofnąć.\n\n"
+                        "Upewnij się, że na wszystkich stanowiskach działa aktualna wersja i zrób kopię zapasową bazy. "
+                        "Kontynuować?")
+        else:
+            question = ("Kompaktowanie przepisze starsze dokumenty w bazie i zmniejszy plik. "
+                        "Najlepiej uruchomić je, gdy pozostałe stanowiska są zamknięte. Kontynuować?")
+        if not tkinter.messagebox.askyesno("Kompaktowanie bazy danych", question, icon='warning'):
+            return
+        self.compact_btn.config(state=DISABLED)
+        self._compact_result = None
+
+        def _run():
+            try:
+                self._compact_result = context_codec.compact_database(path, upgrade=upgrade)
+            except Exception as e:  # noqa: BLE001
+                self._compact_result = (False, f"Nie udało się skompaktować bazy danych: {e}")
+
+        thread = threading.Thread(target=_run, daemon=True, name='context-compaction')
+        thread.start()
+        self.after(200, self._poll_compaction, thread)
+
+    def _poll_compaction(self, thread):
+        if thread.is_alive():
+            self.after(200, self._poll_compaction, thread)
+            return
+        self.compact_btn.config(state=NORMAL)
+        success, message = self._compact_result
+        if success:
+            tkinter.messagebox.showinfo("Kompaktowanie bazy danych", message)
+        else:
+            tkinter.messagebox.showerror("Błąd", message)
+
+    def switch_database(self):
+        """Switch the running application to the newly selected database file"""
+        from src.data.database_service import rebind_database
+        success, message = rebind_database()
+        if success:
+            self.refresh_offer_creation_data()
+            tkinter.messagebox.showinfo("Sukces", f"Ustawienia zostały zapisane.\n\n{message}")
+        else:
+            tkinter.messagebox.showerror(
+                "Błąd bazy danych",
+                f"{message}\n\nUstawienia zostały zapisane, ale dopóki nie wskażesz poprawnej bazy, "
+                "funkcje korzystające z bazy danych nie będą dostępne."
+            )
     
     def refresh_offer_creation_data(self):
         """Refresh company data in offer creation window if it exists"""
@@ -784,10 +894,10 @@ class SettingsFrame(Frame):
                     # Check if the frame has an initialized offer app instance
                     if hasattr(offer_frame, 'offer_app_instance') and offer_frame.offer_app_instance:
                         if hasattr(offer_frame.offer_app_instance, 'ui'):
-                            print(f"Refreshing company data in {frame_name}")
+                            _log.debug("Refreshing company data in %s", frame_name)
                             offer_frame.offer_app_instance.ui.refresh_company_data()
         except Exception as e:
-            print(f"Could not refresh offer creation data: {e}")
+            _log.warning("Could not refresh offer creation data: %s", e)
     
     def return_to_main_menu(self):
         """Return to main menu"""
@@ -893,12 +1003,15 @@ class SettingsFrame(Frame):
         self.pack_forget()
     
     def show(self):
-        """Show this frame and reload settings to discard unsaved edits"""
+        """Show this frame and reload settings to discard unsaved edits
+        (the frame is kept between visits, so this is its reset)"""
         try:
             self.load_current_settings()
         except Exception:
             # Ensure the frame still shows even if reload fails
             pass
+        if hasattr(self, 'main_canvas'):
+            self.main_canvas.yview_moveto(0)
         self.pack(fill=BOTH, expand=True)
         
         # Re-bind global mouse wheel events when showing
@@ -1,9 +1,12 @@
 """
 WZ creation frame for creating new WZ documents
 """
+import logging
 from tkinter import *
 import tkinter.messagebox
 
+_log = logging.getLogger(__name__)
+
 
 class WzCreationFrame(Frame):
     """Frame for WZ creation"""
@@ -276,16 +279,21 @@ class WzCreationFrame(Frame):
             self.after_cancel(self.mouse_check_job)
         self.mouse_check_job = self.after(100, self.check_mouse_position)  # Check every 100ms
     
-    def initialize_wz_app(self):
-        """Initialize the WZ application components"""
+    def initialize_wz_app(self, template_context=None, source_frame=None):
+        """Initialize the WZ application components (built once, then reset for every new WZ)"""
         try:
-            # Always create a fresh WZ app instance
-            # This ensures clean state when re-entering the frame
-            from src.core.wz_generator_app import WzGeneratorApp
-            self.wz_app_instance = WzGeneratorApp(self, self.nav_manager)
-            
-            # Force GUI update to ensure proper rendering
-            self.update_idletasks()
+            if self.wz_app_instance:
+                # Reuse the existing widgets; reset restores a clean form (or loads the template)
+                self.wz_app_instance.reset(template_context, source_frame)
+                self.canvas.yview_moveto(0)
+            else:
+                from src.core.wz_generator_app import WzGeneratorApp
+                self.wz_app_instance = WzGeneratorApp(self, self.nav_manager,
+                                                      template_context=template_context,
+                                                      source_frame=source_frame)
+                
+                # Force GUI update to ensure proper rendering
+                self.update_idletasks()
             
             # Update scroll region after content is loaded
             self.after(100, self.update_scroll_region)
@@ -294,7 +302,7 @@ class WzCreationFrame(Frame):
             self.start_mouse_position_checking()
         except Exception as e:
             tkinter.messagebox.showerror("Błąd", f"Nie udało się załadować interfejsu tworzenia WZ: {e}")
-            print(f"Detailed error: {e}")  # For debugging
+            _log.error("Detailed error: %s", e)
     
     def update_scroll_region(self):
         """Force update of scroll region"""
@@ -303,16 +311,6 @@ class WzCreationFrame(Frame):
     
     def return_to_source(self):
         """Return to main menu"""
-        # Clean up any resources if needed
-        if self.wz_app_instance:
-            try:
-                # Try to clean up the WZ app instance properly
-                if hasattr(self.wz_app_instance, 'cleanup'):
-                    self.wz_app_instance.cleanup()
-            except:
-                pass  # Ignore cleanup errors
-            self.wz_app_instance = None
-        
         self.nav_manager.show_frame('main_menu')
     
     def hide(self):
@@ -327,25 +325,7 @@ class WzCreationFrame(Frame):
         self.unbind_all("<Button-4>")
         self.unbind_all("<Button-5>")
         self.unbind_all("<Shift-MouseWheel>")
-        
-        # Clean up WZ app instance to force recreation on next show
-        if self.wz_app_instance:
-            try:
-                # Try to clean up the WZ app instance properly
-                if hasattr(self.wz_app_instance, 'cleanup'):
-                    self.wz_app_instance.cleanup()
-            except:
-                pass  # Ignore cleanup errors
-            self.wz_app_instance = None
-        
-        # Clear content container to ensure fresh start
-        if hasattr(self, 'content_container'):
-            for widget in self.content_container.winfo_children():
-                try:
-                    widget.destroy()
-                except:
-                    pass  # Ignore destruction errors
-        
+        # The WZ app and its widgets are kept and reset for the next WZ (see initialize_wz_app)
         self.pack_forget()
     
     def show(self):
@@ -358,10 +338,11 @@ class WzCreationFrame(Frame):
         self.bind_all("<Button-5>", self.on_mousewheel)
         self.bind_all("<Shift-MouseWheel>", self.on_mousewheel)
         
-        # Initialize only if not already created (e.g. when coming with template_context)
-        # NavigationManager may have already created wz_app_instance (with template). Don't overwrite it.
+        # Initialize only if not already created; NavigationManager resets an existing
+        # instance (fresh form or template) before showing the frame. Don't reset it again.
         if not self.wz_app_instance:
             self.initialize_wz_app()
         else:
             # Ensure scroll region reflects existing content
             self.after(100, self.update_scroll_region)
+            self.start_mouse_position_checking()
@@ -1,6 +1,7 @@
 """
 WZ editor frame for editing existing WZ documents
 """
+import logging
 from tkinter import *
 import tkinter.messagebox
 import sys
@@ -9,6 +10,8 @@ import os
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
+_log = logging.getLogger(__name__)
+
 
 class WzEditorFrame(Frame):
     """Frame for editing existing WZ documents"""
@@ -284,18 +287,22 @@ class WzEditorFrame(Frame):
     def initialize_wz_app(self, wz_path=None):
         """Initialize the WZ application components for editing"""
         try:
-            if not self.wz_app_instance:
+            if self.wz_app_instance:
+                # Reuse the existing widgets for the next WZ instead of rebuilding them
+                self.wz_app_instance.reset(wz_path or self.wz_path)
+                self.canvas.yview_moveto(0)
+            else:
                 # Create a modified WZ app for editing
                 from src.core.wz_editor_app import WzEditorApp
                 self.wz_app_instance = WzEditorApp(self, self.nav_manager, wz_path or self.wz_path)
-                # Update scroll region after content is loaded
-                self.after(100, self.update_scroll_region)
-                
-                # Start mouse position checking
-                self.start_mouse_position_checking()
+            # Update scroll region after content is loaded
+            self.after(100, self.update_scroll_region)
+            
+            # Start mouse position checking
+            self.start_mouse_position_checking()
         except Exception as e:
             tkinter.messagebox.showerror("Błąd", f"Nie udało się załadować interfejsu edycji WZ: {e}")
-            print(f"Detailed error: {e}")  # For debugging
+            _log.error("Detailed error: %s", e)
     
     def update_scroll_region(self):
         """Force update of scroll region"""
@@ -317,17 +324,8 @@ class WzEditorFrame(Frame):
             self.after_cancel(self.mouse_check_job)
             self.mouse_check_job = None
             
-        # Clean up WZ app instance and destroy widgets properly
-        if self.wz_app_instance:
-            self.wz_app_instance = None
+        # The WZ app and its widgets are kept and reset for the next WZ (see initialize_wz_app)
         
-        # Destroy content container widgets to prevent memory leaks
-        try:
-            for widget in self.content_container.winfo_children():
-                widget.destroy()
-        except:
-            pass
-            
         # Unbind global mouse wheel events to prevent conflicts
         self.unbind_all("<MouseWheel>")
         self.unbind_all("<Button-4>")
@@ -345,8 +343,11 @@ class WzEditorFrame(Frame):
         self.bind_all("<Button-5>", self.on_mousewheel)
         self.bind_all("<Shift-MouseWheel>", self.on_mousewheel)
         
-        # Always initialize WZ app when showing
-        self.initialize_wz_app(self.wz_path)
+        # Initialize WZ app if NavigationManager has not done it yet
+        if not self.wz_app_instance:
+            self.initialize_wz_app(self.wz_path)
+        else:
+            self.start_mouse_position_checking()
         
         # Update scroll region and UI
         self.after(10, self.update_scroll_region)
@@ -0,0 +1,122 @@
+"""Window for moving closed years of offers and WZ documents into the archive."""
+from tkinter import *
+import threading
+import queue
+import tkinter.messagebox
+import os
+import sys
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from src.data import archive_service
+from src.data.database_service import get_database_path, check_database_file
+
+
+class ArchiveYearsWindow:
+    """Lists closed years still kept in the active folders and archives the selected one"""
+
+    POLL_MS = 120
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.top = None
+        self._thread = None
+        self._queue = queue.Queue()
+        self._years = []
+
+    def open(self):
+        if self.top and self.top.winfo_exists():
+            self.top.lift()
+            return
+        db_path = get_database_path()
+        if not check_database_file(db_path):
+            tkinter.messagebox.showerror("Błąd", "Baza danych jest niedostępna.")
+            return
+
+        self.top = Toplevel(self.parent)
+        self.top.title("Archiwizacja lat")
+        self.top.geometry("560x440")
+        self.top.resizable(False, False)
+        self.top.grab_set()
+        self.top.configure(bg='#f8f9fa')
+
+        Label(self.top, text="Archiwizacja zakończonych lat", font=("Arial", 16, "bold"), bg='#f8f9fa').pack(pady=(18, 6))
+        Label(self.top, text="Dokumenty roku trafiają do pliku ZIP w folderze Archiwum, a wpisy z bazy\n"
+                             "do osobnej bazy rocznej. Zarchiwizowane lata nadal widać w przeglądarkach.",
+              font=("Arial", 10), bg='#f8f9fa', fg='#555', justify=LEFT).pack(padx=18, anchor=W)
+
+        body = Frame(self.top, bg='white', relief=RIDGE, bd=2)
+        body.pack(fill=BOTH, expand=True, padx=18, pady=10)
+        self.years_listbox = Listbox(body, font=("Arial", 12), height=8, activestyle='none')
+        self.years_listbox.pack(fill=BOTH, expand=True, padx=10, pady=10)
+        self.status_var = StringVar(value="")
+        Label(body, textvariable=self.status_var, anchor=W, bg='white', fg='#555').pack(fill=X, padx=10, pady=(0, 8))
+
+        btns = Frame(self.top, bg='#f8f9fa')
+        btns.pack(fill=X, padx=18, pady=(0, 14))
+        self.archive_btn = Button(btns, text="Archiwizuj wybrany rok", font=("Arial", 12, "bold"),
+                                  command=self._start_archive, cursor='hand2')
+        self.archive_btn.pack(side=LEFT)
+        Button(btns, text="Zamknij", font=("Arial", 12), command=self.top.destroy).pack(side=RIGHT)
+
+        self._load_years()
+
+    def _load_years(self):
+        self.years_listbox.delete(0, END)
+        try:
+            archivable = archive_service.get_archivable_years(get_database_path())
+        except Exception as e:  # noqa: BLE001
+            tkinter.messagebox.showerror("Błąd", f"Nie udało się odczytać lat z bazy: {e}", parent=self.top)
+            archivable = {}
+        self._years = list(archivable)
+        for year, (offers, wz) in archivable.items():
+            self.years_listbox.insert(END, f"{year}   –   oferty: {offers}, WZ: {wz}")
+        archived = sorted(set(archive_service.list_archived_years(archive_service.KIND_OFFER))
+                          | set(archive_service.list_archived_years(archive_service.KIND_WZ)))
+        if not self._years:
+            self.status_var.set("Brak zakończonych lat do archiwizacji.")
+        else:
+            self.status_var.set(f"Zarchiwizowane lata: {', '.join(archived)}" if archived else "")
+
+    def _start_archive(self):
+        if self._thread and self._thread.is_alive():
+            return
+        selection = self.years_listbox.curselection()
+        if not selection:
+            tkinter.messagebox.showwarning("Uwaga", "Najpierw wybierz rok do archiwizacji!", parent=self.top)
+            return
+        year = self._years[selection[0]]
+        if not tkinter.messagebox.askyesno(
+                "Archiwizacja", f"Przenieść dokumenty i wpisy z roku {year} do archiwum?\n\n"
+                                "Zarchiwizowane dokumenty będą dostępne tylko do odczytu.", parent=self.top):
+            return
+        self.archive_btn.config(state=DISABLED)
+        self._thread = threading.Thread(target=self._run, args=(year,), daemon=True)
+        self._thread.start()
+        self.top.after(self.POLL_MS, self._poll)
+
+    def _run(self, year):
+        result = archive_service.archive_year(year, progress_cb=lambda m: self._queue.put(('progress', m)))
+        self._queue.put(('done',) + tuple(result))
+
+    def _poll(self):
+        if not self.top or not self.top.winfo_exists():
+            return
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == 'progress':
+                self.status_var.set(item[1])
+                continue
+            _kind, success, message = item
+            self.archive_btn.config(state=NORMAL)
+            if success:
+                tkinter.messagebox.showinfo("Archiwizacja", message, parent=self.top)
+            else:
+                tkinter.messagebox.showerror("Błąd", message, parent=self.top)
+            self._load_years()
+            return
+        self.top.after(self.POLL_MS, self._poll)
@@ -0,0 +1,115 @@
+"""Window running the database/documents consistency check."""
+from tkinter import *
+from tkinter import filedialog
+import threading
+import queue
+import tkinter.messagebox
+import os
+import sys
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from src.services.consistency_check_service import run_check
+
+
+class ConsistencyCheckWindow:
+    """Runs the check in a background thread and shows the text report"""
+
+    POLL_MS = 120
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.top = None
+        self._thread = None
+        self._queue = queue.Queue()
+        self._report_text = ''
+
+    def open(self):
+        if self.top and self.top.winfo_exists():
+            self.top.lift()
+            return
+        self.top = Toplevel(self.parent)
+        self.top.title("Spójność danych")
+        self.top.geometry("900x600")
+        self.top.configure(bg='#f8f9fa')
+
+        Label(self.top, text="Sprawdzanie spójności bazy i dokumentów", font=("Arial", 16, "bold"),
+              bg='#f8f9fa').pack(pady=(18, 8))
+
+        body = Frame(self.top, bg='white', relief=RIDGE, bd=2)
+        body.pack(fill=BOTH, expand=True, padx=18, pady=6)
+        self.output = Text(body, state=DISABLED, wrap='none', font=("Courier", 10))
+        scroll = Scrollbar(body, orient=VERTICAL, command=self.output.yview)
+        self.output.configure(yscrollcommand=scroll.set)
+        scroll.pack(side=RIGHT, fill=Y)
+        self.output.pack(fill=BOTH, expand=True)
+
+        btns = Frame(self.top, bg='#f8f9fa')
+        btns.pack(fill=X, padx=18, pady=10)
+        self.repair_var = BooleanVar(value=False)
+        Checkbutton(btns, text="Napraw ścieżki, które da się jednoznacznie ustalić", variable=self.repair_var,
+                    bg='#f8f9fa').pack(side=LEFT)
+        Button(btns, text="Zamknij", font=("Arial", 12), command=self.top.destroy).pack(side=RIGHT)
+        self.save_btn = Button(btns, text="Zapisz raport", font=("Arial", 12), command=self._save_report,
+                               state=DISABLED)
+        self.save_btn.pack(side=RIGHT, padx=(0, 10))
+        self.start_btn = Button(btns, text="Sprawdź", font=("Arial", 12, "bold"), command=self._start,
+                                cursor='hand2')
+        self.start_btn.pack(side=RIGHT, padx=(0, 10))
+
+    def _set_output(self, text):
+        self.output.configure(state=NORMAL)
+        self.output.delete('1.0', END)
+        self.output.insert('1.0', text)
+        self.output.configure(state=DISABLED)
+
+    def _start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        repair = self.repair_var.get()
+        if repair and not tkinter.messagebox.askyesno(
+                "Naprawa", "Ścieżki w bazie zostaną poprawione tam, gdzie plik da się jednoznacznie odnaleźć.\n"
+                           "Wpisy i pliki nie są usuwane. Kontynuować?", parent=self.top):
+            return
+        self.start_btn.config(state=DISABLED)
+        self.save_btn.config(state=DISABLED)
+        self._set_output("Start sprawdzania...")
+        self._thread = threading.Thread(target=self._run, args=(repair,), daemon=True)
+        self._thread.start()
+        self.top.after(self.POLL_MS, self._poll)
+
+    def _run(self, repair):
+        try:
+            report = run_check(repair=repair, progress_cb=lambda m: self._queue.put(('progress', m)))
+            self._queue.put(('done', report.to_text()))
+        except Exception as e:  # noqa: BLE001
+            self._queue.put(('done', f"Sprawdzanie nie powiodło się: {e}"))
+
+    def _poll(self):
+        if not self.top or not self.top.winfo_exists():
+            return
+        while True:
+            try:
+                kind, text = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._set_output(text)
+            if kind == 'done':
+                self._report_text = text
+                self.start_btn.config(state=NORMAL)
+                self.save_btn.config(state=NORMAL)
+                return
+        self.top.after(self.POLL_MS, self._poll)
+
+    def _save_report(self):
+        path = filedialog.asksaveasfilename(parent=self.top, title="Zapisz raport",
+                                            initialfile="raport_spojnosci.txt", defaultextension=".txt",
+                                            filetypes=[("Plik tekstowy", "*.txt")])
+        if not path:
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self._report_text)
+        except OSError as e:
+            tkinter.messagebox.showerror("Błąd", f"Nie udało się zapisać raportu: {e}", parent=self.top)
@@ -0,0 +1,85 @@
+"""Window merging selected offers or WZ documents into one .docx or .pdf file."""
+from tkinter import *
+from tkinter import ttk, filedialog
+import threading
+import queue
+import tkinter.messagebox
+import os
+import sys
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from src.services.document_merge_service import merge_documents, is_docx_merge_available
+
+
+class MergeExportWindow:
+    """Asks for the output file and merges the documents in a background thread"""
+
+    POLL_MS = 100
+
+    def __init__(self, parent, paths, default_name):
+        self.parent = parent
+        self.paths = list(paths)
+        self.default_name = default_name
+        self.top = None
+        self._thread = None
+        self._queue = queue.Queue()
+
+    def open(self):
+        filetypes = [("PDF", "*.pdf")]
+        if is_docx_merge_available():
+            filetypes.insert(0, ("Dokument Word", "*.docx"))
+        output_path = filedialog.asksaveasfilename(
+            parent=self.parent, title="Zapisz połączone dokumenty",
+            initialfile=self.default_name, defaultextension=filetypes[0][1][1:], filetypes=filetypes)
+        if not output_path:
+            return
+
+        self.top = Toplevel(self.parent)
+        self.top.title("Łączenie dokumentów")
+        self.top.geometry("460x140")
+        self.top.resizable(False, False)
+        self.top.grab_set()
+        self.top.configure(bg='#f8f9fa')
+        self.top.protocol("WM_DELETE_WINDOW", lambda: None)  # closed automatically when done
+
+        Label(self.top, text=f"Łączenie dokumentów ({len(self.paths)})...", font=("Arial", 12, "bold"),
+              bg='#f8f9fa').pack(pady=(18, 10))
+        self.progress = ttk.Progressbar(self.top, orient=HORIZONTAL, length=400, mode='determinate',
+                                        maximum=len(self.paths))
+        self.progress.pack(padx=20)
+        self.status_var = StringVar(value=f"0 / {len(self.paths)}")
+        Label(self.top, textvariable=self.status_var, bg='#f8f9fa', fg='#555').pack(pady=(6, 0))
+
+        self._thread = threading.Thread(target=self._run, args=(output_path,), daemon=True)
+        self._thread.start()
+        self.top.after(self.POLL_MS, self._poll)
+
+    def _run(self, output_path):
+        result = merge_documents(self.paths, output_path,
+                                 progress_cb=lambda done, total: self._queue.put(('progress', done, total)))
+        self._queue.put(('done',) + tuple(result))
+
+    def _poll(self):
+        if not self.top or not self.top.winfo_exists():
+            return
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == 'progress':
+                _kind, done, total = item
+                self.progress['value'] = done
+                self.status_var.set(f"{done} / {total}")
+            else:
+                _kind, success, message = item
+                self.top.grab_release()
+                self.top.destroy()
+                if success:
+                    tkinter.messagebox.showinfo("Łączenie dokumentów", message, parent=self.parent)
+                else:
+                    tkinter.messagebox.showerror("Błąd", message, parent=self.parent)
+                return
+        self.top.after(self.POLL_MS, self._poll)
@@ -0,0 +1,118 @@
+"""Window listing offline writes that could not be sent to the shared database."""
+from tkinter import *
+from tkinter import ttk
+import tkinter.messagebox
+import os
+import sys
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from src.data import write_journal
+from src.data.database_service import get_database_path, retry_offline_conflict, discard_offline_conflict
+
+KIND_LABELS = {
+    write_journal.OFFER_INSERT: "Nowa oferta",
+    write_journal.WZ_INSERT: "Nowe WZ",
+    write_journal.OFFER_CONTEXT_UPDATE: "Edycja oferty",
+    write_journal.WZ_CONTEXT_UPDATE: "Edycja WZ",
+    write_journal.CLIENT_ADD: "Nowy klient",
+    write_journal.CLIENT_UPDATE: "Edycja klienta",
+    write_journal.CLIENT_EXTENDED_UPDATE: "Warunki klienta",
+}
+
+
+def describe_entry(kind, payload) -> str:
+    """Short description of a journaled write (document path or client)."""
+    if 'path' in payload:
+        return str(payload['path'])
+    name = ' '.join(str(payload.get('company_name') or '').replace('\\n', ' ').split())
+    return f"NIP {payload.get('nip', '')}" + (f" – {name}" if name else '')
+
+
+class OfflineConflictsWindow:
+    """Shows the conflicting journal entries of the current database; each can be
+    sent again (after the cause was corrected) or discarded"""
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.top = None
+        self._entries = {}
+
+    def open(self):
+        if self.top and self.top.winfo_exists():
+            self.top.lift()
+            self.refresh()
+            return
+        self.top = Toplevel(self.parent)
+        self.top.title("Konflikty synchronizacji")
+        self.top.geometry("1000x460")
+        self.top.configure(bg='#f8f9fa')
+
+        Label(self.top, text="Zapisy offline, których nie udało się przesłać do bazy",
+              font=("Arial", 16, "bold"), bg='#f8f9fa').pack(pady=(18, 4))
+        Label(self.top, text="Popraw przyczynę w bazie (np. numer lub dane klienta) i ponów zapis albo go odrzuć.",
+              font=("Arial", 10), bg='#f8f9fa', fg='#666666').pack(pady=(0, 8))
+
+        body = Frame(self.top, bg='#f8f9fa')
+        body.pack(fill=BOTH, expand=True, padx=18, pady=6)
+        self.tree = ttk.Treeview(body, columns=('created', 'kind', 'target', 'error'), show='headings',
+                                 selectmode='browse')
+        for column, title, width in (('created', "Data", 140), ('kind', "Zapis", 120),
+                                     ('target', "Dokument / klient", 300), ('error', "Problem", 400)):
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, anchor=W)
+        scroll = ttk.Scrollbar(body, orient=VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        scroll.pack(side=RIGHT, fill=Y)
+        self.tree.pack(fill=BOTH, expand=True)
+
+        btns = Frame(self.top, bg='#f8f9fa')
+        btns.pack(fill=X, padx=18, pady=10)
+        Button(btns, text="Zamknij", font=("Arial", 12), command=self.top.destroy).pack(side=RIGHT)
+        Button(btns, text="Odrzuć", font=("Arial", 12), command=self._discard).pack(side=RIGHT, padx=(0, 10))
+        Button(btns, text="Ponów", font=("Arial", 12, "bold"), command=self._retry,
+               cursor='hand2').pack(side=RIGHT, padx=(0, 10))
+        self.refresh()
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        self._entries = {}
+        for entry_id, kind, payload, created_at, last_error in write_journal.get_conflicts(get_database_path()):
+            iid = str(entry_id)
+            self._entries[iid] = (kind, payload)
+            self.tree.insert('', END, iid=iid, values=(str(created_at or '').replace('T', ' '),
+                                                       KIND_LABELS.get(kind, kind),
+                                                       describe_entry(kind, payload), last_error or ''))
+
+    def _selected_id(self):
+        sel = self.tree.selection()
+        if not sel:
+            tkinter.messagebox.showinfo("Konflikty synchronizacji", "Zaznacz zapis na liście.", parent=self.top)
+            return None
+        return int(sel[0])
+
+    def _retry(self):
+        entry_id = self._selected_id()
+        if entry_id is None:
+            return
+        retry_offline_conflict(entry_id)
+        self.refresh()
+        tkinter.messagebox.showinfo("Konflikty synchronizacji",
+                                    "Zapis wrócił do kolejki i zostanie ponownie przesłany do bazy.",
+                                    parent=self.top)
+
+    def _discard(self):
+        entry_id = self._selected_id()
+        if entry_id is None:
+            return
+        kind, payload = self._entries[str(entry_id)]
+        if not tkinter.messagebox.askyesno(
+                "Odrzuć zapis",
+                f"{KIND_LABELS.get(kind, kind)}: {describe_entry(kind, payload)}\n\n"
+                "Zapis zostanie usunięty z lokalnego dziennika i nie trafi do bazy danych. "
+                "Pliki dokumentów nie są usuwane. Kontynuować?",
+                icon='warning', parent=self.top):
+            return
+        discard_offline_conflict(entry_id)
+        self.refresh()
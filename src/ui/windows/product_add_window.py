@@ -1,21 +1,28 @@
 """
 Product add window for adding new products to the offer
 """
+import logging
 from tkinter import *
 import tkinter.messagebox
 
+from src.utils import money
+from src.ui.components.product_autocomplete import ProductAutocomplete, fill_text_widget
+
+_log = logging.getLogger(__name__)
+
 
 class ProductAddWindow:
     """Handles product addition in a separate window"""
     
-    def __init__(self, parent_window, product_add_callback):
+    def __init__(self, parent_window, product_add_callback, client_nip_provider=None):
         self.parent_window = parent_window
         self.product_add_callback = product_add_callback
+        self.client_nip_provider = client_nip_provider
         self.entries = {}
     
     def open_product_add_window(self):
         """Open product addition window"""
-        print("DEBUG: Opening product add window")  # Debug
+        _log.debug("Opening product add window")
 
         # Create product add window
         product_window = Toplevel(self.parent_window)
@@ -26,7 +33,7 @@ class ProductAddWindow:
         product_window.transient(self.parent_window)
         product_window.configure(bg='#f8f9fa')
 
-        print("DEBUG: Product window created")  # Debug
+        _log.debug("Product window created")
 
         # Center the window
         product_window.geometry(
@@ -98,6 +105,10 @@ class ProductAddWindow:
             except Exception:
                 pass
 
+        # Suggestions from the product catalog while typing the name
+        self.autocomplete = ProductAutocomplete(self.entries['product_name'], self._fill_from_catalog,
+                                                client_nip_provider=self.client_nip_provider)
+
         # Add separator line
         separator = Frame(product_window, height=2, bg='#cccccc')
         separator.pack(fill=X, padx=20, pady=(10, 20))
@@ -142,9 +153,22 @@ class ProductAddWindow:
         # Set focus to first field
         self.entries['product_name'].focus_set()
     
+    def _fill_from_catalog(self, product):
+        """Fill name, unit and last price from a picked catalog product"""
+        fill_text_widget(self.entries['product_name'], product['name'].replace('\\n', '\n'))
+        if product.get('unit'):
+            fill_text_widget(self.entries['unit'], product['unit'])
+        if product.get('price'):
+            try:
+                fill_text_widget(self.entries['unit_price'], money.format_amount(money.parse_amount(product['price'])))
+            except ValueError:
+                pass
+        self.entries['quantity'].focus_set()
+        self.entries['quantity'].select_range(0, END)
+
     def _add_product(self, product_window):
         """Handle product addition"""
-        print("DEBUG: _add_product called")  # Debug
+        _log.debug("_add_product called")
         # Get product data (without product_id since it's auto-generated)
         # Read multi-line product name from Text and normalize newlines
         name_widget = self.entries.get('product_name')
@@ -158,7 +182,7 @@ class ProductAddWindow:
             self.entries['quantity'].get(),
             self.entries['unit_price'].get()
         ]
-        print(f"DEBUG: Product data: {product_data}")  # Debug
+        _log.debug("Product data: %s", product_data)
         
         # Validate data
         if not all([field.strip() for field in product_data]):
@@ -167,11 +191,9 @@ class ProductAddWindow:
         
         # Try to validate numeric fields
         try:
-            # quantity must be integer
-            int(product_data[2])
-            # unit_price can contain spaces and comma as decimal
-            _price_clean = product_data[3].replace(' ', '').replace('\u00A0', '').replace(',', '.')
-            float(_price_clean)
+            # quantity must be integer; unit_price can contain spaces and comma as decimal
+            money.parse_quantity(product_data[2])
+            money.parse_amount(product_data[3])
         except ValueError:
             tkinter.messagebox.showerror("Błąd", "Ilość musi być liczbą całkowitą, a cena liczbą!")
             return
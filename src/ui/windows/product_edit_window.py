@@ -1,16 +1,23 @@
 """
 Product edit window for editing existing products in the offer
 """
+import logging
 from tkinter import *
 import tkinter.messagebox
 
+from src.utils import money
+from src.ui.components.product_autocomplete import ProductAutocomplete, fill_text_widget
+
+_log = logging.getLogger(__name__)
+
 
 class ProductEditWindow:
     """Handles product editing in a separate window"""
     
-    def __init__(self, parent_window, product_update_callback):
+    def __init__(self, parent_window, product_update_callback, client_nip_provider=None):
         self.parent_window = parent_window
         self.product_update_callback = product_update_callback
+        self.client_nip_provider = client_nip_provider
         self.entries = {}
         self.item_id = None
     
@@ -21,7 +28,7 @@ class ProductEditWindow:
             return
         
         self.item_id = product_data['item_id']
-        print("DEBUG: Opening product edit window")  # Debug
+        _log.debug("Opening product edit window")
         
         # Create product edit window
         product_window = Toplevel(self.parent_window)
@@ -31,7 +38,7 @@ class ProductEditWindow:
         product_window.grab_set()  # Make window modal
         product_window.transient(self.parent_window)
         product_window.configure(bg='#f8f9fa')  # Light background
-        print("DEBUG: Product edit window created")  # Debug
+        _log.debug("Product edit window created")
         
         # Center the window
         product_window.geometry("+%d+%d" % (
@@ -91,6 +98,10 @@ class ProductEditWindow:
                 entry.bind('<Return>', _on_return)
             except Exception:
                 pass
+
+        # Suggestions from the product catalog while typing the name
+        self.autocomplete = ProductAutocomplete(self.entries['product_name'], self._fill_from_catalog,
+                                                client_nip_provider=self.client_nip_provider)
         
         # Bind Enter key to update product
         product_window.bind('<Return>', lambda event: self._update_product(product_window))
@@ -125,12 +136,25 @@ class ProductEditWindow:
                            cursor='hand2')
         cancel_btn.place(relx=0.7, rely=0.5, anchor=CENTER)
         
-        print("DEBUG: Product edit window UI created")  # Debug
+        _log.debug("Product edit window UI created")
     
+    def _fill_from_catalog(self, product):
+        """Fill name, unit and last price from a picked catalog product"""
+        fill_text_widget(self.entries['product_name'], product['name'].replace('\\n', '\n'))
+        if product.get('unit'):
+            fill_text_widget(self.entries['unit'], product['unit'])
+        if product.get('price'):
+            try:
+                fill_text_widget(self.entries['unit_price'], money.format_amount(money.parse_amount(product['price'])))
+            except ValueError:
+                pass
+        self.entries['quantity'].focus_set()
+        self.entries['quantity'].select_range(0, END)
+
     def _update_product(self, window):
         """Handle product update"""
         try:
-            print("DEBUG: _update_product called")  # Debug
+            _log.debug("_update_product called")
             
             # Get product data (without product_id since position is auto-managed)
             # Read multi-line product name from Text and normalize trailing newline
@@ -147,14 +171,14 @@ class ProductEditWindow:
                 self.entries['unit_price'].get()
             ]
             
-            print(f"DEBUG: Updating product with data: {product_data}")  # Debug
+            _log.debug("Updating product with data: %s", product_data)
             
             # Call the update callback with item_id and product data
             if self.product_update_callback(self.item_id, product_data):
-                print("DEBUG: Product updated successfully")  # Debug
+                _log.debug("Product updated successfully")
                 window.destroy()
             else:
-                print("DEBUG: Product update failed")  # Debug
+                _log.warning("Product update failed")
         except Exception as e:
-            print(f"DEBUG: Error updating product: {e}")  # Debug
+            _log.error("Error updating product: %s", e)
             tkinter.messagebox.showerror("Błąd", f"Nie udało się zaktualizować produktu: {e}")
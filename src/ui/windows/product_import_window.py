@@ -0,0 +1,133 @@
+"""
+Product import window for adding many products at once from a CSV file or the clipboard
+"""
+import logging
+from tkinter import *
+from tkinter import filedialog
+import tkinter.messagebox
+import time
+
+from src.services.product_import_service import parse_product_file, parse_product_text
+
+_log = logging.getLogger(__name__)
+
+# How many row errors are listed in the confirmation dialog
+ERRORS_SHOWN = 10
+
+
+class ProductImportWindow:
+    """Handles bulk import of product rows into an offer or WZ table"""
+
+    def __init__(self, parent_window, import_callback, with_prices=True):
+        self.parent_window = parent_window
+        self.import_callback = import_callback  # receives the list of validated rows, returns inserted count
+        self.with_prices = with_prices
+        self.window = None
+
+    def open_import_window(self):
+        """Open the import source selection window"""
+        if self.window is not None and self.window.winfo_exists():
+            self.window.lift()
+            return
+
+        self.window = Toplevel(self.parent_window)
+        self.window.title("Importuj pozycje")
+        self.window.geometry("560x320")
+        self.window.resizable(False, False)
+        self.window.grab_set()
+        self.window.transient(self.parent_window)
+        self.window.configure(bg='#f8f9fa')
+        self.window.geometry(
+            "+%d+%d" % (
+                self.parent_window.winfo_rootx() + 100,
+                self.parent_window.winfo_rooty() + 100,
+            )
+        )
+
+        Label(self.window, text="Importuj pozycje", font=("Arial", 18, "bold"),
+              bg='#f8f9fa', fg='#343a40').pack(pady=(25, 10), fill=X)
+
+        if self.with_prices:
+            columns = "Nazwa; j.m.; ilość; cena jednostkowa netto"
+        else:
+            columns = "Nazwa; j.m.; ilość"
+        hint = (f"Kolumny: {columns}\n"
+                "Pierwszy wiersz może zawierać nagłówki. Obsługiwane są pliki CSV z Excela\n"
+                "(separator ; lub ,) oraz komórki skopiowane bezpośrednio z arkusza.")
+        Label(self.window, text=hint, font=("Arial", 10), bg='#f8f9fa', fg='#495057',
+              justify=LEFT).pack(pady=(0, 20), padx=20)
+
+        buttons_frame = Frame(self.window, bg='#f8f9fa')
+        buttons_frame.pack(pady=10)
+
+        Button(buttons_frame, text="Z pliku CSV...", font=("Arial", 12, "bold"),
+               bg='#007bff', fg='black', padx=15, pady=8, cursor='hand2',
+               command=self.import_from_file).pack(side=LEFT, padx=10)
+        Button(buttons_frame, text="Wklej ze schowka", font=("Arial", 12, "bold"),
+               bg='#28a745', fg='black', padx=15, pady=8, cursor='hand2',
+               command=self.import_from_clipboard).pack(side=LEFT, padx=10)
+        Button(self.window, text="Anuluj", font=("Arial", 11),
+               command=self.close).pack(pady=15)
+
+    def close(self):
+        if self.window is not None:
+            try:
+                self.window.destroy()
+            except Exception:
+                pass
+        self.window = None
+
+    def import_from_file(self):
+        """Choose a CSV file and import its rows"""
+        path = filedialog.askopenfilename(
+            parent=self.window,
+            title="Wybierz plik CSV",
+            filetypes=[("Pliki CSV", "*.csv"), ("Pliki tekstowe", "*.txt"), ("Wszystkie pliki", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            result = parse_product_file(path, self.with_prices)
+        except OSError as e:
+            tkinter.messagebox.showerror("Błąd", f"Nie udało się odczytać pliku:\n{e}", parent=self.window)
+            return
+        self._apply(result)
+
+    def import_from_clipboard(self):
+        """Import rows copied from a spreadsheet or text editor"""
+        try:
+            text = self.parent_window.clipboard_get()
+        except TclError:
+            text = ''
+        if not text.strip():
+            tkinter.messagebox.showwarning("Uwaga", "Schowek jest pusty.", parent=self.window)
+            return
+        self._apply(parse_product_text(text, self.with_prices))
+
+    def _apply(self, result):
+        """Confirm problems with the user and hand valid rows to the table in one batch"""
+        if not result.rows:
+            details = "\n".join(result.errors[:ERRORS_SHOWN])
+            tkinter.messagebox.showwarning(
+                "Brak pozycji",
+                "Nie znaleziono poprawnych pozycji do zaimportowania." + (f"\n\n{details}" if details else ""),
+                parent=self.window)
+            return
+
+        if result.error_count:
+            details = "\n".join(result.errors[:ERRORS_SHOWN])
+            if result.error_count > ERRORS_SHOWN:
+                details += f"\n... i {result.error_count - ERRORS_SHOWN} więcej"
+            if not tkinter.messagebox.askyesno(
+                    "Błędne wiersze",
+                    f"Pominięto {result.error_count} błędnych wierszy:\n\n{details}\n\n"
+                    f"Zaimportować {len(result.rows)} poprawnych pozycji?",
+                    parent=self.window):
+                return
+
+        t = time.perf_counter()
+        inserted = self.import_callback(result.rows)
+        _log.info("Imported %s product rows in %.3f s", inserted, time.perf_counter() - t)
+        self.close()
+        tkinter.messagebox.showinfo("Import zakończony", f"Zaimportowano pozycji: {inserted}",
+                                    parent=self.parent_window)
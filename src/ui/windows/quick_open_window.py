@@ -0,0 +1,176 @@
+"""
+Quick-open palette (Ctrl+P): jump to any offer, WZ, client or supplier by typing
+"""
+from tkinter import *
+from tkinter import ttk
+import tkinter.messagebox
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from src.data import quick_open_service
+from src.data.database_service import (
+    build_full_offer_path, build_full_wz_path, is_database_available, can_work_offline,
+)
+
+HINT = "Enter – edytuj   Shift+Enter – wczytaj do kreatora   Esc – zamknij"
+
+
+class QuickOpenWindow:
+    """Palette over the quick-open index; results are filtered on every keystroke"""
+
+    POLL_MS = 100
+
+    def __init__(self, root, nav_manager):
+        self.root = root
+        self.nav_manager = nav_manager
+        self.window = None
+        self._results = []
+
+    def open(self):
+        """Show the palette (or bring it back to front with the query selected)"""
+        if not is_database_available() and not can_work_offline():
+            tkinter.messagebox.showerror(
+                "Brak dostępu do bazy danych",
+                "Funkcja niedostępna. Brak połączenia z bazą danych lub baza danych nieprawidłowo ustawiona."
+            )
+            return
+        quick_open_service.preload_async()
+        if self.window is not None and self.window.winfo_exists():
+            self.window.deiconify()
+            self.window.lift()
+        else:
+            self._create()
+        self.entry.focus_set()
+        self.entry.select_range(0, END)
+        self.refresh()
+
+    def _create(self):
+        self.window = Toplevel(self.root)
+        self.window.title("Szybkie otwieranie")
+        self.window.transient(self.root)
+        width, height = 760, 420
+        x = self.root.winfo_rootx() + max(0, (self.root.winfo_width() - width) // 2)
+        y = self.root.winfo_rooty() + 60
+        self.window.geometry(f"{width}x{height}+{x}+{y}")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        main_frame = Frame(self.window)
+        main_frame.pack(fill=BOTH, expand=True, padx=10, pady=10)
+
+        self.query_var = StringVar()
+        self.entry = Entry(main_frame, textvariable=self.query_var, font=("Arial", 14))
+        self.entry.pack(fill=X)
+        self.query_var.trace_add('write', lambda *_args: self.refresh())
+
+        self.status_var = StringVar(value=HINT)
+        Label(main_frame, textvariable=self.status_var, font=("Arial", 9), fg='#666666',
+              anchor=W).pack(fill=X, pady=(4, 6))
+
+        list_frame = Frame(main_frame)
+        list_frame.pack(fill=BOTH, expand=True)
+        self.tree = ttk.Treeview(list_frame, columns=('kind', 'title', 'detail'), show='headings',
+                                 selectmode='browse')
+        for column, title, width in (('kind', "Typ", 90), ('title', "Nazwa", 330), ('detail', "Szczegóły", 300)):
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, anchor=W, stretch=(column != 'kind'))
+        scrollbar = ttk.Scrollbar(list_frame, orient=VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=LEFT, fill=BOTH, expand=True)
+        scrollbar.pack(side=RIGHT, fill=Y)
+
+        for widget in (self.entry, self.tree):
+            widget.bind('<Return>', lambda e: self.activate(load_to_creator=False))
+            widget.bind('<KP_Enter>', lambda e: self.activate(load_to_creator=False))
+            widget.bind('<Shift-Return>', lambda e: self.activate(load_to_creator=True))
+            widget.bind('<Escape>', lambda e: self.close())
+        self.entry.bind('<Down>', lambda e: self._move(1))
+        self.entry.bind('<Up>', lambda e: self._move(-1))
+        self.entry.bind('<Next>', lambda e: self._move(10))
+        self.entry.bind('<Prior>', lambda e: self._move(-10))
+        self.tree.bind('<Double-1>', lambda e: self.activate(load_to_creator=False))
+
+    def refresh(self):
+        """Show the entries matching the current query"""
+        if self.window is None or not self.window.winfo_exists():
+            return
+        query = self.query_var.get()
+        self._results = quick_open_service.search(query)
+        self.tree.delete(*self.tree.get_children())
+        for i, entry in enumerate(self._results):
+            self.tree.insert('', END, iid=str(i), values=(quick_open_service.KIND_LABELS[entry.kind],
+                                                          entry.title, entry.detail))
+        if self._results:
+            self.tree.selection_set('0')
+            self.tree.see('0')
+        if not quick_open_service.is_loaded():
+            self.status_var.set("Wczytywanie indeksu...")
+            self.window.after(self.POLL_MS, self._wait_for_index)
+        elif query.strip() and not self._results:
+            self.status_var.set("Brak wyników")
+        else:
+            self.status_var.set(HINT)
+
+    def _wait_for_index(self):
+        if self.window is None or not self.window.winfo_exists():
+            return
+        if quick_open_service.is_loaded():
+            self.refresh()
+        else:
+            self.window.after(self.POLL_MS, self._wait_for_index)
+
+    def _move(self, step):
+        if not self._results:
+            return 'break'
+        sel = self.tree.selection()
+        current = int(sel[0]) if sel else -1
+        target = str(max(0, min(len(self._results) - 1, current + step)))
+        self.tree.selection_set(target)
+        self.tree.see(target)
+        return 'break'
+
+    def _selected(self):
+        sel = self.tree.selection()
+        return self._results[int(sel[0])] if sel else None
+
+    def activate(self, load_to_creator=False):
+        """Open the selected entry: documents in the editor (or the creator), clients and suppliers for editing"""
+        entry = self._selected()
+        if entry is None:
+            return 'break'
+        self.close()
+        kind = entry.kind
+        if kind == quick_open_service.KIND_OFFER:
+            path = build_full_offer_path(entry.key)
+            if load_to_creator:
+                self.nav_manager.frames['browse_offers'].load_offer_into_creator(path, source_frame=None)
+            elif self._require_file(path, "Plik oferty nie istnieje"):
+                self.nav_manager.show_frame('offer_editor', offer_path=path)
+        elif kind == quick_open_service.KIND_WZ:
+            path = build_full_wz_path(entry.key)
+            if load_to_creator:
+                self.nav_manager.frames['browse_wz'].load_wz_into_creator(path, source_frame=None)
+            elif self._require_file(path, "Plik WZ nie istnieje"):
+                self.nav_manager.show_frame('wz_editor', wz_path=path)
+        elif kind == quick_open_service.KIND_CLIENT:
+            self.nav_manager.show_frame('browse_clients')
+            self.nav_manager.frames['browse_clients'].open_client_editor(entry.key)
+        elif kind == quick_open_service.KIND_SUPPLIER:
+            self.nav_manager.show_frame('browse_suppliers')
+            self.nav_manager.frames['browse_suppliers'].open_edit_supplier_form(entry.key, None)
+        return 'break'
+
+    @staticmethod
+    def _require_file(path, message):
+        if os.path.isfile(path):
+            return True
+        tkinter.messagebox.showerror("Błąd", f"{message}:\n{path}")
+        return False
+
+    def close(self):
+        """Hide the palette; it keeps its last query for the next Ctrl+P"""
+        if self.window is not None and self.window.winfo_exists():
+            self.window.withdraw()
+        self.root.focus_set()
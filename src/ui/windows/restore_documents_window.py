@@ -1,4 +1,5 @@
 """Window for restoring Word documents from an existing database file."""
+import logging
 from tkinter import *
 from tkinter import filedialog
 import threading
@@ -8,6 +9,8 @@ import os
 
 from src.services.restore_documents_service import restore_from_database
 
+_log = logging.getLogger(__name__)
+
 class RestoreDocumentsWindow:
     def __init__(self, parent):
         self.parent = parent
@@ -97,7 +100,7 @@ class RestoreDocumentsWindow:
         # Fallback: if thread finished, queue empty, final line not yet added
         if (self.restore_thread and not self.restore_thread.is_alive() and not self._end_line_inserted):
             try:
-                print("[RestoreWindow DEBUG] fallback final line insertion")
+                _log.debug("Restore progress: fallback final line insertion")
             except Exception:
                 pass
             # Build final line using stored report if present
@@ -129,7 +132,7 @@ class RestoreDocumentsWindow:
         msg_strip = msg.lstrip()
         try:
             # Print debug to stdout (terminal) to help diagnose prefix issues
-            print(f"[RestoreWindow DEBUG] msg={raw_msg!r} offers={self._offers_done} wz={self._wz_done}")
+            _log.debug("Restore progress msg=%r offers=%s wz=%s", raw_msg, self._offers_done, self._wz_done)
         except Exception:
             pass
         # Detect counters (ignore leading whitespace)
@@ -148,7 +151,7 @@ class RestoreDocumentsWindow:
             self.progress_box.see(END)
             self.progress_box.configure(state=DISABLED)
         except Exception as e:
-            print(f"[RestoreWindow] progress write error: {e}")
+            _log.error("Restore progress write error: %s", e)
 
     def _start_restore(self):
         # Prevent duplicate runs
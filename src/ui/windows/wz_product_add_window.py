@@ -4,6 +4,8 @@ WZ Product Add Window - simplified version without pricing
 from tkinter import *
 import tkinter.messagebox
 
+from src.ui.components.product_autocomplete import ProductAutocomplete, fill_text_widget
+
 
 class WzProductAddWindow:
     """Window for adding products to WZ - simplified without pricing"""
@@ -79,6 +81,9 @@ class WzProductAddWindow:
                             padx=20, pady=5, command=self.close)
         cancel_btn.pack(side=LEFT, padx=10)
 
+        # Suggestions from the product catalog while typing the name
+        self.autocomplete = ProductAutocomplete(self.entries['name'], self._fill_from_catalog, with_price=False)
+
         # Focus on name field
         self.entries['name'].focus_set()
 
@@ -102,6 +107,14 @@ class WzProductAddWindow:
         self.window.bind('<KP_Enter>', _on_return)
         self.window.bind('<Escape>', lambda e: self.close())
     
+    def _fill_from_catalog(self, product):
+        """Fill name and unit from a picked catalog product"""
+        fill_text_widget(self.entries['name'], product['name'].replace('\\n', '\n'))
+        if product.get('unit'):
+            fill_text_widget(self.entries['unit'], product['unit'])
+        self.entries['quantity'].focus_set()
+        self.entries['quantity'].select_range(0, END)
+
     def add_product(self):
         """Add the product"""
         # Get values
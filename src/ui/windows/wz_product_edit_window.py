@@ -4,6 +4,8 @@ WZ Product Edit Window - simplified version without pricing
 from tkinter import *
 import tkinter.messagebox
 
+from src.ui.components.product_autocomplete import ProductAutocomplete, fill_text_widget
+
 
 class WzProductEditWindow:
     """Window for editing products in WZ - simplified without pricing"""
@@ -82,6 +84,9 @@ class WzProductEditWindow:
                            padx=20, pady=5, command=self.close)
         cancel_btn.pack(side=LEFT, padx=10)
         
+        # Suggestions from the product catalog while typing the name
+        self.autocomplete = ProductAutocomplete(self.entries['name'], self._fill_from_catalog, with_price=False)
+
         # Focus on name field
         self.entries['name'].focus_set()
 
@@ -104,6 +109,14 @@ class WzProductEditWindow:
         self.window.bind('<KP_Enter>', _on_return)
         self.window.bind('<Escape>', lambda e: self.close())
     
+    def _fill_from_catalog(self, product):
+        """Fill name and unit from a picked catalog product"""
+        fill_text_widget(self.entries['name'], product['name'].replace('\\n', '\n'))
+        if product.get('unit'):
+            fill_text_widget(self.entries['unit'], product['unit'])
+        self.entries['quantity'].focus_set()
+        self.entries['quantity'].select_range(0, END)
+
     def save_changes(self):
         """Save the changes"""
         # Get values
@@ -1,17 +1,27 @@
 """
 Application logging module.
 
-Logs are written to .txt files in a 'logs' folder next to the executable
-(or next to main.py in development mode).
+Logs are written as JSON lines (one object per record: ts, level, logger,
+thread, msg, plus exc and any `extra=` fields) to app.jsonl in a 'logs'
+folder next to the executable (or next to main.py in development mode).
+
+Loggers only put records on an in-memory queue (QueueHandler); a listener
+thread formats them and writes the file (and finished traces to
+traces.jsonl, see tracing), so logging never blocks the Tk thread on disk I/O. Levels are set per logger, so disabled records are
+dropped at the call site: the root level is INFO and the app setting
+'log_levels' ({"src.data": "DEBUG", ...}) overrides single modules.
 
 Rotation rules:
   - Single file max size : 5 MB
   - Max number of files  : 20  (oldest deleted when limit exceeded)
 """
 
+import atexit
+import json
 import logging
 import logging.handlers
 import os
+import queue
 import sys
 import glob
 
@@ -19,9 +29,16 @@ import glob
 # ── Constants ────────────────────────────────────────────────────────────────
 _MAX_BYTES = 5 * 1024 * 1024   # 5 MB per file
 _BACKUP_COUNT = 19              # 19 backups + 1 active = 20 files max
-_LOG_FILENAME = "app.txt"
-_LOG_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
+_LOG_FILENAME = "app.jsonl"
 _DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+_DEFAULT_LEVEL = logging.INFO
+# Chatty third-party loggers
+_DEFAULT_MODULE_LEVELS = {
+    'PIL': logging.WARNING,
+    'docxtpl': logging.WARNING,
+}
+
+_listener = None
 
 
 def _get_logs_dir() -> str:
@@ -43,7 +60,7 @@ def _get_logs_dir() -> str:
 
 def _cleanup_old_logs(logs_dir: str) -> None:
     """Delete oldest log files if count exceeds the limit (20 total)."""
-    pattern = os.path.join(logs_dir, "app.txt*")
+    pattern = os.path.join(logs_dir, "app.*")  # includes app.txt* written by older versions
     log_files = sorted(glob.glob(pattern), key=os.path.getmtime)
     max_total = _BACKUP_COUNT + 1  # 20
     while len(log_files) > max_total:
@@ -54,6 +71,80 @@ def _cleanup_old_logs(logs_dir: str) -> None:
             pass
 
 
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; `extra=` fields are kept as their own keys."""
+
+    _STANDARD = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+    def format(self, record):
+        data = {
+            'ts': f"{self.formatTime(record, _DATE_FORMAT)}.{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in self._STANDARD and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        if record.stack_info:
+            data['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Freeze the message and traceback on the logging thread, keep the record's
+    fields for the JSON formatter (the stock prepare() flattens them into msg)."""
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _module_levels() -> dict:
+    """Default third-party levels updated with the 'log_levels' app setting."""
+    levels = dict(_DEFAULT_MODULE_LEVELS)
+    try:
+        from src.utils.settings import settings_manager
+        configured = settings_manager.get_app_setting('log_levels') or {}
+    except Exception:  # noqa: BLE001 - logging must start even with broken settings
+        configured = {}
+    if isinstance(configured, dict):
+        for name, level in configured.items():
+            value = logging.getLevelName(str(level).upper())
+            if isinstance(value, int):
+                levels[name] = value
+    return levels
+
+
+def apply_log_levels(levels: dict) -> None:
+    """Set per-logger levels ({logger name: level}); '' or 'root' is the root logger."""
+    for name, level in levels.items():
+        logging.getLogger('' if name == 'root' else name).setLevel(level)
+
+
+def shutdown_logging() -> None:
+    """Write out the queued records and stop the listener thread (runs at exit)."""
+    global _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, _QueueHandler)]:
+        root.removeHandler(handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
 def setup_logging() -> logging.Logger:
     """Configure and return the root application logger.
 
@@ -64,28 +155,39 @@ def setup_logging() -> logging.Logger:
         logger = logging.getLogger(__name__)
         logger.info("message")
     """
-    logs_dir = _get_logs_dir()
-    log_path = os.path.join(logs_dir, _LOG_FILENAME)
-
-    # Clean up before attaching handler (in case of leftover files)
-    _cleanup_old_logs(logs_dir)
-
-    # Rotating file handler  (5 MB × 20 files)
-    file_handler = logging.handlers.RotatingFileHandler(
-        log_path,
-        maxBytes=_MAX_BYTES,
-        backupCount=_BACKUP_COUNT,
-        encoding='utf-8',
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(logging.Formatter(_LOG_FORMAT, datefmt=_DATE_FORMAT))
-
-    # Root logger
+    global _listener
     root = logging.getLogger()
-    root.setLevel(logging.DEBUG)
+    root.setLevel(_DEFAULT_LEVEL)
 
     # Avoid duplicate handlers on repeated calls
-    if not any(isinstance(h, logging.handlers.RotatingFileHandler) for h in root.handlers):
-        root.addHandler(file_handler)
+    if _listener is None:
+        logs_dir = _get_logs_dir()
+        log_path = os.path.join(logs_dir, _LOG_FILENAME)
+
+        # Clean up before attaching handler (in case of leftover files)
+        _cleanup_old_logs(logs_dir)
+
+        # Rotating file handler  (5 MB × 20 files), written by the listener thread only
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_path,
+            maxBytes=_MAX_BYTES,
+            backupCount=_BACKUP_COUNT,
+            encoding='utf-8',
+        )
+        file_handler.setFormatter(JsonFormatter())
+
+        handlers = [file_handler]
+        try:
+            from src.utils import tracing
+            handlers.append(tracing.traces_file_handler())
+        except Exception:  # noqa: BLE001 - logging must start even without the traces file
+            pass
+
+        records = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        root.addHandler(_QueueHandler(records))
 
+    apply_log_levels(_module_levels())
     return root
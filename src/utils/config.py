@@ -35,7 +35,15 @@ DEFAULT_APP_SETTINGS = {
     'wz_folder': "",
     # Automatic database backup on app start
     'db_backup_enabled': False,
-    'db_backup_folder': ""
+    'db_backup_folder': "",
+    # Serve reads from a local copy of the database kept in get_data_dir()
+    'db_replica_enabled': False,
+    # Export every generated offer/WZ to PDF in the background
+    'pdf_export_enabled': False,
+    # Show the stage timings of the last generated document in a status bar
+    'show_timings': False,
+    # Per-module log levels, e.g. {"src.data": "DEBUG", "PIL": "WARNING"} (see app_logging)
+    'log_levels': {}
 }
 
 # Default company data
@@ -1,6 +1,7 @@
 """Date formatting utilities for Polish and English (genitive month names)."""
 from __future__ import annotations
 import datetime as _dt
+import re
 
 # Genitive month names used after day numbers in Polish dates
 _POLISH_MONTHS_GENITIVE = {
@@ -75,4 +76,74 @@ def format_date(date: _dt.datetime | _dt.date, language: str = "PL") -> str:
     else:
         return format_polish_date(date)
 
-__all__ = ["format_polish_date", "format_english_date", "format_date"]
+
+_MONTH_NUMBERS = {name.casefold(): number for names in (_POLISH_MONTHS_GENITIVE, _ENGLISH_MONTHS)
+                  for number, name in names.items()}
+_YEAR_RE = re.compile(r'(?:19|20)\d{2}')
+
+
+def parse_year_month(value) -> tuple[int, int] | None:
+    """Return (year, month) of a stored document date, or None when it cannot be read.
+
+    Accepts date/datetime objects, ISO strings ('2025-11-13T00:00:00'), 'DD MM YYYY'
+    or 'DD.MM.YYYY', and the formatted Polish/English dates ('13 listopada 2025',
+    'November 13, 2025').
+    """
+    if isinstance(value, (_dt.date, _dt.datetime)):
+        return value.year, value.month
+    text = str(value or '').strip()
+    m = re.match(r'^((?:19|20)\d{2})-(\d{1,2})', text)
+    if m:
+        year, month = int(m.group(1)), int(m.group(2))
+    else:
+        m = re.match(r'^\d{1,2}[ ./-](\d{1,2})[ ./-]((?:19|20)\d{2})$', text)
+        if m:
+            month, year = int(m.group(1)), int(m.group(2))
+        else:
+            year_match = _YEAR_RE.search(text)
+            words = re.findall(r'[^\W\d_]+', text.casefold())
+            month = next((_MONTH_NUMBERS[w] for w in words if w in _MONTH_NUMBERS), None)
+            if not year_match or month is None:
+                return None
+            year = int(year_match.group(0))
+    return (year, month) if 1 <= month <= 12 else None
+
+
+def parse_date(value) -> _dt.date | None:
+    """Return the calendar date of a stored document date, or None when it cannot be read.
+
+    Accepts the same forms as parse_year_month; the day is the one- or two-digit
+    number of the text ('13 listopada 2025', 'November 13, 2025').
+    """
+    if isinstance(value, _dt.datetime):
+        return value.date()
+    if isinstance(value, _dt.date):
+        return value
+    text = str(value or '').strip()
+    m = re.match(r'^((?:19|20)\d{2})-(\d{1,2})-(\d{1,2})', text)
+    if m:
+        year, month, day = int(m.group(1)), int(m.group(2)), int(m.group(3))
+    else:
+        m = re.match(r'^(\d{1,2})[ ./-](\d{1,2})[ ./-]((?:19|20)\d{2})$', text)
+        if m:
+            day, month, year = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        else:
+            period = parse_year_month(text)
+            days = re.findall(r'(?<!\d)\d{1,2}(?!\d)', text)
+            if period is None or len(days) != 1:
+                return None
+            (year, month), day = period, int(days[0])
+    try:
+        return _dt.date(year, month, day)
+    except ValueError:
+        return None
+
+
+def to_iso_date(value) -> str | None:
+    """Stored document date as 'YYYY-MM-DD' (sortable), or None when it cannot be read."""
+    date = parse_date(value)
+    return date.isoformat() if date else None
+
+
+__all__ = ["format_polish_date", "format_english_date", "format_date", "parse_year_month",
+           "parse_date", "to_iso_date"]
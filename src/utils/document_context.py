@@ -0,0 +1,224 @@
+"""
+Typed offer and WZ contexts.
+
+The form builds a context dict, the services render it into a template and
+the database stores it. OfferContext and WzContext hold that context as one
+record with __slots__. A record is built once, from the form or from a stored
+context, and its names are sanitized there (RichText values and leftover Word
+run XML become plain text with literal '\\n' line markers). It then converts
+to the shapes the pipeline needs:
+
+- to_template(): a new dict for docxtpl (formatted date, names as RichText)
+- to_storage():  the plain dict stored in the database
+- to_form():     the dict the form components load (same keys as the form)
+
+Fields missing from the source stay None and are left out of every
+conversion, so the template placeholder check still sees them as missing.
+Keys the record does not know (older contexts) are kept in `extra` and
+round-trip unchanged.
+"""
+import datetime
+import os
+import re
+import sys
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.date_utils import format_date
+from src.utils import money
+
+_WORD_XML = re.compile(r'</?w:[^>]*>')
+_DATE_PATTERNS = ('%d %m %Y', '%Y-%m-%d', '%d-%m-%Y', '%d.%m.%Y', '%d/%m/%Y')
+
+COMPANY_FIELDS = ('town', 'address_1', 'address_2', 'nip', 'regon', 'email', 'phone_number',
+                  'bank_name', 'account_number')
+PARTY_FIELDS = ('supplier_name', 'supplier_address_1', 'supplier_address_2', 'supplier_nip', 'supplier_alias',
+                'client_name', 'client_address_1', 'client_address_2', 'client_nip', 'client_alias')
+NAME_FIELDS = ('client_name', 'supplier_name')
+
+
+def plain_text(value) -> str:
+    """Plain text of a name field: RichText and Word run XML reduced to their text."""
+    if value is None:
+        return ''
+    text = str(value)
+    if '<w:' in text:
+        text = _WORD_XML.sub('', text)
+    return text
+
+
+def rich_text(value):
+    """Template value of a name: literal '\\n' markers become real line breaks (RichText)."""
+    text = plain_text(value)
+    if '\\n' not in text:
+        return text
+    from docxtpl import RichText
+
+    rt = RichText()
+    rt.add(text.replace('\\n', '\n'))
+    return rt
+
+
+def format_nip(value):
+    """NIP as XXX-XXX-XX-XX when it has 10 digits, otherwise unchanged."""
+    if not value:
+        return value
+    digits = ''.join(ch for ch in str(value) if ch.isdigit())
+    if len(digits) == 10:
+        return f"{digits[0:3]}-{digits[3:6]}-{digits[6:8]}-{digits[8:10]}"
+    return value
+
+
+def parse_document_date(value):
+    """date/datetime of a context date (date objects, 'DD MM YYYY', ISO and similar
+    numeric forms), or None for text that is already formatted or unreadable."""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value
+    text = str(value or '').strip()
+    if not text:
+        return None
+    for pattern in _DATE_PATTERNS:
+        try:
+            return datetime.datetime.strptime(text, pattern)
+        except ValueError:
+            continue
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+class DocumentContext:
+    """Fields shared by offers and WZ documents; see OfferContext and WzContext."""
+
+    __slots__ = COMPANY_FIELDS + PARTY_FIELDS + ('date', 'language', 'products', 'extra')
+    FIELDS = COMPANY_FIELDS + PARTY_FIELDS + ('date', 'language', 'products')
+
+    @classmethod
+    def from_dict(cls, data):
+        """Record of a form or stored context dict (the dict itself is not modified)."""
+        if not isinstance(data, dict):
+            raise ValueError(f"Kontekst dokumentu musi być słownikiem, otrzymano {type(data).__name__}")
+        record = cls.__new__(cls)
+        extra = dict(data)
+        for name in cls.FIELDS:
+            setattr(record, name, extra.pop(name, None))
+        for name in NAME_FIELDS:
+            value = getattr(record, name)
+            if value is not None:
+                setattr(record, name, plain_text(value))
+        products = record.products
+        if products is not None and not isinstance(products, list):
+            raise ValueError("Lista produktów w kontekście dokumentu jest nieprawidłowa")
+        record.extra = extra
+        return record
+
+    @classmethod
+    def coerce(cls, value):
+        """`value` itself when it already is a record of this type, else from_dict(value)."""
+        return value if isinstance(value, cls) else cls.from_dict(value)
+
+    def get(self, name, default=None):
+        """Field (or extra key) value, like dict.get on the form context."""
+        value = getattr(self, name, None) if name in self.FIELDS else self.extra.get(name)
+        return default if value is None else value
+
+    @property
+    def language_code(self) -> str:
+        return 'EN' if str(self.language or 'PL').upper() == 'EN' else 'PL'
+
+    def document_date(self):
+        """date/datetime of the document, None when the stored date cannot be parsed."""
+        return parse_document_date(self.date)
+
+    def date_text(self) -> str:
+        """The document date as printed in the document ('13 listopada 2025')."""
+        parsed = self.document_date()
+        if parsed is None:
+            return str(self.date or '')
+        return format_date(parsed, self.language_code)
+
+    def to_form(self) -> dict:
+        data = dict(self.extra)
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        return data
+
+    def to_storage(self) -> dict:
+        return self.to_form()
+
+    def to_template(self) -> dict:
+        data = self.to_form()
+        if self.date is not None:
+            data['date'] = self.date_text()
+        for name in NAME_FIELDS:
+            if name in data:
+                data[name] = rich_text(data[name])
+        return data
+
+
+class OfferContext(DocumentContext):
+    """Offer context: the shared fields plus number, terms, totals and table headers."""
+
+    __slots__ = ('offer_number', 'termin_realizacji', 'termin_platnosci', 'warunki_dostawy', 'waznosc_oferty',
+                 'gwarancja', 'cena', 'uwagi', 'products_total_netto', 'total_netto', 'total_vat', 'total_brutto',
+                 'product_headers')
+    FIELDS = DocumentContext.FIELDS + __slots__
+
+    def to_storage(self) -> dict:
+        """Stored form: a datetime keeps its ISO timestamp, other dates the printed text."""
+        data = self.to_form()
+        if isinstance(self.date, datetime.datetime):
+            data['date'] = self.date.isoformat()
+        elif self.date is not None and not isinstance(self.date, str):
+            data['date'] = self.date_text()
+        return data
+
+
+class WzContext(DocumentContext):
+    """WZ context: the shared fields plus the WZ number; products are [pid, name, unit, qty]."""
+
+    __slots__ = ('wz_number',)
+    FIELDS = DocumentContext.FIELDS + __slots__
+
+    # Fields the WZ templates always get, empty when the form left them out
+    TEMPLATE_DEFAULTS = COMPANY_FIELDS + (
+        'supplier_name', 'supplier_address_1', 'supplier_address_2', 'supplier_nip',
+        'client_name', 'client_address_1', 'client_address_2', 'client_nip', 'wz_number',
+    )
+
+    def _template_products(self):
+        def _quantity_text(value):
+            try:
+                return money.format_quantity(value)
+            except ValueError:
+                return str(value)
+
+        rows = []
+        for product in self.products or []:
+            if isinstance(product, (list, tuple)) and len(product) >= 4:
+                name, unit, quantity = product[1], product[2], product[3]
+            elif isinstance(product, dict):
+                name, unit, quantity = product.get('name', ''), product.get('unit', ''), product.get('quantity', '0')
+            else:
+                continue
+            rows.append([str(len(rows) + 1), str(name), str(unit), _quantity_text(quantity)])
+        return rows
+
+    def to_template(self) -> dict:
+        data = self.to_form()
+        for name in self.TEMPLATE_DEFAULTS:
+            data.setdefault(name, '')
+        date_text = self.date_text() if self.date else format_date(datetime.datetime.now(), self.language_code)
+        data['date'] = data['formatted_date'] = date_text
+        for name in NAME_FIELDS:
+            data[name] = rich_text(data[name])
+        data['supplier_nip'] = format_nip(data['supplier_nip'])
+        data['client_nip'] = format_nip(data['client_nip'])
+        data['products'] = self._template_products()
+        # WZ has no pricing
+        data['total_net'] = data['total_tax'] = data['total_gross'] = ''
+        return data
@@ -0,0 +1,176 @@
+"""
+Fast writer for documents rendered from a template (DocxTemplate).
+
+python-docx re-serialises and re-compresses every part of the package on save,
+including images (logos, backgrounds) that never change between documents.
+This writer keeps a per-template "skeleton": the compressed bytes of each
+zip member, held in memory. It starts from the template members (stored members,
+such as the PNG logos, are deflated once when the template is loaded) and learns
+the bytes python-docx serialises for the unchanged XML parts on the first save.
+On save, a part whose bytes match the skeleton entry (same name, CRC and size)
+is copied precompressed; only parts that actually changed (document.xml and
+anything the render touched) are deflated again. The package is assembled in a local temp
+file and then copied to its destination (usually the network share) in one
+sequential write.
+
+If anything unexpected happens the document is saved the regular way.
+"""
+import logging
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
+
+_log = logging.getLogger(__name__)
+
+# Compression level for parts that differ from the template
+COMPRESS_LEVEL = 9
+
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_LOCAL_SIG = b'PK\x03\x04'
+_CENTRAL_SIG = b'PK\x01\x02'
+_END_SIG = b'PK\x05\x06'
+_VERSION = 20
+
+_cache_lock = threading.Lock()
+_skeletons = {}  # template path -> ((mtime_ns, size), {membername: (crc, size, method, raw)})
+
+
+def _deflate(blob):
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    return compressor.compress(blob) + compressor.flush()
+
+
+def _load_skeleton(template_path):
+    """Read the compressed bytes of every member of the template, once per template version."""
+    st = os.stat(template_path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        cached = _skeletons.get(template_path)
+        if cached and cached[0] == key:
+            return cached[1]
+    members = {}
+    with open(template_path, 'rb') as raw_file, ZipFile(template_path) as archive:
+        for info in archive.infolist():
+            if info.flag_bits & 0x1 or info.compress_type not in (ZIP_STORED, ZIP_DEFLATED):
+                continue  # encrypted or unusual members are simply recompressed
+            raw_file.seek(info.header_offset)
+            header = _LOCAL_HEADER.unpack(raw_file.read(_LOCAL_HEADER.size))
+            name_len, extra_len = header[9], header[10]
+            raw_file.seek(info.header_offset + _LOCAL_HEADER.size + name_len + extra_len)
+            raw = raw_file.read(info.compress_size)
+            if info.compress_type == ZIP_STORED:
+                # Word often stores images uncompressed; deflate them once here
+                deflated = _deflate(raw)
+                if len(deflated) < len(raw):
+                    members[info.filename] = (info.CRC, info.file_size, ZIP_DEFLATED, deflated)
+                    continue
+            members[info.filename] = (info.CRC, info.file_size, info.compress_type, raw)
+    with _cache_lock:
+        _skeletons[template_path] = (key, members)
+    return members
+
+
+def _dos_datetime(timestamp):
+    t = time.localtime(timestamp)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+class _SkeletonZipWriter:
+    """Minimal zip writer with the PhysPkgWriter interface used by python-docx."""
+
+    def __init__(self, fileobj, skeleton):
+        self._f = fileobj
+        self._skeleton = skeleton
+        self._entries = []
+        self._time, self._date = _dos_datetime(time.time())
+        self.reused = 0
+        self.compressed = 0
+
+    def write(self, pack_uri, blob):
+        name = pack_uri.membername
+        crc = zlib.crc32(blob) & 0xFFFFFFFF
+        with _cache_lock:
+            cached = self._skeleton.get(name)
+        if cached and cached[0] == crc and cached[1] == len(blob):
+            method, data = cached[2], cached[3]
+            self.reused += 1
+        else:
+            method, data = ZIP_DEFLATED, _deflate(blob)
+            self.compressed += 1
+            with _cache_lock:
+                self._skeleton[name] = (crc, len(blob), method, data)
+        encoded = name.encode('utf-8')
+        offset = self._f.tell()
+        self._f.write(_LOCAL_HEADER.pack(_LOCAL_SIG, _VERSION, 0x800, method, self._time, self._date,
+                                         crc, len(data), len(blob), len(encoded), 0))
+        self._f.write(encoded)
+        self._f.write(data)
+        self._entries.append((encoded, method, crc, len(data), len(blob), offset))
+
+    def close(self):
+        start = self._f.tell()
+        for encoded, method, crc, compressed_size, size, offset in self._entries:
+            self._f.write(_CENTRAL_HEADER.pack(_CENTRAL_SIG, _VERSION, _VERSION, 0x800, method,
+                                               self._time, self._date, crc, compressed_size, size,
+                                               len(encoded), 0, 0, 0, 0, 0, offset))
+            self._f.write(encoded)
+        end = self._f.tell()
+        self._f.write(_END_RECORD.pack(_END_SIG, 0, 0, len(self._entries), len(self._entries),
+                                       end - start, start, 0))
+
+
+def _write_package(document, fileobj, skeleton):
+    from docx.opc.pkgwriter import PackageWriter
+
+    package = document.part.package
+    parts = list(package.parts)
+    for part in parts:
+        part.before_marshal()
+    writer = _SkeletonZipWriter(fileobj, skeleton)
+    PackageWriter._write_content_types_stream(writer, parts)
+    PackageWriter._write_pkg_rels(writer, package.rels)
+    PackageWriter._write_parts(writer, parts)
+    writer.close()
+    return writer
+
+
+def save_rendered_document(doc, target_path, template_path):
+    """Save a rendered DocxTemplate to target_path reusing the template's compressed members."""
+    if getattr(doc, 'crc_to_new_media', None) or getattr(doc, 'crc_to_new_embedded', None) \
+            or getattr(doc, 'zipname_to_replace', None) or not getattr(doc, 'is_rendered', False):
+        # Media replacement is handled by docxtpl's own post-processing
+        doc.save(target_path)
+        return
+    tmp_path = None
+    try:
+        t = time.perf_counter()
+        skeleton = _load_skeleton(template_path)
+        doc.pre_processing()
+        fd, tmp_path = tempfile.mkstemp(suffix='.docx')
+        with os.fdopen(fd, 'wb') as tmp:
+            writer = _write_package(doc.docx, tmp, skeleton)
+        # One sequential copy to the destination, replaced in place
+        partial = target_path + '.part'
+        shutil.copyfile(tmp_path, partial)
+        os.replace(partial, target_path)
+        doc.is_saved = True
+        _log.info("Saved %s (%d parts reused, %d compressed) in %.3f s", target_path,
+                  writer.reused, writer.compressed, time.perf_counter() - t)
+    except Exception as e:
+        _log.warning("Skeleton save of %s failed, using regular save: %s", target_path, e)
+        doc.save(target_path)
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
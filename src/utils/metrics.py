@@ -0,0 +1,262 @@
+"""
+Local performance metrics of this workstation.
+
+Counters and timing histograms are kept in a small SQLite file in the local
+data directory (metrics.db). Recording is cheap: observe()/incr() only append
+to an in-memory buffer, which a background thread writes out every few
+seconds (and flush() on demand, e.g. before a snapshot).
+
+Recorded timings (seconds):
+  - trace.<operation> and trace.<operation>.<stage>: every finished trace of
+    the document pipeline (see tracing), e.g. trace.offer.generate.render
+  - db.<function>: database_service calls wrapped with timed()
+  - list.<name>: loading the browse lists
+  - app.startup: building the main window
+Samples older than RETENTION_DAYS are dropped at start.
+"""
+import atexit
+import datetime
+import functools
+import json
+import logging
+import math
+import os
+import platform
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass, asdict
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.config import get_data_dir
+from src.utils import tracing
+
+_log = logging.getLogger(__name__)
+
+METRICS_FILENAME = 'metrics.db'
+FLUSH_INTERVAL_SECONDS = 5.0
+RETENTION_DAYS = 90
+# Buffered observations kept when nothing flushes them (the writer is not running)
+MAX_PENDING = 10000
+
+SNAPSHOT_WINDOWS = (('24h', 1), ('7d', 7), ('30d', 30))
+
+_lock = threading.Lock()
+_db_lock = threading.Lock()
+_samples = []      # (name, timestamp, seconds)
+_counters = {}     # name -> increment not written yet
+_worker = None
+
+
+@dataclass
+class MetricSummary:
+    name: str
+    count: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+def get_metrics_path() -> str:
+    """Path of the local metrics database."""
+    return os.path.join(get_data_dir(), METRICS_FILENAME)
+
+
+def _connect():
+    conn = sqlite3.connect(get_metrics_path(), timeout=10)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Samples (
+            Name TEXT NOT NULL,
+            RecordedAt REAL NOT NULL,
+            Seconds REAL NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS IX_Samples_RecordedAt ON Samples (RecordedAt)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Counters (
+            Name TEXT PRIMARY KEY,
+            Value INTEGER NOT NULL,
+            UpdatedAt REAL NOT NULL
+        )
+        """
+    )
+    return conn
+
+
+# ------------------------------
+# Recording
+# ------------------------------
+
+def observe(name, seconds):
+    """Record one timing sample of `name`."""
+    with _lock:
+        if len(_samples) >= MAX_PENDING:
+            del _samples[:len(_samples) - MAX_PENDING + 1]
+        _samples.append((name, time.time(), float(seconds)))
+
+
+def incr(name, value=1):
+    """Add `value` to the counter `name`."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def timed(name):
+    """Decorator recording the duration of every call as a sample of `name`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            t = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - t)
+        return wrapper
+    return decorator
+
+
+def _on_trace(trace):
+    prefix = f"trace.{trace.name}"
+    observe(prefix, trace.seconds)
+    for stage, (seconds, _count) in trace.stages.items():
+        observe(f"{prefix}.{stage}", seconds)
+    if trace.error:
+        incr(f"{prefix}.errors")
+
+
+def flush():
+    """Write the buffered samples and counters to the metrics database."""
+    with _lock:
+        samples = _samples[:]
+        counters = dict(_counters)
+        _samples.clear()
+        _counters.clear()
+    if not samples and not counters:
+        return
+    now = time.time()
+    try:
+        with _db_lock:
+            conn = _connect()
+            try:
+                with conn:
+                    conn.executemany("INSERT INTO Samples (Name, RecordedAt, Seconds) VALUES (?, ?, ?)", samples)
+                    conn.executemany(
+                        "INSERT INTO Counters (Name, Value, UpdatedAt) VALUES (?, ?, ?) "
+                        "ON CONFLICT(Name) DO UPDATE SET Value = Value + excluded.Value, UpdatedAt = excluded.UpdatedAt",
+                        [(name, value, now) for name, value in counters.items()])
+            finally:
+                conn.close()
+    except sqlite3.Error as e:
+        _log.warning("Writing metrics failed (%d samples dropped): %s", len(samples), e)
+
+
+def _prune():
+    cutoff = time.time() - RETENTION_DAYS * 86400
+    with _db_lock:
+        conn = _connect()
+        try:
+            with conn:
+                removed = conn.execute("DELETE FROM Samples WHERE RecordedAt < ?", (cutoff,)).rowcount
+        finally:
+            conn.close()
+    if removed:
+        _log.info("Pruned %d metric samples older than %d days", removed, RETENTION_DAYS)
+
+
+def _run_writer():
+    try:
+        _prune()
+    except sqlite3.Error as e:
+        _log.warning("Pruning metrics failed: %s", e)
+    while True:
+        time.sleep(FLUSH_INTERVAL_SECONDS)
+        flush()
+
+
+def start():
+    """Record finished traces and start the background writer (idempotent)."""
+    global _worker
+    tracing.add_trace_listener(_on_trace)
+    with _lock:
+        if _worker is not None and _worker.is_alive():
+            return
+        _worker = threading.Thread(target=_run_writer, daemon=True, name='metrics-writer')
+        _worker.start()
+    atexit.register(flush)
+
+
+# ------------------------------
+# Reading
+# ------------------------------
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    index = max(0, min(len(sorted_values), math.ceil(fraction * len(sorted_values))) - 1)
+    return sorted_values[index]
+
+
+def summarize(days=7):
+    """MetricSummary of every timing recorded in the last `days` days, sorted by name."""
+    flush()
+    since = time.time() - days * 86400
+    with _db_lock:
+        conn = _connect()
+        try:
+            rows = conn.execute(
+                "SELECT Name, Seconds FROM Samples WHERE RecordedAt >= ? ORDER BY Name, Seconds", (since,)).fetchall()
+        finally:
+            conn.close()
+    summaries = []
+    name, values = None, []
+    for row_name, seconds in rows + [(None, None)]:
+        if row_name != name:
+            if values:
+                summaries.append(MetricSummary(
+                    name, len(values), sum(values) / len(values), _percentile(values, 0.5),
+                    _percentile(values, 0.9), _percentile(values, 0.99), values[-1]))
+            name, values = row_name, []
+        if seconds is not None:
+            values.append(seconds)
+    return summaries
+
+
+def get_counters():
+    """[(name, value, last update as datetime)] of all counters, sorted by name."""
+    flush()
+    with _db_lock:
+        conn = _connect()
+        try:
+            rows = conn.execute("SELECT Name, Value, UpdatedAt FROM Counters ORDER BY Name").fetchall()
+        finally:
+            conn.close()
+    return [(name, value, datetime.datetime.fromtimestamp(updated)) for name, value, updated in rows]
+
+
+def snapshot() -> dict:
+    """Counters, percentiles per time window and the latest traces, for support."""
+    try:
+        from src.utils.version import get_version_string
+        version = get_version_string()
+    except ImportError:
+        version = ''
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'computer': platform.node(),
+        'system': platform.platform(),
+        'version': version,
+        'counters': {name: value for name, value, _updated in get_counters()},
+        'timings': {label: [asdict(s) for s in summarize(days)] for label, days in SNAPSHOT_WINDOWS},
+        'recent_traces': tracing.read_recent(50),
+    }
+
+
+def snapshot_json() -> str:
+    return json.dumps(snapshot(), ensure_ascii=False, indent=2)
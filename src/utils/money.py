@@ -0,0 +1,128 @@
+"""Exact money and quantity arithmetic shared by the product tables and document services.
+
+All amounts are Decimal. Values are parsed from user/UI text once, computed exactly
+and rounded only where a figure is presented (line totals and document totals).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN, ROUND_HALF_UP, localcontext
+from typing import Iterable, List, Sequence, Tuple
+
+# Rounding modes: commercial (half away from zero, used on Polish invoices) and banker's
+ROUND_COMMERCIAL = ROUND_HALF_UP
+ROUND_BANKERS = ROUND_HALF_EVEN
+DEFAULT_ROUNDING = ROUND_COMMERCIAL
+
+CENT = Decimal('0.01')
+ZERO = Decimal('0.00')
+# Standard Polish VAT rate
+DEFAULT_VAT_RATE = Decimal('0.23')
+
+# Enough digits for any realistic offer; avoids surprises from the global context
+_PRECISION = 28
+
+
+def parse_amount(value) -> Decimal:
+    """Parse '36 800,50', '36800.5', 12.3, 7 or Decimal into an exact Decimal.
+    Raises ValueError for anything that is not a finite number."""
+    if isinstance(value, Decimal):
+        result = value
+    elif isinstance(value, bool):
+        raise ValueError(f"Invalid amount: {value!r}")
+    elif isinstance(value, int):
+        result = Decimal(value)
+    elif isinstance(value, float):
+        # repr gives the shortest round-tripping text (0.1 -> '0.1'), not the binary expansion
+        result = Decimal(repr(value))
+    else:
+        cleaned = str(value).strip().replace(' ', '').replace('\u00A0', '').replace(',', '.')
+        try:
+            result = Decimal(cleaned)
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount: {value!r}")
+    if not result.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    return result
+
+
+def parse_quantity(value, integral: bool = True):
+    """Parse a quantity. With integral=True (the tables' rule) returns int and rejects fractions."""
+    amount = parse_amount(value)
+    if not integral:
+        return amount
+    if amount != amount.to_integral_value():
+        raise ValueError(f"Quantity must be a whole number: {value!r}")
+    return int(amount)
+
+
+def round_money(value, rounding=DEFAULT_ROUNDING) -> Decimal:
+    """Round to whole grosze using the given rounding mode."""
+    return parse_amount(value).quantize(CENT, rounding=rounding)
+
+
+def line_total(quantity, unit_price, rounding=DEFAULT_ROUNDING) -> Decimal:
+    """Netto value of one line: quantity × unit price, rounded once."""
+    with localcontext() as ctx:
+        ctx.prec = _PRECISION
+        return (parse_amount(unit_price) * parse_amount(quantity)).quantize(CENT, rounding=rounding)
+
+
+def vat_amount(netto, rate=DEFAULT_VAT_RATE, rounding=DEFAULT_ROUNDING) -> Decimal:
+    """VAT for a netto amount at `rate` (e.g. Decimal('0.23'))."""
+    with localcontext() as ctx:
+        ctx.prec = _PRECISION
+        return (parse_amount(netto) * parse_amount(rate)).quantize(CENT, rounding=rounding)
+
+
+@dataclass(frozen=True)
+class Totals:
+    """Document totals computed from line values."""
+    netto: Decimal
+    vat: Decimal
+    brutto: Decimal
+    vat_rate: Decimal = DEFAULT_VAT_RATE
+
+
+def totals_from_netto(netto, rate=DEFAULT_VAT_RATE, rounding=DEFAULT_ROUNDING) -> Totals:
+    """Build Totals from a netto sum; VAT is computed on the document total, not per line."""
+    netto = round_money(netto, rounding)
+    vat = vat_amount(netto, rate, rounding)
+    return Totals(netto=netto, vat=vat, brutto=netto + vat, vat_rate=parse_amount(rate))
+
+
+def compute_lines(lines: Iterable[Sequence], rate=DEFAULT_VAT_RATE,
+                  rounding=DEFAULT_ROUNDING) -> Tuple[List[Decimal], Totals]:
+    """Batch-compute line totals for many (quantity, unit_price) pairs and the document totals.
+
+    Runs in one pass under a single decimal context, so large lists (pasted or imported
+    product tables) are computed without per-row context setup or float round-trips.
+    """
+    with localcontext() as ctx:
+        ctx.prec = _PRECISION
+        totals = [
+            (parse_amount(price) * parse_amount(qty)).quantize(CENT, rounding=rounding)
+            for qty, price in lines
+        ]
+        netto = sum(totals, ZERO)
+    return totals, totals_from_netto(netto, rate, rounding)
+
+
+def format_amount(value, grouping: bool = True) -> str:
+    """Format as '36 800,00' (space thousands, comma decimals); grouping=False gives '36800,00'."""
+    amount = parse_amount(value).quantize(CENT, rounding=DEFAULT_ROUNDING)
+    text = f"{amount:,.2f}" if grouping else f"{amount:.2f}"
+    return text.replace(',', ' ').replace('.', ',')
+
+
+def format_quantity(value) -> str:
+    """Format a quantity without a trailing '.0' (3 -> '3', 2.5 -> '2,5')."""
+    amount = parse_amount(value)
+    if amount == amount.to_integral_value():
+        return str(int(amount))
+    return format(amount.normalize(), 'f').replace('.', ',')
+
+
+def to_plain_string(value) -> str:
+    """Dot-decimal text suitable for edit fields ('1000.50')."""
+    return format(parse_amount(value), 'f')
@@ -4,10 +4,13 @@ OS utilities
 Provides a helper to open documents in the system's associated application.
 On macOS, it prefers Microsoft Word when available for .docx files.
 """
+import logging
 import os
 import sys
 import subprocess
 
+_log = logging.getLogger(__name__)
+
 
 def open_document(file_path: str) -> None:
     """Open a document with the default app (preferring Word on macOS).
@@ -30,4 +33,4 @@ def open_document(file_path: str) -> None:
         else:
             subprocess.run(["xdg-open", path], check=False)
     except Exception as e:
-        print(f"Could not open document '{file_path}': {e}")
+        _log.warning("Could not open document '%s': %s", file_path, e)
@@ -1,5 +1,6 @@
 """Settings management for the Offer Generator application"""
 
+import logging
 import json
 import os
 import sys
@@ -7,6 +8,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from src.utils.config import DEFAULT_COMPANY_DATA, DEFAULT_OFFER_DETAILS, DEFAULT_APP_SETTINGS, get_data_dir
 
+_log = logging.getLogger(__name__)
+
 # Settings file should be in a persistent, writable location
 SETTINGS_FILE = os.path.join(get_data_dir(), 'app_settings.json')
 
@@ -22,7 +25,7 @@ class SettingsManager:
             self.settings = self.load_settings()
         except Exception as e:
             # Keep existing settings on failure and log
-            print(f"Error reloading settings: {e}")
+            _log.error("Error reloading settings: %s", e)
     
     def load_settings(self):
         """Load settings from file or create default settings"""
@@ -39,7 +42,7 @@ class SettingsManager:
                         settings['app_settings'] = DEFAULT_APP_SETTINGS.copy()
                     return settings
             except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading settings: {e}")
+                _log.error("Error loading settings: %s", e)
                 return self.get_default_settings()
         else:
             return self.get_default_settings()
@@ -59,7 +62,7 @@ class SettingsManager:
                 json.dump(self.settings, f, ensure_ascii=False, indent=4)
             return True
         except IOError as e:
-            print(f"Error saving settings: {e}")
+            _log.error("Error saving settings: %s", e)
             return False
     
     # Company data methods
@@ -137,7 +140,7 @@ class SettingsManager:
         """Update DATABASE_PATH in config.py file (only in development mode)"""
         # Skip updating config.py in PyInstaller environment
         if getattr(sys, 'frozen', False):
-            print("Running in PyInstaller mode - skipping config.py update")
+            _log.info("Running in PyInstaller mode - skipping config.py update")
             return
             
         try:
@@ -157,10 +160,10 @@ class SettingsManager:
             with open(config_file_path, 'w', encoding='utf-8') as f:
                 f.write(new_content)
                 
-            print(f"Updated DATABASE_PATH in config.py to: {new_path}")
+            _log.info("Updated DATABASE_PATH in config.py to: %s", new_path)
             
         except Exception as e:
-            print(f"Error updating DATABASE_PATH in config.py: {e}")
+            _log.error("Error updating DATABASE_PATH in config.py: %s", e)
             try:
                 import tkinter.messagebox
                 tkinter.messagebox.showwarning("Uwaga", 
@@ -169,7 +172,7 @@ class SettingsManager:
                     f"Błąd: {e}")
             except ImportError:
                 # If tkinter is not available, just print the error
-                print(f"Warning: Could not update DATABASE_PATH in config.py: {e}")
+                _log.warning("Could not update DATABASE_PATH in config.py: %s", e)
 
 # Global settings manager instance
 settings_manager = SettingsManager()
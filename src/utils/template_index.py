@@ -0,0 +1,134 @@
+"""
+Placeholder index of the Word templates.
+
+Each template is parsed once (docxtpl's own Jinja parse of the document,
+headers and footers) to collect the variables it uses. The index is kept in
+memory and in a small JSON file in the local data directory, keyed by template
+name, size and modification time, and is built for all templates in the
+background at start-up.
+
+Before a document is rendered, prepare_render_context() checks the context
+against the template's placeholders: missing values are reported before the
+render and the network write, and keys the template does not use are left out
+of the render context.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.config import get_data_dir
+
+_log = logging.getLogger(__name__)
+
+INDEX_FILENAME = 'template_index.json'
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'templates')
+
+_lock = threading.Lock()
+_index = {}          # template path -> ((mtime_ns, size), frozenset of placeholders)
+_disk_entries = None  # contents of the JSON cache, read once
+
+
+def _fingerprint(template_path):
+    st = os.stat(template_path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _index_file():
+    return os.path.join(get_data_dir(), INDEX_FILENAME)
+
+
+def _load_disk_index():
+    """Entries from the JSON cache: {file name: {'fingerprint': [...], 'placeholders': [...]}}."""
+    global _disk_entries
+    if _disk_entries is None:
+        try:
+            with open(_index_file(), 'r', encoding='utf-8') as f:
+                _disk_entries = json.load(f)
+        except (OSError, ValueError):
+            _disk_entries = {}
+    return _disk_entries
+
+
+def _save_disk_index():
+    with _lock:
+        data = {os.path.basename(path): {'fingerprint': list(fp), 'placeholders': sorted(names)}
+                for path, (fp, names) in _index.items()}
+    tmp = _index_file() + '.tmp'
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, _index_file())
+    except OSError as e:
+        _log.warning("Could not save template index: %s", e)
+
+
+def _parse_placeholders(template_path):
+    from docxtpl import DocxTemplate
+    return frozenset(DocxTemplate(template_path).get_undeclared_template_variables())
+
+
+def get_placeholders(template_path, persist=True):
+    """Set of Jinja variables used by the template (parsed once per template version)."""
+    fingerprint = _fingerprint(template_path)
+    with _lock:
+        cached = _index.get(template_path)
+        if cached is None:
+            stored = _load_disk_index().get(os.path.basename(template_path))
+            if stored and stored.get('fingerprint') == fingerprint:
+                cached = (fingerprint, frozenset(stored.get('placeholders', ())))
+                _index[template_path] = cached
+        if cached and list(cached[0]) == fingerprint:
+            return cached[1]
+    names = _parse_placeholders(template_path)
+    with _lock:
+        _index[template_path] = (fingerprint, names)
+    if persist:
+        _save_disk_index()
+    return names
+
+
+def prepare_render_context(template_path, context, optional=()):
+    """Return (render_context, missing) for rendering `template_path` with `context`.
+
+    render_context holds only the keys the template uses; placeholders listed in
+    `optional` that the context lacks are rendered empty. `missing` lists the
+    other placeholders without a value; when it is not empty the document should
+    not be rendered. If the template cannot be analysed the full context is used.
+    """
+    try:
+        placeholders = get_placeholders(template_path)
+    except Exception as e:
+        _log.warning("Template analysis of %s failed: %s", template_path, e)
+        return dict(context), []
+    render_context = {key: context[key] for key in placeholders if key in context}
+    missing = []
+    for key in sorted(placeholders - render_context.keys()):
+        if key in optional:
+            render_context[key] = ''
+        else:
+            missing.append(key)
+    return render_context, missing
+
+
+def warm_up_async(templates_dir=None):
+    """Build the index of every template in the background."""
+    folder = templates_dir or TEMPLATES_DIR
+
+    def _run():
+        try:
+            names = sorted(n for n in os.listdir(folder) if n.lower().endswith('.docx') and not n.startswith('~$'))
+        except OSError:
+            return
+        for name in names:
+            try:
+                get_placeholders(os.path.join(folder, name), persist=False)
+            except Exception as e:
+                _log.warning("Template analysis of %s failed: %s", name, e)
+        _save_disk_index()
+
+    threading.Thread(target=_run, daemon=True, name='template-index').start()
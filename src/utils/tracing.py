@@ -0,0 +1,254 @@
+"""
+Span-based timing of the document pipeline.
+
+    @tracing.traced('offer.generate')
+    def generate_offer_document(...):
+        with tracing.span('number'):
+            ...
+
+A trace collects the spans opened inside it on the same thread. Spans with
+the same name add up (restore renders hundreds of documents in one trace), and
+a trace opened while another one is running on the thread only contributes
+its spans to the outer one. When the outermost trace ends it is:
+  - logged as one INFO line with the time of each stage; the record carries
+    the trace as its 'trace' field, and the logging listener thread (see
+    app_logging) also appends it to the traces file (<data dir>/traces.jsonl,
+    one JSON object per line, rotated to traces.jsonl.1 at TRACES_FILE_BYTES),
+    so finishing a trace never touches the disk on the traced thread,
+  - kept as the latest trace for the status bar readout and passed to the
+    registered listeners (on the thread that ran it).
+Spans opened outside a trace are not recorded.
+"""
+import datetime
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.config import get_data_dir
+
+_log = logging.getLogger(__name__)
+
+TRACES_FILENAME = 'traces.jsonl'
+TRACES_FILE_BYTES = 256 * 1024
+
+TRACE_LABELS = {
+    'offer.generate': "Generowanie oferty",
+    'offer.update': "Zapis zmian oferty",
+    'wz.generate': "Generowanie WZ",
+    'wz.update': "Zapis zmian WZ",
+    'restore': "Przywracanie dokumentów",
+}
+STAGE_LABELS = {
+    'number': "numer",
+    'template': "szablon",
+    'load': "wczytanie szablonu",
+    'render': "wypełnianie",
+    'folder': "folder",
+    'backup': "kopia",
+    'save': "zapis pliku",
+    'pdf': "PDF",
+    'db': "baza",
+    'decode': "odczyt bazy",
+}
+
+_local = threading.local()
+_lock = threading.Lock()
+_last = None
+_listeners = []
+
+
+class Trace:
+    """One traced operation: total time and the summed time and count of each stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.datetime.now()
+        self.stages = {}          # stage name -> [seconds, count], in first-seen order
+        self.seconds = 0.0
+        self.error = None
+        self._t0 = time.perf_counter()
+
+    def add(self, stage, seconds):
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def to_record(self) -> dict:
+        return {
+            'name': self.name,
+            'started': self.started_at.isoformat(timespec='seconds'),
+            'seconds': round(self.seconds, 4),
+            'error': self.error,
+            'stages': {stage: {'seconds': round(s, 4), 'count': n} for stage, (s, n) in self.stages.items()},
+        }
+
+    def log_text(self) -> str:
+        parts = [f"{stage} {s:.3f}s" + (f" x{n}" if n > 1 else "") for stage, (s, n) in self.stages.items()]
+        status = f" FAILED ({self.error})" if self.error else ""
+        return f"{self.name} {self.seconds:.3f}s{status}: " + (", ".join(parts) or "no stages")
+
+    def summary_text(self) -> str:
+        """Polish one-line readout for the status bar."""
+        label = TRACE_LABELS.get(self.name, self.name)
+        parts = [f"{STAGE_LABELS.get(stage, stage)} {s:.2f} s" for stage, (s, _n) in self.stages.items()
+                 if s >= 0.005]
+        text = f"{label}: {self.seconds:.2f} s"
+        if self.error:
+            text += " (błąd)"
+        if parts:
+            text += "  (" + " · ".join(parts) + ")"
+        return text
+
+
+def _current():
+    return getattr(_local, 'trace', None)
+
+
+class _TraceScope:
+    def __init__(self, name):
+        self.name = name
+        self.trace = None
+        self._outer = False
+
+    def __enter__(self):
+        active = _current()
+        if active is not None:
+            self.trace = active
+            return active
+        self.trace = Trace(self.name)
+        self._outer = True
+        _local.trace = self.trace
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self._outer:
+            return False
+        _local.trace = None
+        trace = self.trace
+        trace.seconds = time.perf_counter() - trace._t0
+        if exc is not None:
+            trace.error = f"{exc_type.__name__}: {exc}"
+        _finish(trace)
+        return False
+
+
+class _SpanScope:
+    def __init__(self, name):
+        self.name = name
+        self._t0 = 0.0
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        trace = _current()
+        if trace is not None:
+            trace.add(self.name, time.perf_counter() - self._t0)
+        return False
+
+
+def trace(name):
+    """Context manager timing one operation (see module docstring)."""
+    return _TraceScope(name)
+
+
+def span(name):
+    """Context manager timing one stage of the running trace."""
+    return _SpanScope(name)
+
+
+def traced(name):
+    """Decorator running the function inside trace(name)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _TraceScope(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def mark_failed(reason):
+    """Flag the running trace as failed without raising (e.g. a shown error dialog)."""
+    trace = _current()
+    if trace is not None and trace.error is None:
+        trace.error = str(reason)
+
+
+def last_trace():
+    """The most recently finished trace, or None."""
+    with _lock:
+        return _last
+
+
+def add_trace_listener(callback):
+    """Call `callback(trace)` after each finished trace (on the thread that ran it)."""
+    with _lock:
+        if callback not in _listeners:
+            _listeners.append(callback)
+
+
+def traces_path() -> str:
+    return os.path.join(get_data_dir(), TRACES_FILENAME)
+
+
+class _TraceFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(record.trace, ensure_ascii=False, default=str)
+
+
+def traces_file_handler() -> logging.Handler:
+    """Handler writing the 'trace' field of finished-trace records to the traces file.
+    Added to the logging listener by app_logging.setup_logging()."""
+    handler = logging.handlers.RotatingFileHandler(traces_path(), maxBytes=TRACES_FILE_BYTES,
+                                                   backupCount=1, encoding='utf-8', delay=True)
+    handler.addFilter(lambda record: isinstance(getattr(record, 'trace', None), dict))
+    handler.setFormatter(_TraceFormatter())
+    return handler
+
+
+def _finish(trace):
+    global _last
+    _log.info("Trace %s", trace.log_text(), extra={'trace': trace.to_record()})
+    with _lock:
+        _last = trace
+        listeners = list(_listeners)
+    for callback in listeners:
+        try:
+            callback(trace)
+        except Exception as e:  # noqa: BLE001 - a listener must not break the traced operation
+            _log.warning("Trace listener failed: %s", e)
+
+
+def read_recent(limit=50):
+    """The newest `limit` trace records from the traces file (and its rotated
+    predecessor when needed), oldest first."""
+    path = traces_path()
+    lines = []
+    for name in (path, path + '.1'):
+        try:
+            with open(name, 'r', encoding='utf-8') as f:
+                lines = f.readlines()[-(limit - len(lines)):] + lines
+        except OSError:
+            pass
+        if len(lines) >= limit:
+            break
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
@@ -1,30 +1,84 @@
-"""Unified versioning: always 1.0.0.<short_commit_hash>"""
-import subprocess
+"""Unified versioning: BASE_VERSION.<short_commit_hash>
+
+Release builds carry a generated src/utils/_build_info.py (written by
+stamp_build_info.py before PyInstaller runs) with the commit, build time and
+dependency versions, so nothing has to be discovered at runtime. Only in a
+development checkout without that module is git asked once, lazily.
+"""
 import os
+import sys
+from functools import lru_cache
 
 BASE_VERSION = "1.1.1"
 
+try:
+    from src.utils import _build_info
+except ImportError:
+    _build_info = None
+
+
+@lru_cache(maxsize=1)
 def _get_git_commit_hash():
     """Return short commit hash or 'unknown' if not a git repo."""
+    if _build_info is not None:
+        return _build_info.COMMIT or "unknown"
+    # CI systems often expose the commit in the environment
+    for env_var in ("GITHUB_SHA", "CI_COMMIT_SHA"):
+        if os.environ.get(env_var):
+            return os.environ[env_var][:8]
+    if getattr(sys, 'frozen', False):
+        # Frozen build without stamp: there is no repository to ask
+        return "unknown"
     try:
-        # Try environment first (CI systems often expose this)
-        for env_var in ("GITHUB_SHA", "CI_COMMIT_SHA"):
-            if env_var in os.environ and os.environ[env_var]:
-                return os.environ[env_var][:8]
-        # Fallback to git command
+        import subprocess
         result = subprocess.run([
-            'git','rev-parse','--short','HEAD'
-        ], capture_output=True, text=True, check=True)
-        return result.stdout.strip()
+            'git', 'rev-parse', '--short', 'HEAD'
+        ], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)))
+        return result.stdout.strip() or "unknown"
     except Exception:
         return "unknown"
 
+
 def get_version_string():
+    if _build_info is not None and _build_info.VERSION:
+        return _build_info.VERSION
     commit = _get_git_commit_hash()
     return f"{BASE_VERSION}.{commit}" if commit != "unknown" else f"{BASE_VERSION}"
 
+
+def get_build_info():
+    """Version details for the About dialog and diagnostics.
+    Keys: version, commit, build_time, python, dependencies (name -> version)."""
+    if _build_info is not None:
+        return {
+            'version': get_version_string(),
+            'commit': _build_info.COMMIT,
+            'build_time': _build_info.BUILD_TIME,
+            'python': _build_info.PYTHON_VERSION,
+            'dependencies': dict(_build_info.DEPENDENCIES),
+        }
+    return {
+        'version': get_version_string(),
+        'commit': _get_git_commit_hash(),
+        'build_time': None,
+        'python': sys.version.split()[0],
+        'dependencies': {},
+    }
+
+
 def get_full_version_info():
-    commit = _get_git_commit_hash()
-    return f"Wersja: {get_version_string()}"
+    info = get_build_info()
+    lines = [f"Wersja: {info['version']}"]
+    if info['build_time']:
+        lines.append(f"Data kompilacji: {info['build_time']}")
+    else:
+        lines.append("Wersja deweloperska (bez znacznika kompilacji)")
+    lines.append(f"Python: {info['python']}")
+    if info['dependencies']:
+        lines.append("Biblioteki: " + ", ".join(
+            f"{name} {version}" for name, version in sorted(info['dependencies'].items())))
+    return "\n".join(lines)
+
 
 APP_VERSION = get_version_string()
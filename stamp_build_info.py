@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Write src/utils/_build_info.py before packaging with PyInstaller.
+
+The generated module records the version, commit, build time and versions of
+the bundled dependencies, so the packaged app never has to run git at startup.
+The file is not committed (see .gitignore).
+"""
+import datetime
+import os
+import subprocess
+import sys
+from importlib import metadata
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OUTPUT = os.path.join(ROOT, 'src', 'utils', '_build_info.py')
+
+# Distributions whose versions are reported in the About dialog and diagnostics
+DEPENDENCIES = ('python-docx', 'docxtpl', 'docxcompose', 'Pillow', 'tkcalendar', 'babel', 'lxml', 'PyInstaller')
+
+
+def get_commit():
+    for env_var in ("GITHUB_SHA", "CI_COMMIT_SHA"):
+        if os.environ.get(env_var):
+            return os.environ[env_var][:8]
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True, cwd=ROOT)
+        return result.stdout.strip()
+    except Exception:
+        return ''
+
+
+def get_dependency_versions():
+    versions = {}
+    for name in DEPENDENCIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            continue
+    return versions
+
+
+def main():
+    sys.path.insert(0, ROOT)
+    if os.path.exists(OUTPUT):
+        os.remove(OUTPUT)  # never base the new stamp on a stale one
+    from src.utils.version import BASE_VERSION
+
+    commit = get_commit()
+    version = f"{BASE_VERSION}.{commit}" if commit else BASE_VERSION
+    build_time = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+    dependencies = get_dependency_versions()
+
+    with open(OUTPUT, 'w', encoding='utf-8') as f:
+        f.write('"""Generated by stamp_build_info.py - do not edit."""\n')
+        f.write(f'VERSION = {version!r}\n')
+        f.write(f'COMMIT = {commit!r}\n')
+        f.write(f'BUILD_TIME = {build_time!r}\n')
+        f.write(f'PYTHON_VERSION = {sys.version.split()[0]!r}\n')
+        f.write(f'DEPENDENCIES = {dependencies!r}\n')
+    print(f"Build info written to {OUTPUT}: {version} ({build_time})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Tests for the quote analytics month resolution (src/services/analytics_service.py)."""
+import json
+import os
+import sqlite3
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.analytics_service import load_line_items, aggregate
+
+
+def _offers_db(*contexts):
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE Offers (OfferYearNumber INTEGER, OfferContext TEXT)")
+    for year, context in contexts:
+        conn.execute("INSERT INTO Offers VALUES (?, ?)", (year, json.dumps(context, ensure_ascii=False)))
+    return conn
+
+
+def _offer(date, client_name='ACME', products=None):
+    return {
+        'date': date,
+        'client_name': client_name,
+        'client_nip': '1234567890',
+        'products': products or [[1, 'Rura stalowa', 'szt', '2', '10,50', '21,00']],
+    }
+
+
+class LoadLineItemsTest(unittest.TestCase):
+
+    def test_polish_text_date_is_counted_in_its_month(self):
+        conn = _offers_db((2025, _offer('13 listopada 2025')))
+        items = load_line_items(conn, '2025-11', '2025-11')
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items.months, ['2025-11'])
+        self.assertEqual(items.offer_count, 1)
+
+    def test_text_iso_and_english_dates_share_the_month(self):
+        conn = _offers_db((2025, _offer('13 listopada 2025')),
+                          (2025, _offer('2025-11-20T00:00:00')),
+                          (2025, _offer('November 3, 2025')))
+        report = aggregate(load_line_items(conn, '2025-01', '2025-12'), '2025-01', '2025-12')
+        self.assertEqual([row.label for row in report.by_month], ['2025-11'])
+        self.assertEqual(report.by_month[0].offers, 3)
+        self.assertAlmostEqual(report.total_value, 63.0)
+
+    def test_offers_outside_the_range_or_without_a_date_are_skipped(self):
+        conn = _offers_db((2025, _offer('2 stycznia 2025')),
+                          (2025, _offer('13 listopada 2025')),
+                          (2025, _offer('')))
+        items = load_line_items(conn, '2025-11', '2025-12')
+        self.assertEqual(items.months, ['2025-11'])
+        self.assertEqual(items.offer_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
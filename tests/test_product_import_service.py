@@ -0,0 +1,29 @@
+"""Tests for the header detection of the product import (src/services/product_import_service.py)."""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.product_import_service import parse_product_text
+
+
+class HeaderDetectionTest(unittest.TestCase):
+
+    def test_table_copied_from_generated_offer(self):
+        text = ("Lp\tNazwa\tj.m.\tilość\tCena jednostkowa netto [PLN]\tWartość Netto [PLN]\n"
+                "1\tRura stalowa\tszt.\t2\t10,50\t21,00\n")
+        result = parse_product_text(text, with_prices=True)
+        self.assertEqual(result.errors, [])
+        self.assertTrue(result.skipped_header)
+        self.assertEqual(len(result.rows), 1)
+        self.assertEqual(result.rows[0][0], 'Rura stalowa')
+
+    def test_plain_headers_still_recognised(self):
+        result = parse_product_text("Nazwa;JM;Ilość;Cena\nZawór;szt;3;5,00\n", with_prices=True)
+        self.assertEqual(result.errors, [])
+        self.assertEqual(len(result.rows), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()